@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+import sys
+from os import remove
+from os.path import getsize, join
+from time import perf_counter
+from tempfile import gettempdir
+from argparse import ArgumentParser
+
+from tfo.utils.ttx_archive import TTXReader, TTXWriter, newXMLDocument
+
+# =============================================================================
+# Benchmark des codecs de compression des fichiers .ttx
+# Mesure du temps d'enregistrement, de chargement et de la taille du fichier
+# sur des designs synthétiques (une coil de N discs)
+# =============================================================================
+
+LST_CODEC = ["stored", "deflate:1", "deflate:6", "deflate:9", "bzip2", "lzma"]
+LST_NB_DISC = [10, 1000, 10000]
+
+def addTextElement(docDom, tag_parent, tag, text):
+    tag_tmp = docDom.createElement(tag)
+    tag_tmp.appendChild(docDom.createTextNode(text))
+    tag_parent.appendChild(tag_tmp)
+    return tag_tmp
+
+def syntheticCoilXML(nb_disc, h_disc=10.0, t_duct=4.0, step_pressboard=20):
+    """
+    Génération d'un coil.xml synthétique au format de Coil.addXMLTreeDesign (longueurs en mm)
+    Empilement : duct / disc / duct / ... / disc / duct, un pressboard tous les step_pressboard discs
+    """
+    docDom = newXMLDocument()
+    root = docDom.documentElement()
+    tag_coil = docDom.createElement("coil")
+    root.appendChild(tag_coil)
+    addTextElement(docDom, tag_coil, "name", "HV")
+    addTextElement(docDom, tag_coil, "r_inner_m", "%e"%0.5)
+    addTextElement(docDom, tag_coil, "width_m", "%e"%0.1)
+
+    tag_vduct = docDom.createElement("vertical_ducts")
+    tag_coil.appendChild(tag_vduct)
+    for r_center in [0.498, 0.602]:
+        tag_d = docDom.createElement("duct")
+        tag_vduct.appendChild(tag_d)
+        addTextElement(docDom, tag_d, "t_duct_m", "%e"%4e-3)
+        addTextElement(docDom, tag_d, "r_center_m", "%e"%r_center)
+
+    tag_disc = docDom.createElement("discs")
+    tag_coil.appendChild(tag_disc)
+    tag_hduct = docDom.createElement("horizontal_ducts")
+    tag_coil.appendChild(tag_hduct)
+    tag_pressboard = docDom.createElement("pressboards")
+    tag_coil.appendChild(tag_pressboard)
+
+    z = 0.0
+    for k in range(nb_disc + 1):
+        tag_d = docDom.createElement("duct")
+        tag_hduct.appendChild(tag_d)
+        addTextElement(docDom, tag_d, "t_duct_m", "%e"%(t_duct*1e-3))
+        addTextElement(docDom, tag_d, "z_center_m", "%e"%((z + t_duct/2)*1e-3))
+        z += t_duct
+        if k == nb_disc:
+            break
+
+        if k > 0 and k%step_pressboard == 0:
+            tag_p = docDom.createElement("pressboard")
+            tag_pressboard.appendChild(tag_p)
+            addTextElement(docDom, tag_p, "t_pressboard_m", "%e"%2e-3)
+            addTextElement(docDom, tag_p, "z_center_m", "%e"%((z + 1.0)*1e-3))
+            addTextElement(docDom, tag_p, "oil_guides", "inner" if (k//step_pressboard)%2 else "outer")
+            z += 2.0
+
+        tag_d = docDom.createElement("disc")
+        tag_disc.appendChild(tag_d)
+        addTextElement(docDom, tag_d, "type", "Din_%i"%(k%3 + 1))
+        addTextElement(docDom, tag_d, "z_center_m", "%e"%((z + h_disc/2)*1e-3))
+        addTextElement(docDom, tag_d, "oil_guides", "no")
+        z += h_disc
+
+    return docDom
+
+def runBenchmark(lst_codec=LST_CODEC, lst_nb_disc=LST_NB_DISC, nb_repeat=3, path_template=None):
+    """
+    Renvoie une liste de dict (nb_disc, codec, save_s, load_s, size_kB)
+    Les temps sont les minimums sur nb_repeat essais
+    """
+    # Parties du fichier modèle (hors coil.xml) recopiées telles quelles
+    dict_template = {}
+    if not path_template is None:
+        with TTXReader(path_template) as ttx:
+            for name in ttx.lstParts():
+                if name != "design/coil.xml":
+                    dict_template[name] = ttx.readBytes(name)
+    if not "main.xml" in dict_template:
+        doc = newXMLDocument()
+        addTextElement(doc, doc.documentElement(), "version", "benchmark")
+        dict_template["main.xml"] = doc.toByteArray(4).data()
+
+    path_ttx = join(gettempdir(), "benchmark_ttx.ttx")
+    lst_res = []
+    for nb_disc in lst_nb_disc:
+        doc_coil = syntheticCoilXML(nb_disc)
+        for codec in lst_codec:
+            t_save = []
+            t_load = []
+            for _ in range(nb_repeat):
+                # Enregistrement : sérialisation + compression + écriture
+                t0 = perf_counter()
+                with TTXWriter(path_ttx, codec=codec) as ttx:
+                    for name, data in dict_template.items():
+                        ttx.writeBytes(name, data)
+                    ttx.writeXML("design/coil.xml", doc_coil)
+                t_save.append(perf_counter() - t0)
+
+                # Chargement : décompression + parsing de toutes les parties xml
+                t0 = perf_counter()
+                with TTXReader(path_ttx) as ttx:
+                    for name in ttx.lstParts():
+                        if name.endswith(".xml"):
+                            ttx.readXML(name)
+                t_load.append(perf_counter() - t0)
+
+            lst_res.append({"nb_disc": nb_disc, "codec": codec, "save_s": min(t_save), "load_s": min(t_load), \
+                            "size_kB": getsize(path_ttx)/1024})
+            print("%6i discs  %-10s  save %8.4f s  load %8.4f s  size %10.1f kB"%(nb_disc, codec, min(t_save), min(t_load), getsize(path_ttx)/1024))
+            sys.stdout.flush()
+
+    remove(path_ttx)
+
+    return lst_res
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Benchmark of the .ttx compression codecs")
+    parser.add_argument("--codec", nargs="+", default=LST_CODEC, help="codecs to compare (name or name:level)")
+    parser.add_argument("--discs", nargs="+", type=int, default=LST_NB_DISC, help="number of discs of the synthetic coil")
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs, the best time is kept")
+    parser.add_argument("--template", default=None, help=".ttx file whose other parts are copied into the synthetic design")
+    args = parser.parse_args()
+
+    runBenchmark(args.codec, args.discs, args.repeat, args.template)
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+import sys
+from os import makedirs, cpu_count
+from os.path import join, exists, abspath
+from glob import glob
+from csv import DictWriter
+from json import dumps
+from time import perf_counter
+from traceback import format_exc
+from argparse import ArgumentParser
+from multiprocessing import freeze_support
+from concurrent.futures import ProcessPoolExecutor
+
+from tfo.model.design import Design
+
+# =============================================================================
+# Export en lot de fichiers .ttx (JSON, CSV ou Parquet)
+# Chaque fichier est lu par le modèle headless dans un processus du pool,
+# le processus principal ne fait qu'écrire les lignes des tables au fil de l'eau
+# =============================================================================
+
+LST_FORMAT = ["json", "csv", "parquet"]
+LST_TABLE = ["rating_plate", "windings", "taps", "cables", "discs", "coil_stack"]
+# Colonnes de chaque table (CSV : en-tête fixe, une clé manquante donne une case vide)
+DICT_FIELD = {"rating_plate": ["file", "reference", "phase_nb", "rated_freq_Hz", "design", "cooling_mode", "vector_group", \
+                               "windings", "power_MVA", "voltage_kV", "nb_taps", "nb_cables", "nb_discs", "nb_coils", \
+                               "nb_discs_stacked", "nb_errors"], \
+              "windings": ["file", "arrangement", "style", "winding", "power_VA", "voltage_V", "Um_voltage_V", "connection", \
+                           "neutral", "displacement", "tap_changer", "rated_tap"], \
+              "taps": ["file", "winding", "tap", "u_tap_kV", "s_tap_MVA", "i_line_A", "i_coil_A"], \
+              "cables": ["file", "cable", "type", "N_strands", "h_strand_m", "t_strand_m", "t_strandInsulation_m", \
+                         "t_cableInsulation_m", "t_pressboard_m", "t_cable_m", "h_cable_m"], \
+              "discs": ["file", "disc", "coil", "cable", "N_cables", "t_cable_m", "h_cable_m"], \
+              "coil_stack": ["file", "coil", "position", "kind", "disc_type", "z_center_m", "thickness_m", "oil_guides"]}
+
+### Lecture d'un fichier (processus du pool)
+def getTables(path_ttx):
+    """
+    Tables d'un design : dict key=nom de la table ; value=liste de lignes (dict)
+    """
+    design = Design.fromFile(path_ttx)
+    tr = design.transformer
+    dict_table = {table: [] for table in LST_TABLE}
+
+    row = {"file": path_ttx}
+    row.update(design.getSummary())
+    row["nb_errors"] = len(design.checkDesign())
+    dict_table["rating_plate"].append(row)
+
+    for num_arr, arr in enumerate(tr.lst_arrangement):
+        for w in arr.lst_winding:
+            dict_table["windings"].append({"file": path_ttx, "arrangement": num_arr + 1, "style": arr.style, \
+                                           "winding": w.name, "power_VA": w.power_VA, "voltage_V": w.voltage_V, \
+                                           "Um_voltage_V": w.um_V, "connection": w.connection, \
+                                           "neutral": w.hasNeutralBushing(), "displacement": w.displacement, \
+                                           "tap_changer": w.hasTapChanger(), "rated_tap": w.getTapRated()})
+            for t in w.lst_tap:
+                i_line, i_coil = w.getTapCurrent(tr.isMonophase(), t.tap)
+                dict_table["taps"].append({"file": path_ttx, "winding": w.name, "tap": t.tap, \
+                                           "u_tap_kV": t.u_tap_kV, "s_tap_MVA": t.s_tap_MVA, \
+                                           "i_line_A": i_line, "i_coil_A": i_coil})
+
+    for cable in design.lst_cable:
+        prop = cable.getCableProperties()
+        dict_table["cables"].append({"file": path_ttx, "cable": cable.name, "type": cable.type, \
+                                     "N_strands": cable.N_strands, "h_strand_m": cable.h_strand_m, \
+                                     "t_strand_m": cable.t_strand_m, "t_strandInsulation_m": cable.t_strandInsulation_m, \
+                                     "t_cableInsulation_m": cable.t_cableInsulation_m, "t_pressboard_m": cable.t_pressboard_m, \
+                                     "t_cable_m": prop["t_cable"]*1e-3 if prop != {} else None, \
+                                     "h_cable_m": prop["h_cable"]*1e-3 if prop != {} else None})
+
+    for disc in design.lst_disc:
+        dict_table["discs"].append({"file": path_ttx, "disc": disc.name, "coil": disc.coil, "cable": disc.cable, \
+                                    "N_cables": disc.N_cables, "t_cable_m": disc.t_cable_m, "h_cable_m": disc.h_cable_m})
+
+    # Empilement trié suivant z (épaisseur d'un disc : celle du cable équivalent de sa définition, cf. gui_geom.Coil)
+    dict_t_disc = {disc.name: disc.t_cable_m for disc in design.lst_disc}
+    for coil in design.lst_coil:
+        lst_item = [("disc", d["type"], d["z_center_m"], dict_t_disc.get(d["type"]), d["oil_guides"]) for d in coil.lst_disc] + \
+                   [("horizontal_duct", "", d["z_center_m"], d["t_duct_m"], "no") for d in coil.lst_hduct] + \
+                   [("pressboard", "", p["z_center_m"], p["t_pressboard_m"], p["oil_guides"]) for p in coil.lst_pressboard]
+        for num, (kind, type_disc, z, t, guides) in enumerate(sorted(lst_item, key=lambda i: i[2])):
+            dict_table["coil_stack"].append({"file": path_ttx, "coil": coil.name, "position": num, "kind": kind, \
+                                             "disc_type": type_disc, "z_center_m": z, "thickness_m": t, \
+                                             "oil_guides": guides})
+
+    return dict_table
+
+def exportFile(path_ttx):
+    """
+    Renvoie (chemin, tables, message d'erreur) ; une erreur ne doit pas interrompre le lot
+    """
+    try:
+        return path_ttx, getTables(path_ttx), ""
+    except Exception:
+        return path_ttx, {}, format_exc()
+
+### Ecriture des tables (processus principal)
+class TableWriter():
+    """
+    Ecriture d'une table, les lignes sont ajoutées au fil des fichiers lus
+    csv et json sont écrits en flux, parquet est écrit à la fermeture
+    """
+
+    def __init__(self, path_base, fmt, lst_field):
+        self.path = path_base + "." + fmt
+        self.fmt = fmt
+        self.lst_field = lst_field
+        self.f = None
+        self.writer = None
+        self.lst_row = []
+        self.nb_rows = 0
+
+    def addRows(self, lst_row):
+        if self.fmt == "parquet":
+            self.lst_row.extend(lst_row)
+        elif self.fmt == "csv":
+            for row in lst_row:
+                if self.writer is None:
+                    self.f = open(self.path, "w", newline="", encoding="utf-8")
+                    self.writer = DictWriter(self.f, fieldnames=self.lst_field, restval="")
+                    self.writer.writeheader()
+                self.writer.writerow(row)
+        else:
+            for row in lst_row:
+                if self.f is None:
+                    self.f = open(self.path, "w", encoding="utf-8")
+                    self.f.write("[\n")
+                else:
+                    self.f.write(",\n")
+                self.f.write(dumps(row))
+        self.nb_rows = self.nb_rows + len(lst_row)
+
+    def close(self):
+        if self.fmt == "parquet":
+            if len(self.lst_row) > 0:
+                from pandas import DataFrame
+                DataFrame(self.lst_row, columns=self.lst_field).to_parquet(self.path, index=False)
+            self.lst_row = []
+        elif not self.f is None:
+            if self.fmt == "json":
+                self.f.write("\n]\n")
+            self.f.close()
+            self.f = None
+
+def checkFormat(fmt):
+    """
+    Vérification du format avant toute lecture : parquet nécessite pandas et pyarrow
+    """
+    if not fmt in LST_FORMAT:
+        raise Exception("Format '%s' inconnu (valeurs attendues : %s)"%(fmt, ", ".join(LST_FORMAT)))
+    if fmt == "parquet":
+        try:
+            import pandas, pyarrow
+        except ImportError:
+            raise Exception("L'export parquet nécessite pandas et pyarrow (pip install pandas pyarrow)")
+
+def runExport(lst_path, path_out, fmt="csv", nb_workers=None, chunksize=8, quiet=False):
+    """
+    Export des fichiers lst_path dans le dossier path_out (une table par fichier)
+    Renvoie la liste des erreurs [(chemin, message)]
+    """
+    checkFormat(fmt)
+    if not exists(path_out):
+        makedirs(path_out)
+
+    dict_writer = {table: TableWriter(join(path_out, table), fmt, DICT_FIELD[table]) for table in LST_TABLE}
+    lst_error = []
+    nb_file = len(lst_path)
+    t0 = perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=nb_workers) as executor:
+            # map conserve l'ordre des fichiers : les tables sont identiques quel que soit le nombre de processus
+            for num, (path_ttx, dict_table, msg) in enumerate(executor.map(exportFile, lst_path, chunksize=chunksize)):
+                if msg != "":
+                    lst_error.append((path_ttx, msg))
+                for table, lst_row in dict_table.items():
+                    dict_writer[table].addRows(lst_row)
+                if not quiet:
+                    print("[%i/%i] %s%s"%(num + 1, nb_file, path_ttx, " : ERROR" if msg != "" else ""))
+                    sys.stdout.flush()
+    finally:
+        for writer in dict_writer.values():
+            writer.close()
+
+    # Rapport d'erreurs par fichier
+    with open(join(path_out, "errors.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = DictWriter(f, fieldnames=["file", "error"])
+        writer.writeheader()
+        for path_ttx, msg in lst_error:
+            writer.writerow({"file": path_ttx, "error": msg})
+
+    if not quiet:
+        t = perf_counter() - t0
+        print("%i files exported in %.1f s (%.1f files/s), %i errors"%(nb_file - len(lst_error), t, nb_file/max(t, 1e-9), len(lst_error)))
+        for table, writer in dict_writer.items():
+            print("    %-14s %8i rows"%(table, writer.nb_rows))
+        for path_ttx, msg in lst_error:
+            print("ERROR %s\n%s"%(path_ttx, msg.strip().splitlines()[-1]))
+
+    return lst_error
+
+if __name__ == "__main__":
+    freeze_support()
+
+    parser = ArgumentParser(description="Batch export of .ttx files (rating plate, windings, taps, cables, discs, coil stacks)")
+    parser.add_argument("patterns", nargs="+", help="glob patterns of the .ttx files (** for sub-folders)")
+    parser.add_argument("-o", "--output", default="export_ttx", help="output folder, one file per table")
+    parser.add_argument("-f", "--format", default="csv", choices=LST_FORMAT, help="output format")
+    parser.add_argument("-j", "--jobs", type=int, default=cpu_count(), help="number of worker processes")
+    parser.add_argument("--chunksize", type=int, default=8, help="number of files sent at once to a worker")
+    parser.add_argument("-q", "--quiet", action="store_true", help="no progress output")
+    args = parser.parse_args()
+    try:
+        checkFormat(args.format)
+    except Exception as e:
+        parser.error(str(e))
+
+    lst_path = []
+    set_path = set()
+    for pattern in args.patterns:
+        for path in sorted(glob(pattern, recursive=True)):
+            if not abspath(path) in set_path:
+                set_path.add(abspath(path))
+                lst_path.append(abspath(path))
+    if len(lst_path) == 0:
+        print("No .ttx file found")
+        sys.exit(1)
+
+    lst_error = runExport(lst_path, args.output, args.format, args.jobs, args.chunksize, args.quiet)
+    sys.exit(1 if len(lst_error) > 0 else 0)
@@ -1,31 +1,36 @@
 # -*- coding: utf-8 -*-
 import sys
-from os import listdir, remove, walk, startfile
-from os.path import join, dirname, realpath, abspath, basename, splitext, normpath
+from os import listdir, remove, replace, close, startfile
+from os.path import join, dirname, realpath, abspath, basename, splitext, normpath, exists
 from shutil import rmtree
+from tempfile import mkstemp
 from datetime import datetime
 from functools import partial
-from zipfile import ZipFile, ZIP_BZIP2
 from multiprocessing import freeze_support
 
 from matplotlib import pyplot as plt
 plt.rcParams["font.family"] = "Arial"
 plt.rcParams["font.size"] = 10
 
-from PySide6.QtGui import QIcon, QStandardItemModel, QStandardItem
-from PySide6.QtCore import Qt, Signal, QItemSelection, QFile, QDir, QIODevice, QTextStream, QSettings, QCoreApplication, QByteArray, QCommandLineParser, QFileInfo, QTemporaryDir
-from PySide6.QtWidgets import QMessageBox, QVBoxLayout, QFileDialog, QApplication, QMainWindow
+from PySide6.QtGui import QIcon, QStandardItemModel, QStandardItem, QActionGroup, QAction
+from PySide6.QtCore import Qt, Signal, QItemSelection, QDir, QSettings, QCoreApplication, QByteArray, QCommandLineParser, QFileInfo
+from PySide6.QtWidgets import QMessageBox, QVBoxLayout, QFileDialog, QApplication, QMainWindow, QMenu
 from PySide6.QtXml import QDomDocument
 
 from tfo.definition.ratingPlate import UI_RatingPlate
 from tfo.definition.material_properties import UI_MaterialProperties
 from tfo.definition.cable_all import UI_CableAll
 from tfo.definition.disc_all import UI_DiscAll
-from tfo.definition.coilsGeneralDefinition import UI_CoilsGeneralDefinition
+from tfo.definition.coilsGeneralDefinition import UI_CoilsGeneralDefinition, getStackEncoding
 
 from tfo.error.error import UI_Error
 from tfo.utils.pdf_generator import PDF
 from tfo.utils.designCheck import UI_DesignCheck
+from tfo.utils.designLibrary import UI_DesignLibrary
+from tfo.utils.tapEnvelope import UI_TapEnvelope
+from tfo.utils.ttx_archive import TTXReader, TTXWriter, newXMLDocument, lstPartEntries, getResultsPath, DEFAULT_CODEC
+from tfo.utils.autosave import TTXAutosave, AUTOSAVE_INTERVAL, getLstJournal, isJournalNewer, isJournalInUse, removeJournal
+from tfo.utils.gui_geom import getRenderCacheMode, setRenderCacheMode, getPaintStats, resetPaintStats
 
 from license.about import UI_About
 from license.license import UI_License
@@ -56,6 +61,12 @@ def resource_path(relative_path):
 PATHRC = resource_path("ressources")
 ##################################################################
 
+### Dépendances entre parties du ttx
+# Une modification de la clé oblige à régénérer aussi les parties listées
+# (le coil.xml contient les noms et positions des discs, qui dépendent des cables)
+DICT_PART_DEPENDENCY = {"design/cable.xml": ["design/disc.xml", "design/coil.xml"], \
+                        "design/disc.xml": ["design/coil.xml"]}
+
 class UI_Main(QMainWindow, Ui_MainWindow):
 
     # Signal quand le design est freezé
@@ -81,6 +92,51 @@ class UI_Main(QMainWindow, Ui_MainWindow):
         self.action_GenPDF.setIcon(QIcon(join(PATHRC, "pdf.png")))
         self.action_Check.setIcon(QIcon(join(PATHRC, "check_green.png")))
 
+        # Ouverture depuis la bibliothèque de designs
+        self.action_OpenLibrary = QAction("Open from &library...", self)
+        self.action_OpenLibrary.setShortcut("Ctrl+Shift+O")
+        self.menu_File.insertAction(self.action_Save, self.action_OpenLibrary)
+
+        # Choix du codec de compression des .ttx
+        self.menu_Codec = QMenu("Compression", self.menu_File)
+        self.group_Codec = QActionGroup(self)
+        for codec, text in [("stored", "Stored (fastest, largest)"), ("deflate:1", "Deflate - fast"), ("deflate:6", "Deflate - default"), \
+                            ("deflate:9", "Deflate - best"), ("bzip2", "Bzip2"), ("lzma", "LZMA (slowest, smallest)")]:
+            act = self.menu_Codec.addAction(text)
+            act.setData(codec)
+            act.setCheckable(True)
+            self.group_Codec.addAction(act)
+        self.menu_Codec.addSeparator()
+        self.action_CoilBinary = self.menu_Codec.addAction("Binary coil stacks (not readable by older versions)")
+        self.action_CoilBinary.setCheckable(True)
+        self.action_CoilBlocks = self.menu_Codec.addAction("Run-length coil stacks (not readable by older versions)")
+        self.action_CoilBlocks.setCheckable(True)
+        self.menu_File.addSeparator()
+        self.menu_File.addMenu(self.menu_Codec)
+        self.group_Codec.triggered.connect(self.changeCodec)
+        self.action_CoilBinary.toggled.connect(self.changeCoilBinary)
+        self.action_CoilBlocks.toggled.connect(self.changeCoilBlocks)
+
+        # Tensions et courants sur toutes les prises de tous les enroulements
+        self.action_TapEnvelope = QAction("Tap envelope...", self)
+        self.menu_Design.insertAction(self.action_GenPDF, self.action_TapEnvelope)
+        self.action_TapEnvelope.triggered.connect(self.showTapEnvelope)
+
+        # Cache du rendu des dessins statiques (vue du transformateur, section des cables)
+        self.menu_RenderCache = QMenu("Drawing cache", self.menu_Design)
+        self.group_RenderCache = QActionGroup(self)
+        for mode, text in [("device", "Screen resolution (default)"), ("item", "Fixed resolution (faster zoom)"), ("none", "Off (repaint every time)")]:
+            act = self.menu_RenderCache.addAction(text)
+            act.setData(mode)
+            act.setCheckable(True)
+            self.group_RenderCache.addAction(act)
+        self.menu_RenderCache.addSeparator()
+        self.action_PaintStats = self.menu_RenderCache.addAction("Drawing statistics...")
+        self.menu_Design.addSeparator()
+        self.menu_Design.addMenu(self.menu_RenderCache)
+        self.group_RenderCache.triggered.connect(self.changeRenderCache)
+        self.action_PaintStats.triggered.connect(self.showPaintStats)
+
         # Ajout d'un layout au ui_activeWidget
         self.ui_layout_activeWidget = QVBoxLayout(self.ui_activeWidget)
 
@@ -96,11 +152,15 @@ class UI_Main(QMainWindow, Ui_MainWindow):
         self.resizeDocks([self.ui_dockCase], [2.5*self.ui_dockCase.width()], Qt.Horizontal)
         self.ui_txt_comments.textChanged.connect(self.uiWasModified)
 
+        # Autosave en arrière-plan
+        self.autosave = TTXAutosave(self)
+        self.autosave.snapshotDone.connect(self.autosaveDone)
+
         # Divers
         self.readSettings()
         self.uiChanged = False
         self.designFrozen = False
-        self.tmpSaveDirPath = None
+        self.ttx_reader = None
         self.curFilePath = None
         self.window_mode = None
 
@@ -113,6 +173,7 @@ class UI_Main(QMainWindow, Ui_MainWindow):
         self.action_SaveAs.triggered.connect(self.saveAs)
         self.action_New.triggered.connect(self.new)
         self.action_Open.triggered.connect(self.openFile)
+        self.action_OpenLibrary.triggered.connect(self.openLibrary)
         self.action_GenPDF.triggered.connect(self.generatePDF)
         self.action_Check.triggered.connect(partial(self.checkDesign, True))
         self.action_About.triggered.connect(UI_About(self).exec)
@@ -173,8 +234,8 @@ class UI_Main(QMainWindow, Ui_MainWindow):
             item = self.ui_layout_activeWidget.itemAt(k)
             item.widget().hide()
 
-        # Définition du chemin du dossier temporaire
-        self.setTempSaveDir()
+        # Fermeture de l'archive précédente
+        self.closeReader()
 
         # Reset
         self.model.clear()
@@ -215,6 +276,16 @@ class UI_Main(QMainWindow, Ui_MainWindow):
         self.widg_coilsGen.isModified.connect(self.uiWasModified)
         self.tree_coilsGen = TreeCase("Coils", self.tree_windings, self.ui_treeCase, self.widg_coilsGen, self.ui_layout_activeWidget)
 
+        # Suivi des parties du ttx à régénérer à l'enregistrement
+        self.dict_partDirty = {}
+        self.coilSignature = None
+        # Format des empilements de design/coil.xml dans le fichier ouvert (cf. getStackEncoding)
+        self.coilEncoding = None
+        self.autosave.reset()
+        for w in self.getAllTreeCaseWidget([]):
+            w.isModified.connect(partial(self.setPartDirty, w.ttx_part))
+        self.widg_coilsGen.coilModified.connect(partial(self.setPartDirty, self.widg_coilsGen.ttx_part))
+
         # Affichage du rating plate
         self.tree_ratingPlate.showWidget()
 
@@ -315,14 +386,89 @@ class UI_Main(QMainWindow, Ui_MainWindow):
 
         self.setWindowTitle(shownName)
 
-    def setTempSaveDir(self):
+    def closeReader(self):
+        """
+        Fermeture de l'archive ouverte au chargement
+        """
+        if not self.ttx_reader is None:
+            self.ttx_reader.close()
+            self.ttx_reader = None
+
+    def setPartDirty(self, part):
+        """
+        La partie part du ttx (et celles qui en dépendent) devra être régénérée au prochain enregistrement
+        """
+        self.dict_partDirty[part] = True
+        self.autosave.setPartDirty(part)
+        for p in DICT_PART_DEPENDENCY.get(part, []):
+            self.dict_partDirty[p] = True
+            self.autosave.setPartDirty(p)
+
+    def setAllPartsClean(self, coilEncoding):
         """
-        Définition du dossier temporaire pour l'extraction du fichier d'enregistrement
+        Toutes les parties du ttx correspondent au fichier ouvert
+        coilEncoding : format de ses empilements de coils (None si aucun), cf. getStackEncoding
         """
-        tmp = QTemporaryDir()
-        tmp.setAutoRemove(False)
-        self.tmpSaveDirPath = tmp.path()
-        print(self.tmpSaveDirPath)
+        self.dict_partDirty = {w.ttx_part: False for w in self.getAllTreeCaseWidget([])}
+        self.coilSignature = self.widg_coilsGen.getCoilSignature()
+        self.coilEncoding = coilEncoding
+        self.autosave.reset()
+        self.checkCoilEncoding()
+
+    def checkCoilEncoding(self):
+        """
+        coil.xml (et ses .npz) est régénéré si ses empilements ne sont pas au format choisi (Binary / Run-length coil stacks)
+        """
+        if not self.coilEncoding is None and self.coilEncoding != getStackEncoding(self.coil_binary, self.coil_blocks):
+            self.setPartDirty(self.widg_coilsGen.ttx_part)
+
+    def isPartDirty(self, part):
+        return self.dict_partDirty.get(part, True)
+
+    def autosaveDone(self, t_snapshot):
+        self.ui_statusbar.showMessage("Autosave (snapshot %.0f ms)"%t_snapshot, 2000)
+
+    def restoreAutosave(self):
+        """
+        Proposition de restauration d'un journal d'autosave laissé par une session interrompue
+        """
+        for path_journal, info in getLstJournal():
+            # Journal de cette instance ou d'une autre instance en cours
+            if path_journal == self.autosave.path_journal or isJournalInUse(path_journal):
+                continue
+            # Journal d'une session interrompue, antérieur au dernier enregistrement de son fichier
+            if not isJournalNewer(path_journal, info):
+                removeJournal(path_journal)
+                continue
+
+            if info.get("source") is None:
+                str_file = "an unsaved design"
+            else:
+                str_file = info["source"]
+            msgBox = QMessageBox(QMessageBox.Question, "TransfoTron", \
+                "TransfoTron was not closed properly.\nAn autosave of %s from %s was found.\n\nDo you want to restore it?"%(str_file, info.get("time", "?").replace("T", " ")[:19]), \
+                QMessageBox.Yes | QMessageBox.Discard | QMessageBox.Ignore, self)
+            msgBox.button(QMessageBox.Yes).setText("Restore")
+            msgBox.button(QMessageBox.Ignore).setText("Later")
+            msgBox.setDefaultButton(QMessageBox.Yes)
+            ret = msgBox.exec()
+            if ret == QMessageBox.Discard:
+                removeJournal(path_journal)
+            elif ret == QMessageBox.Yes:
+                self.loadFile(path_journal)
+                # Le journal n'est pas le fichier de l'utilisateur : tout sera régénéré au prochain enregistrement
+                self.closeReader()
+                self.autosave.reset()
+                if not info.get("source") is None and exists(info["source"]):
+                    self.setCurrentFile(info["source"])
+                else:
+                    self.setCurrentFile(None)
+                self.uiWasModified()
+                # Le design restauré est repris par l'autosave de cette instance
+                removeJournal(path_journal)
+                # Un seul design par fenêtre : les autres journaux seront proposés au prochain démarrage
+                break
+            # Later : le journal est conservé et sera proposé au prochain démarrage
 
     def openFile(self):
         if self.maybeSave():
@@ -330,6 +476,15 @@ class UI_Main(QMainWindow, Ui_MainWindow):
             if path_open != "":
                 self.loadFile(path_open)
 
+    def openLibrary(self):
+        """
+        Recherche d'un design dans la bibliothèque puis ouverture
+        """
+        if self.maybeSave():
+            dialog = UI_DesignLibrary(self)
+            if dialog.exec() and not dialog.path_selected is None:
+                self.loadFile(dialog.path_selected)
+
     def save(self):
         if self.curFilePath == None:
             return self.saveAs()
@@ -347,20 +502,14 @@ class UI_Main(QMainWindow, Ui_MainWindow):
 
         return self.saveFile(path_save)
 
-    def saveFile(self, path_save):
+    def generateParts(self, ttx, isPartDirty, copyPart):
         """
-        Fonction d'enregistrement du fichier
+        Ecriture de main.xml puis des parties des widgets dans ttx (TTXWriter ou TTXSnapshot)
+        Les parties non modifiées (isPartDirty(part) faux) sont recopiées par copyPart(ttx, part)
         """
-        # Curseur de chargement
-        QApplication.setOverrideCursor(Qt.WaitCursor)
-
-        # Nouveau dossier temporaire
-        self.setTempSaveDir()
-
-        ### Création des xml dans le dossier temporaire
         ## main.xml
-        doc = QDomDocument()
-        root = doc.appendChild(doc.createElement("root"))
+        doc = newXMLDocument()
+        root = doc.documentElement()
         root.appendChild(doc.createComment("Created on " + str(datetime.now().isoformat())))
         # Version de TransfoTron
         tag_tmp = doc.createElement("version")
@@ -375,33 +524,61 @@ class UI_Main(QMainWindow, Ui_MainWindow):
         tag_tmp = doc.createElement("comments")
         tag_tmp.appendChild(doc.createTextNode("%s"%self.ui_txt_comments.toPlainText()))
         root.appendChild(tag_tmp)
-
-        # Enregistrement
-        header = doc.createProcessingInstruction("xml", "version=\"1.0\" encoding=\"UTF-8\"")
-        doc.insertBefore(header, root)
-        file = QFile(join(self.tmpSaveDirPath, "main.xml"))
-        file.open(QIODevice.WriteOnly)
-        out = QTextStream(file)
-        doc.save(out, 4, QDomDocument.EncodingFromDocument)
-        file.close()
+        ttx.writeXML("main.xml", doc)
 
         ## Passage aux autres widgets
         # Parcours des UI_widget
-        lst_case = self.getAllTreeCaseWidget([])
-        for w in lst_case:
-            print("saveFile", w.__class__.__name__)
-            w.generateXML(self.tmpSaveDirPath)
-
-        ### Zippage de l'ensemble et enregistrement
-        # Récupération de tous les chemins des fichiers
-        file_paths = []
-        for root, directories, files in walk(self.tmpSaveDirPath):
-            for filename in files:
-                file_paths.append(join(root, filename))
-        # Ecriture du fichier .ttx
-        with ZipFile(path_save, 'w', compression=ZIP_BZIP2) as zip_file:
-            for file in file_paths:
-                zip_file.write(file, arcname=file.replace(self.tmpSaveDirPath, ""))
+        lst_copied = []
+        for w in self.getAllTreeCaseWidget([]):
+            if isPartDirty(w.ttx_part):
+                w.generateXML(ttx)
+            elif not w.ttx_part in lst_copied:
+                # Partie inchangée : recopie de ses entrées (partie et annexes déclarées)
+                copyPart(ttx, w.ttx_part)
+                lst_copied.append(w.ttx_part)
+
+    def saveFile(self, path_save):
+        """
+        Fonction d'enregistrement du fichier
+        """
+        # Curseur de chargement
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+
+        # Archive d'où recopier les parties non modifiées (si elle a été écrite avec le même codec)
+        ttx_source = self.ttx_reader
+        if not ttx_source is None and ttx_source.codec() != self.ttx_codec:
+            ttx_source = None
+        # Les coils ont pu changer suite à une modification des enroulements
+        if self.widg_coilsGen.getCoilSignature() != self.coilSignature:
+            self.setPartDirty(self.widg_coilsGen.ttx_part)
+        self.checkCoilEncoding()
+        isCoilWritten = ttx_source is None or self.isPartDirty(self.widg_coilsGen.ttx_part)
+
+        ### Ecriture dans un fichier temporaire à côté de la destination, puis remplacement
+        fd, path_tmp = mkstemp(suffix=".tmp", prefix=basename(path_save) + ".", dir=dirname(abspath(path_save)))
+        close(fd)
+        try:
+            with TTXWriter(path_tmp, codec=self.ttx_codec, coil_binary=self.coil_binary, coil_blocks=self.coil_blocks) as ttx:
+                self.generateParts(ttx, lambda part: ttx_source is None or self.isPartDirty(part), \
+                                   lambda ttx, part: [ttx.copyPart(ttx_source, name) for name in lstPartEntries(ttx_source.lstParts(), part)])
+        except:
+            remove(path_tmp)
+            QApplication.restoreOverrideCursor()
+            raise
+
+        # L'archive chargée peut être celle que l'on va écraser
+        self.closeReader()
+        replace(path_tmp, path_save)
+        self.ttx_reader = TTXReader(path_save)
+        self.setAllPartsClean(getStackEncoding(self.coil_binary, self.coil_blocks) if isCoilWritten else self.coilEncoding)
+
+        # Résultats de calcul des coils, à côté du ttx
+        try:
+            self.widg_coilsGen.saveResults(getResultsPath(path_save))
+        except:
+            QApplication.restoreOverrideCursor()
+            QMessageBox.warning(self, "TransfoTron", "Cannot save calculation results in %s."%getResultsPath(path_save))
+            QApplication.setOverrideCursor(Qt.WaitCursor)
 
         self.setCurrentFile(path_save)
         self.ui_statusbar.showMessage("TransfoTron file saved", 2000)
@@ -529,34 +706,29 @@ class UI_Main(QMainWindow, Ui_MainWindow):
         QApplication.setOverrideCursor(Qt.WaitCursor)
 
         if ext == ".ttx":
-            ### Dézippage dans le dossier temporaire
+            ### Ouverture de l'archive, les parties seront lues à la demande
             try:
-                with ZipFile(path_open, "r") as zip_file:
-                    zip_file.extractall(self.tmpSaveDirPath)
+                self.ttx_reader = TTXReader(path_open)
             except:
                 QApplication.restoreOverrideCursor()
                 QMessageBox.warning(self, "TransfoTron", "Cannot read file %s."%path_open)
-                QApplication.setOverrideCursor(Qt.WaitCursor)
                 return
 
             ### Chargement des infos
             ## main.xml
-            file = QFile(join(self.tmpSaveDirPath, "main.xml"))
-            doc = QDomDocument()
-            if not file.open(QIODevice.ReadOnly):
-                file.close()
-                QApplication.restoreOverrideCursor()
-                QMessageBox.warning(self, "TransfoTron", "Error while loading XML part: main.xml")
-                QApplication.setOverrideCursor(Qt.WaitCursor)
-            if not doc.setContent(file):
-                file.close()
+            try:
+                doc = self.ttx_reader.readXML("main.xml")
+            except:
+                doc = None
+            if doc is None:
                 QApplication.restoreOverrideCursor()
                 QMessageBox.warning(self, "TransfoTron", "Error while loading XML part: main.xml")
                 QApplication.setOverrideCursor(Qt.WaitCursor)
-            file.close()
+                doc = QDomDocument()
 
             root = doc.documentElement()
             if root.isNull():
+                QApplication.restoreOverrideCursor()
                 return
 
             # Commentaires
@@ -574,20 +746,30 @@ class UI_Main(QMainWindow, Ui_MainWindow):
                 if hasattr(sys, "_MEIPASS"):
                     # En mode compilé
                     try:
-                        w.loadXML(self.tmpSaveDirPath)
+                        w.loadXML(self.ttx_reader)
                     except:
                         QApplication.restoreOverrideCursor()
                         QMessageBox.warning(self, "TransfoTron", "Error while loading XML part: %s."%w.__class__.__name__)
                         QApplication.setOverrideCursor(Qt.WaitCursor)
                         print("Error...")
                 else:
-                    w.loadXML(self.tmpSaveDirPath)
+                    w.loadXML(self.ttx_reader)
 
         else:
             QApplication.restoreOverrideCursor()
             QMessageBox.warning(self, "TransfoTron", "Cannot read file %s."%path_open)
             return
 
+        # Résultats de calcul des coils, à côté du ttx
+        lst_error = self.widg_coilsGen.loadResults(getResultsPath(path_open))
+        if len(lst_error) > 0:
+            QApplication.restoreOverrideCursor()
+            QMessageBox.warning(self, "TransfoTron", "Calculation results do not match the coil stack: %s."%", ".join(lst_error))
+            QApplication.setOverrideCursor(Qt.WaitCursor)
+
+        # Toutes les parties correspondent au fichier ouvert
+        self.setAllPartsClean(self.widg_coilsGen.stack_encoding)
+
         # Nom du fichier
         self.setCurrentFile(path_open)
         self.ui_statusbar.showMessage("TransfoTron file loaded", 2000)
@@ -605,6 +787,79 @@ class UI_Main(QMainWindow, Ui_MainWindow):
         else:
             self.restoreGeometry(geometry)
 
+        # Intervalle de l'autosave (s), 0 pour le désactiver
+        self.autosave.setInterval(settings.value("autosaveInterval", AUTOSAVE_INTERVAL, type=int))
+
+        # Codec de compression des .ttx
+        self.ttx_codec = settings.value("ttxCodec", DEFAULT_CODEC)
+        for act in self.group_Codec.actions():
+            act.setChecked(act.data() == self.ttx_codec)
+        # Empilements des coils
+        self.coil_binary = settings.value("coilBinary", False, type=bool)
+        self.action_CoilBinary.setChecked(self.coil_binary)
+        self.coil_blocks = settings.value("coilBlocks", False, type=bool)
+        self.action_CoilBlocks.setChecked(self.coil_blocks)
+
+        # Cache du rendu des dessins
+        mode = getRenderCacheMode()
+        for act in self.group_RenderCache.actions():
+            act.setChecked(act.data() == mode)
+
+    def changeCodec(self, action):
+        """
+        Changement du codec de compression utilisé à l'enregistrement
+        """
+        self.ttx_codec = action.data()
+        settings = QSettings(QCoreApplication.organizationName(), QCoreApplication.applicationName())
+        settings.setValue("ttxCodec", self.ttx_codec)
+
+    def changeRenderCache(self, action):
+        """
+        Changement du mode de cache du rendu des dessins statiques
+        """
+        setRenderCacheMode(action.data())
+
+    def showTapEnvelope(self):
+        """
+        Enveloppe des tensions et courants sur toutes les prises de tous les enroulements
+        """
+        dialog = UI_TapEnvelope(self.widg_ratingPlate, self)
+        dialog.exec()
+
+    def showPaintStats(self):
+        """
+        Nombre et durée des dessins effectifs depuis la dernière remise à zéro (mesure de l'effet du cache du rendu)
+        """
+        dict_stat = getPaintStats()
+        lst_line = ["Drawing cache: %s"%getRenderCacheMode(), ""]
+        for name, (nb, time_s) in sorted(dict_stat.items()):
+            lst_line.append("%s: %i repaints, %.1f ms (%.2f ms per repaint)"%(name, nb, time_s*1e3, time_s*1e3/nb))
+        if len(dict_stat) == 0:
+            lst_line.append("No repaint")
+        ret = QMessageBox.information(self, "Drawing statistics", "\n".join(lst_line), QMessageBox.Reset | QMessageBox.Close, QMessageBox.Close)
+        if ret == QMessageBox.Reset:
+            resetPaintStats()
+
+    def changeCoilBinary(self, isChecked):
+        """
+        Enregistrement des empilements des coils au format colonnaire (.npz) ou XML
+        """
+        self.coil_binary = isChecked
+        if hasattr(self, "widg_coilsGen"):
+            self.setPartDirty(self.widg_coilsGen.ttx_part)
+        settings = QSettings(QCoreApplication.organizationName(), QCoreApplication.applicationName())
+        settings.setValue("coilBinary", self.coil_binary)
+
+    def changeCoilBlocks(self, isChecked):
+        """
+        Enregistrement des empilements XML des coils par blocs de motifs répétés ou élément par élément
+        """
+        self.coil_blocks = isChecked
+        if hasattr(self, "widg_coilsGen"):
+            self.setPartDirty(self.widg_coilsGen.ttx_part)
+        settings = QSettings(QCoreApplication.organizationName(), QCoreApplication.applicationName())
+        settings.setValue("coilBlocks", self.coil_blocks)
+
     def writeSettings(self):
         settings = QSettings(QCoreApplication.organizationName(), QCoreApplication.applicationName())
         settings.setValue("geometry", self.saveGeometry())
@@ -642,6 +897,8 @@ class UI_Main(QMainWindow, Ui_MainWindow):
 
         if self.maybeSave():
             self.writeSettings() # Pour se souvenir de la taille et position de la fenetre et du curPath
+            self.closeReader()
+            self.autosave.stop()
             self.deleteTempFiles()
             event.accept()
         else:
@@ -781,4 +1038,7 @@ if __name__ == "__main__":
         fullPath = QFileInfo(parser.positionalArguments()[0]).absoluteFilePath()
         win.loadFile(fullPath)
 
+    # Restauration éventuelle d'un autosave
+    win.restoreAutosave()
+
     sys.exit(app.exec())
\ No newline at end of file
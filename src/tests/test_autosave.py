@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import unittest
+from os.path import join, dirname, realpath, exists
+from tempfile import TemporaryDirectory
+from unittest import mock
+from zipfile import ZipFile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, dirname(dirname(realpath(__file__))))
+
+from PySide6.QtWidgets import QApplication
+
+from tfo.utils.ttx_archive import TTXSnapshot
+
+# =============================================================================
+# Autosave : instantané sur le thread GUI, construction et écriture dans un thread
+# =============================================================================
+
+PATH_EXAMPLE = join(dirname(dirname(dirname(realpath(__file__)))), "TT_example.ttx")
+
+class TestAutosave(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+        cls.app.setOrganizationName("TT_tests")
+        cls.app.setApplicationName("TransfoTron - Design Data")
+        import main_DD
+        cls.win = main_DD.UI_Main()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.win.autosave.stop()
+
+    def setUp(self):
+        self.dir_tmp = TemporaryDirectory()
+        self.win.uiChanged = False
+        self.win.new()
+        self.win.loadFile(PATH_EXAMPLE)
+        self.autosave = self.win.autosave
+        self.autosave.setInterval(0)
+
+    def tearDown(self):
+        # Modifications abandonnées, l'archive ouverte est fermée avant la suppression du dossier
+        self.win.uiChanged = False
+        self.win.new()
+        self.dir_tmp.cleanup()
+
+    def modifyCoils(self):
+        for c in self.win.widg_coilsGen.lst_coilThermalData:
+            for c_ui in c["lst_UI_CoilDefinition"]:
+                c_ui.isModified.emit()
+        self.win.uiChanged = True
+
+    def runAutosave(self):
+        self.autosave.autosave()
+        self.autosave.wait()
+        self.app.processEvents()
+
+    def test_coilBuiltInWorker(self):
+        self.modifyCoils()
+        lst_snapshot = []
+        writeArchive = TTXSnapshot.writeArchive
+        def writeArchiveCheck(snapshot, path_save, codec):
+            # coil.xml n'est pas encore construit quand l'instantané quitte le thread GUI
+            lst_snapshot.append(("design/coil.xml" in snapshot.dict_part, len(snapshot.lst_state)))
+            return writeArchive(snapshot, path_save, codec)
+        with mock.patch.object(TTXSnapshot, "writeArchive", writeArchiveCheck):
+            self.runAutosave()
+        self.assertEqual(lst_snapshot, [(False, 1)])
+
+        # Même coil.xml qu'un enregistrement
+        path_save = join(self.dir_tmp.name, "design.ttx")
+        self.win.saveFile(path_save)
+        with ZipFile(path_save) as z_save:
+            coil_xml = z_save.read("design/coil.xml")
+        self.modifyCoils()
+        self.runAutosave()
+        with ZipFile(self.autosave.path_journal) as z_journal:
+            self.assertEqual(z_journal.read("design/coil.xml"), coil_xml)
+
+    def test_failure(self):
+        self.modifyCoils()
+        def writeArchiveFail(snapshot, path_save, codec):
+            with open(path_save, "wb") as f:
+                f.write(b"PK")
+            raise OSError("disk full")
+        lst_error = []
+        with mock.patch.object(TTXSnapshot, "writeArchive", writeArchiveFail), \
+             mock.patch.object(sys, "excepthook", lambda *exc_info: lst_error.append(exc_info[1])):
+            self.runAutosave()
+            self.runAutosave()
+
+        # Pas de fichier temporaire, erreur remontée une fois, parties toujours à régénérer
+        self.assertFalse(exists(self.autosave.path_journal + ".tmp"))
+        self.assertEqual([str(e) for e in lst_error], ["disk full"])
+        self.assertIn("design/coil.xml", self.autosave.set_dirty)
+
+        # Un autosave réussi réarme le signalement
+        self.runAutosave()
+        self.assertTrue(exists(self.autosave.path_journal))
+        self.assertFalse(self.autosave.isFailing)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import unittest
+from os.path import join, dirname, realpath
+from tempfile import TemporaryDirectory
+from zipfile import ZipFile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, dirname(dirname(realpath(__file__))))
+
+from PySide6.QtWidgets import QApplication
+
+# =============================================================================
+# Régénération de coil.xml quand le format des empilements change
+# =============================================================================
+
+PATH_EXAMPLE = join(dirname(dirname(dirname(realpath(__file__)))), "TT_example.ttx")
+
+class TestCoilEncoding(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+        cls.app.setOrganizationName("TT_tests")
+        cls.app.setApplicationName("TransfoTron - Design Data")
+        import main_DD
+        cls.win = main_DD.UI_Main()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.win.autosave.stop()
+
+    def saveAs(self, path, coil_binary, coil_blocks):
+        """
+        Enregistrement avec les réglages Binary / Run-length coil stacks donnés
+        """
+        self.win.coil_binary = coil_binary
+        self.win.coil_blocks = coil_blocks
+        self.win.saveFile(path)
+        with ZipFile(path) as z:
+            return z.namelist(), z.read("design/coil.xml").decode("utf-8")
+
+    def reopen(self, path, coil_binary, coil_blocks):
+        """
+        Ouverture avec les réglages donnés (comme au démarrage de l'application)
+        """
+        self.win.coil_binary = coil_binary
+        self.win.coil_blocks = coil_blocks
+        self.win.new()
+        self.win.loadFile(path)
+
+    def test_binaryToItems(self):
+        with TemporaryDirectory() as path_dir:
+            path_npz, path_xml = join(path_dir, "npz.ttx"), join(path_dir, "xml.ttx")
+            self.reopen(PATH_EXAMPLE, False, False)
+            lst_name, coil_xml = self.saveAs(path_npz, True, False)
+            self.assertTrue(any(name.endswith(".npz") for name in lst_name))
+            self.assertIn("<stack_part>", coil_xml)
+
+            # Fichier npz ouvert, binaire désactivé : coil.xml est réécrit élément par élément
+            self.reopen(path_npz, False, False)
+            self.assertTrue(self.win.isPartDirty("design/coil.xml"))
+            lst_name, coil_xml = self.saveAs(path_xml, False, False)
+            self.assertFalse(any(name.endswith(".npz") for name in lst_name))
+            self.assertNotIn("<stack_part>", coil_xml)
+            self.assertIn("<disc>", coil_xml)
+
+            # Le fichier obtenu est dans le format courant
+            self.reopen(path_xml, False, False)
+            self.assertFalse(self.win.isPartDirty("design/coil.xml"))
+
+    def test_itemsToBlocks(self):
+        with TemporaryDirectory() as path_dir:
+            path_xml, path_blocks = join(path_dir, "xml.ttx"), join(path_dir, "blocks.ttx")
+            self.reopen(PATH_EXAMPLE, False, False)
+            lst_name, coil_xml = self.saveAs(path_xml, False, False)
+            self.assertNotIn("<blocks>", coil_xml)
+
+            self.reopen(path_xml, False, True)
+            lst_name, coil_xml = self.saveAs(path_blocks, False, True)
+            self.assertIn("<blocks>", coil_xml)
+
+            # Après l'enregistrement, le format chargé est le format courant
+            self.assertFalse(self.win.isPartDirty("design/coil.xml"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import unittest
+from os.path import join, dirname, realpath, exists
+from tempfile import TemporaryDirectory
+
+import numpy
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, dirname(dirname(realpath(__file__))))
+
+from PySide6.QtWidgets import QApplication
+
+from tfo.utils.gui_geom import CoilResults
+from tfo.utils.ttx_archive import getResultsPath
+
+# =============================================================================
+# Persistance des résultats de calcul (.npy à côté du ttx)
+# =============================================================================
+
+PATH_EXAMPLE = join(dirname(dirname(dirname(realpath(__file__)))), "TT_example.ttx")
+
+def getFilledResults():
+    results = CoilResults(5)
+    results.setValue("c1", "averageTR", 2, 12.5)
+    results.setValue("c2", "maxTR", 0, 30.25)
+    results.setLossArray("c2", [1, 3], numpy.array([[1.5, 2.5], [3.5, numpy.nan]]), [2, 1])
+    results.removeCalcul("c1")
+    results.setValue("c3", "averageVelocity", 4, 0.125)
+    return results
+
+class TestCoilResults(unittest.TestCase):
+
+    def test_arraysRoundTrip(self):
+        results = getFilledResults()
+        with TemporaryDirectory() as path_dir:
+            results.saveArrays(join(path_dir, "coil_HV"))
+            dict_arr = CoilResults.loadArrays(join(path_dir, "coil_HV"))
+            self.assertIsInstance(dict_arr["loss_W"], numpy.memmap)
+
+            results_load = CoilResults(5)
+            results_load.setArrays(dict_arr)
+            self.assertEqual(results_load.getIds(), results.getIds())
+            for name in CoilResults.LST_NAME:
+                numpy.testing.assert_array_equal(results_load.getArray(name), results.getArray(name))
+            self.assertEqual(results_load.getLossCable("c2", 1), [1.5, 2.5])
+
+            # Projection en copie à l'écriture : le fichier n'est pas modifié
+            results_load.setValue("c2", "maxTR", 0, 99.0)
+            results_load.setValue("c4", "maxTR", 0, 1.0)
+            self.assertEqual(float(CoilResults.loadArrays(join(path_dir, "coil_HV"))["maxTR"][0, 0]), 30.25)
+
+            # Réécriture dans le dossier projeté
+            results_load.saveArrays(join(path_dir, "coil_HV"))
+            dict_arr = CoilResults.loadArrays(join(path_dir, "coil_HV"))
+            self.assertEqual(dict_arr["id_calcul"].tolist(), ["c2", "c3", "c4"])
+            self.assertEqual(float(dict_arr["maxTR"][0, 0]), 99.0)
+
+            CoilResults.removeArrays(join(path_dir, "coil_HV"))
+            self.assertIsNone(CoilResults.loadArrays(join(path_dir, "coil_HV")))
+
+    def test_wrongItemNumber(self):
+        with TemporaryDirectory() as path_dir:
+            getFilledResults().saveArrays(path_dir)
+            with self.assertRaises(Exception):
+                CoilResults(4).setArrays(CoilResults.loadArrays(path_dir))
+
+class TestCoilResultsFile(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+        cls.app.setOrganizationName("TT_tests")
+        cls.app.setApplicationName("TransfoTron - Design Data")
+        import main_DD
+        cls.win = main_DD.UI_Main()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.win.autosave.stop()
+
+    def getCoil(self):
+        return self.win.widg_coilsGen.lst_coilThermalData[0]["lst_UI_CoilDefinition"][0].coil
+
+    def test_saveLoad(self):
+        with TemporaryDirectory() as path_dir:
+            path_save = join(path_dir, "design.ttx")
+            self.win.new()
+            self.win.loadFile(PATH_EXAMPLE)
+            stack = self.getCoil().stack
+            stack.setResult("c1", "averageTR", 3, 12.5)
+            stack.setResult("c1", "maxTR", 3, 20.0)
+            self.win.saveFile(path_save)
+            self.assertTrue(exists(join(getResultsPath(path_save), "coil_%s"%self.win.widg_coilsGen.lst_coilThermalData[0]["name"])))
+
+            # Rechargement : résultats relus dans les fichiers .npy
+            self.win.new()
+            self.win.loadFile(path_save)
+            stack = self.getCoil().stack
+            self.assertEqual(stack.results.getIds(), ["c1"])
+            self.assertEqual(stack.getResult("c1", "averageTR", 3), 12.5)
+            self.assertEqual(stack.getResult("c1", "maxTR", 3), 20.0)
+            self.win.new()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import unittest
+from os.path import join, dirname, realpath
+from tempfile import TemporaryDirectory
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, dirname(dirname(realpath(__file__))))
+
+from PySide6.QtWidgets import QApplication
+
+from tfo.model.design import Design
+
+# =============================================================================
+# Modèle sans widgets : mêmes grandeurs dérivées et même empilement que l'interface
+# =============================================================================
+
+PATH_EXAMPLE = join(dirname(dirname(dirname(realpath(__file__)))), "TT_example.ttx")
+
+class TestDesignModel(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+        cls.app.setOrganizationName("TT_tests")
+        cls.app.setApplicationName("TransfoTron - Design Data")
+        import main_DD
+        cls.win = main_DD.UI_Main()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.win.autosave.stop()
+
+    def reopen(self, path, coil_binary=False, coil_blocks=False):
+        self.win.coil_binary = coil_binary
+        self.win.coil_blocks = coil_blocks
+        self.win.uiChanged = False
+        self.win.new()
+        self.win.loadFile(path)
+
+    def test_derivedValues(self):
+        self.reopen(PATH_EXAMPLE)
+        design = Design.fromFile(PATH_EXAMPLE)
+        widg_ratingPlate = self.win.widg_ratingPlate
+        tr = design.transformer
+
+        self.assertEqual(tr.getStudyName(), widg_ratingPlate.updateStudyName())
+        self.assertEqual(tr.getVectorGroup(), widg_ratingPlate.getVectorGroup())
+        self.assertEqual(tr.getCoolingMode(), widg_ratingPlate.cooling_mode)
+
+        lst_ui_wind = widg_ratingPlate.getLstWindingVoltageDescendingNameAlphabetical()
+        lst_wind = tr.getLstWindingVoltageDescendingNameAlphabetical()
+        self.assertEqual([w.name for w in lst_wind], [w.getName() for w in lst_ui_wind])
+        for w, ui_w in zip(lst_wind, lst_ui_wind):
+            self.assertEqual(w.getStrRegulation(), ui_w.getStrRegulation())
+            # Tensions de prise recalculées par le widget : écart au dernier chiffre près
+            for tap in w.getLstPositions():
+                for i, i_ui in zip(w.getTapCurrent(tr.isMonophase(), tap), ui_w.getTapCurrent(tap)):
+                    self.assertAlmostEqual(i, i_ui, places=9)
+
+        lst_prop = self.win.widg_cableAll.getLstPropCables()
+        self.assertEqual(len(lst_prop), len(design.lst_cable))
+        for prop in lst_prop:
+            prop_model = design.getCable(prop["name"]).getCableProperties()
+            for key, val in prop.items():
+                if isinstance(val, float):
+                    self.assertAlmostEqual(prop_model[key], val, places=9)
+                else:
+                    self.assertEqual(prop_model[key], val)
+
+    def test_stackEncodings(self):
+        """
+        Empilement identique quel que soit le format de coil.xml (élément par élément, blocs, npz)
+        """
+        self.reopen(PATH_EXAMPLE)
+        with TemporaryDirectory() as path_dir:
+            lst_design = []
+            for name, coil_binary, coil_blocks in [("items", False, False), ("blocks", False, True), ("npz", True, False)]:
+                path = join(path_dir, name + ".ttx")
+                self.win.coil_binary = coil_binary
+                self.win.coil_blocks = coil_blocks
+                self.win.saveFile(path)
+                lst_design.append(Design.fromFile(path))
+
+        ref = lst_design[0]
+        self.assertGreater(len(ref.lst_coil), 0)
+        for design in lst_design[1:]:
+            self.assertEqual([c.name for c in design.lst_coil], [c.name for c in ref.lst_coil])
+            for coil, coil_ref in zip(design.lst_coil, ref.lst_coil):
+                self.assertGreater(coil_ref.getNbreDiscs(), 0)
+                self.assertEqual([d["type"] for d in coil.lst_disc], [d["type"] for d in coil_ref.lst_disc])
+                self.assertEqual([d["oil_guides"] for d in coil.lst_disc], [d["oil_guides"] for d in coil_ref.lst_disc])
+                self.assertEqual(len(coil.lst_hduct), len(coil_ref.lst_hduct))
+                self.assertEqual(len(coil.lst_pressboard), len(coil_ref.lst_pressboard))
+                self.assertAlmostEqual(coil.getHeight(), coil_ref.getHeight(), places=6)
+                for d, d_ref in zip(coil.lst_disc, coil_ref.lst_disc):
+                    self.assertAlmostEqual(d["z_center_m"], d_ref["z_center_m"], places=6)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+import sys
+import unittest
+from os.path import dirname, realpath
+
+sys.path.insert(0, dirname(dirname(realpath(__file__))))
+
+from tfo.utils.TapTableModel import TapTableModel, COL_U_PC, COL_U_KV, COL_S_MVA, COL_I_LINE
+
+# =============================================================================
+# Tableau des prises
+# =============================================================================
+
+class TestTapTableModel(unittest.TestCase):
+
+    def test_textRoundTrip(self):
+        # Le texte enregistré (tap.xml, exports) est relu sans perte
+        model = TapTableModel()
+        model.appendTap(1, 0.1, 400.0/3, 1e-7)
+        model.setValue(0, COL_I_LINE, 2/3)
+        model.appendTap(2, 112.5, "", 100)
+        for row in range(model.rowCount()):
+            for col in (COL_U_PC, COL_U_KV, COL_S_MVA, COL_I_LINE):
+                text = model.text(row, col)
+                val = model.getValue(row, col)
+                if text == "":
+                    self.assertNotEqual(val, val)
+                else:
+                    self.assertEqual(float(text), val)
+        self.assertEqual(model.text(0, 0), "1")
+        self.assertEqual(model.text(0, COL_U_PC), "0.1")
+
+if __name__ == "__main__":
+    unittest.main()
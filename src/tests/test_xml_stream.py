@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+import sys
+import unittest
+from io import BytesIO
+from os.path import dirname, realpath
+from unittest import mock
+
+sys.path.insert(0, dirname(dirname(realpath(__file__))))
+
+from tfo.utils import xml_stream
+
+# =============================================================================
+# Lecture en flux des enregistrements XML
+# =============================================================================
+
+XML_COIL = b"""<?xml version="1.0" encoding="UTF-8"?>
+<root>
+  <info><version>1</version></info>
+  <coil>
+    <name>HV</name>
+    <radial_spacers><N_spacers>12</N_spacers></radial_spacers>
+    <discs>
+      <disc id="0"><t_disc_m>0.01</t_disc_m></disc>
+      <disc id="1"><t_disc_m>0.02</t_disc_m></disc>
+    </discs>
+  </coil>
+  <coil>
+    <name>LV</name>
+    <discs><disc id="2"><t_disc_m/></disc></discs>
+  </coil>
+</root>
+"""
+
+DICT_RECORD = {"coil": "coil", "coil/discs/disc": "disc"}
+
+class TestIterRecords(unittest.TestCase):
+
+    def readRecords(self):
+        """
+        Lecture de XML_COIL ; renvoie les enregistrements et l'élément root
+        """
+        lst_root = []
+        iterparse = xml_stream.iterparse
+        def iterparseRoot(f, events):
+            for event, elt in iterparse(f, events):
+                if len(lst_root) == 0:
+                    lst_root.append(elt)
+                yield event, elt
+        with mock.patch.object(xml_stream, "iterparse", iterparseRoot):
+            lst_rec = list(xml_stream.iterRecords(BytesIO(XML_COIL), DICT_RECORD))
+        return lst_rec, lst_root[0]
+
+    def test_records(self):
+        lst_rec, _ = self.readRecords()
+        self.assertEqual(lst_rec, [("disc", {"@id": "0", "t_disc_m": "0.01"}),
+                                   ("disc", {"@id": "1", "t_disc_m": "0.02"}),
+                                   ("coil", {"name": "HV", "radial_spacers/N_spacers": "12"}),
+                                   ("disc", {"@id": "2", "t_disc_m": ""}),
+                                   ("coil", {"name": "LV"})])
+
+    def test_released(self):
+        # Les éléments traités sont détachés : root est vide à la fin de la lecture
+        _, root = self.readRecords()
+        self.assertEqual(len(root), 0)
+
+    def test_parseError(self):
+        with self.assertRaises(Exception):
+            list(xml_stream.iterRecords(BytesIO(b"<root><coil></root>"), DICT_RECORD, "design/coil.xml"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,9 @@
 # -*- coding: utf-8 -*-
 import sys
-from os import makedirs
-from os.path import join, dirname, realpath, exists
+from os.path import join, dirname, realpath
 
 from PySide6.QtGui import QIcon, QStandardItemModel, QStandardItem
-from PySide6.QtCore import Signal, QItemSelection, QIODevice, QTextStream, QFile
+from PySide6.QtCore import Signal, QItemSelection
 from PySide6.QtWidgets import QVBoxLayout, QFrame, QWidget
 from PySide6.QtXml import QDomDocument
 
@@ -38,6 +37,9 @@ class UI_CableAll(QWidget, Ui_Form):
     # Signal quand le widget est modifié par l'utilisateur (non programmatiquement)
     isModified = Signal()
 
+    # Partie du ttx générée par ce widget (les entrées design/cable*.* lui appartiennent)
+    ttx_part = "design/cable.xml"
+
     def __init__(self, ui_main, parent=None):
         super().__init__(parent)
         self.setupUi(self)
@@ -215,14 +217,10 @@ class UI_CableAll(QWidget, Ui_Form):
 
         super().showEvent(event)
 
-    def generateXML(self, tmpSaveDirPath):
+    def generateXML(self, ttx):
         """
-        Génération du fichier XML dans le dossier temporaire
+        Génération de la partie XML dans l'archive ttx
         """
-        path_design = join(tmpSaveDirPath, "design")
-        if not exists(path_design):
-            makedirs(path_design)
-
         docDom = QDomDocument()
         root = docDom.appendChild(docDom.createElement("root"))
 
@@ -235,11 +233,7 @@ class UI_CableAll(QWidget, Ui_Form):
         # Enregistrement
         header = docDom.createProcessingInstruction("xml", "version=\"1.0\" encoding=\"UTF-8\"")
         docDom.insertBefore(header, root)
-        file = QFile(join(path_design, "cable.xml"))
-        file.open(QIODevice.WriteOnly)
-        out = QTextStream(file)
-        docDom.save(out, 4, QDomDocument.EncodingFromDocument)
-        file.close()
+        ttx.writeXML("design/cable.xml", docDom)
 
     def addPDF(self, pdf, part, lst_id_calcul=[]):
         """
@@ -262,24 +256,14 @@ class UI_CableAll(QWidget, Ui_Form):
             for cable in lst_ui_cable:
                 cable.addPDF(pdf, part, lst_id_calcul)
 
-    def loadXML(self, tmpSaveDirPath):
+    def loadXML(self, ttx):
         """
-        Chargement du fichier xml dans le ttx
+        Chargement de la partie xml dans le ttx
         """
-        path_xml = join(tmpSaveDirPath, "design", "cable.xml")
-        if not exists(path_xml):
+        doc = ttx.readXML("design/cable.xml")
+        if doc is None:
             return
 
-        file = QFile(path_xml)
-        doc = QDomDocument()
-        if not file.open(QIODevice.ReadOnly):
-            file.close()
-            raise Exception("Probleme lecture du fichier %s"%path_xml)
-        if not doc.setContent(file):
-            file.close()
-            raise Exception("Probleme lecture du fichier %s"%path_xml)
-        file.close()
-
         root = doc.documentElement()
         if root.isNull():
             return
@@ -8,6 +8,7 @@ from PySide6.QtWidgets import QVBoxLayout, QGraphicsScene, QFrame, QWidget
 
 from ..utils import gui_utils
 from ..utils import gui_geom
+from ..model.design import calcCableProperties
 
 from .cable_one_ui import Ui_Form
 
@@ -335,40 +336,11 @@ class UI_Cable(QWidget, Ui_Form):
             prop["t_pressboard"] = float(self.ui_le_pressboardThick.text())
         else:
             prop["t_pressboard"] = 0.0
-
-        # Isolation extérieure du cable
-        if prop["type"] == "CTC Paper" or prop["type"] == "Meplat":
-            prop["type_cableInsulation"] = "paper"
-        elif prop["type"] == "CTC Netting tape":
-            prop["type_cableInsulation"] = "polyester"
-        else:
-            raise Exception("Type de cable inconnu")
         prop["t_cableInsulation"] = float(self.ui_le_paperThick.text())
-
-        # Calcul des dimensions du cable à partir de l'epaisseur de vernis
         prop["t_strandInsulation"] = float(self.ui_le_varnishThick.text())
 
-        if prop["type"] == "CTC Paper":
-            prop["t_cable"] = 2*(prop["h_strand"] + prop["t_strandInsulation"]) + prop["t_pressboard"] + prop["t_cableInsulation"]
-            prop["h_cable"] = (int((prop["N_strands"]-1)/2)+1)*(prop["t_strand"]+prop["t_strandInsulation"]) + prop["t_cableInsulation"]
-        elif prop["type"] == "CTC Netting tape":
-            prop["t_cable"] = 2*(prop["h_strand"] + prop["t_strandInsulation"]) + prop["t_pressboard"] + prop["t_cableInsulation"]
-            prop["h_cable"] = (int((prop["N_strands"]-1)/2)+1)*(prop["t_strand"]+prop["t_strandInsulation"]) + prop["t_cableInsulation"]
-        elif prop["type"] == "Meplat":
-            prop["t_cable"] = prop["h_strand"] + prop["t_strandInsulation"] + prop["t_cableInsulation"]
-            prop["h_cable"] = prop["N_strands"]*(prop["t_strand"]+prop["t_strandInsulation"]) + prop["t_cableInsulation"]
-        else:
-            raise Exception("Type de cable inconnu")
-
-        # Quelques vérifications pour n'envoyer que des "bons" cables
-        if "CTC" in self.ui_cBox_type.currentText():
-            if self.ui_spBox_nbreStrands.value()%2 == 0:
-                # Cable CTC mal défini
-                return {}
-        if prop["h_cable"] <= 0.0 and prop["t_cable"] <= 0.0:
-            return {}
-
-        return prop
+        # Isolation extérieure et dimensions du cable, vérifications pour n'envoyer que des "bons" cables
+        return calcCableProperties(prop)
 
     def updateCableView(self):
         """
@@ -2,12 +2,13 @@
 import sys
 from os.path import join, dirname, realpath
 
-from PySide6.QtGui import QDoubleValidator, QPen, QImage, QPainter, QColor
+from PySide6.QtGui import QDoubleValidator, QPen, QImage, QPainter, QColor, QAction, QKeySequence
 from PySide6.QtCore import Qt, Signal, QLocale, QIODevice, QTemporaryFile, QSize, QRectF
-from PySide6.QtWidgets import QVBoxLayout, QGraphicsScene, QGraphicsView, QGraphicsRectItem, QFrame, QMessageBox, QWidget
+from PySide6.QtWidgets import QVBoxLayout, QGraphicsScene, QGraphicsView, QGraphicsRectItem, QFrame, QMessageBox, QWidget, QLabel, QComboBox
 
 from ..utils import gui_utils
 from ..utils import gui_geom
+from ..model.design import addXMLTreeStack
 
 from .coilDefinition_ui import Ui_Form
 
@@ -32,6 +33,34 @@ def resource_path(relative_path):
 PATHRC = resource_path("ressources")
 ##################################################################
 
+def addXMLTreeCoil(state, tag_coil, docDom, ttx=None, stack_part=None):
+    """
+    Ecriture XML d'une coil à partir de son état recopié (cf. UI_CoilDefinition.getXMLState), sans accès aux widgets
+    Si stack_part est donné, l'empilement est écrit au format colonnaire dans cette entrée du ttx
+    """
+    tag_tmp = docDom.createElement('r_inner_m')
+    tag_tmp.appendChild(docDom.createTextNode(state["r_inner_m"]))
+    tag_coil.appendChild(tag_tmp)
+
+    tag_rs = docDom.createElement('radial_spacers')
+    tag_coil.appendChild(tag_rs)
+    tag_tmp = docDom.createElement('N_spacers')
+    tag_tmp.appendChild(docDom.createTextNode(state["N_spacers"]))
+    tag_rs.appendChild(tag_tmp)
+    tag_tmp = docDom.createElement('w_spacer_m')
+    tag_tmp.appendChild(docDom.createTextNode(state["w_spacer_m"]))
+    tag_rs.appendChild(tag_tmp)
+
+    if state["stack"] is None:
+        return
+    if stack_part is None:
+        addXMLTreeStack(tag_coil, docDom, state["stack"], state["blocks"])
+    else:
+        ttx.writeArrays(stack_part, state["stack"])
+        tag_tmp = docDom.createElement('stack_part')
+        tag_tmp.appendChild(docDom.createTextNode(stack_part))
+        tag_coil.appendChild(tag_tmp)
+
 class UI_CoilDefinition(QWidget, Ui_Form):
 
     # Signal quand le widget est modifié par l'utilisateur (non programmatiquement)
@@ -116,6 +145,16 @@ class UI_CoilDefinition(QWidget, Ui_Form):
         self.view_lgd.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.view_lgd.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
 
+        ### Résultats superposés à la bobine : calcul et grandeur
+        self.ui_cb_overlayCalcul = QComboBox(self.ui_gBox_view)
+        self.ui_cb_overlayName = QComboBox(self.ui_gBox_view)
+        self.ui_cb_overlayName.addItem("Definition colors", None)
+        for name in gui_geom.LST_OVERLAY_DISC:
+            self.ui_cb_overlayName.addItem(gui_geom.DICT_OVERLAY[name][0], name)
+        self.verticalLayout.addWidget(QLabel("Results", self.ui_gBox_view))
+        self.verticalLayout.addWidget(self.ui_cb_overlayCalcul)
+        self.verticalLayout.addWidget(self.ui_cb_overlayName)
+
         ### Divers
         # Pour les résultats de calculs
         self.dict_thermalDiag = {} # key=id_calcul ; data={dict TR}
@@ -140,8 +179,19 @@ class UI_CoilDefinition(QWidget, Ui_Form):
         self.coil.isModified.connect(self.emitIsModified)
         self.view_zoom.viewUpdated.connect(self.updateActiveViewRect)
         self.ui_spBox_nbreDiscs.valueChanged.connect(self.coil.setDiscNumber)
+        self.coil.calculsChanged.connect(self.updateOverlayChoices)
+        # Annulation des modifications de la bobine depuis la vue zoomée
+        for text, key, slot in [("Undo", QKeySequence.Undo, self.coil.undo), ("Redo", QKeySequence.Redo, self.coil.redo)]:
+            action = QAction(text, self.view_zoom)
+            action.setShortcut(key)
+            action.setShortcutContext(Qt.WidgetWithChildrenShortcut)
+            action.triggered.connect(slot)
+            self.view_zoom.addAction(action)
+        self.ui_cb_overlayCalcul.currentIndexChanged.connect(self.changeOverlay)
+        self.ui_cb_overlayName.currentIndexChanged.connect(self.changeOverlay)
 
         ### Au démarrage
+        self.updateOverlayChoices()
         self.updateActiveViewRect()
         self.connectModification()
 
@@ -228,6 +278,31 @@ class UI_CoilDefinition(QWidget, Ui_Form):
         if id_calcul in self.dict_thermalDiag.keys():
             del self.dict_thermalDiag[id_calcul]
 
+    def updateOverlayChoices(self):
+        """
+        MAJ de la liste des calculs dont les résultats peuvent être superposés à la bobine
+        """
+        id_current = self.ui_cb_overlayCalcul.currentText()
+        lst_id = [str(c["id_calcul"]) for c in self.coil.lst_calcul_loaded]
+
+        self.ui_cb_overlayCalcul.blockSignals(True)
+        self.ui_cb_overlayCalcul.clear()
+        self.ui_cb_overlayCalcul.addItems(lst_id)
+        if id_current in lst_id:
+            self.ui_cb_overlayCalcul.setCurrentText(id_current)
+        self.ui_cb_overlayCalcul.blockSignals(False)
+        self.ui_cb_overlayCalcul.setEnabled(len(lst_id) > 0)
+        self.ui_cb_overlayName.setEnabled(len(lst_id) > 0)
+
+        self.changeOverlay()
+
+    def changeOverlay(self):
+        """
+        Application du calcul et de la grandeur choisis
+        """
+        id_calcul = self.ui_cb_overlayCalcul.currentText() if self.ui_cb_overlayCalcul.count() > 0 else None
+        self.coil.setOverlay(id_calcul, self.ui_cb_overlayName.currentData())
+
     def updateActiveViewRect(self):
         """
         Fonction d'affichage sur la vue non zoomée du rectangle correspondant à la vue zoomée
@@ -291,28 +366,29 @@ class UI_CoilDefinition(QWidget, Ui_Form):
         self.updateGraphicsSize()
         super().showEvent(event)
 
-    def addXMLTree(self, tag_coil, docDom):
+    def getXMLState(self, isBlocks=False):
         """
-        Generation de l'arbre XML
+        Copie des données de la coil nécessaires à son écriture (cf. addXMLTreeCoil)
+        Faite sur le thread GUI : textes des champs et tableaux de l'empilement
         """
         # MAJ des infos de la coil
         self.coil.updateDiscCalculation()
         self.coil.setDiscNumber(self.ui_spBox_nbreDiscs.value())
 
-        tag_tmp = docDom.createElement('r_inner_m')
-        tag_tmp.appendChild(docDom.createTextNode("%f"%(self.getInnerRadius()*1e-3)))
-        tag_coil.appendChild(tag_tmp)
-
-        tag_rs = docDom.createElement('radial_spacers')
-        tag_coil.appendChild(tag_rs)
-        tag_tmp = docDom.createElement('N_spacers')
-        tag_tmp.appendChild(docDom.createTextNode("%i"%(self.ui_spBox_nbre_radSpacers.value())))
-        tag_rs.appendChild(tag_tmp)
-        tag_tmp = docDom.createElement('w_spacer_m')
-        tag_tmp.appendChild(docDom.createTextNode("%f"%(float(self.ui_le_radSpacerWidth.text())*1e-3)))
-        tag_rs.appendChild(tag_tmp)
+        dict_stack = self.coil.getStackArrays()
+        return {"r_inner_m": "%f"%(self.getInnerRadius()*1e-3), \
+                "N_spacers": "%i"%(self.ui_spBox_nbre_radSpacers.value()), \
+                "w_spacer_m": "%f"%(float(self.ui_le_radSpacerWidth.text())*1e-3), \
+                "stack": dict_stack, \
+                "blocks": self.coil.stack.getBlocks() if isBlocks and not dict_stack is None else None}
 
-        self.coil.addXMLTreeDesign(tag_coil, docDom)
+    def addXMLTree(self, tag_coil, docDom, ttx=None, stack_part=None, isBlocks=False):
+        """
+        Generation de l'arbre XML
+        Si stack_part est donné, l'empilement est écrit au format colonnaire dans cette entrée du ttx
+        Sinon, si isBlocks, il est écrit par blocs de motifs répétés
+        """
+        addXMLTreeCoil(self.getXMLState(isBlocks and stack_part is None), tag_coil, docDom, ttx, stack_part)
 
     def addPDF(self, pdf, part, lst_id_calcul=[]):
         """
@@ -424,43 +500,56 @@ class UI_CoilDefinition(QWidget, Ui_Form):
             # On remet le rect view
             self.updateActiveViewRect()
 
-    def loadXMLTree(self, coil_elt):
+    def loadRecord(self, rec_coil, dict_stack_xml, lst_res_thermo, ttx=None):
         """
-        Chargement de l'arbre XML
+        Chargement d'une coil lue en flux dans coil.xml (cf. xml_stream)
+        rec_coil : enregistrement de la coil, dict_stack_xml : empilement XML (cf. model.design.addStackRecord),
+        lst_res_thermo : attributs des éléments res_thermo_K
+        L'empilement colonnaire (stack_part) est utilisé s'il est présent dans le ttx, sinon le XML (par blocs ou élément par élément)
         """
         # MAJ des infos de la coil
         self.coil.updateDiscCalculation()
 
+        # Empilement au format colonnaire
+        dict_stack = None
+        if "stack_part" in rec_coil and not ttx is None:
+            dict_stack = ttx.readArrays(rec_coil["stack_part"])
+
         self.disconnectModification()
 
         # Rayon et nombre de discs
-        self.ui_le_innerRadius.setText(float(coil_elt.firstChildElement("r_inner_m").text())*1e3)
-        self.ui_spBox_nbreDiscs.setValue(coil_elt.firstChildElement("discs").childNodes().count())
+        self.ui_le_innerRadius.setText(float(rec_coil["r_inner_m"])*1e3)
+        if dict_stack is None and len(dict_stack_xml["block"]) > 0:
+            self.ui_spBox_nbreDiscs.setValue(sum(b["repeat"]*len([i for i in b["items"] if i["item"] == "disc"]) \
+                                                 for b in dict_stack_xml["block"]))
+        elif dict_stack is None:
+            self.ui_spBox_nbreDiscs.setValue(len([i for i in dict_stack_xml["item"] if i["item"] == "disc"]))
+        else:
+            self.ui_spBox_nbreDiscs.setValue(int((dict_stack["kind"] == gui_geom.ITEM_DISC).sum()))
         self.coil.setDiscNumber(self.ui_spBox_nbreDiscs.value())
 
         # Radial spacers
-        e_rs = coil_elt.firstChildElement("radial_spacers")
-        self.ui_spBox_nbre_radSpacers.setValue(int(e_rs.firstChildElement("N_spacers").text()))
-        self.ui_le_radSpacerWidth.setText(float(e_rs.firstChildElement("w_spacer_m").text())*1e3)
+        self.ui_spBox_nbre_radSpacers.setValue(int(rec_coil["radial_spacers/N_spacers"]))
+        self.ui_le_radSpacerWidth.setText(float(rec_coil["radial_spacers/w_spacer_m"])*1e3)
 
         # Résultats
-        lst_res_thermo = []
-        tmp = coil_elt.elementsByTagName("res_thermo_K")
-        for i in range(tmp.count()):
-            lst_res_thermo.append(tmp.item(i).attributes())
         for tr in lst_res_thermo:
-            if tr.count() > 0:
+            if len(tr) > 0:
                 dict_res = {}
-                for c in range(tr.count()):
-                    attribute = tr.item(c).toAttr()
-                    if "id_calcul" in attribute.name():
-                        id_calcul = attribute.value()
+                for name, value in tr.items():
+                    if "id_calcul" in name:
+                        id_calcul = value
                     else:
-                        dict_res[attribute.name()] = float(attribute.value())
+                        dict_res[name] = float(value)
                 self.setThermalDiagram(id_calcul, dict_res)
 
         # Coil
-        self.coil.loadXMLTree(coil_elt)
+        if dict_stack is None and len(dict_stack_xml["block"]) > 0:
+            self.coil.loadStackBlocks(dict_stack_xml["vduct"], dict_stack_xml["block"])
+        elif dict_stack is None:
+            self.coil.loadStack(dict_stack_xml["vduct"], dict_stack_xml["item"], dict_stack_xml["hduct"])
+        else:
+            self.coil.loadStackArrays(dict_stack)
 
         self.connectModification()
 
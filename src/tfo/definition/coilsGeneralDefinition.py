@@ -1,13 +1,17 @@
 # -*- coding: utf-8 -*-
 import sys
-from os import makedirs
 from os.path import join, dirname, realpath, exists
 from copy import copy
+from re import sub
 
-from PySide6.QtCore import Signal, QIODevice, QTextStream, QFile
+from PySide6.QtCore import Signal
 from PySide6.QtWidgets import QVBoxLayout, QWidget
 from PySide6.QtXml import QDomDocument
 
+from ..utils import gui_geom
+from ..model.design import DICT_RECORD_COIL, getEmptyStackRecord, addStackRecord
+from .coilDefinition import addXMLTreeCoil
+
 from .coilsGeneralDefinition_ui import Ui_Form
 
 # =============================================================================
@@ -31,10 +35,50 @@ def resource_path(relative_path):
 PATHRC = resource_path("ressources")
 ##################################################################
 
+def getStackEncoding(isBinary, isBlocks):
+    """
+    Format des empilements dans coil.xml : "binary" (.npz), "blocks" (motifs répétés) ou "items" (élément par élément)
+    """
+    if isBinary:
+        return "binary"
+    if isBlocks:
+        return "blocks"
+    return "items"
+
+def generateCoilXML(lst_coil_state, ttx):
+    """
+    Ecriture de coil.xml à partir des données recopiées des coils (cf. UI_CoilsGeneralDefinition.getXMLState)
+    N'accède pas aux widgets : peut être appelée hors du thread GUI
+    """
+    docDom = QDomDocument()
+    root = docDom.appendChild(docDom.createElement("root"))
+
+    for name, lst_part in lst_coil_state:
+        tag_c = docDom.createElement('coil')
+        root.appendChild(tag_c)
+        tag_tmp = docDom.createElement('name')
+        tag_tmp.appendChild(docDom.createTextNode(name))
+        tag_c.appendChild(tag_tmp)
+        for part_name, state in lst_part:
+            if ttx.coil_binary:
+                addXMLTreeCoil(state, tag_c, docDom, ttx, "design/%s.npz"%part_name)
+            else:
+                addXMLTreeCoil(state, tag_c, docDom)
+
+    # Enregistrement
+    header = docDom.createProcessingInstruction("xml", "version=\"1.0\" encoding=\"UTF-8\"")
+    docDom.insertBefore(header, root)
+    ttx.writeXML("design/coil.xml", docDom)
+
 class UI_CoilsGeneralDefinition(QWidget, Ui_Form):
 
     # Signal quand le widget est modifié par l'utilisateur (non programmatiquement)
     isModified = Signal()
+    # Signal quand une des coils est modifiée par l'utilisateur
+    coilModified = Signal()
+
+    # Partie du ttx générée par ce widget (les entrées design/coil*.* lui appartiennent)
+    ttx_part = "design/coil.xml"
 
     def __init__(self, widg_ratingPlate, parent=None):
         super().__init__(parent)
@@ -51,6 +95,9 @@ class UI_CoilsGeneralDefinition(QWidget, Ui_Form):
 
         ### Divers
         self.lst_coilThermalData = []
+        self.lst_coilConnected = []
+        # Format des empilements du coil.xml chargé (None si aucun empilement lu), cf. getStackEncoding
+        self.stack_encoding = None
 
         ### Connecteurs
         self.ui_cBox_coil.currentIndexChanged.connect(self.changeCoil)
@@ -97,6 +144,17 @@ class UI_CoilsGeneralDefinition(QWidget, Ui_Form):
                     # On ajoute le widget au layout
                     self.layout_coil.addWidget(c_ui)
                     c_ui.hide()
+                if not c_ui in self.lst_coilConnected:
+                    c_ui.isModified.connect(self.coilModified)
+                    self.lst_coilConnected.append(c_ui)
+
+    def getCoilSignature(self):
+        """
+        Liste des coils (nom, widgets) : permet de savoir si coil.xml doit être régénéré
+        suite à une modification des enroulements
+        """
+        self.updateCoilThermalData()
+        return [(c["name"], [id(c_ui) for c_ui in c["lst_UI_CoilDefinition"]]) for c in self.lst_coilThermalData]
 
     def showEvent(self, event):
 
@@ -120,79 +178,120 @@ class UI_CoilsGeneralDefinition(QWidget, Ui_Form):
 
         super().showEvent(event)
 
-    def generateXML(self, tmpSaveDirPath):
+    def getLstCoilPart(self):
         """
-        Génération du fichier XML dans le dossier temporaire
+        Liste des (nom unique construit à partir du nom de la coil, widget de la coil)
+        Nom de l'entrée .npz de l'empilement (design/<nom>.npz) et du dossier de ses résultats
         """
-        path_design = join(tmpSaveDirPath, "design")
-        if not exists(path_design):
-            makedirs(path_design)
-
-        docDom = QDomDocument()
-        root = docDom.appendChild(docDom.createElement("root"))
-
-        # On met tout à jour
-        self.updateCoilThermalData()
-
+        lst_coil_part = []
+        lst_name = []
         for c in self.lst_coilThermalData:
-            tag_c = docDom.createElement('coil')
-            root.appendChild(tag_c)
-            tag_tmp = docDom.createElement('name')
-            tag_tmp.appendChild(docDom.createTextNode(c["name"]))
-            tag_c.appendChild(tag_tmp)
             for c_ui in c["lst_UI_CoilDefinition"]:
-                c_ui.addXMLTree(tag_c, docDom)
+                name = "coil_%s"%sub(r"[^\w\-]", "_", c["name"])
+                k = 2
+                while name in lst_name:
+                    name = "coil_%s_%i"%(sub(r"[^\w\-]", "_", c["name"]), k)
+                    k = k + 1
+                lst_name.append(name)
+                lst_coil_part.append((name, c_ui))
+        return lst_coil_part
+
+    def saveResults(self, path_dir):
+        """
+        Ecriture des résultats de calcul des coils dans le dossier path_dir (cf. getResultsPath)
+        Les résultats d'une coil sans calcul sont supprimés
+        """
+        self.updateCoilThermalData()
+        for name, c_ui in self.getLstCoilPart():
+            results = c_ui.coil.stack.results
+            if len(results.getIds()) > 0:
+                results.saveArrays(join(path_dir, name))
+            elif exists(join(path_dir, name)):
+                results.removeArrays(join(path_dir, name))
+
+    def loadResults(self, path_dir):
+        """
+        Chargement des résultats de calcul du dossier path_dir (projetés en mémoire)
+        Renvoie la liste des coils dont les résultats ne correspondent plus à l'empilement
+        """
+        lst_error = []
+        if not exists(path_dir):
+            return lst_error
+        self.updateCoilThermalData()
+        for name, c_ui in self.getLstCoilPart():
+            dict_arr = gui_geom.CoilResults.loadArrays(join(path_dir, name))
+            if dict_arr is None:
+                continue
+            try:
+                c_ui.coil.loadArraysResult(dict_arr)
+            except Exception:
+                lst_error.append(name)
+        return lst_error
 
-        # Enregistrement
-        header = docDom.createProcessingInstruction("xml", "version=\"1.0\" encoding=\"UTF-8\"")
-        docDom.insertBefore(header, root)
-        file = QFile(join(path_design, "coil.xml"))
-        file.open(QIODevice.WriteOnly)
-        out = QTextStream(file)
-        docDom.save(out, 4, QDomDocument.EncodingFromDocument)
-        file.close()
+    def getXMLState(self, isBlocks=False):
+        """
+        Copie des données des coils pour l'écriture de coil.xml (cf. generateCoilXML)
+        [(nom de la coil, [(nom unique de l'empilement, état de UI_CoilDefinition.getXMLState)])]
+        """
+        self.updateCoilThermalData()
+        dict_part = {id(c_ui): name for name, c_ui in self.getLstCoilPart()}
+        return [(c["name"], [(dict_part[id(c_ui)], c_ui.getXMLState(isBlocks)) for c_ui in c["lst_UI_CoilDefinition"]]) \
+                for c in self.lst_coilThermalData]
 
-    def loadXML(self, tmpSaveDirPath):
+    def generateXML(self, ttx):
         """
-        Chargement du fichier xml dans le ttx
+        Génération de la partie XML dans l'archive ttx
+        Seule la copie des données est faite ici : le XML est construit par generateCoilXML,
+        tout de suite (TTXWriter) ou dans le thread de l'autosave (TTXSnapshot)
         """
-        path_xml = join(tmpSaveDirPath, "design", "coil.xml")
-        if not exists(path_xml):
-            return
+        ttx.writeState(generateCoilXML, self.getXMLState(ttx.coil_blocks and not ttx.coil_binary))
 
-        file = QFile(path_xml)
-        doc = QDomDocument()
-        if not file.open(QIODevice.ReadOnly):
-            file.close()
-            raise Exception("Probleme lecture du fichier %s"%path_xml)
-        if not doc.setContent(file):
-            file.close()
-            raise Exception("Probleme lecture du fichier %s"%path_xml)
-        file.close()
-
-        root = doc.documentElement()
-        if root.isNull():
+    def loadXML(self, ttx):
+        """
+        Chargement de la partie xml dans le ttx
+        coil.xml est lu en flux : les discs, ducts et pressboards sont accumulés
+        coil par coil, sans construire d'arbre DOM
+        """
+        it_record = ttx.readRecords("design/coil.xml", DICT_RECORD_COIL)
+        if it_record is None:
             return
 
         # Les windings ont été chargés auparavant
         # Création de lst_coilThermalData
         self.updateCoilThermalData()
 
-        n = root.firstChildElement("coil")
         lst_coil_tmp = copy(self.lst_coilThermalData) # Pour gérer les cas où il y a plusieurs coils avec le même nom
-        while not n.isNull():
-            e_coil = n.toElement()
+        dict_stack_xml = getEmptyStackRecord()
+        lst_res_thermo = []
+        lst_encoding = []
+        for kind, rec in it_record:
+            if addStackRecord(dict_stack_xml, kind, rec):
+                continue
+            if kind == "res_thermo":
+                lst_res_thermo.append({k[1:]: v for k, v in rec.items() if k.startswith("@")})
+                continue
+
+            # Fin de la coil : format de son empilement
+            if "stack_part" in rec or len(dict_stack_xml["block"]) > 0 or len(dict_stack_xml["item"]) > 0:
+                lst_encoding.append(getStackEncoding("stack_part" in rec, len(dict_stack_xml["block"]) > 0))
+
             # Chargement des infos sur la 1ère bonne coil
-            name_xml = e_coil.firstChildElement("name").text()
             for c in lst_coil_tmp:
-                if c["name"] == name_xml:
+                if c["name"] == rec.get("name", ""):
                     # On charge
                     for c_ui in c["lst_UI_CoilDefinition"]:
-                        c_ui.loadXMLTree(e_coil)
+                        c_ui.loadRecord(rec, dict_stack_xml, lst_res_thermo, ttx)
                     lst_coil_tmp.remove(c)
                     break
 
-            n = n.nextSiblingElement("coil")
+            dict_stack_xml = getEmptyStackRecord()
+            lst_res_thermo = []
+
+        # Un seul format si toutes les coils ont été écrites de la même façon
+        if len(set(lst_encoding)) == 1:
+            self.stack_encoding = lst_encoding[0]
+        elif len(lst_encoding) > 0:
+            self.stack_encoding = "mixed"
 
 if __name__ == "__main__":
     """
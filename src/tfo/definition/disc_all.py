@@ -1,10 +1,9 @@
 # -*- coding: utf-8 -*-
 import sys
-from os import makedirs
-from os.path import join, dirname, realpath, exists
+from os.path import join, dirname, realpath
 
 from PySide6.QtGui import QIcon, QStandardItemModel, QStandardItem
-from PySide6.QtCore import Signal, QItemSelection, QIODevice, QTextStream, QFile
+from PySide6.QtCore import Signal, QItemSelection
 from PySide6.QtWidgets import QVBoxLayout, QFrame, QWidget
 from PySide6.QtXml import QDomDocument
 
@@ -38,6 +37,9 @@ class UI_DiscAll(QWidget, Ui_Form):
     # Signal quand le widget est modifié par l'utilisateur (non programmatiquement)
     isModified = Signal()
 
+    # Partie du ttx générée par ce widget (les entrées design/disc*.* lui appartiennent)
+    ttx_part = "design/disc.xml"
+
     def __init__(self, widg_ratingPlate, widg_cableAll, ui_main, parent=None):
         super().__init__(parent)
         self.setupUi(self)
@@ -198,14 +200,10 @@ class UI_DiscAll(QWidget, Ui_Form):
 
         super().showEvent(event)
 
-    def generateXML(self, tmpSaveDirPath):
+    def generateXML(self, ttx):
         """
-        Génération du fichier XML dans le dossier temporaire
+        Génération de la partie XML dans l'archive ttx
         """
-        path_design = join(tmpSaveDirPath, "design")
-        if not exists(path_design):
-            makedirs(path_design)
-
         docDom = QDomDocument()
         root = docDom.appendChild(docDom.createElement("root"))
 
@@ -218,30 +216,16 @@ class UI_DiscAll(QWidget, Ui_Form):
         # Enregistrement
         header = docDom.createProcessingInstruction("xml", "version=\"1.0\" encoding=\"UTF-8\"")
         docDom.insertBefore(header, root)
-        file = QFile(join(path_design, "disc.xml"))
-        file.open(QIODevice.WriteOnly)
-        out = QTextStream(file)
-        docDom.save(out, 4, QDomDocument.EncodingFromDocument)
-        file.close()
+        ttx.writeXML("design/disc.xml", docDom)
 
-    def loadXML(self, tmpSaveDirPath):
+    def loadXML(self, ttx):
         """
-        Chargement du fichier xml dans le ttx
+        Chargement de la partie xml dans le ttx
         """
-        path_xml = join(tmpSaveDirPath, "design", "disc.xml")
-        if not exists(path_xml):
+        doc = ttx.readXML("design/disc.xml")
+        if doc is None:
             return
 
-        file = QFile(path_xml)
-        doc = QDomDocument()
-        if not file.open(QIODevice.ReadOnly):
-            file.close()
-            raise Exception("Probleme lecture du fichier %s"%path_xml)
-        if not doc.setContent(file):
-            file.close()
-            raise Exception("Probleme lecture du fichier %s"%path_xml)
-        file.close()
-
         root = doc.documentElement()
         if root.isNull():
             return
@@ -1,13 +1,11 @@
 # -*- coding: utf-8 -*-
 import sys
-from os import makedirs
-from os.path import join, dirname, realpath, exists
+from os.path import join, dirname, realpath
 from json import load
 
 from PySide6.QtGui import QDoubleValidator
-from PySide6.QtCore import Signal, QLocale, QIODevice, QTextStream, QFile
+from PySide6.QtCore import Signal, QLocale
 from PySide6.QtWidgets import QVBoxLayout, QWidget
-from PySide6.QtXml import QDomDocument
 
 from matplotlib import pyplot as plt
 from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
@@ -44,6 +42,9 @@ class UI_MaterialProperties(QWidget, Ui_Form):
     # Signal quand le widget est modifié par l'utilisateur (non programmatiquement)
     isModified = Signal()
 
+    # Partie du ttx générée par ce widget (les entrées design/material*.* lui appartiennent)
+    ttx_part = "design/material.xml"
+
     def __init__(self, material, ui_main, parent=None):
         super().__init__(parent)
         self.setupUi(self)
@@ -404,34 +405,13 @@ class UI_MaterialProperties(QWidget, Ui_Form):
                 self.ui_le_rhoEA.setEnabled(True)
                 self.ui_le_rhoEB.setEnabled(True)
 
-    def generateXML(self, tmpSaveDirPath):
+    def generateXML(self, ttx):
         """
-        Génération du fichier XML dans le dossier temporaire
+        Génération de la partie XML dans l'archive ttx
         """
-        path_design = join(tmpSaveDirPath, "design")
-        if not exists(path_design):
-            makedirs(path_design)
-
-        # Bidouilles car enregistrement de toutes les prop dans le même fichier
-        path_xml = join(path_design, "material.xml")
-        if not exists(path_xml):
-            docDom = QDomDocument()
-            root = docDom.appendChild(docDom.createElement("root"))
-            header = docDom.createProcessingInstruction("xml", "version=\"1.0\" encoding=\"UTF-8\"")
-            docDom.insertBefore(header, root)
-        else:
-            file = QFile(path_xml)
-            docDom = QDomDocument()
-            if not file.open(QIODevice.ReadOnly):
-                file.close()
-                raise Exception("Probleme lecture du fichier")
-            if not docDom.setContent(file):
-                file.close()
-                raise Exception("Probleme lecture du fichier")
-            file.close()
-            root = docDom.documentElement()
-            if root.isNull():
-                return
+        # Enregistrement de toutes les prop dans le même fichier
+        docDom = ttx.sharedDocument("design/material.xml")
+        root = docDom.documentElement()
 
         tag_prop = docDom.createElement(self.material)
         root.appendChild(tag_prop)
@@ -463,13 +443,6 @@ class UI_MaterialProperties(QWidget, Ui_Form):
             tag_tmp.setAttribute("b", self.ui_le_rhoEB.text())
             tag_prop.appendChild(tag_tmp)
 
-        # Enregistrement
-        file = QFile(path_xml)
-        file.open(QIODevice.WriteOnly)
-        out = QTextStream(file)
-        docDom.save(out, 4, QDomDocument.EncodingFromDocument)
-        file.close()
-
     def addPDF(self, pdf, part, lst_id_calcul=[]):
         """
         Remplissage du fichier PDF
@@ -543,24 +516,14 @@ class UI_MaterialProperties(QWidget, Ui_Form):
                 widths = [w_firstCol] + [col_width]*(len(row_title)-1)
                 pdf.tableMultiCell(row_title, tab_data, widths=widths)
 
-    def loadXML(self, tmpSaveDirPath):
+    def loadXML(self, ttx):
         """
-        Chargement du fichier xml dans le ttx
+        Chargement de la partie xml dans le ttx
         """
-        path_xml = join(tmpSaveDirPath, "design", "material.xml")
-        if not exists(path_xml):
+        doc = ttx.readXML("design/material.xml")
+        if doc is None:
             return
 
-        file = QFile(path_xml)
-        doc = QDomDocument()
-        if not file.open(QIODevice.ReadOnly):
-            file.close()
-            raise Exception("Probleme lecture du fichier %s"%path_xml)
-        if not doc.setContent(file):
-            file.close()
-            raise Exception("Probleme lecture du fichier %s"%path_xml)
-        file.close()
-
         root = doc.documentElement()
         if root.isNull():
             return
@@ -1,10 +1,12 @@
 # -*- coding: utf-8 -*-
 import sys
-from os import makedirs
-from os.path import join, dirname, realpath, exists
+from os.path import join, dirname, realpath
+from math import sqrt
+
+import numpy
 
 from PySide6.QtGui import QDoubleValidator, QRegularExpressionValidator, QStandardItemModel, QIcon, QStandardItem, QBrush
-from PySide6.QtCore import Qt, Signal, QRegularExpression, QLocale, QIODevice, QTextStream, QFile, QItemSelection
+from PySide6.QtCore import Qt, Signal, QRegularExpression, QLocale, QItemSelection
 from PySide6.QtWidgets import QVBoxLayout, QGraphicsScene, QFrame, QHeaderView, QWidget
 from PySide6.QtXml import QDomDocument
 
@@ -12,6 +14,8 @@ from .winding_arrangement import UI_WindingArrangement
 from ..utils import gui_geom
 from ..utils import gui_utils
 from ..utils.GridTableView import GridTableView
+from ..utils.TapTableModel import COL_U_KV, COL_S_MVA
+from ..model.design import getStrCoolingMode, getStrStudyName
 
 from .ratingPlate_ui import Ui_Form
 
@@ -19,6 +23,10 @@ from .ratingPlate_ui import Ui_Form
 # Fenetre de definitions de la plaque signalitique du transformateur
 # =============================================================================
 
+# Colonnes de l'enveloppe des prises (cf. getTapEnvelope)
+LST_TITLE_ENVELOPE = ["Winding", "Vector group", "Taps", "Min. voltage (kV)", "Max. voltage (kV)", "Max. power (MVA)", \
+                      "Max. line current (A)", "Tap (max. line current)", "Max. coil current (A)", "Tap (max. coil current)"]
+
 ################## A ADAPTER SELON LE CAS ########################
 # Define function to import external files when using PyInstaller.
 def resource_path(relative_path):
@@ -40,6 +48,9 @@ class UI_RatingPlate(QWidget, Ui_Form):
 
     # Signal quand le widget est modifié par l'utilisateur (non programmatiquement)
     isModified = Signal()
+
+    # Partie du ttx générée par ce widget (les entrées design/ratingPlate*.* lui appartiennent)
+    ttx_part = "design/ratingPlate.xml"
     # Signal quand la study est MAJ
     studyNameUpdated = Signal(str)
 
@@ -270,6 +281,11 @@ class UI_RatingPlate(QWidget, Ui_Form):
         self.lst_UI_WindingArrangement = []
         self.CM_graphic = gui_geom.MagneticCircuit(self.data_view["L_CM"])
         self.CM_graphic.setZValue(self.z_value_cm)
+        # Modification du circuit magnétique prise en compte lors de la dernière MAJ des graphiques (cf. updateGraphicsSize)
+        self.nb_change_CM = -1
+        # Matrice enroulements x prises et état des tableaux des prises lors de son calcul (cf. getTapMatrix)
+        self.tap_matrix = None
+        self.key_tap_matrix = None
 
         ### Préparation de la représentation du transfo
         self.ui_frame_displayTfo.setMinimumSize(200, 200)
@@ -749,7 +765,8 @@ class UI_RatingPlate(QWidget, Ui_Form):
         Mise à jour du mode de refroidissement
         """
         # Symbole de réfrigération
-        self.cooling_mode = "%s%s%s%s"%(self.ui_cb_cool_refInt.currentText(), self.ui_cb_cool_refIntMode.currentText(), self.ui_cb_cool_refExt.currentText(), self.ui_cb_cool_refExtMode.currentText())
+        self.cooling_mode = getStrCoolingMode([self.ui_cb_cool_refInt.currentText(), self.ui_cb_cool_refIntMode.currentText(), \
+                                               self.ui_cb_cool_refExt.currentText(), self.ui_cb_cool_refExtMode.currentText()])
 
         # Infos pompes huile en D ou en F
         if self.ui_cb_cool_refIntMode.currentText() in ["F", "D"] and self.cooling_mode != "ODAF":
@@ -1147,6 +1164,90 @@ class UI_RatingPlate(QWidget, Ui_Form):
         out = list(reversed(sorted(self.getLstWinding(), key=lambda w:tmpFct(w))))
         return out
 
+    def getTapMatrix(self):
+        """
+        Matrices enroulements x prises (getLstWinding x prises, NaN au-delà du nombre de prises de l'enroulement) :
+        tension (kV), puissance (MVA), courants de ligne et de bobine (A) et leur maximum par enroulement
+        Recalcul uniquement si un tableau des prises, un couplage ou le nombre de phases a changé
+        """
+        lst_w = self.getLstWinding()
+        key = (self.isMonophase(), tuple((w.model_tab_taps.nb_change, w.ui_cBox_ydi.currentText().upper()) for w in lst_w))
+        if key == self.key_tap_matrix:
+            return self.tap_matrix
+
+        nb_w = len(lst_w)
+        nb_tap = max([w.model_tab_taps.rowCount() for w in lst_w] + [0])
+        tap = numpy.full((nb_w, nb_tap), "", dtype=object)
+        u_kV = numpy.full((nb_w, nb_tap), numpy.nan)
+        s_MVA = numpy.full((nb_w, nb_tap), numpy.nan)
+        for k, w in enumerate(lst_w):
+            nb = w.model_tab_taps.rowCount()
+            tap[k, :nb] = w.getLstPositions()
+            u_kV[k, :nb] = w.model_tab_taps.getColumn(COL_U_KV)
+            s_MVA[k, :nb] = w.model_tab_taps.getColumn(COL_S_MVA)
+
+        ### Courants (mêmes formules que UI_WindingData.getTapCurrent)
+        # Courant de ligne (A)
+        if self.isMonophase():
+            k_phase = 3.0
+        else:
+            k_phase = 1.0
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            i_line = k_phase*s_MVA*1e3/(u_kV*sqrt(3))
+        i_line[~numpy.isfinite(i_line)] = numpy.nan
+        # Courant de bobine (A) : enroulement delta => /sqrt(3)
+        k_coil = numpy.array([1.0 if w.ui_cBox_ydi.currentText().upper() == "Y" else 1/sqrt(3) for w in lst_w])
+        i_coil = i_line*k_coil.reshape(-1, 1)
+
+        ### Enveloppe par enroulement : extremum et prise correspondante (NaN et -1 si aucune valeur)
+        def envelope(arr, isMin=False):
+            if nb_tap == 0:
+                return numpy.full(nb_w, numpy.nan), numpy.full(nb_w, -1)
+            if isMin:
+                tmp = numpy.where(numpy.isnan(arr), numpy.inf, arr)
+                k_tap = tmp.argmin(axis=1)
+            else:
+                tmp = numpy.where(numpy.isnan(arr), -numpy.inf, arr)
+                k_tap = tmp.argmax(axis=1)
+            val = tmp[numpy.arange(nb_w), k_tap]
+            isValid = numpy.isfinite(val)
+            return numpy.where(isValid, val, numpy.nan), numpy.where(isValid, k_tap, -1)
+
+        self.tap_matrix = {}
+        self.tap_matrix["lst_winding"] = lst_w
+        self.tap_matrix["tap"] = tap
+        self.tap_matrix["u_kV"] = u_kV
+        self.tap_matrix["s_MVA"] = s_MVA
+        self.tap_matrix["i_line"] = i_line
+        self.tap_matrix["i_coil"] = i_coil
+        self.tap_matrix["u_min"], _ = envelope(u_kV, True)
+        self.tap_matrix["u_max"], _ = envelope(u_kV)
+        self.tap_matrix["s_max"], _ = envelope(s_MVA)
+        self.tap_matrix["i_line_max"], self.tap_matrix["i_line_row"] = envelope(i_line)
+        self.tap_matrix["i_coil_max"], self.tap_matrix["i_coil_row"] = envelope(i_coil)
+        self.key_tap_matrix = key
+
+        return self.tap_matrix
+
+    def getTapEnvelope(self):
+        """
+        Enveloppe des prises : une ligne par enroulement (colonnes LST_TITLE_ENVELOPE, None si pas de valeur)
+        Les enroulements sont rangés par tension décroissante
+        """
+        mat = self.getTapMatrix()
+
+        def value(name, k):
+            return None if numpy.isnan(mat[name][k]) else float(mat[name][k])
+        def tap(name, k):
+            return None if mat[name][k] < 0 else mat["tap"][k, mat[name][k]]
+
+        lst_row = []
+        for w in self.getLstWindingVoltageDescendingNameAlphabetical():
+            k = mat["lst_winding"].index(w)
+            lst_row.append([w.getName(), w.getVectorGroup(), w.model_tab_taps.rowCount(), value("u_min", k), value("u_max", k), \
+                            value("s_max", k), value("i_line_max", k), tap("i_line_row", k), value("i_coil_max", k), tap("i_coil_row", k)])
+        return lst_row
+
     def getLstCoilThermalData(self):
         """
         Renvoi la liste des données des bobines thermiques de tous les enroulements
@@ -1193,61 +1294,26 @@ class UI_RatingPlate(QWidget, Ui_Form):
         """
         Fourniture et MAJ de la study name
         """
-        lst_infos = []
-
-        # Nom
-        lst_infos.append(self.ui_le_reference.text())
-
         # Liste des enroulements rangés
         lst_ui_windDesc = self.getLstWindingVoltageDescendingNameAlphabetical()
 
-        # Puissances
-        lst_tmp = []
-        for w in lst_ui_windDesc:
-            tmp = w.getTapPower()
-            if tmp is None:
-                tmp = 0.0
-            if tmp.is_integer():
-                lst_tmp.append("%i"%tmp)
-            else:
-                lst_tmp.append("%.3f"%tmp)
-        lst_infos.append('/'.join(lst_tmp) + " MVA")
-
-        # Tensions
-        lst_tmp = []
-        for w in lst_ui_windDesc:
-            tmp = w.getTapVoltage()
-            if tmp is None:
-                tmp = 0.0
-            if tmp.is_integer():
-                tmp = "%i"%tmp
-            else:
-                tmp = "%.3f"%tmp
-            tmp = tmp + w.getStrRegulation()
-            lst_tmp.append(tmp)
-        lst_infos.append('/'.join(lst_tmp) + " kV")
-
-        # Couplages
-        lst_infos.append(self.getVectorGroup())
-
-        # Fréquence
-        lst_infos.append(self.ui_cb_frequency.currentText() + " Hz")
-
-        # Mode de refroidissement
-        lst_infos.append(self.cooling_mode)
-
-        # Mise en forme des infos
-        lst_infos = [s for s in lst_infos if s != ""]
-        study = ' - '.join(lst_infos)
+        study = getStrStudyName(self.ui_le_reference.text(), [w.getTapPower() for w in lst_ui_windDesc], \
+                                [w.getTapVoltage() for w in lst_ui_windDesc], [w.getStrRegulation() for w in lst_ui_windDesc], \
+                                self.getVectorGroup(), self.ui_cb_frequency.currentText(), self.cooling_mode)
 
         self.studyNameUpdated.emit(study)
 
         return study
 
-    def updateGraphicsSize(self):
+    def updateGraphicsSize(self, isForced=True):
         """
         Met à jour les graphiques (reconstruit également)
+        Sans isForced, rien n'est refait si le circuit magnétique et les windings n'ont pas changé depuis (redimensionnement, affichage)
         """
+        if not isForced and self.nb_change_CM == self.CM_graphic.nb_change:
+            return
+        self.nb_change_CM = self.CM_graphic.nb_change
+
         # Mise à jour des centres des enroulements
         lst_x_center_col, lst_y_center_col = self.CM_graphic.get_center_col()
         # Et du rayon des enroulements
@@ -1266,7 +1332,7 @@ class UI_RatingPlate(QWidget, Ui_Form):
         Permet le redimensionnement lors de la modification de la taille de la fenêtre
         Surcharge
         """
-        self.updateGraphicsSize()
+        self.updateGraphicsSize(False)
         super().resizeEvent(event)
 
     def showEvent(self, event):
@@ -1274,17 +1340,13 @@ class UI_RatingPlate(QWidget, Ui_Form):
         Pour que la figure soit mise à jour lors du changement de TreeCase dans la MainWindow
         Surcharge
         """
-        self.updateGraphicsSize()
+        self.updateGraphicsSize(False)
         super().showEvent(event)
 
-    def generateXML(self, tmpSaveDirPath):
+    def generateXML(self, ttx):
         """
-        Génération du fichier XML dans le dossier temporaire
+        Génération de la partie XML dans l'archive ttx
         """
-        path_design = join(tmpSaveDirPath, "design")
-        if not exists(path_design):
-            makedirs(path_design)
-
         docDom = QDomDocument()
         root = docDom.appendChild(docDom.createElement("root"))
 
@@ -1468,11 +1530,7 @@ class UI_RatingPlate(QWidget, Ui_Form):
         # Enregistrement
         header = docDom.createProcessingInstruction("xml", "version=\"1.0\" encoding=\"UTF-8\"")
         docDom.insertBefore(header, root)
-        file = QFile(join(path_design, "ratingPlate.xml"))
-        file.open(QIODevice.WriteOnly)
-        out = QTextStream(file)
-        docDom.save(out, 4, QDomDocument.EncodingFromDocument)
-        file.close()
+        ttx.writeXML("design/ratingPlate.xml", docDom)
 
     def addPDF(self, pdf, part, lst_id_calcul=[]):
         """
@@ -1609,6 +1667,17 @@ class UI_RatingPlate(QWidget, Ui_Form):
                 pdf.ln()
                 w.addPDF(pdf, part, lst_id_calcul)
 
+            # Enveloppe sur toutes les prises de tous les enroulements
+            tab_data = []
+            for row in self.getTapEnvelope():
+                tab_data.append(["" if val is None else "%.3f"%val if isinstance(val, float) else "%s"%val for val in row])
+            if len(tab_data) > 0:
+                pdf.ln()
+                pdf.set_font(style="IU")
+                pdf.multi_cell(txt="> Tap envelope (all windings, all taps):")
+                pdf.set_font()
+                pdf.tableMultiCell(LST_TITLE_ENVELOPE, tab_data)
+
         elif "data_detail" in part:
             pdf.ln()
             pdf.toc_entry("Windings arrangement", 2)
@@ -1730,24 +1799,14 @@ class UI_RatingPlate(QWidget, Ui_Form):
             tt_template.addLine("RP_cooling_pump_consumption", self.ui_le_powerPump.text(), unit="W")
             tt_template.addLine("RP_cooling_fan_consumption", self.ui_le_powerFan.text(), unit="W")
 
-    def loadXML(self, tmpSaveDirPath):
+    def loadXML(self, ttx):
         """
-        Chargement du fichier xml dans le ttx
+        Chargement de la partie xml dans le ttx
         """
-        path_xml = join(tmpSaveDirPath, "design", "ratingPlate.xml")
-        if not exists(path_xml):
+        doc = ttx.readXML("design/ratingPlate.xml")
+        if doc is None:
             return
 
-        file = QFile(path_xml)
-        doc = QDomDocument()
-        if not file.open(QIODevice.ReadOnly):
-            file.close()
-            raise Exception("Probleme lecture du fichier %s"%path_xml)
-        if not doc.setContent(file):
-            file.close()
-            raise Exception("Probleme lecture du fichier %s"%path_xml)
-        file.close()
-
         root = doc.documentElement()
         if root.isNull():
             return
@@ -1,14 +1,16 @@
 # -*- coding: utf-8 -*-
 import sys
 from os.path import join, dirname, realpath
-from math import sqrt
+from math import isnan
 
-from PySide6.QtGui import QRegularExpressionValidator, QDoubleValidator, QStandardItemModel, QStandardItem, QFont, QBrush
+from PySide6.QtGui import QRegularExpressionValidator, QDoubleValidator
 from PySide6.QtCore import Qt, Signal, QRegularExpression, QLocale
 from PySide6.QtWidgets import QGraphicsItem, QVBoxLayout, QAbstractItemView, QWidget
 
 from ..utils import gui_geom, gui_utils
 from ..utils.GridTableView import GridTableView
+from ..utils.TapTableModel import TapTableModel, COL_U_PC, COL_U_KV, COL_S_MVA, COL_I_LINE
+from ..model.design import getStrVectorGroup, getStrRegulationRange, calcTapCurrent
 
 from .winding_data_ui import Ui_Form
 
@@ -120,7 +122,7 @@ class UI_WindingData(QWidget, Ui_Form):
         self.layout_table = QVBoxLayout(self.ui_widget_table)
         self.ui_tabV_taps = GridTableView()
         self.layout_table.addWidget(self.ui_tabV_taps)
-        self.model_tab_taps = QStandardItemModel(self)
+        self.model_tab_taps = TapTableModel(self)
         self.ui_tabV_taps.setModel(self.model_tab_taps)
         self.ui_tabV_taps.setSelectionMode(QAbstractItemView.ContiguousSelection)
 
@@ -144,8 +146,7 @@ class UI_WindingData(QWidget, Ui_Form):
             hHeader.setSpan(title[1][0], title[1][1], title[1][2], title[1][3])
             hHeader.setCellLabel(title[1][0], title[1][1], title[0])
 
-        # Choix du mode de classement du tableau
-        self.model_tab_taps.setSortRole(Qt.EditRole) # Penser à mettre les données numériques de rangement en EditRole et pas en setText (sinon ordre alphabétique)
+        # Choix du mode de classement du tableau (rangement numérique des prises dans le modèle)
         self.ui_tabV_taps.horizontalHeader().setSortIndicator(0, Qt.AscendingOrder)
 
         # Valideurs de champs
@@ -171,7 +172,7 @@ class UI_WindingData(QWidget, Ui_Form):
         self.ui_cBox_ratedTap.currentIndexChanged.connect(self.updateHighlightedTap)
         self.ui_cBox_ratedTap.currentIndexChanged.connect(self.widg_ratingPlate.updateWindingsData)
         self.ui_rbut_standard.toggled.connect(self.updateFillingMethod)
-        self.model_tab_taps.itemChanged.connect(self.calculateRow)
+        self.model_tab_taps.tapEdited.connect(self.calculateRow)
 
         self.ui_le_power.editingFinished.connect(self.calculateTableUpdateWindingsData)
         self.ui_le_voltage.editingFinished.connect(self.calculateTableUpdateWindingsData)
@@ -211,7 +212,7 @@ class UI_WindingData(QWidget, Ui_Form):
         self.ui_cBox_ratedTap.currentIndexChanged.connect(self.emitIsModified)
         self.ui_rbut_standard.toggled.connect(self.emitIsModified)
         self.ui_rbut_userDefined.toggled.connect(self.emitIsModified)
-        self.model_tab_taps.itemChanged.connect(self.emitIsModified)
+        self.model_tab_taps.dataChanged.connect(self.emitIsModified)
 
     def emitIsModified(self):
         self.isModified.emit()
@@ -237,7 +238,7 @@ class UI_WindingData(QWidget, Ui_Form):
         self.ui_cBox_ratedTap.currentIndexChanged.disconnect(self.emitIsModified)
         self.ui_rbut_standard.toggled.disconnect(self.emitIsModified)
         self.ui_rbut_userDefined.toggled.disconnect(self.emitIsModified)
-        self.model_tab_taps.itemChanged.disconnect(self.emitIsModified)
+        self.model_tab_taps.dataChanged.disconnect(self.emitIsModified)
 
     def checkDesign(self):
         """
@@ -447,15 +448,10 @@ class UI_WindingData(QWidget, Ui_Form):
         """
         String de représentation du couplage
         """
-        vector_group = self.ui_cBox_ydi.currentText()
-        if self.ui_cBox_ydi.currentText().upper() == "Y":
-            vector_group = vector_group + self.ui_cBox_n.currentText()
-
-        if len(self.widg_ratingPlate.getLstWindingVoltageDescendingNameAlphabetical()) > 0:
-            if self.widg_ratingPlate.getLstWindingVoltageDescendingNameAlphabetical()[0] != self:
-                vector_group = vector_group + "%i"%self.ui_spBox_phase.value()
-
-        return vector_group
+        lst_w = self.widg_ratingPlate.getLstWindingVoltageDescendingNameAlphabetical()
+        isReference = len(lst_w) == 0 or lst_w[0] == self
+        return getStrVectorGroup(self.ui_cBox_ydi.currentText(), self.ui_cBox_n.currentText() != "", \
+                                 self.ui_spBox_phase.value(), isReference)
 
     def getName(self):
         """
@@ -497,68 +493,29 @@ class UI_WindingData(QWidget, Ui_Form):
             nb_positions = self.ui_spBox_nbreTaps.value()
 
         # Rajout des lignes
-        rootItem = self.model_tab_taps.invisibleRootItem()
         for k in range(nb_positions - self.model_tab_taps.rowCount()):
-            row = []
-
-            # Prise
-            tmp = QStandardItem()
+            # Prise, tension % rated, tension kV, puissance prise (le courant est calculé)
             if self.ui_rbut_userDefined.isChecked():
-                tmp.setData(self.model_tab_taps.rowCount()+1, Qt.EditRole)
-            tmp.setData(Qt.AlignCenter, Qt.TextAlignmentRole)
-            tmp.setFlags(Qt.ItemIsEnabled | Qt.ItemIsEditable | Qt.ItemIsSelectable)
-            row.append(tmp)
-
-            # Tension % rated
-            tmp = QStandardItem("100.0")
-            tmp.setData(Qt.AlignCenter, Qt.TextAlignmentRole)
-            tmp.setFlags(Qt.ItemIsEnabled | Qt.ItemIsEditable | Qt.ItemIsSelectable)
-            row.append(tmp)
-
-            # Tension kV
-            tmp = QStandardItem(self.ui_le_voltage.text())
-            tmp.setData(Qt.AlignCenter, Qt.TextAlignmentRole)
-            tmp.setFlags(Qt.ItemIsEnabled | Qt.ItemIsEditable | Qt.ItemIsSelectable)
-            row.append(tmp)
-
-            # Puissance prise
-            tmp = QStandardItem(self.ui_le_power.text())
-            tmp.setData(Qt.AlignCenter, Qt.TextAlignmentRole)
-            tmp.setFlags(Qt.ItemIsEnabled | Qt.ItemIsEditable | Qt.ItemIsSelectable)
-            row.append(tmp)
-
-            # Courant de prise
-            tmp = QStandardItem("")
-            tmp.setData(Qt.AlignCenter, Qt.TextAlignmentRole)
-            tmp.setFlags(Qt.ItemIsEnabled | Qt.ItemIsSelectable)
-            row.append(tmp)
-
-            rootItem.appendRow(row)
+                tap = self.model_tab_taps.rowCount() + 1
+            else:
+                tap = None
+            self.model_tab_taps.appendTap(tap, 100.0, self.ui_le_voltage.text(), self.ui_le_power.text())
             if self.ui_rbut_userDefined.isChecked():
-                self.calculateRow(row[0])
+                self.calculateRow(self.model_tab_taps.rowCount() - 1, 0)
 
         # Suppression des lignes
-        k = nb_positions
-        while k < self.model_tab_taps.rowCount():
-            self.model_tab_taps.takeRow(k)
+        if nb_positions < self.model_tab_taps.rowCount():
+            self.model_tab_taps.removeRows(nb_positions, self.model_tab_taps.rowCount() - nb_positions)
 
         # En fonction du mode de remplissage
         if self.ui_rbut_standard.isChecked():
             # On redéfini les numéros de prises et les % LL
             self.fillFixedRegulationStep(False)
             # No Backgroung
-            self.model_tab_taps.itemChanged.disconnect(self.calculateRow)
-            for k in range(self.model_tab_taps.rowCount()):
-                for r in range(4):
-                    self.model_tab_taps.item(k, r).setData(0, Qt.BackgroundRole)
-            self.model_tab_taps.itemChanged.connect(self.calculateRow)
+            self.model_tab_taps.setEditable(False)
         else:
             # Backgroung jaune sur les cases à éditables
-            self.model_tab_taps.itemChanged.disconnect(self.calculateRow)
-            for k in range(self.model_tab_taps.rowCount()):
-                for r in range(4):
-                    self.model_tab_taps.item(k, r).setData(QBrush(Qt.yellow), Qt.BackgroundRole)
-            self.model_tab_taps.itemChanged.connect(self.calculateRow)
+            self.model_tab_taps.setEditable(True)
 
     def calculateTableUpdateWindingsData(self):
         """
@@ -571,79 +528,61 @@ class UI_WindingData(QWidget, Ui_Form):
         """
         Recalcul du tableau
         """
-        for k in range(self.model_tab_taps.rowCount()):
-            self.calculateRow(self.model_tab_taps.item(k, 1))
+        for row in range(self.model_tab_taps.rowCount()):
+            self.calculateRow(row, COL_U_PC)
 
-    def calculateRow(self, item):
+    def calculateRow(self, row, column):
         """
         Recalcul d'une ligne
         """
-        self.model_tab_taps.itemChanged.disconnect(self.calculateRow)
+        model = self.model_tab_taps
+        try:
+            u_r = float(self.ui_le_voltage.text())
+        except:
+            u_r = None
 
         ### Tension
-        if self.model_tab_taps.indexFromItem(item).column() != 2:
+        if column != COL_U_KV:
             # Modification de la tension en % => Calcul du kV
-            try:
-                u_pc = float(self.model_tab_taps.item(item.row(), 1).text())/100
-            except:
-                u_pc = None
+            u_pc = model.getValue(row, COL_U_PC)
+            if isnan(u_pc) or u_r is None:
                 u_kV = None
-                self.model_tab_taps.item(item.row(), 2).setText("")
             else:
-                try:
-                    u_kV = u_pc*float(self.ui_le_voltage.text())
-                except:
-                    u_kV = None
-                    self.model_tab_taps.item(item.row(), 2).setText("")
-                else:
-                    self.model_tab_taps.item(item.row(), 2).setText("%f"%u_kV)
+                u_kV = u_pc/100*u_r
+            model.setValue(row, COL_U_KV, u_kV)
 
         else:
             # Modification de la tension en kV => Calcul du %
-            try:
-                u_kV = float(self.model_tab_taps.item(item.row(), 2).text())
-            except:
-                u_pc = None
+            u_kV = model.getValue(row, COL_U_KV)
+            if isnan(u_kV):
                 u_kV = None
-                self.model_tab_taps.item(item.row(), 1).setText("")
+                model.setValue(row, COL_U_PC, None)
+            elif u_r is None or u_r == 0:
+                model.setValue(row, COL_U_PC, None)
             else:
-                try:
-                    u_pc = (u_kV/float(self.ui_le_voltage.text()))*100
-                except:
-                    u_pc = None
-                    self.model_tab_taps.item(item.row(), 1).setText("")
-                else:
-                    self.model_tab_taps.item(item.row(), 1).setText("%f"%u_pc)
+                model.setValue(row, COL_U_PC, (u_kV/u_r)*100)
 
         ### Puissance
         if self.ui_rbut_standard.isChecked():
-            self.model_tab_taps.item(item.row(), 3).setText(self.ui_le_power.text())
-        try:
-            s_tap = float(self.model_tab_taps.item(item.row(), 3).text())
-        except:
-            s_tap = None
+            model.setValue(row, COL_S_MVA, self.ui_le_power.text())
+        s_tap = model.getValue(row, COL_S_MVA)
 
         ### Courant de ligne
-        if s_tap != None and u_kV != None and u_kV != 0:
-            if self.widg_ratingPlate.isMonophase():
-                i_line = 3*s_tap*1000/(u_kV*sqrt(3))
-            else:
-                i_line = s_tap*1000/(u_kV*sqrt(3))
-            self.model_tab_taps.item(item.row(), 4).setText("%f"%i_line)
+        if not isnan(s_tap) and u_kV != None and u_kV != 0:
+            i_line, _ = calcTapCurrent(s_tap, u_kV, self.widg_ratingPlate.isMonophase(), self.ui_cBox_ydi.currentText())
+            model.setValue(row, COL_I_LINE, i_line)
         else:
-            self.model_tab_taps.item(item.row(), 4).setText("")
+            model.setValue(row, COL_I_LINE, None)
 
         ### Mise à jour de la liste des tap
         if self.ui_rbut_userDefined.isChecked():
             self.updateTapComboBox()
 
-        self.model_tab_taps.itemChanged.connect(self.calculateRow)
-
         ### Surlignage de la prise principale
         self.updateHighlightedTap()
 
         ### Pour le rangement du tableau (nécessite de le rappeler systématiquement)
-        if item.column() == 0:
+        if column == 0:
             self.ui_tabV_taps.setSortingEnabled(True)
 
         ### Mise à jour de la plaque
@@ -680,9 +619,7 @@ class UI_WindingData(QWidget, Ui_Form):
         Mise à jour de la liste de choix de la prise assignée
         """
         tap_rated = self.getTapRated()
-        lst_taps = []
-        for row in range(self.model_tab_taps.rowCount()):
-            lst_taps.append(self.model_tab_taps.item(row, 0).text())
+        lst_taps = self.model_tab_taps.getLstTaps()
 
         self.ui_cBox_ratedTap.currentIndexChanged.disconnect(self.updateHighlightedTap)
 
@@ -698,47 +635,41 @@ class UI_WindingData(QWidget, Ui_Form):
         """
         Remplissage des colonnes avec un pas de régulation fixe
         """
-        self.model_tab_taps.itemChanged.disconnect(self.calculateRow)
-
         row = 0
 
         # Prises positives
         for k in range(self.ui_spBox_nbreTaps_p.value()):
             # Numéro de prise
-            self.model_tab_taps.item(row, 0).setData(row + 1, Qt.EditRole)
+            self.model_tab_taps.setTap(row, row + 1)
 
             # Pourcentage
             try:
                 u_pc = 100 + (self.ui_spBox_nbreTaps_p.value() - k)*float(self.ui_le_regStep_p.text())
             except:
-                self.model_tab_taps.item(row, 1).setText("")
-            else:
-                self.model_tab_taps.item(row, 1).setText("%f"%u_pc)
+                u_pc = None
+            self.model_tab_taps.setValue(row, COL_U_PC, u_pc)
 
             row = row + 1
 
         # Prise médiane
-        self.model_tab_taps.item(row, 0).setData(row + 1, Qt.EditRole)
-        self.model_tab_taps.item(row, 1).setText("%f"%100)
+        self.model_tab_taps.setTap(row, row + 1)
+        self.model_tab_taps.setValue(row, COL_U_PC, 100.0)
         row = row + 1
 
         # Prises négatives
         for k in range(self.ui_spBox_nbreTaps_m.value()):
             # Numéro de prise
-            self.model_tab_taps.item(row, 0).setData(row + 1, Qt.EditRole)
+            self.model_tab_taps.setTap(row, row + 1)
 
             # Pourcentage
             try:
                 u_pc = 100 - (k + 1)*float(self.ui_le_regStep_m.text())
             except:
-                self.model_tab_taps.item(row, 1).setText("")
-            else:
-                self.model_tab_taps.item(row, 1).setText("%f"%u_pc)
+                u_pc = None
+            self.model_tab_taps.setValue(row, COL_U_PC, u_pc)
 
             row = row + 1
 
-        self.model_tab_taps.itemChanged.connect(self.calculateRow)
-
         if updateWindingsData:
             self.calculateTableUpdateWindingsData()
         else:
@@ -748,25 +679,7 @@ class UI_WindingData(QWidget, Ui_Form):
         """
         Mise en évidence de la ligne prise assignée
         """
-        tap_rated = self.getTapRated()
-        font_bold = QFont()
-        font_bold.setBold(True)
-        font_std = QFont()
-
-        self.model_tab_taps.itemChanged.disconnect(self.calculateRow)
-
-        find = False
-        for row in range(self.model_tab_taps.rowCount()):
-            if self.model_tab_taps.item(row, 0).text() == tap_rated and not find:
-                # C'est la première bonne ligne
-                for col in range(self.model_tab_taps.columnCount()):
-                    self.model_tab_taps.item(row, col).setFont(font_bold)
-                find = True
-            else:
-                for col in range(self.model_tab_taps.columnCount()):
-                    self.model_tab_taps.item(row, col).setFont(font_std)
-
-        self.model_tab_taps.itemChanged.connect(self.calculateRow)
+        self.model_tab_taps.setHighlightedTap(self.getTapRated())
 
     def getStrRegulation(self):
         """
@@ -776,38 +689,13 @@ class UI_WindingData(QWidget, Ui_Form):
             return ""
 
         # Il peut y avoir un écart s'il n'y a pas de prise sur la tension indiquée dans main voltage d'où le fait de ne pas prendre les valeurs du tableau
-        min_pc = 100.0
-        max_pc = 0.0
         try:
             rated_voltage = self.getTapVoltage()
         except:
             rated_voltage = 0.0
 
-        for row in range(self.model_tab_taps.rowCount()):
-            try:
-                pc = round((float(self.model_tab_taps.item(row, 2).text())/rated_voltage - 1)*100, 3)
-            except:
-                continue
-            min_pc = min(min_pc, pc)
-            max_pc = max(max_pc, pc)
-
-        if abs(min_pc) == abs(max_pc):
-            tmp = abs(min_pc)
-            if tmp.is_integer():
-                return u"\u00B1" + "%i%%"%abs(min_pc)
-            else:
-                return u"\u00B1" + "%.2f%%"%abs(min_pc)
-        else:
-            tmp = ""
-            if max_pc.is_integer():
-                tmp += "%+i%%"%max_pc
-            else:
-                tmp += "%+.2f%%"%max_pc
-            if min_pc.is_integer():
-                tmp += ", %+i%%"%min_pc
-            else:
-                tmp += ", %+.2f%%"%min_pc
-            return tmp
+        return getStrRegulationRange([u_kV for u_kV in self.model_tab_taps.getColumn(COL_U_KV).tolist() if not isnan(u_kV)], \
+                                     rated_voltage)
 
     def addXMLTree(self, tag_arr, docDom):
         """
@@ -892,13 +780,13 @@ class UI_WindingData(QWidget, Ui_Form):
             tag_data = docDom.createElement('data')
 
             tag_tmp = docDom.createElement('tap')
-            tag_tmp.appendChild(docDom.createTextNode(self.model_tab_taps.item(row, 0).text()))
+            tag_tmp.appendChild(docDom.createTextNode(self.model_tab_taps.text(row, 0)))
             tag_data.appendChild(tag_tmp)
             tag_tmp = docDom.createElement('u_tap_kV')
-            tag_tmp.appendChild(docDom.createTextNode(self.model_tab_taps.item(row, 2).text()))
+            tag_tmp.appendChild(docDom.createTextNode(self.model_tab_taps.text(row, COL_U_KV)))
             tag_data.appendChild(tag_tmp)
             tag_tmp = docDom.createElement('s_tap_MVA')
-            tag_tmp.appendChild(docDom.createTextNode(self.model_tab_taps.item(row, 3).text()))
+            tag_tmp.appendChild(docDom.createTextNode(self.model_tab_taps.text(row, COL_S_MVA)))
             tag_data.appendChild(tag_tmp)
 
             tag_taps.appendChild(tag_data)
@@ -933,8 +821,9 @@ class UI_WindingData(QWidget, Ui_Form):
                 data = []
                 for col in range(self.model_tab_taps.columnCount()):
                     # Bidouilles pour avoir le même format d'affichage que dans le tableau
-                    dlg = self.ui_tabV_taps.itemDelegate(self.model_tab_taps.item(row, col).index())
-                    data.append(dlg.displayText(self.model_tab_taps.item(row, col).text(), self.locale))
+                    index = self.model_tab_taps.index(row, col)
+                    dlg = self.ui_tabV_taps.itemDelegate(index)
+                    data.append(dlg.displayText(self.model_tab_taps.data(index), self.locale))
                 tab_data.append(data)
             if len(tab_data) > 0:
                 pdf.ln()
@@ -965,7 +854,7 @@ class UI_WindingData(QWidget, Ui_Form):
         for row in range(self.model_tab_taps.rowCount()):
             data = []
             for col in range(self.model_tab_taps.columnCount()):
-                data.append(self.model_tab_taps.item(row, col).text())
+                data.append(self.model_tab_taps.text(row, col))
             tab_data.append(data)
         row_title = ["Tap", "LL voltage (%)", "LL voltage (kV)", "Power (MVA)", "Current (A)"]
         tt_template.addTableRow("%s_rated_values"%prefix, [row_title] + tab_data)
@@ -1055,15 +944,17 @@ class UI_WindingData(QWidget, Ui_Form):
                         tap = int(e_tmp.text())
                     except:
                         tap = e_tmp.text()
-                    self.model_tab_taps.item(row, 0).setData(tap, Qt.EditRole)
+                    self.model_tab_taps.setTap(row, tap)
                     e_tmp = e_data.firstChildElement("u_tap_kV")
-                    self.model_tab_taps.item(row, 2).setText(e_tmp.text())
+                    self.model_tab_taps.setValue(row, COL_U_KV, e_tmp.text())
                     e_tmp = e_data.firstChildElement("s_tap_MVA")
-                    self.model_tab_taps.item(row, 3).setText(e_tmp.text())
+                    self.model_tab_taps.setValue(row, COL_S_MVA, e_tmp.text())
+                    self.calculateRow(row, COL_U_KV)
 
                     n = n.nextSiblingElement("data")
                     row = row + 1
 
+                self.ui_tabV_taps.setSortingEnabled(True)
                 self.updateTapComboBox()
 
             else:
@@ -1127,10 +1018,7 @@ class UI_WindingData(QWidget, Ui_Form):
         """
         Renvoi la liste des positions
         """
-        lst_taps = []
-        for row in range(self.model_tab_taps.rowCount()):
-            lst_taps.append(self.model_tab_taps.item(row, 0).text())
-        return lst_taps
+        return self.model_tab_taps.getLstTaps()
 
     def getTapVoltage(self, tap=None):
         """
@@ -1139,16 +1027,7 @@ class UI_WindingData(QWidget, Ui_Form):
         if tap is None:
             tap = self.getTapRated()
 
-        for row in range(self.model_tab_taps.rowCount()):
-            if self.model_tab_taps.item(row, 0).text() == tap:
-                try:
-                    u_tap = float(self.model_tab_taps.item(row, 2).text())
-                except:
-                    u_tap = 0.0
-
-                return u_tap
-
-        return None
+        return self.model_tab_taps.getTapValue(tap, COL_U_KV)
 
     def getTapPower(self, tap=None):
         """
@@ -1157,16 +1036,7 @@ class UI_WindingData(QWidget, Ui_Form):
         if tap is None:
             tap = self.getTapRated()
 
-        for row in range(self.model_tab_taps.rowCount()):
-            if self.model_tab_taps.item(row, 0).text() == tap:
-                try:
-                    s_tap = float(self.model_tab_taps.item(row, 3).text())
-                except:
-                    s_tap = 0.0
-
-                return s_tap
-
-        return None
+        return self.model_tab_taps.getTapValue(tap, COL_S_MVA)
 
     def getTapCurrent(self, tap=None, s_r=None):
         """
@@ -1176,31 +1046,8 @@ class UI_WindingData(QWidget, Ui_Form):
             tap = self.getTapRated()
         if s_r is None:
             s_r = self.getTapPower(tap)
-            if s_r is None:
-                return [None, None]
-
-        # Puissance de l'enroulement (kVA)
-        s_r = s_r*1e3
-
-        # Tension assignée de l'enroulement (kV)
-        u_r = self.getTapVoltage(tap)
-        if u_r is None:
-            return [None, None]
-
-        # Courant assigné de ligne (A)
-        if self.widg_ratingPlate.isMonophase():
-            i_line = 3*s_r/(u_r*sqrt(3))
-        else:
-            i_line = s_r/(u_r*sqrt(3))
-
-        # Courant assigné de la bobine (A)
-        if self.ui_cBox_ydi.currentText().upper() == 'Y':
-            i_coil = i_line
-        else:
-            # on est sur un enroulement delta
-            i_coil = i_line/sqrt(3)
 
-        return [i_line, i_coil]
+        return calcTapCurrent(s_r, self.getTapVoltage(tap), self.widg_ratingPlate.isMonophase(), self.ui_cBox_ydi.currentText())
 
     def getHighestVoltage(self, neutral_included=True):
         """
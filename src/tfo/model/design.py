@@ -0,0 +1,1107 @@
+# -*- coding: utf-8 -*-
+from re import fullmatch
+from math import sqrt
+from xml.etree.ElementTree import fromstring
+
+from numpy import flatnonzero
+
+from ..utils.ttx_archive import TTXReader
+
+# =============================================================================
+# Modèle de données du design, indépendant des widgets Qt
+# Lecture des .ttx écrits par les widgets (seule sérialisation du format), vérification et grandeurs dérivées sans QApplication
+# La lecture de l'empilement et le calcul des grandeurs dérivées sont des fonctions sur des valeurs simples, communes aux widgets
+# (transformateur -> arrangements -> enroulements -> prises ; cables ; discs ; coils ; matériaux)
+# Les longueurs sont en m, les tensions en V et les puissances en VA comme dans le ttx
+# =============================================================================
+
+# Enregistrements lus en flux dans coil.xml (cf. xml_stream)
+DICT_RECORD_COIL = {"coil": "coil", \
+                    "coil/vertical_ducts/duct": "vertical_duct", \
+                    "coil/discs/disc": "disc", \
+                    "coil/horizontal_ducts/duct": "horizontal_duct", \
+                    "coil/pressboards/pressboard": "pressboard", \
+                    "coil/blocks/block/disc": "block_disc", \
+                    "coil/blocks/block/duct": "block_duct", \
+                    "coil/blocks/block/pressboard": "block_pressboard", \
+                    "coil/blocks/block": "block", \
+                    "coil/res_thermo_K": "res_thermo"}
+
+# Noms acceptés pour les enroulements, cables et discs (cf. validateurs des widgets)
+REGEXP_NAME = r"[A-Za-z0-9\-_]+"
+
+# Version par défaut (main.xml sans version)
+MODEL_VERSION = "1.6.3.DD"
+
+### Codes de la description colonnaire de l'empilement (cf. gui_geom.Coil.getStackArrays)
+ITEM_DISC = 0
+ITEM_DUCT = 1
+ITEM_PRESSBOARD = 2
+GUIDE_NO = 0
+GUIDE_INNER = 1
+GUIDE_OUTER = 2
+LST_GUIDE_NAME = ["no", "inner", "outer"]
+
+### Fonctions utilitaires XML
+def getText(elt, path, default=""):
+    """
+    Texte du sous-élément path de elt (default s'il est absent)
+    """
+    if elt is None:
+        return default
+    e_tmp = elt.find(path)
+    if e_tmp is None:
+        return default
+    if e_tmp.text is None:
+        return ""
+    return e_tmp.text
+
+def toFloat(text, default=None):
+    try:
+        return float(text)
+    except:
+        return default
+
+def toInt(text, default=0):
+    try:
+        return int(text)
+    except:
+        return default
+
+### Ecriture XML de l'empilement
+def addXMLTreeStack(tag_coil, docDom, dict_stack, blocks=None):
+    """
+    Ecriture sous tag_coil de l'empilement colonnaire dict_stack (cf. gui_geom.Coil.getStackArrays)
+    blocks : (indice de début, nombre d'éléments du motif, nombre de répétitions) des blocs (cf. gui_geom.CoilStack.getBlocks)
+    pour une écriture par blocs, sinon élément par élément
+    N'utilise que les tableaux : peut être appelée hors du thread GUI (cf. TTXSnapshot.writeState)
+    """
+    def addText(tag_parent, name, text):
+        tag_tmp = docDom.createElement(name)
+        tag_tmp.appendChild(docDom.createTextNode(text))
+        tag_parent.appendChild(tag_tmp)
+
+    addText(tag_coil, 'width_m', "%e"%dict_stack["width_m"][0])
+
+    tag_vduct = docDom.createElement('vertical_ducts')
+    tag_coil.appendChild(tag_vduct)
+    for t_duct, r_center in dict_stack["vertical_ducts_m"].tolist():
+        tag_d = docDom.createElement('duct')
+        tag_vduct.appendChild(tag_d)
+        addText(tag_d, 't_duct_m', "%e"%t_duct)
+        addText(tag_d, 'r_center_m', "%e"%r_center)
+
+    kind = dict_stack["kind"]
+    lst_thickness = dict_stack["thickness_m"].tolist()
+    lst_z_center = dict_stack["z_center_m"].tolist()
+    lst_guides = [LST_GUIDE_NAME[g] for g in dict_stack["oil_guides"].tolist()]
+    lst_disc_types = dict_stack["disc_types"].tolist()
+    lst_type = [lst_disc_types[t] if t >= 0 else "" for t in dict_stack["disc_type"].tolist()]
+
+    if not blocks is None:
+        tag_blocks = docDom.createElement('blocks')
+        tag_coil.appendChild(tag_blocks)
+        for start, nb_item, repeat in zip(*[arr.tolist() for arr in blocks]):
+            tag_b = docDom.createElement('block')
+            tag_blocks.appendChild(tag_b)
+            addText(tag_b, 'repeat', "%i"%repeat)
+            for k in range(start, start + nb_item):
+                thickness = "%e"%lst_thickness[k]
+                if kind[k] == ITEM_DISC:
+                    tag_d = docDom.createElement('disc')
+                    lst_child = [("type", lst_type[k]), ("t_disc_m", thickness), ("oil_guides", lst_guides[k])]
+                elif kind[k] == ITEM_DUCT:
+                    tag_d = docDom.createElement('duct')
+                    lst_child = [("t_duct_m", thickness)]
+                else:
+                    tag_d = docDom.createElement('pressboard')
+                    lst_child = [("t_pressboard_m", thickness), ("oil_guides", lst_guides[k])]
+                tag_b.appendChild(tag_d)
+                for name, text in lst_child:
+                    addText(tag_d, name, text)
+        return
+
+    # Eléments par type, du bas vers le haut
+    tag_disc = docDom.createElement('discs')
+    tag_coil.appendChild(tag_disc)
+    for k in flatnonzero(kind == ITEM_DISC).tolist():
+        tag_d = docDom.createElement('disc')
+        tag_disc.appendChild(tag_d)
+        addText(tag_d, 'type', lst_type[k])
+        addText(tag_d, 'z_center_m', "%e"%lst_z_center[k])
+        addText(tag_d, 'oil_guides', lst_guides[k])
+
+    tag_duct = docDom.createElement('horizontal_ducts')
+    tag_coil.appendChild(tag_duct)
+    for k in flatnonzero(kind == ITEM_DUCT).tolist():
+        tag_d = docDom.createElement('duct')
+        tag_duct.appendChild(tag_d)
+        addText(tag_d, 't_duct_m', "%e"%lst_thickness[k])
+        addText(tag_d, 'z_center_m', "%e"%lst_z_center[k])
+
+    tag_pressboard = docDom.createElement('pressboards')
+    tag_coil.appendChild(tag_pressboard)
+    for k in flatnonzero(kind == ITEM_PRESSBOARD).tolist():
+        tag_d = docDom.createElement('pressboard')
+        tag_pressboard.appendChild(tag_d)
+        addText(tag_d, 't_pressboard_m', "%e"%lst_thickness[k])
+        addText(tag_d, 'z_center_m', "%e"%lst_z_center[k])
+        addText(tag_d, 'oil_guides', lst_guides[k])
+
+### Lecture XML de l'empilement
+def getEmptyStackRecord():
+    """
+    Listes de l'empilement XML d'une coil, remplies par addStackRecord
+    """
+    return {"vduct": [], "item": [], "hduct": [], "block": [], "block_item": []}
+
+def addStackRecord(dict_stack_xml, kind, rec, scale=1e3):
+    """
+    Ajout d'un enregistrement XML de l'empilement (cf. xml_stream, DICT_RECORD_COIL) à dict_stack_xml (cf. getEmptyStackRecord)
+    scale : facteur appliqué aux longueurs du ttx (m), 1e3 pour les widgets (mm), 1.0 pour le modèle (cf. Coil.loadStackRecord)
+    Renvoie False si l'enregistrement ne fait pas partie de l'empilement
+    """
+    if kind == "vertical_duct":
+        dict_stack_xml["vduct"].append({"t_duct": float(rec["t_duct_m"])*scale, \
+                                        "r_center": float(rec["r_center_m"])*scale})
+    elif kind == "disc":
+        dict_stack_xml["item"].append({"item": "disc", "type": rec.get("type", ""), \
+                                       "z_center": float(rec["z_center_m"])*scale, \
+                                       "oil_guides": rec.get("oil_guides", "")})
+    elif kind == "pressboard":
+        dict_stack_xml["item"].append({"item": "pressboard", \
+                                       "t_pressboard": float(rec["t_pressboard_m"])*scale, \
+                                       "z_center": float(rec["z_center_m"])*scale, \
+                                       "oil_guides": rec.get("oil_guides", "")})
+    elif kind == "horizontal_duct":
+        dict_stack_xml["hduct"].append({"t_duct": float(rec["t_duct_m"])*scale, \
+                                        "z_center": float(rec["z_center_m"])*scale})
+    # Empilement par blocs : les éléments du motif sont lus avant le bloc
+    elif kind == "block_disc":
+        dict_stack_xml["block_item"].append({"item": "disc", "type": rec.get("type", ""), \
+                                             "t_disc": float(rec["t_disc_m"])*scale, \
+                                             "oil_guides": rec.get("oil_guides", "")})
+    elif kind == "block_duct":
+        dict_stack_xml["block_item"].append({"item": "duct", "t_duct": float(rec["t_duct_m"])*scale})
+    elif kind == "block_pressboard":
+        dict_stack_xml["block_item"].append({"item": "pressboard", "t_pressboard": float(rec["t_pressboard_m"])*scale, \
+                                             "oil_guides": rec.get("oil_guides", "")})
+    elif kind == "block":
+        dict_stack_xml["block"].append({"repeat": int(rec["repeat"]), "items": dict_stack_xml["block_item"]})
+        dict_stack_xml["block_item"] = []
+    else:
+        return False
+
+    return True
+
+### Grandeurs dérivées, à partir de valeurs simples (utilisées par les widgets et par le modèle)
+def getStrCoolingMode(lst_cooling_type):
+    """
+    Mode de refroidissement (ex : ONAN) à partir des 4 lettres
+    """
+    return "".join(lst_cooling_type)
+
+def getStrVectorGroup(connection, neutral, displacement, isReference):
+    """
+    Couplage d'un enroulement (ex : YN, d11), en majuscules pour l'enroulement de référence
+    """
+    if isReference:
+        vector_group = connection.upper()
+        if vector_group == "Y" and neutral:
+            vector_group = vector_group + "N"
+        return vector_group
+
+    vector_group = connection.lower()
+    if vector_group == "y" and neutral:
+        vector_group = vector_group + "n"
+    return vector_group + "%i"%displacement
+
+def getStrRegulationRange(lst_u_kV, rated_voltage):
+    """
+    Plage de régulation (ex : ±10%, +5%, -15%) à partir des tensions de prise (kV)
+    Les tensions non définies (None) sont ignorées
+    """
+    min_pc = 100.0
+    max_pc = 0.0
+    for u_kV in lst_u_kV:
+        try:
+            pc = round((u_kV/rated_voltage - 1)*100, 3)
+        except:
+            continue
+        min_pc = min(min_pc, pc)
+        max_pc = max(max_pc, pc)
+
+    if abs(min_pc) == abs(max_pc):
+        if abs(min_pc).is_integer():
+            return u"\u00B1" + "%i%%"%abs(min_pc)
+        else:
+            return u"\u00B1" + "%.2f%%"%abs(min_pc)
+    else:
+        tmp = "%+i%%"%max_pc if max_pc.is_integer() else "%+.2f%%"%max_pc
+        tmp += ", %+i%%"%min_pc if min_pc.is_integer() else ", %+.2f%%"%min_pc
+        return tmp
+
+def getStrStudyName(reference, lst_power_MVA, lst_voltage_kV, lst_regulation, vector_group, rated_freq_Hz, cooling_mode):
+    """
+    Study name : enroulements rangés par tension décroissante (puissances et tensions assignées, régulation)
+    """
+    def strValue(val):
+        if val is None:
+            val = 0.0
+        if float(val).is_integer():
+            return "%i"%val
+        return "%.3f"%val
+
+    lst_infos = [reference, \
+                 "/".join(strValue(s) for s in lst_power_MVA) + " MVA", \
+                 "/".join(strValue(u) + reg for u, reg in zip(lst_voltage_kV, lst_regulation)) + " kV", \
+                 vector_group, \
+                 "%s Hz"%rated_freq_Hz, \
+                 cooling_mode]
+
+    return " - ".join(s for s in lst_infos if s != "")
+
+def calcTapCurrent(s_r_MVA, u_r_kV, isMonophase, connection):
+    """
+    Courants assignés [ligne, bobine] (A) pour une puissance (MVA) et une tension LL (kV), [None, None] si non définies
+    """
+    if s_r_MVA is None or u_r_kV is None:
+        return [None, None]
+
+    # Puissance de l'enroulement (kVA)
+    s_r = s_r_MVA*1e3
+
+    # Courant assigné de ligne (A)
+    if isMonophase:
+        i_line = 3*s_r/(u_r_kV*sqrt(3))
+    else:
+        i_line = s_r/(u_r_kV*sqrt(3))
+
+    # Courant assigné de la bobine (A)
+    if connection.upper() == "Y":
+        return [i_line, i_line]
+    else:
+        return [i_line, i_line/sqrt(3)]
+
+def calcCableProperties(prop):
+    """
+    Complète les propriétés d'un cable en mm (name, type, N_strands, h_strand, t_strand, type_strandInsulation,
+    t_strandInsulation, t_pressboard, t_cableInsulation) : isolation extérieure et dimensions du cable
+    Renvoie {} si le cable est mal défini
+    """
+    # Pressboard uniquement en CTC
+    if not "CTC" in prop["type"]:
+        prop["t_pressboard"] = 0.0
+
+    if prop["type"] == "CTC Paper" or prop["type"] == "CTC Netting tape":
+        prop["type_cableInsulation"] = "paper" if prop["type"] == "CTC Paper" else "polyester"
+        prop["t_cable"] = 2*(prop["h_strand"] + prop["t_strandInsulation"]) + prop["t_pressboard"] + prop["t_cableInsulation"]
+        prop["h_cable"] = (int((prop["N_strands"]-1)/2)+1)*(prop["t_strand"]+prop["t_strandInsulation"]) + prop["t_cableInsulation"]
+        if prop["N_strands"]%2 == 0:
+            # Cable CTC mal défini
+            return {}
+    elif prop["type"] == "Meplat":
+        prop["type_cableInsulation"] = "paper"
+        prop["t_cable"] = prop["h_strand"] + prop["t_strandInsulation"] + prop["t_cableInsulation"]
+        prop["h_cable"] = prop["N_strands"]*(prop["t_strand"]+prop["t_strandInsulation"]) + prop["t_cableInsulation"]
+    else:
+        raise Exception("Type de cable inconnu")
+
+    if prop["h_cable"] <= 0.0 and prop["t_cable"] <= 0.0:
+        return {}
+
+    return prop
+
+class Tap():
+    """
+    Ligne du tableau des prises d'un enroulement
+    """
+
+    def __init__(self, tap="1", u_tap_kV=None, s_tap_MVA=None):
+        self.tap = tap
+        self.u_tap_kV = u_tap_kV
+        self.s_tap_MVA = s_tap_MVA
+
+class Winding():
+    """
+    Enroulement et son réglage
+    """
+
+    def __init__(self, name=""):
+        self.name = name
+        self.power_VA = 0.0
+        self.voltage_V = 0.0
+        self.um_choice = ""
+        self.um_V = None
+        self.um_neutral_choice = ""
+        self.um_neutral_V = None
+
+        # Couplage
+        self.connection = "y"
+        self.neutral = False
+        self.displacement = 0
+
+        # Réglage
+        self.filling_method = "standard"
+        self.regulation = False
+        self.nb_taps = 1
+        self.rated_tap = ""
+        self.nb_taps_p = 0
+        self.reg_step_p = 0.0
+        self.nb_taps_m = 0
+        self.reg_step_m = 0.0
+        self.lst_tap = [Tap("1")]
+
+    def hasNeutralBushing(self):
+        return self.connection.upper() == "Y" and self.neutral
+
+    def hasTapChanger(self):
+        if self.filling_method == "standard":
+            return (self.nb_taps_p + self.nb_taps_m) > 0 and self.regulation
+        else:
+            return self.nb_taps > 1 and self.regulation
+
+    def fillFixedRegulationStep(self):
+        """
+        Remplissage du tableau des prises avec un pas de régulation fixe (mode standard)
+        """
+        lst_pc = [100 + (self.nb_taps_p - k)*self.reg_step_p for k in range(self.nb_taps_p)] + [100.0] + \
+                 [100 - (k + 1)*self.reg_step_m for k in range(self.nb_taps_m)]
+        self.lst_tap = [Tap("%i"%(k + 1), self.voltage_V*1e-3*pc/100, self.power_VA*1e-6) for k, pc in enumerate(lst_pc)]
+
+    def getTapRated(self):
+        """
+        Renvoi la prise assignée
+        """
+        if self.filling_method == "standard":
+            return "%i"%(self.nb_taps_p + 1)
+        else:
+            return self.rated_tap
+
+    def getLstPositions(self):
+        return [t.tap for t in self.lst_tap]
+
+    def getTap(self, tap=None):
+        """
+        Ligne de la prise spécifiée (sinon rated), None si absente
+        """
+        if tap is None:
+            tap = self.getTapRated()
+        for t in self.lst_tap:
+            if t.tap == tap:
+                return t
+        return None
+
+    def getTapVoltage(self, tap=None):
+        """
+        Tension LL de prise sur la prise spécifiée (sinon rated) (kV)
+        """
+        t = self.getTap(tap)
+        if t is None:
+            return None
+        return t.u_tap_kV if not t.u_tap_kV is None else 0.0
+
+    def getTapPower(self, tap=None):
+        """
+        Puissance de prise sur la prise spécifiée (sinon rated) (MVA)
+        """
+        t = self.getTap(tap)
+        if t is None:
+            return None
+        return t.s_tap_MVA if not t.s_tap_MVA is None else 0.0
+
+    def getTapCurrent(self, isMonophase, tap=None, s_r=None):
+        """
+        Courants assignés [ligne, bobine] sur la prise spécifiée (sinon rated) et pour la puissance donnée (sinon de prise) (A)
+        """
+        if s_r is None:
+            s_r = self.getTapPower(tap)
+        return calcTapCurrent(s_r, self.getTapVoltage(tap), isMonophase, self.connection)
+
+    def getStrRegulation(self):
+        """
+        Renvoi le string d'écriture de la régulation (cf. UI_WindingData.getStrRegulation)
+        """
+        if not self.hasTapChanger():
+            return ""
+        return getStrRegulationRange([t.u_tap_kV for t in self.lst_tap], self.getTapVoltage())
+
+    def loadXML(self, wind_elt):
+        """
+        Chargement à partir de l'élément winding de ratingPlate.xml
+        """
+        self.name = getText(wind_elt, "name")
+
+        e_rv = wind_elt.find("rated_values")
+        self.power_VA = toFloat(getText(e_rv, "power_VA"), 0.0)
+        self.voltage_V = toFloat(getText(e_rv, "LL_voltage_V"), 0.0)
+        self.um_choice = getText(e_rv, "Um_voltage_choice")
+        self.um_V = toFloat(getText(e_rv, "Um_voltage_V"))
+        self.um_neutral_choice = getText(e_rv, "Um_neutral_voltage_choice")
+        self.um_neutral_V = toFloat(getText(e_rv, "Um_neutral_voltage_V"))
+
+        self.connection = getText(e_rv, "vector_group/connection").lower()
+        self.neutral = getText(e_rv, "vector_group/neutral") == "yes"
+        self.displacement = toInt(getText(e_rv, "vector_group/displacement"))
+
+        e_reg = e_rv.find("regulation")
+        if e_reg is None:
+            return
+        if e_reg.get("filling_method", "") == "":
+            # Ancien mode de définition du réglage
+            self.filling_method = "standard"
+            nb_taps = int(e_reg.get("nb_taps"))
+            self.nb_taps_m = int((nb_taps - 1)/2)
+            self.nb_taps_p = nb_taps - self.nb_taps_m - 1
+            self.reg_step_p = float(e_reg.get("tap_step_100-1"))
+            self.reg_step_m = self.reg_step_p
+            self.regulation = nb_taps > 1
+            self.nb_taps = nb_taps
+            self.fillFixedRegulationStep()
+            return
+
+        self.filling_method = e_reg.get("filling_method")
+        self.regulation = e_reg.get("regulation") == "yes"
+        self.nb_taps = toInt(getText(e_reg, "nb_taps"), 1)
+        self.rated_tap = getText(e_reg, "rated_tap")
+        self.nb_taps_p = toInt(getText(e_reg, "nb_taps_p"))
+        self.reg_step_p = toFloat(getText(e_reg, "reg_step_p"), 0.0)
+        self.nb_taps_m = toInt(getText(e_reg, "nb_taps_m"))
+        self.reg_step_m = toFloat(getText(e_reg, "reg_step_m"), 0.0)
+        self.lst_tap = []
+        for e_data in e_reg.iterfind("taps/data"):
+            self.lst_tap.append(Tap(getText(e_data, "tap"), toFloat(getText(e_data, "u_tap_kV")), \
+                                    toFloat(getText(e_data, "s_tap_MVA"))))
+
+    def checkDesign(self):
+        """
+        Vérification de l'enroulement
+        """
+        lst_error = []
+        if fullmatch(REGEXP_NAME, self.name) is None:
+            lst_error.append("Winding name must only have A-Z or a-z or 0-9 or - or _ characters")
+        if not self.power_VA > 0:
+            lst_error.append("Winding rated power value must be strictly positive")
+        if not self.voltage_V > 0:
+            lst_error.append("Winding main voltage value must be strictly positive")
+        if self.um_V is None or not self.um_V > 0:
+            lst_error.append("Winding highest voltage value must be strictly positive")
+        if self.hasNeutralBushing() and (self.um_neutral_V is None or not self.um_neutral_V > 0):
+            lst_error.append("Winding neutral highest voltage value must be strictly positive")
+        if self.reg_step_p < 0 or self.reg_step_m < 0:
+            lst_error.append("Winding regulation step value must be positive")
+
+        return lst_error
+
+class WindingArrangement():
+    """
+    Arrangement (disposition) d'un ou plusieurs enroulements
+    """
+
+    def __init__(self):
+        self.direction = "positive"
+        self.style = "classic"
+        self.lst_winding = []
+
+    def getLstCoilName(self):
+        """
+        Noms des bobines thermiques de l'arrangement (cf. UI_WindingArrangement.updateCoilData)
+        """
+        lst_name = [w.name for w in self.lst_winding]
+        if self.style in ["classic", "middle-entry"]:
+            return lst_name[:1]
+        elif self.style in ["double-classic", "fine-coarse", "one-axial-split", "two-axial-split"]:
+            return ["_".join(lst_name) + "_inner", "_".join(lst_name) + "_outer"]
+        # Shell type : pas de design détaillé
+        return []
+
+    def loadXML(self, e_arr):
+        self.direction = getText(e_arr, "direction", "positive")
+        self.style = getText(e_arr, "style", "classic")
+        self.lst_winding = []
+        for wind_elt in e_arr.iterfind("winding"):
+            w = Winding()
+            w.loadXML(wind_elt)
+            self.lst_winding.append(w)
+
+class CoolingStage():
+    """
+    Stade de réfrigération
+    """
+
+    def __init__(self, num="1", nb_in_operation=None, T_on=None, T_off=None):
+        self.num = num
+        self.nb_in_operation = nb_in_operation
+        self.T_on = T_on
+        self.T_off = T_off
+
+    def loadXML(self, e_std):
+        self.num = e_std.tag[len("std_"):]
+        lst_val = [toFloat(e.text) for e in e_std.iterfind("val")] + [None, None, None]
+        self.nb_in_operation = None if lst_val[0] is None else int(lst_val[0])
+        self.T_on = lst_val[1]
+        self.T_off = lst_val[2]
+
+class Transformer():
+    """
+    Plaque signalétique : données générales, réfrigération, garanties et arrangements
+    """
+
+    def __init__(self):
+        self.reference = ""
+        self.phase_nb = 3
+        self.limbs_nb = 3
+        self.rated_freq_Hz = 50
+        self.design = "core"
+
+        # Réfrigération
+        self.cooling_type = ["O", "N", "A", "N"]
+        self.N_pumps = 0
+        self.oil_pump_unit = "m3/h"
+        self.oil_flow_m3h = 0.0
+        self.N_water_pumps = 0
+        self.water_pump_unit = "m3/h"
+        self.water_flow_m3h = 0.0
+        self.oil_bottom_TR_K = None
+        self.ambient_T_C = None
+        self.coolers_adjustment_method = "fans"
+        self.pump_power_W = None
+        self.fan_power_W = None
+        self.lst_stage_FM = [CoolingStage()]
+        self.N_pumps_FM = 1
+        self.lst_stage_EM = [CoolingStage()]
+        self.N_fans_EM = 1
+
+        # Garanties : éléments tolerance conservés tels quels
+        self.lst_tolerance = []
+
+        self.lst_arrangement = []
+
+    def isMonophase(self):
+        return self.phase_nb == 1
+
+    def isCoreType(self):
+        return self.design == "core"
+
+    def getCoolingMode(self):
+        return getStrCoolingMode(self.cooling_type)
+
+    def getLstWinding(self):
+        return [w for arr in self.lst_arrangement for w in arr.lst_winding]
+
+    def getLstWindingVoltageDescendingNameAlphabetical(self):
+        def tmpFct(w):
+            u = w.getTapVoltage()
+            if u is None:
+                return 0.0
+            return u
+        return list(sorted(self.getLstWinding(), key=lambda w: (-tmpFct(w), w.name)))
+
+    def getWindingReference(self):
+        """
+        Enroulement de référence du couplage (tension la plus haute)
+        """
+        lst_w = self.getLstWindingVoltageDescendingNameAlphabetical()
+        if len(lst_w) == 0:
+            return None
+        return lst_w[0]
+
+    def getVectorGroup(self):
+        """
+        String de représentation du couplage
+        """
+        w_ref = self.getWindingReference()
+        return "".join(getStrVectorGroup(w.connection, w.neutral, w.displacement, w is w_ref) \
+                       for w in self.getLstWindingVoltageDescendingNameAlphabetical())
+
+    def getStudyName(self):
+        """
+        Study name (cf. UI_RatingPlate.updateStudyName)
+        """
+        lst_w = self.getLstWindingVoltageDescendingNameAlphabetical()
+        return getStrStudyName(self.reference, [w.getTapPower() for w in lst_w], [w.getTapVoltage() for w in lst_w], \
+                               [w.getStrRegulation() for w in lst_w], self.getVectorGroup(), self.rated_freq_Hz, \
+                               self.getCoolingMode())
+
+    def getLstCoilName(self):
+        return [name for arr in self.lst_arrangement for name in arr.getLstCoilName()]
+
+    def getCoolersAdjustmentMethod(self):
+        """
+        Mode de pilotage de la réfrigération si ODAF
+        """
+        if self.getCoolingMode() != "ODAF":
+            return None
+        if self.coolers_adjustment_method == "fans":
+            return "fans"
+        return "exchangers"
+
+    def getCoolingStageData(self):
+        """
+        Informations de fonctionnement de la réfrigération (cf. UI_RatingPlate.getCoolingStageData)
+        """
+        cooling_mode = self.getCoolersAdjustmentMethod()
+        if cooling_mode is None:
+            return {}
+
+        dict_coolData = {"cooler_mode": cooling_mode, \
+                         "oil_flow_pump_m3h": self.oil_flow_m3h, \
+                         "power_pump_W": self.pump_power_W if not self.pump_power_W is None else 0, \
+                         "power_fan_W": self.fan_power_W if not self.fan_power_W is None else 0}
+
+        if cooling_mode == "fans":
+            lst_stage = self.lst_stage_FM
+        else:
+            lst_stage = self.lst_stage_EM
+        lst_stage = [s for s in lst_stage if not s.nb_in_operation is None]
+        dict_coolData["nb_in_operation"] = [s.nb_in_operation for s in lst_stage]
+        dict_coolData["T_on"] = [s.T_on for s in lst_stage]
+        dict_coolData["T_off"] = [s.T_off for s in lst_stage]
+        nb_max = max(dict_coolData["nb_in_operation"] + [0])
+        if cooling_mode == "fans":
+            dict_coolData["nb_oil_pump"] = self.N_pumps_FM
+            dict_coolData["nb_air_fan"] = nb_max
+        else:
+            dict_coolData["nb_air_fan"] = self.N_fans_EM
+            dict_coolData["nb_oil_pump"] = nb_max
+
+        return dict_coolData
+
+    def loadXML(self, root):
+        """
+        Chargement à partir de la racine de ratingPlate.xml
+        """
+        self.reference = getText(root, "reference")
+        self.phase_nb = toInt(getText(root, "phase_nb"), 3)
+        self.limbs_nb = toInt(getText(root, "limbs_nb"), 3)
+        self.rated_freq_Hz = toInt(getText(root, "rated_freq_Hz"), 50)
+        self.design = getText(root, "design", "core")
+
+        e_ct = root.find("cooling_type")
+        self.cooling_type = [getText(e_ct, tag) for tag in ["internal_medium", "internal_mode", "external_medium", "external_mode"]]
+
+        e_cool = root.find("cooling")
+        self.N_pumps = toInt(getText(e_cool, "N_pumps"))
+        # Pas de champ oil_pump_unit dans les anciens ttx : m3/h
+        if getText(e_cool, "oil_pump_unit") == "l/s":
+            self.oil_pump_unit = "l/s"
+        else:
+            self.oil_pump_unit = "m3/h"
+        self.oil_flow_m3h = toFloat(getText(e_cool, "oil_pump_m3.h-1"), 0.0)
+        self.N_water_pumps = toInt(getText(e_cool, "N_water_pumps"))
+        self.water_pump_unit = "l/s" if getText(e_cool, "water_pump_unit") == "l/s" else "m3/h"
+        self.water_flow_m3h = toFloat(getText(e_cool, "water_pump_m3.h-1"), 0.0)
+        self.oil_bottom_TR_K = toFloat(getText(e_cool, "oil_bottom_TR_K"))
+        self.ambient_T_C = toFloat(getText(e_cool, "ambient_T_C"))
+
+        # Stades de réfrigération (non présents dans les anciens ttx)
+        if not e_cool is None and not e_cool.find("coolers_adjustment_method") is None:
+            self.coolers_adjustment_method = "fans" if getText(e_cool, "coolers_adjustment_method") == "fans" else "sub-exchangers"
+            self.pump_power_W = toFloat(getText(e_cool, "pump_power_W"))
+            self.fan_power_W = toFloat(getText(e_cool, "fan_power_W"))
+            for tag, attr in [("cooling_stage_FM", "lst_stage_FM"), ("cooling_stage_EM", "lst_stage_EM")]:
+                lst_stage = []
+                for e_std in list(e_cool.find(tag)):
+                    stage = CoolingStage()
+                    stage.loadXML(e_std)
+                    lst_stage.append(stage)
+                setattr(self, attr, lst_stage)
+            self.N_pumps_FM = toInt(getText(e_cool, "N_pumps_FM"), 1)
+            self.N_fans_EM = toInt(getText(e_cool, "N_fans_EM"), 1)
+
+        self.lst_tolerance = list(root.iterfind("tolerance"))
+
+        self.lst_arrangement = []
+        for e_arr in root.iterfind("winding_arrangement"):
+            arr = WindingArrangement()
+            arr.loadXML(e_arr)
+            self.lst_arrangement.append(arr)
+
+    def checkDesign(self):
+        lst_error = []
+        for w in self.getLstWinding():
+            lst_error = lst_error + w.checkDesign()
+        return lst_error
+
+class Cable():
+    """
+    Cable (CTC ou méplat) défini par ses brins
+    """
+
+    def __init__(self, name=""):
+        self.name = name
+        self.type = "Meplat"
+        self.N_strands = 1
+        self.h_strand_m = 0.0
+        self.t_strand_m = 0.0
+        self.type_strandInsulation = "paper"
+        self.t_strandInsulation_m = 0.0
+        self.t_cableInsulation_m = 0.0
+        self.t_pressboard_m = 0.0
+
+    def getCableProperties(self):
+        """
+        Propriétés du cable en mm (même dictionnaire que UI_Cable.getCableProperties), {} si mal défini
+        """
+        return calcCableProperties({"name": self.name, "type": self.type, "N_strands": self.N_strands, \
+                                    "h_strand": self.h_strand_m*1e3, "t_strand": self.t_strand_m*1e3, \
+                                    "type_strandInsulation": self.type_strandInsulation, \
+                                    "t_strandInsulation": self.t_strandInsulation_m*1e3, \
+                                    "t_pressboard": self.t_pressboard_m*1e3, \
+                                    "t_cableInsulation": self.t_cableInsulation_m*1e3})
+
+    def loadXML(self, e_cable):
+        e_cable_cable = e_cable.find("cable")
+        e_cable_strands = e_cable.find("strands")
+        self.name = getText(e_cable, "name")
+        self.type = getText(e_cable, "type")
+        self.N_strands = int(e_cable_strands.get("N_strands"))
+        self.h_strand_m = float(e_cable_strands.get("h_strand_m"))
+        self.t_strand_m = float(e_cable_strands.get("t_strand_m"))
+        self.t_strandInsulation_m = float(e_cable_strands.get("t_insulation_m"))
+        self.type_strandInsulation = "varnish" if e_cable_strands.get("insulation") == "varnish" else "paper"
+        self.t_cableInsulation_m = float(e_cable_cable.get("t_insulation_m"))
+        self.t_pressboard_m = float(e_cable.find("pressboard").get("t_pressboard_m"))
+
+    def checkDesign(self):
+        lst_error = []
+        if fullmatch(REGEXP_NAME, self.name) is None:
+            lst_error.append("Cable name must only have A-Z or a-z or 0-9 or - or _ characters")
+        if not self.h_strand_m > 0:
+            lst_error.append("Strand length value must be strictly positive")
+        if not self.t_strand_m > 0:
+            lst_error.append("Strand width value must be strictly positive")
+        if self.t_strandInsulation_m < 0:
+            lst_error.append("Strand insulation thickness value must be positive")
+        if not self.t_cableInsulation_m > 0:
+            lst_error.append("Paper covering thickness value must be strictly positive")
+        if self.t_pressboard_m < 0:
+            lst_error.append("Cable pressboard thinckness value must be positive")
+        if "CTC" in self.type and self.N_strands%2 == 0:
+            lst_error.append("CTC cable %s must have an odd number of strands"%self.name)
+        return lst_error
+
+class Disc():
+    """
+    Disc : N cables d'un type donné, rattaché à une bobine thermique
+    Les dimensions du cable équivalent sont celles enregistrées par le widget
+    """
+
+    def __init__(self, name=""):
+        self.name = name
+        self.coil = ""
+        self.cable = ""
+        self.N_cables = 1
+        self.t_cable_m = 0.0
+        self.h_cable_m = 0.0
+
+    def loadXML(self, e_disc):
+        self.name = getText(e_disc, "name")
+        self.coil = getText(e_disc, "coil")
+        e_cable = e_disc.find("cable")
+        self.cable = e_cable.get("original", "")
+        self.N_cables = toInt(e_cable.get("N_cables"), 1)
+        self.t_cable_m = toFloat(e_cable.get("t_cable_m"), 0.0)
+        self.h_cable_m = toFloat(e_cable.get("h_cable_m"), 0.0)
+
+    def checkDesign(self):
+        if fullmatch(REGEXP_NAME, self.name) is None:
+            return ["Disc name must only have A-Z or a-z or 0-9 or - or _ characters"]
+        return []
+
+class Coil():
+    """
+    Bobine thermique : dimensions, cales et empilement (ducts verticaux, discs, ducts horizontaux, pressboards)
+    """
+
+    def __init__(self, name=""):
+        self.name = name
+        self.r_inner_m = 0.0
+        self.N_spacers = 0
+        self.w_spacer_m = 0.0
+        self.width_m = None
+        # [{"t_duct_m", "r_center_m"}]
+        self.lst_vduct = []
+        # [{"type", "z_center_m", "oil_guides"}]
+        self.lst_disc = []
+        # [{"t_duct_m", "z_center_m"}]
+        self.lst_hduct = []
+        # [{"t_pressboard_m", "z_center_m", "oil_guides"}]
+        self.lst_pressboard = []
+        # Attributs des éléments res_thermo_K
+        self.lst_res_thermo = []
+        # Empilement XML en cours de lecture (cf. addStackRecord)
+        self.dict_stack_xml = getEmptyStackRecord()
+
+    def getNbreDiscs(self):
+        return len(self.lst_disc)
+
+    def getHeight(self):
+        """
+        Hauteur de l'empilement (m)
+        """
+        lst_z = [(d["z_center_m"], d["t_duct_m"]) for d in self.lst_hduct] + \
+                [(p["z_center_m"], p["t_pressboard_m"]) for p in self.lst_pressboard]
+        if len(lst_z) == 0:
+            return 0.0
+        return max(z + t/2 for z, t in lst_z) - min(z - t/2 for z, t in lst_z)
+
+    def addRecord(self, kind, rec):
+        """
+        Ajout d'un enregistrement lu en flux (cf. DICT_RECORD_COIL)
+        L'empilement est lu comme par les widgets (addStackRecord, longueurs gardées en m) et chargé à la fin de la coil
+        """
+        if addStackRecord(self.dict_stack_xml, kind, rec, 1.0):
+            return
+        if kind == "res_thermo":
+            self.lst_res_thermo.append({k[1:]: v for k, v in rec.items() if k.startswith("@")})
+        elif kind == "coil":
+            self.name = rec.get("name", "")
+            self.r_inner_m = toFloat(rec.get("r_inner_m"), 0.0)
+            self.N_spacers = toInt(rec.get("radial_spacers/N_spacers"))
+            self.w_spacer_m = toFloat(rec.get("radial_spacers/w_spacer_m"), 0.0)
+            self.width_m = toFloat(rec.get("width_m"))
+            self.loadStackRecord(self.dict_stack_xml)
+            self.dict_stack_xml = getEmptyStackRecord()
+
+    def loadStackRecord(self, dict_stack_xml):
+        """
+        Chargement de l'empilement XML lu par addStackRecord (élément par élément ou par blocs), longueurs en m
+        """
+        def getGuides(item):
+            return item["oil_guides"] if item["oil_guides"] != "" else "no"
+
+        self.lst_vduct = [{"t_duct_m": d["t_duct"], "r_center_m": d["r_center"]} for d in dict_stack_xml["vduct"]]
+        self.lst_disc = []
+        self.lst_hduct = [{"t_duct_m": d["t_duct"], "z_center_m": d["z_center"]} for d in dict_stack_xml["hduct"]]
+        self.lst_pressboard = []
+        for item in dict_stack_xml["item"]:
+            if item["item"] == "disc":
+                self.lst_disc.append({"type": item["type"], "z_center_m": item["z_center"], "oil_guides": getGuides(item)})
+            else:
+                self.lst_pressboard.append({"t_pressboard_m": item["t_pressboard"], "z_center_m": item["z_center"], \
+                                            "oil_guides": getGuides(item)})
+
+        # Blocs : motifs répétés empilés à partir de z=0
+        z_top = 0.0
+        for block in dict_stack_xml["block"]:
+            for _ in range(block["repeat"]):
+                for item in block["items"]:
+                    if item["item"] == "disc":
+                        t = item["t_disc"]
+                        self.lst_disc.append({"type": item["type"], "z_center_m": z_top + t/2, "oil_guides": getGuides(item)})
+                    elif item["item"] == "duct":
+                        t = item["t_duct"]
+                        self.lst_hduct.append({"t_duct_m": t, "z_center_m": z_top + t/2})
+                    else:
+                        t = item["t_pressboard"]
+                        self.lst_pressboard.append({"t_pressboard_m": t, "z_center_m": z_top + t/2, "oil_guides": getGuides(item)})
+                    z_top = z_top + t
+
+    def loadStackArrays(self, dict_stack):
+        """
+        Chargement de l'empilement au format colonnaire (cf. gui_geom.Coil.getStackArrays)
+        """
+        self.width_m = float(dict_stack["width_m"][0])
+        self.lst_vduct = [{"t_duct_m": float(t), "r_center_m": float(r)} for t, r in dict_stack["vertical_ducts_m"]]
+        self.lst_disc = []
+        self.lst_hduct = []
+        self.lst_pressboard = []
+        lst_types = [str(t) for t in dict_stack["disc_types"]]
+        for k, kind in enumerate(dict_stack["kind"]):
+            z = float(dict_stack["z_center_m"][k])
+            t = float(dict_stack["thickness_m"][k])
+            guides = LST_GUIDE_NAME[dict_stack["oil_guides"][k]]
+            if kind == ITEM_DISC:
+                self.lst_disc.append({"type": lst_types[dict_stack["disc_type"][k]], "z_center_m": z, "oil_guides": guides})
+            elif kind == ITEM_PRESSBOARD:
+                self.lst_pressboard.append({"t_pressboard_m": t, "z_center_m": z, "oil_guides": guides})
+            else:
+                self.lst_hduct.append({"t_duct_m": t, "z_center_m": z})
+
+    def checkDesign(self, lst_disc_name):
+        lst_error = []
+        if not self.w_spacer_m > 0:
+            lst_error.append("Radial spacer width value must be strictly positive")
+        if not self.r_inner_m > 0:
+            lst_error.append("Winding inner radius value must be strictly positive")
+        for d in self.lst_disc:
+            if not d["type"] in lst_disc_name:
+                lst_error.append("Coil %s uses an undefined disc %s"%(self.name, d["type"]))
+                break
+        return lst_error
+
+class Material():
+    """
+    Propriétés d'un matériau : coefficients des lois en température (attributs a, b, c)
+    """
+
+    def __init__(self, material):
+        self.material = material
+        self.reference = ""
+        # key=propriété (ex : "density_kg.m3-1") ; value={"a": str, "b": str, ...}
+        self.dict_prop = {}
+
+    def getCoefficients(self, prop):
+        """
+        Coefficients de la propriété prop en float ([] si absente)
+        """
+        if not prop in self.dict_prop:
+            return []
+        return [float(self.dict_prop[prop][k]) for k in sorted(self.dict_prop[prop])]
+
+    def loadXML(self, e_mat):
+        self.reference = getText(e_mat, "reference")
+        self.dict_prop = {}
+        for e_prop in e_mat:
+            if e_prop.tag != "reference":
+                self.dict_prop[e_prop.tag] = dict(e_prop.attrib)
+
+class Design():
+    """
+    Design complet d'un fichier .ttx
+    """
+
+    def __init__(self):
+        self.version = MODEL_VERSION
+        self.mode = "DR"
+        self.comments = ""
+
+        self.transformer = Transformer()
+        self.lst_cable = []
+        self.lst_disc = []
+        self.lst_coil = []
+        # key=nom du matériau (oil, copper, paper, varnish, pressboard)
+        self.dict_material = {}
+
+    @classmethod
+    def fromFile(cls, path_open):
+        design = cls()
+        design.loadFile(path_open)
+        return design
+
+    def getCable(self, name):
+        for c in self.lst_cable:
+            if c.name == name:
+                return c
+        return None
+
+    def getCoil(self, name):
+        for c in self.lst_coil:
+            if c.name == name:
+                return c
+        return None
+
+    def loadFile(self, path_open):
+        """
+        Chargement d'un fichier .ttx
+        """
+        with TTXReader(path_open) as ttx:
+            self.loadXML(ttx)
+
+    def loadXML(self, ttx):
+        """
+        Chargement de toutes les parties d'un ttx ouvert (TTXReader)
+        """
+        data = ttx.readBytes("main.xml")
+        if data is None:
+            raise Exception("Fichier %s invalide : main.xml absent"%ttx.path_open)
+        root = fromstring(data)
+        self.version = getText(root, "version", MODEL_VERSION)
+        self.mode = getText(root, "mode", "DR")
+        self.comments = getText(root, "comments")
+
+        data = ttx.readBytes("design/ratingPlate.xml")
+        self.transformer = Transformer()
+        if not data is None:
+            self.transformer.loadXML(fromstring(data))
+
+        data = ttx.readBytes("design/material.xml")
+        self.dict_material = {}
+        if not data is None:
+            for e_mat in fromstring(data):
+                mat = Material(e_mat.tag)
+                mat.loadXML(e_mat)
+                self.dict_material[mat.material] = mat
+
+        data = ttx.readBytes("design/cable.xml")
+        self.lst_cable = []
+        if not data is None:
+            for e_cable in fromstring(data).iterfind("cable"):
+                cable = Cable()
+                cable.loadXML(e_cable)
+                self.lst_cable.append(cable)
+
+        data = ttx.readBytes("design/disc.xml")
+        self.lst_disc = []
+        if not data is None:
+            for e_disc in fromstring(data).iterfind("disc"):
+                disc = Disc()
+                disc.loadXML(e_disc)
+                self.lst_disc.append(disc)
+
+        # coil.xml lu en flux, empilements colonnaires éventuels dans design/coil_*.npz
+        self.lst_coil = []
+        it_record = ttx.readRecords("design/coil.xml", DICT_RECORD_COIL)
+        if not it_record is None:
+            coil = Coil()
+            for kind, rec in it_record:
+                coil.addRecord(kind, rec)
+                if kind == "coil":
+                    if "stack_part" in rec:
+                        dict_stack = ttx.readArrays(rec["stack_part"])
+                        if not dict_stack is None:
+                            coil.loadStackArrays(dict_stack)
+                    self.lst_coil.append(coil)
+                    coil = Coil()
+
+    def checkDesign(self):
+        """
+        Vérification du design : liste d'erreurs à corriger
+        """
+        lst_error = self.transformer.checkDesign()
+
+        lst_name = []
+        for cable in self.lst_cable:
+            lst_error = lst_error + cable.checkDesign()
+            if cable.name in lst_name:
+                lst_error.append("Several cables have the same name")
+            lst_name.append(cable.name)
+
+        lst_name = []
+        lst_coil_name = self.transformer.getLstCoilName()
+        for disc in self.lst_disc:
+            lst_error = lst_error + disc.checkDesign()
+            if disc.name in lst_name:
+                lst_error.append("Several discs have the same name")
+            lst_name.append(disc.name)
+            if self.getCable(disc.cable) is None:
+                lst_error.append("Disc %s uses an undefined cable %s"%(disc.name, disc.cable))
+            if len(lst_coil_name) > 0 and not disc.coil in lst_coil_name:
+                lst_error.append("Disc %s belongs to an undefined coil %s"%(disc.name, disc.coil))
+
+        for coil in self.lst_coil:
+            lst_error = lst_error + coil.checkDesign(lst_name)
+
+        return lst_error
+
+    def getSummary(self):
+        """
+        Résumé du design à plat (export, index)
+        """
+        tr = self.transformer
+        lst_w = tr.getLstWindingVoltageDescendingNameAlphabetical()
+        return {"reference": tr.reference, \
+                "phase_nb": tr.phase_nb, \
+                "rated_freq_Hz": tr.rated_freq_Hz, \
+                "design": tr.design, \
+                "cooling_mode": tr.getCoolingMode(), \
+                "vector_group": tr.getVectorGroup(), \
+                "windings": " / ".join(w.name for w in lst_w), \
+                "power_MVA": " / ".join("%g"%(w.power_VA*1e-6) for w in lst_w), \
+                "voltage_kV": " / ".join("%g"%(w.voltage_V*1e-3) for w in lst_w), \
+                "nb_taps": max([len(w.lst_tap) for w in lst_w] + [0]), \
+                "nb_cables": len(self.lst_cable), \
+                "nb_discs": len(self.lst_disc), \
+                "nb_coils": len(self.lst_coil), \
+                "nb_discs_stacked": sum(c.getNbreDiscs() for c in self.lst_coil)}
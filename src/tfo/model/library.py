@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+import sqlite3
+from os import walk, stat
+from os.path import join, abspath, normcase, commonpath
+from hashlib import blake2b
+from time import perf_counter
+from traceback import format_exc
+from concurrent.futures import ProcessPoolExecutor
+
+from .design import Design
+
+# =============================================================================
+# Bibliothèque de designs : index SQLite des .ttx d'une arborescence
+# Mise à jour incrémentale : un fichier n'est relu que si sa date / taille a changé
+# et que son contenu (hash) est différent ; la lecture est faite dans un pool de processus
+# =============================================================================
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS design (
+    path TEXT PRIMARY KEY,
+    mtime REAL, size INTEGER, hash TEXT,
+    reference TEXT, study_name TEXT,
+    powers_MVA TEXT, voltages_kV TEXT, power_MVA REAL, voltage_kV REAL,
+    vector_group TEXT, freq_Hz INTEGER, cooling_mode TEXT,
+    phase_nb INTEGER, limbs_nb INTEGER, nb_windings INTEGER, nb_discs INTEGER,
+    error TEXT);
+CREATE TABLE IF NOT EXISTS coil (
+    path TEXT, name TEXT, nb_discs INTEGER,
+    PRIMARY KEY (path, name));
+CREATE INDEX IF NOT EXISTS idx_design_power ON design (power_MVA);
+CREATE INDEX IF NOT EXISTS idx_design_voltage ON design (voltage_kV);
+CREATE INDEX IF NOT EXISTS idx_design_reference ON design (reference);
+"""
+
+# Colonnes renvoyées par les requêtes (hors mtime, size, hash)
+LST_COLUMN = ["path", "reference", "study_name", "powers_MVA", "voltages_kV", "power_MVA", "voltage_kV", \
+              "vector_group", "freq_Hz", "cooling_mode", "phase_nb", "limbs_nb", "nb_windings", "nb_discs", "error"]
+
+def hashFile(path):
+    """
+    Empreinte du contenu d'un fichier
+    """
+    h = blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def isInFolder(path, root):
+    """
+    Le chemin path est-il dans l'arborescence root ? (chemins normalisés ; /tmp/lib/ab n'est pas dans /tmp/lib/a)
+    """
+    try:
+        return commonpath([path, root]) == root
+    except ValueError:
+        # Lecteurs différents sous Windows
+        return False
+
+def escapeLike(text):
+    """
+    Texte recherché tel quel dans un LIKE ... ESCAPE '\\' (% et _ ne sont pas des jokers)
+    """
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def indexFile(path, mtime, size, file_hash):
+    """
+    Lecture d'un design (processus du pool) : (ligne de la table design, [(coil, nb discs)])
+    file_hash : empreinte du fichier si elle est déjà connue (sinon calculée ici)
+    Un fichier illisible est indexé avec son message d'erreur pour ne pas être relu à chaque mise à jour
+    """
+    row = {k: None for k in LST_COLUMN}
+    row.update({"path": path, "mtime": mtime, "size": size, "hash": file_hash})
+    try:
+        if file_hash is None:
+            row["hash"] = hashFile(path)
+        design = Design.fromFile(path)
+    except Exception:
+        row["error"] = format_exc().strip().splitlines()[-1]
+        return row, []
+
+    tr = design.transformer
+    lst_w = tr.getLstWindingVoltageDescendingNameAlphabetical()
+    lst_power = [w.getTapPower() or 0.0 for w in lst_w]
+    lst_voltage = [w.getTapVoltage() or 0.0 for w in lst_w]
+    row.update({"reference": tr.reference, "study_name": tr.getStudyName(), \
+                "powers_MVA": "/".join("%g"%p for p in lst_power), "voltages_kV": "/".join("%g"%u for u in lst_voltage), \
+                "power_MVA": max(lst_power + [0.0]), "voltage_kV": max(lst_voltage + [0.0]), \
+                "vector_group": tr.getVectorGroup(), "freq_Hz": tr.rated_freq_Hz, "cooling_mode": tr.getCoolingMode(), \
+                "phase_nb": tr.phase_nb, "limbs_nb": tr.limbs_nb, "nb_windings": len(lst_w), \
+                "nb_discs": sum(c.getNbreDiscs() for c in design.lst_coil)})
+
+    return row, [(c.name, c.getNbreDiscs()) for c in design.lst_coil]
+
+class DesignLibrary():
+    """
+    Index SQLite des designs
+    Une instance par thread (connexion sqlite non partageable)
+    """
+
+    def __init__(self, path_db):
+        self.path_db = path_db
+        self.con = sqlite3.connect(path_db)
+        self.con.row_factory = sqlite3.Row
+        self.con.executescript(SCHEMA)
+
+    def close(self):
+        self.con.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    ### Mise à jour de l'index
+    def update(self, lst_root, nb_workers=None, chunksize=4, callback=None):
+        """
+        Mise à jour de l'index pour les .ttx des dossiers lst_root
+        callback(nb_done, nb_total) : avancement de la relecture des fichiers
+        Renvoie un dict de statistiques (scanned, unchanged, touched, indexed, removed, errors, time_s)
+        """
+        t0 = perf_counter()
+        dict_stat = {"scanned": 0, "unchanged": 0, "touched": 0, "indexed": 0, "removed": 0, "errors": 0}
+
+        # key=chemin ; value=(mtime, size, hash) de l'index
+        dict_known = {}
+        for row in self.con.execute("SELECT path, mtime, size, hash FROM design"):
+            dict_known[row["path"]] = (row["mtime"], row["size"], row["hash"])
+
+        # Parcours de l'arborescence : seules la date et la taille sont lues
+        lst_todo = []
+        lst_touched = []
+        set_seen = set()
+        for root in lst_root:
+            for dirpath, _, lst_file in walk(root):
+                for f in lst_file:
+                    if not f.lower().endswith(".ttx"):
+                        continue
+                    path = normcase(abspath(join(dirpath, f)))
+                    if path in set_seen:
+                        continue
+                    set_seen.add(path)
+                    try:
+                        st = stat(path)
+                    except OSError:
+                        continue
+                    dict_stat["scanned"] += 1
+                    known = dict_known.get(path)
+                    if not known is None and known[0] == st.st_mtime and known[1] == st.st_size:
+                        dict_stat["unchanged"] += 1
+                        continue
+                    if known is None:
+                        # Nouveau fichier : le hash est calculé dans le pool
+                        lst_todo.append((path, st.st_mtime, st.st_size, None))
+                        continue
+                    # Date modifiée : le fichier n'est relu que si son contenu a changé
+                    file_hash = hashFile(path)
+                    if known[2] == file_hash:
+                        lst_touched.append((st.st_mtime, st.st_size, path))
+                        continue
+                    lst_todo.append((path, st.st_mtime, st.st_size, file_hash))
+
+        with self.con:
+            self.con.executemany("UPDATE design SET mtime=?, size=? WHERE path=?", lst_touched)
+            dict_stat["touched"] = len(lst_touched)
+
+            # Fichiers supprimés des dossiers parcourus
+            lst_root_norm = [normcase(abspath(root)) for root in lst_root]
+            lst_removed = [(path,) for path in dict_known if not path in set_seen and \
+                           any(isInFolder(path, root) for root in lst_root_norm)]
+            self.con.executemany("DELETE FROM design WHERE path=?", lst_removed)
+            self.con.executemany("DELETE FROM coil WHERE path=?", lst_removed)
+            dict_stat["removed"] = len(lst_removed)
+
+        # Relecture des fichiers nouveaux ou modifiés
+        if len(lst_todo) > 0:
+            lst_col = ["mtime", "size", "hash"] + LST_COLUMN
+            sql_design = "INSERT OR REPLACE INTO design (%s) VALUES (%s)"%(", ".join(lst_col), ", ".join(["?"]*len(lst_col)))
+            with ProcessPoolExecutor(max_workers=nb_workers) as executor, self.con:
+                for num, (row, lst_coil) in enumerate(executor.map(indexFile, *zip(*lst_todo), chunksize=chunksize)):
+                    self.con.execute(sql_design, [row[k] for k in lst_col])
+                    self.con.execute("DELETE FROM coil WHERE path=?", (row["path"],))
+                    self.con.executemany("INSERT INTO coil (path, name, nb_discs) VALUES (?, ?, ?)", \
+                                         [(row["path"], name, nb) for name, nb in lst_coil])
+                    dict_stat["indexed"] += 1
+                    if not row["error"] is None:
+                        dict_stat["errors"] += 1
+                    if not callback is None:
+                        callback(num + 1, len(lst_todo))
+
+        dict_stat["time_s"] = perf_counter() - t0
+
+        return dict_stat
+
+    ### Requêtes
+    def query(self, text="", power_MVA=None, voltage_kV=None, vector_group="", freq_Hz=None, cooling_mode="", \
+              phase_nb=None, limbs_nb=None, nb_windings=None, tolerance=0.1, limit=500):
+        """
+        Designs correspondant aux critères (liste de dict, colonnes LST_COLUMN + coils)
+        text : contenu dans la référence, la study name ou le chemin
+        power_MVA / voltage_kV : puissance / tension la plus haute à tolerance près (relatif)
+        Les résultats sont triés du plus proche au plus éloigné en puissance et tension
+        """
+        lst_where = ["error IS NULL"]
+        lst_arg = []
+        if text != "":
+            lst_where.append("(reference LIKE ? ESCAPE '\\' OR study_name LIKE ? ESCAPE '\\' OR path LIKE ? ESCAPE '\\')")
+            lst_arg.extend(["%" + escapeLike(text) + "%"]*3)
+        for col, val in [("power_MVA", power_MVA), ("voltage_kV", voltage_kV)]:
+            if not val is None:
+                lst_where.append("%s BETWEEN ? AND ?"%col)
+                lst_arg.extend([val*(1 - tolerance), val*(1 + tolerance)])
+        for col, val in [("vector_group", vector_group), ("cooling_mode", cooling_mode)]:
+            if val != "":
+                lst_where.append("%s = ? COLLATE NOCASE"%col)
+                lst_arg.append(val)
+        for col, val in [("freq_Hz", freq_Hz), ("phase_nb", phase_nb), ("limbs_nb", limbs_nb), ("nb_windings", nb_windings)]:
+            if not val is None:
+                lst_where.append("%s = ?"%col)
+                lst_arg.append(val)
+
+        # Tri suivant la distance relative au design recherché
+        lst_order = []
+        lst_arg_order = []
+        for col, val in [("power_MVA", power_MVA), ("voltage_kV", voltage_kV)]:
+            if not val is None and val > 0:
+                lst_order.append("ABS(%s - ?)/?"%col)
+                lst_arg_order.extend([val, val])
+        sql = "SELECT %s FROM design WHERE %s"%(", ".join(LST_COLUMN), " AND ".join(lst_where))
+        if len(lst_order) > 0:
+            sql = sql + " ORDER BY " + " + ".join(lst_order) + ", reference, path"
+        else:
+            sql = sql + " ORDER BY reference, path"
+        sql = sql + " LIMIT ?"
+
+        lst_res = [dict(row) for row in self.con.execute(sql, lst_arg + lst_arg_order + [limit])]
+        self.addCoils(lst_res)
+
+        return lst_res
+
+    def findSimilar(self, path_ttx, tolerance=0.2, limit=20):
+        """
+        Designs proches du design path_ttx (même couplage, fréquence et nombre de phases)
+        """
+        row, _ = indexFile(path_ttx, 0.0, 0, "")
+        if not row["error"] is None:
+            raise Exception("Lecture du fichier %s impossible : %s"%(path_ttx, row["error"]))
+
+        lst_res = self.query(power_MVA=row["power_MVA"], voltage_kV=row["voltage_kV"], vector_group=row["vector_group"], \
+                             freq_Hz=row["freq_Hz"], phase_nb=row["phase_nb"], tolerance=tolerance, limit=limit + 1)
+
+        return [r for r in lst_res if r["path"] != normcase(abspath(path_ttx))][:limit]
+
+    def addCoils(self, lst_res):
+        """
+        Ajout de la liste des coils [(nom, nb discs)] à chaque résultat
+        """
+        dict_res = {r["path"]: r for r in lst_res}
+        for r in lst_res:
+            r["coils"] = []
+        lst_path = list(dict_res)
+        # Requêtes par paquets (nombre de paramètres sqlite limité)
+        for k in range(0, len(lst_path), 500):
+            lst_tmp = lst_path[k:k + 500]
+            sql = "SELECT path, name, nb_discs FROM coil WHERE path IN (%s) ORDER BY path, name"%", ".join(["?"]*len(lst_tmp))
+            for row in self.con.execute(sql, lst_tmp):
+                dict_res[row["path"]]["coils"].append((row["name"], row["nb_discs"]))
+
+    def getLstValues(self, col):
+        """
+        Valeurs distinctes d'une colonne (listes de choix du dialog)
+        """
+        if not col in LST_COLUMN:
+            raise Exception("Colonne '%s' inconnue"%col)
+        sql = "SELECT DISTINCT %s FROM design WHERE %s IS NOT NULL ORDER BY %s"%(col, col, col)
+        return [row[0] for row in self.con.execute(sql)]
+
+    def count(self):
+        return self.con.execute("SELECT COUNT(*) FROM design").fetchone()[0]
@@ -4,10 +4,21 @@
 
 from PySide6.QtWidgets import QTableView, QAbstractItemView
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QGuiApplication
+from PySide6.QtGui import QGuiApplication, QStandardItemModel
 
 from .GridTableHeaderView import GridTableHeaderView
 
+def indexText(index):
+    """
+    Texte d'une case quel que soit le modèle (QStandardItemModel ou modèle dédié)
+    """
+    if isinstance(index.model(), QStandardItemModel):
+        return index.model().itemFromIndex(index).text()
+    val = index.data(Qt.DisplayRole)
+    if val is None:
+        return ""
+    return "%s"%val
+
 class GridTableView(QTableView):
 
     def __init__(self, parent=None):
@@ -20,9 +31,8 @@ class GridTableView(QTableView):
             if self.editTriggers() == QAbstractItemView.NoEditTriggers:
                 return
             for c in self.selectedIndexes():
-                item = self.model().itemFromIndex(c)
-                if item.isEditable():
-                    item.setText("")
+                if c.flags() & Qt.ItemIsEditable:
+                    self.model().setData(c, "", Qt.EditRole)
 
         # Passage à la ligne inférieure
         elif e.key() in (Qt.Key_Return, Qt.Key_Enter):
@@ -30,7 +40,7 @@ class GridTableView(QTableView):
             nextIndex = current.sibling(current.row() + 1, current.column())
             if nextIndex.isValid():
                 self.setCurrentIndex(nextIndex)
-                if self.model().itemFromIndex(nextIndex).isEditable() and (self.editTriggers() != QAbstractItemView.NoEditTriggers):
+                if (nextIndex.flags() & Qt.ItemIsEditable) and (self.editTriggers() != QAbstractItemView.NoEditTriggers):
                     self.edit(nextIndex)
 
         # Copier
@@ -39,7 +49,7 @@ class GridTableView(QTableView):
             copy_text = ''
             max_column = copied_cells[-1].column()
             for c in copied_cells:
-                copy_text += self.model().itemFromIndex(c).text()
+                copy_text += indexText(c)
                 if c.column() == max_column:
                     copy_text += '\n'
                 else:
@@ -52,14 +62,13 @@ class GridTableView(QTableView):
             copy_text = ''
             max_column = copied_cells[-1].column()
             for c in copied_cells:
-                item = self.model().itemFromIndex(c)
-                copy_text += item.text()
+                copy_text += indexText(c)
                 if c.column() == max_column:
                     copy_text += '\n'
                 else:
                     copy_text += '\t'
-                if item.isEditable() and (self.editTriggers() != QAbstractItemView.NoEditTriggers):
-                    item.setText("")
+                if (c.flags() & Qt.ItemIsEditable) and (self.editTriggers() != QAbstractItemView.NoEditTriggers):
+                    self.model().setData(c, "", Qt.EditRole)
             QGuiApplication.clipboard().setText(copy_text)
 
         # Coller
@@ -78,10 +87,10 @@ class GridTableView(QTableView):
             c = self.currentIndex().column()
             for k_row in range(len(tab)):
                 for k_col in range(len(tab[k_row])):
-                    item = self.model().item(k_row + r, k_col + c)
-                    if item is None:
+                    index = self.model().index(k_row + r, k_col + c)
+                    if not index.isValid():
                         continue
-                    if item.isEditable():
+                    if index.flags() & Qt.ItemIsEditable:
                         txt = tab[k_row][k_col]
                         # On converti les virgules en point si ça donne un float
                         try:
@@ -90,7 +99,7 @@ class GridTableView(QTableView):
                             pass
                         else:
                             txt = txt.replace(",", ".")
-                        item.setText(txt)
+                        self.model().setData(index, txt, Qt.EditRole)
 
         else:
             super().keyPressEvent(e)
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+from math import isnan
+from itertools import count
+
+import numpy
+
+from PySide6.QtCore import Qt, Signal, QAbstractTableModel, QModelIndex
+from PySide6.QtGui import QFont, QBrush
+
+# =============================================================================
+# Modèle du tableau des prises d'un enroulement
+# =============================================================================
+
+# Colonnes : prise, tension (% main voltage), tension (kV), puissance (MVA), courant de ligne (A)
+NB_COL_TAP = 5
+# Colonnes numériques (indice dans le tableau des valeurs = colonne - 1)
+COL_U_PC, COL_U_KV, COL_S_MVA, COL_I_LINE = 1, 2, 3, 4
+# Compteur commun à tous les tableaux : une modification donne un numéro jamais utilisé (cf. UI_RatingPlate.getTapMatrix)
+COUNTER_CHANGE = count()
+
+class TapTableModel(QAbstractTableModel):
+    """
+    Tableau des prises : les valeurs sont stockées en float (NaN si vide) et
+    un dictionnaire donne la ligne d'une prise à partir de son libellé
+    """
+    # Signal à l'édition d'une case par l'utilisateur (ligne, colonne)
+    tapEdited = Signal(int, int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        # Libellés des prises (int, str ou None si non défini)
+        self.lst_tap = []
+        # Valeurs numériques (une ligne par prise, colonnes 1 à 4)
+        self.arr_value = numpy.zeros((0, NB_COL_TAP - 1))
+        # Libellé (str) => première ligne portant ce libellé
+        self.dict_row = {}
+        # Numéro de la dernière modification des libellés ou des valeurs
+        self.nb_change = next(COUNTER_CHANGE)
+
+        # Mise en forme
+        self.isEditable = False
+        self.tap_highlighted = None
+        self.brush_editable = QBrush(Qt.yellow)
+        self.font_bold = QFont()
+        self.font_bold.setBold(True)
+
+    ### Interface Qt
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.lst_tap)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return NB_COL_TAP
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        if index.column() == COL_I_LINE:
+            return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        return Qt.ItemIsEnabled | Qt.ItemIsEditable | Qt.ItemIsSelectable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        col = index.column()
+
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            if col == 0:
+                tap = self.lst_tap[row]
+                return "" if tap is None else tap
+            val = float(self.arr_value[row, col - 1])
+            return "" if isnan(val) else val
+        elif role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        elif role == Qt.BackgroundRole:
+            if self.isEditable and col != COL_I_LINE:
+                return self.brush_editable
+        elif role == Qt.FontRole:
+            if not self.tap_highlighted is None and self.dict_row.get(self.tap_highlighted) == row:
+                return self.font_bold
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        """
+        Edition par l'utilisateur (délégué, copier/coller, suppression)
+        """
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        if index.column() == 0:
+            self.setTap(index.row(), value)
+        else:
+            self.setValue(index.row(), index.column(), value)
+        self.tapEdited.emit(index.row(), index.column())
+        return True
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """
+        Rangement des lignes (numériques avant les libellés, cases vides en fin)
+        """
+        if self.rowCount() < 2:
+            return
+
+        if column == 0:
+            def key(row):
+                tap = self.lst_tap[row]
+                if tap is None:
+                    return (2, 0)
+                if isinstance(tap, str):
+                    return (1, tap)
+                return (0, tap)
+        else:
+            def key(row):
+                val = float(self.arr_value[row, column - 1])
+                return (1, 0.0) if isnan(val) else (0, val)
+        lst_row = sorted(range(self.rowCount()), key=key, reverse=(order == Qt.DescendingOrder))
+        if lst_row == list(range(self.rowCount())):
+            return
+
+        self.layoutAboutToBeChanged.emit()
+        self.lst_tap = [self.lst_tap[row] for row in lst_row]
+        self.arr_value = self.arr_value[lst_row]
+        self.updateDictRow()
+        self.nb_change = next(COUNTER_CHANGE)
+        # Les index persistants (sélection, case courante) suivent les lignes déplacées
+        new_row = numpy.argsort(lst_row)
+        lst_old = self.persistentIndexList()
+        lst_new = [self.index(int(new_row[idx.row()]), idx.column()) for idx in lst_old]
+        self.changePersistentIndexList(lst_old, lst_new)
+        self.layoutChanged.emit()
+
+    ### Modification programmatique (pas de signal tapEdited)
+    def appendTap(self, tap, u_pc, u_kV, s_tap):
+        """
+        Ajout d'une ligne en fin de tableau
+        """
+        row = self.rowCount()
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.lst_tap.append(tap)
+        self.arr_value = numpy.vstack([self.arr_value, [[toFloat(u_pc), toFloat(u_kV), toFloat(s_tap), numpy.nan]]])
+        self.updateDictRow()
+        self.nb_change = next(COUNTER_CHANGE)
+        self.endInsertRows()
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if count <= 0 or row < 0 or row + count > self.rowCount():
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        del self.lst_tap[row:row + count]
+        self.arr_value = numpy.delete(self.arr_value, numpy.s_[row:row + count], axis=0)
+        self.updateDictRow()
+        self.nb_change = next(COUNTER_CHANGE)
+        self.endRemoveRows()
+        return True
+
+    def setTap(self, row, tap):
+        """
+        Libellé de la prise de la ligne (les libellés numériques sont gardés en int)
+        """
+        if isinstance(tap, str):
+            tap = tap.strip()
+            if tap == "":
+                tap = None
+            else:
+                try:
+                    tap = int(tap)
+                except:
+                    pass
+        if tap == self.lst_tap[row] and type(tap) == type(self.lst_tap[row]):
+            return
+        self.lst_tap[row] = tap
+        self.updateDictRow()
+        self.nb_change = next(COUNTER_CHANGE)
+        # Le surlignage dépend des libellés
+        self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, NB_COL_TAP - 1))
+
+    def setValue(self, row, col, value):
+        """
+        Valeur numérique d'une case (NaN si la valeur n'est pas un nombre)
+        """
+        value = toFloat(value)
+        old = self.arr_value[row, col - 1]
+        if value == old or (isnan(value) and isnan(old)):
+            return
+        self.arr_value[row, col - 1] = value
+        self.nb_change = next(COUNTER_CHANGE)
+        self.dataChanged.emit(self.index(row, col), self.index(row, col))
+
+    def setEditable(self, isEditable):
+        """
+        Fond jaune sur les cases éditables
+        """
+        if isEditable == self.isEditable:
+            return
+        self.isEditable = isEditable
+        if self.rowCount() > 0:
+            self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, NB_COL_TAP - 1), [Qt.BackgroundRole])
+
+    def setHighlightedTap(self, tap):
+        """
+        Mise en gras de la première ligne portant le libellé
+        """
+        if tap == self.tap_highlighted:
+            return
+        self.tap_highlighted = tap
+        if self.rowCount() > 0:
+            self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, NB_COL_TAP - 1), [Qt.FontRole])
+
+    def updateDictRow(self):
+        self.dict_row = {}
+        for row, tap in enumerate(self.lst_tap):
+            if not tap is None:
+                self.dict_row.setdefault("%s"%tap, row)
+
+    ### Lecture
+    def getRow(self, tap):
+        """
+        Ligne de la prise (None si le libellé n'existe pas)
+        """
+        return self.dict_row.get(tap)
+
+    def getLstTaps(self):
+        """
+        Liste des libellés des prises (str)
+        """
+        return ["" if tap is None else "%s"%tap for tap in self.lst_tap]
+
+    def getValue(self, row, col):
+        """
+        Valeur d'une case (NaN si vide)
+        """
+        return float(self.arr_value[row, col - 1])
+
+    def getColumn(self, col):
+        """
+        Vue sur une colonne de valeurs
+        """
+        return self.arr_value[:, col - 1]
+
+    def getTapValue(self, tap, col):
+        """
+        Valeur de la colonne pour la prise (None si la prise n'existe pas, 0.0 si la case est vide)
+        """
+        row = self.dict_row.get(tap)
+        if row is None:
+            return None
+        val = float(self.arr_value[row, col - 1])
+        return 0.0 if isnan(val) else val
+
+    def text(self, row, col):
+        """
+        Texte d'une case pour l'enregistrement et les exports
+        repr : écriture la plus courte relue à l'identique (pas de perte de précision au rechargement)
+        """
+        if col == 0:
+            tap = self.lst_tap[row]
+            return "" if tap is None else "%s"%tap
+        val = float(self.arr_value[row, col - 1])
+        return "" if isnan(val) else repr(val)
+
+def toFloat(value):
+    try:
+        return float(value)
+    except:
+        return numpy.nan
@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+import sys
+from os import makedirs, listdir, remove, replace, getpid
+from os.path import join, exists, getmtime, splitext
+from json import dump, load
+from datetime import datetime
+from time import perf_counter
+from functools import partial
+
+from PySide6.QtCore import Signal, QObject, QThread, QTimer, QStandardPaths, QLockFile
+
+from .ttx_archive import TTXSnapshot, lstPartEntries
+
+# =============================================================================
+# Enregistrement automatique en arrière-plan dans un journal de récupération
+# Le thread GUI ne fait que l'instantané des parties modifiées (copie des données de coil.xml,
+# cf. TTXSnapshot.writeState) ; la construction de coil.xml, la sérialisation et la compression
+# sont faites dans un thread
+# =============================================================================
+
+# Codec rapide pour le journal
+AUTOSAVE_CODEC = "deflate:1"
+# Intervalle par défaut (s) et intervalle max en cas d'instantanés trop lents
+AUTOSAVE_INTERVAL = 120
+AUTOSAVE_INTERVAL_MAX = 1800
+# Budget du thread GUI pour un instantané (ms)
+SNAPSHOT_BUDGET_MS = 50.0
+
+def getRecoveryDir():
+    """
+    Dossier des journaux de récupération
+    """
+    path_dir = join(QStandardPaths.writableLocation(QStandardPaths.AppLocalDataLocation), "recovery")
+    if not exists(path_dir):
+        makedirs(path_dir)
+
+    return path_dir
+
+def getLstJournal():
+    """
+    Liste des journaux présents, du plus récent au plus ancien : [(chemin du journal, infos)]
+    """
+    path_dir = getRecoveryDir()
+    lst_journal = []
+    for f in listdir(path_dir):
+        if f.endswith(".ttx") and exists(join(path_dir, splitext(f)[0] + ".json")):
+            try:
+                with open(join(path_dir, splitext(f)[0] + ".json"), "r") as f_json:
+                    info = load(f_json)
+            except:
+                continue
+            lst_journal.append((join(path_dir, f), info))
+
+    return sorted(lst_journal, key=lambda j: getmtime(j[0]), reverse=True)
+
+def isJournalNewer(path_journal, info):
+    """
+    Le journal est-il plus récent que le dernier enregistrement du fichier d'origine ?
+    """
+    if info.get("source") is None or not exists(info["source"]):
+        return True
+
+    return getmtime(path_journal) > getmtime(info["source"])
+
+def getLockPath(path_journal):
+    """
+    Verrou tenu par l'instance propriétaire du journal tant qu'elle tourne
+    """
+    return splitext(path_journal)[0] + ".lock"
+
+def isJournalInUse(path_journal):
+    """
+    Le journal appartient-il à une instance en cours d'exécution ?
+    Le verrou d'un processus terminé (crash) est périmé : il est alors supprimé
+    """
+    if not exists(getLockPath(path_journal)):
+        return False
+    lock = QLockFile(getLockPath(path_journal))
+    # Verrou périmé uniquement si son processus n'existe plus, quel que soit son âge
+    lock.setStaleLockTime(0)
+    if lock.tryLock(0):
+        lock.unlock()
+        return False
+    return True
+
+def removeJournal(path_journal):
+    for path in [path_journal, splitext(path_journal)[0] + ".json"]:
+        if exists(path):
+            try:
+                remove(path)
+            except:
+                pass
+
+class AutosaveWorker(QThread):
+    """
+    Thread de sérialisation / compression / écriture d'un instantané
+    """
+    saved = Signal(object)
+    # (type, valeur, traceback) de l'exception
+    failed = Signal(object)
+
+    def __init__(self, snapshot, path_journal, info):
+        super().__init__()
+
+        self.snapshot = snapshot
+        self.path_journal = path_journal
+        self.info = info
+
+    def run(self):
+        # Ecriture dans des fichiers temporaires puis remplacement : le journal est toujours complet
+        path_tmp = self.path_journal + ".tmp"
+        path_json = splitext(self.path_journal)[0] + ".json"
+        try:
+            dict_bytes = self.snapshot.writeArchive(path_tmp, AUTOSAVE_CODEC)
+            replace(path_tmp, self.path_journal)
+            with open(path_json + ".tmp", "w") as f_json:
+                dump(self.info, f_json)
+            replace(path_json + ".tmp", path_json)
+        except Exception:
+            # Pas de fichier temporaire laissé dans le dossier de récupération
+            for path in [path_tmp, path_json + ".tmp"]:
+                if exists(path):
+                    try:
+                        remove(path)
+                    except:
+                        pass
+            self.failed.emit(sys.exc_info())
+        else:
+            self.saved.emit(dict_bytes)
+
+class TTXAutosave(QObject):
+    """
+    Autosave périodique du design de la fenêtre principale
+    """
+    # Temps de l'instantané sur le thread GUI (ms)
+    snapshotDone = Signal(float)
+
+    def __init__(self, ui_main, interval=AUTOSAVE_INTERVAL, parent=None):
+        super().__init__(parent)
+
+        self.ui_main = ui_main
+        self.interval = interval
+        self.path_journal = join(getRecoveryDir(), "autosave_%i.ttx"%getpid())
+        # Verrou : le journal d'une instance en cours n'est ni proposé ni supprimé par les autres
+        self.lock = QLockFile(getLockPath(self.path_journal))
+        self.lock.setStaleLockTime(0)
+        self.lock.tryLock(0)
+
+        # Contenus sérialisés du dernier journal et parties modifiées depuis
+        self.dict_cache = {}
+        self.set_dirty = set()
+        self.set_pending = set()
+        self.worker = None
+        # Incrémenté à chaque reset : un journal écrit pour un état antérieur est ignoré
+        self.generation = 0
+        # Echec du dernier autosave (l'erreur n'est affichée qu'au premier échec d'une série)
+        self.isFailing = False
+
+        # Mesures des instantanés (ms)
+        self.lst_snapshot_ms = []
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.autosave)
+        self.setInterval(interval)
+
+    def setInterval(self, interval):
+        """
+        Intervalle en s (0 pour désactiver)
+        """
+        self.interval = interval
+        if interval > 0:
+            self.timer.start(int(interval*1000))
+        else:
+            self.timer.stop()
+
+    def getMaxSnapshotTime(self):
+        if len(self.lst_snapshot_ms) == 0:
+            return 0.0
+        return max(self.lst_snapshot_ms)
+
+    def reset(self):
+        """
+        Nouveau design (new / load / save) : le cache n'est plus valable et le journal est obsolète
+        """
+        self.generation = self.generation + 1
+        self.dict_cache = {}
+        self.set_dirty = set()
+        self.set_pending = set()
+        removeJournal(self.path_journal)
+
+    def setPartDirty(self, part):
+        self.set_dirty.add(part)
+
+    def isPartDirty(self, part):
+        """
+        La partie doit-elle être régénérée dans l'instantané ?
+        """
+        if part in self.set_pending:
+            return True
+        # Sinon elle est reprise du cache ou de l'archive ouverte
+        if len(lstPartEntries(self.dict_cache, part)) > 0:
+            return False
+        return self.ui_main.ttx_reader is None
+
+    def copyPart(self, snapshot, part):
+        """
+        Partie non modifiée : reprise du dernier journal ou de l'archive ouverte
+        """
+        lst_name = lstPartEntries(self.dict_cache, part)
+        if len(lst_name) > 0:
+            for name in lst_name:
+                snapshot.writeBytes(name, self.dict_cache[name])
+        else:
+            for name in lstPartEntries(self.ui_main.ttx_reader.lstParts(), part):
+                snapshot.copyFrom(self.ui_main.ttx_reader.path_open, name)
+
+    def autosave(self):
+        """
+        Instantané sur le thread GUI (copie des données) puis construction et écriture du journal dans un thread
+        """
+        # Rien à sauver ou écriture précédente en cours
+        if not self.ui_main.uiChanged:
+            return
+        if not self.worker is None and self.worker.isRunning():
+            return
+
+        t0 = perf_counter()
+        snapshot = TTXSnapshot(self.ui_main.coil_binary, self.ui_main.coil_blocks)
+        self.set_pending = set(self.set_dirty)
+        self.set_dirty = set()
+        self.ui_main.generateParts(snapshot, self.isPartDirty, self.copyPart)
+        snapshot.close()
+        t_snapshot = (perf_counter() - t0)*1e3
+        self.lst_snapshot_ms.append(t_snapshot)
+        self.snapshotDone.emit(t_snapshot)
+
+        # Un instantané trop long gênerait la saisie : on espace les autosaves
+        if t_snapshot > SNAPSHOT_BUDGET_MS and 0 < self.interval < AUTOSAVE_INTERVAL_MAX:
+            self.setInterval(min(2*self.interval, AUTOSAVE_INTERVAL_MAX))
+
+        info = {"source": self.ui_main.curFilePath, "time": datetime.now().isoformat(), "snapshot_ms": t_snapshot}
+        self.worker = AutosaveWorker(snapshot, self.path_journal, info)
+        self.worker.saved.connect(partial(self.updateCache, self.generation))
+        self.worker.failed.connect(partial(self.restoreDirty, self.generation))
+        self.worker.start()
+
+    def updateCache(self, generation, dict_bytes):
+        if generation != self.generation:
+            # Le design a été enregistré ou rechargé pendant l'écriture
+            removeJournal(self.path_journal)
+            return
+        self.dict_cache = dict_bytes
+        self.set_pending = set()
+        self.isFailing = False
+
+    def restoreDirty(self, generation, exc_info):
+        """
+        Echec de l'écriture : les parties seront régénérées au prochain autosave
+        L'erreur passe par le gestionnaire d'exceptions de l'application (fenêtre d'erreur en mode compilé)
+        """
+        if generation == self.generation:
+            self.set_dirty = self.set_dirty | self.set_pending
+        self.set_pending = set()
+        if not self.isFailing:
+            self.isFailing = True
+            sys.excepthook(*exc_info)
+
+    def wait(self):
+        """
+        Attente de la fin de l'écriture en cours
+        """
+        if not self.worker is None:
+            self.worker.wait()
+
+    def stop(self):
+        """
+        Arrêt de l'autosave et suppression du journal (fermeture normale)
+        """
+        self.timer.stop()
+        self.wait()
+        removeJournal(self.path_journal)
+        self.lock.unlock()
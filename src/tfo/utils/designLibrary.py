@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+import sys
+from os import makedirs
+from os.path import join, exists
+
+from PySide6.QtGui import QStandardItemModel, QStandardItem
+from PySide6.QtCore import Qt, Signal, QThread, QSettings, QCoreApplication, QStandardPaths
+from PySide6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QLineEdit, QComboBox, QPushButton, \
+                              QTableView, QAbstractItemView, QListWidget, QFileDialog, QProgressBar, QDialogButtonBox, QHeaderView
+
+from ..model.library import DesignLibrary
+
+# =============================================================================
+# Dialog "Open from library" : recherche dans l'index des designs et ouverture
+# =============================================================================
+
+# Colonnes affichées : (titre, colonne de l'index)
+LST_DISPLAY = [("Reference", "reference"), ("Power (MVA)", "powers_MVA"), ("Voltage (kV)", "voltages_kV"), \
+               ("Vector group", "vector_group"), ("Freq. (Hz)", "freq_Hz"), ("Cooling", "cooling_mode"), \
+               ("Phases", "phase_nb"), ("Limbs", "limbs_nb"), ("Windings", "nb_windings"), ("Coils (discs)", "coils"), \
+               ("File", "path")]
+
+def getLibraryPath():
+    """
+    Fichier de l'index des designs
+    """
+    path_dir = QStandardPaths.writableLocation(QStandardPaths.AppLocalDataLocation)
+    if not exists(path_dir):
+        makedirs(path_dir)
+
+    return join(path_dir, "library.sqlite")
+
+class LibraryUpdateWorker(QThread):
+    """
+    Thread de mise à jour de l'index (la relecture des fichiers est faite dans un pool de processus)
+    """
+    progress = Signal(int, int)
+    updated = Signal(object)
+    failed = Signal(str)
+
+    def __init__(self, path_db, lst_root):
+        super().__init__()
+
+        self.path_db = path_db
+        self.lst_root = lst_root
+
+    def run(self):
+        try:
+            # Connexion propre au thread
+            with DesignLibrary(self.path_db) as lib:
+                dict_stat = lib.update(self.lst_root, callback=self.progress.emit)
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.updated.emit(dict_stat)
+
+class UI_DesignLibrary(QDialog):
+
+    def __init__(self, parent=None, path_db=None):
+        super().__init__(parent)
+
+        self.path_db = path_db if not path_db is None else getLibraryPath()
+        self.library = DesignLibrary(self.path_db)
+        self.worker = None
+        # Chemin du design choisi
+        self.path_selected = None
+
+        self.setup()
+
+    def setup(self):
+
+        # Un titre
+        self.setWindowTitle("Open from library")
+        self.resize(1100, 600)
+
+        # Suppression du bouton "?" dans la barre de titre
+        self.setWindowFlags(self.windowFlags() & ~Qt.WindowContextHelpButtonHint)
+
+        layout = QVBoxLayout(self)
+
+        ### Dossiers indexés
+        layout_folder = QHBoxLayout()
+        self.ui_list_folders = QListWidget()
+        self.ui_list_folders.setMaximumHeight(80)
+        settings = QSettings(QCoreApplication.organizationName(), QCoreApplication.applicationName())
+        self.ui_list_folders.addItems(settings.value("libraryFolders", [], type=list))
+        layout_folder.addWidget(self.ui_list_folders)
+        layout_but = QVBoxLayout()
+        self.ui_but_addFolder = QPushButton("Add folder...")
+        self.ui_but_removeFolder = QPushButton("Remove folder")
+        self.ui_but_update = QPushButton("Update index")
+        for but in [self.ui_but_addFolder, self.ui_but_removeFolder, self.ui_but_update]:
+            layout_but.addWidget(but)
+        layout_folder.addLayout(layout_but)
+        layout.addLayout(layout_folder)
+
+        self.ui_progress = QProgressBar()
+        self.ui_progress.setVisible(False)
+        layout.addWidget(self.ui_progress)
+
+        ### Critères de recherche
+        layout_search = QGridLayout()
+        self.ui_le_text = QLineEdit()
+        self.ui_le_text.setPlaceholderText("reference, study name or file")
+        self.ui_le_power = QLineEdit()
+        self.ui_le_power.setPlaceholderText("MVA")
+        self.ui_le_voltage = QLineEdit()
+        self.ui_le_voltage.setPlaceholderText("kV")
+        self.ui_le_tolerance = QLineEdit("10")
+        self.ui_cb_vectorGroup = QComboBox()
+        self.ui_cb_cooling = QComboBox()
+        self.ui_cb_freq = QComboBox()
+        self.ui_cb_phase = QComboBox()
+        for col, (text, widget) in enumerate([("Search", self.ui_le_text), ("Highest power", self.ui_le_power), \
+                                              ("Highest voltage", self.ui_le_voltage), ("Tolerance (%)", self.ui_le_tolerance), \
+                                              ("Vector group", self.ui_cb_vectorGroup), ("Cooling", self.ui_cb_cooling), \
+                                              ("Frequency", self.ui_cb_freq), ("Phases", self.ui_cb_phase)]):
+            layout_search.addWidget(QLabel(text), 0, col)
+            layout_search.addWidget(widget, 1, col)
+        layout_search.setColumnStretch(0, 3)
+        layout.addLayout(layout_search)
+
+        ### Résultats
+        self.model = QStandardItemModel(0, len(LST_DISPLAY))
+        self.model.setHorizontalHeaderLabels([title for title, _ in LST_DISPLAY])
+        self.ui_tab_results = QTableView()
+        self.ui_tab_results.setModel(self.model)
+        self.ui_tab_results.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.ui_tab_results.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.ui_tab_results.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.ui_tab_results.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.ui_tab_results.horizontalHeader().setStretchLastSection(True)
+        self.ui_tab_results.verticalHeader().setVisible(False)
+        layout.addWidget(self.ui_tab_results)
+
+        self.ui_lbl_status = QLabel()
+        layout.addWidget(self.ui_lbl_status)
+
+        self.ui_buttonBox = QDialogButtonBox(QDialogButtonBox.Open | QDialogButtonBox.Cancel)
+        layout.addWidget(self.ui_buttonBox)
+
+        self.updateChoices()
+        self.search()
+
+        # Connection
+        self.ui_but_addFolder.clicked.connect(self.addFolder)
+        self.ui_but_removeFolder.clicked.connect(self.removeFolder)
+        self.ui_but_update.clicked.connect(self.updateIndex)
+        for le in [self.ui_le_text, self.ui_le_power, self.ui_le_voltage, self.ui_le_tolerance]:
+            le.textChanged.connect(self.search)
+        for cb in [self.ui_cb_vectorGroup, self.ui_cb_cooling, self.ui_cb_freq, self.ui_cb_phase]:
+            cb.currentIndexChanged.connect(self.search)
+        self.ui_tab_results.doubleClicked.connect(self.accept)
+        self.ui_buttonBox.accepted.connect(self.accept)
+        self.ui_buttonBox.rejected.connect(self.reject)
+
+    def getLstFolder(self):
+        return [self.ui_list_folders.item(k).text() for k in range(self.ui_list_folders.count())]
+
+    def saveFolders(self):
+        settings = QSettings(QCoreApplication.organizationName(), QCoreApplication.applicationName())
+        settings.setValue("libraryFolders", self.getLstFolder())
+
+    def addFolder(self):
+        path_dir = QFileDialog.getExistingDirectory(self, "Add a folder to the library")
+        if path_dir != "" and not path_dir in self.getLstFolder():
+            self.ui_list_folders.addItem(path_dir)
+            self.saveFolders()
+            self.updateIndex()
+
+    def removeFolder(self):
+        for item in self.ui_list_folders.selectedItems():
+            self.ui_list_folders.takeItem(self.ui_list_folders.row(item))
+        self.saveFolders()
+
+    def updateChoices(self):
+        """
+        Listes de choix à partir des valeurs présentes dans l'index
+        """
+        for cb, col in [(self.ui_cb_vectorGroup, "vector_group"), (self.ui_cb_cooling, "cooling_mode"), \
+                        (self.ui_cb_freq, "freq_Hz"), (self.ui_cb_phase, "phase_nb")]:
+            cur = cb.currentText()
+            cb.blockSignals(True)
+            cb.clear()
+            cb.addItem("")
+            cb.addItems([str(v) for v in self.library.getLstValues(col)])
+            cb.setCurrentText(cur)
+            cb.blockSignals(False)
+
+    def updateIndex(self):
+        """
+        Mise à jour de l'index en arrière-plan
+        """
+        if not self.worker is None and self.worker.isRunning():
+            return
+        self.ui_but_update.setEnabled(False)
+        self.ui_progress.setVisible(True)
+        self.ui_progress.setRange(0, 0)
+        self.ui_lbl_status.setText("Scanning folders...")
+        self.worker = LibraryUpdateWorker(self.path_db, self.getLstFolder())
+        self.worker.progress.connect(self.updateProgress)
+        self.worker.updated.connect(self.indexUpdated)
+        self.worker.failed.connect(self.indexFailed)
+        self.worker.start()
+
+    def updateProgress(self, nb_done, nb_total):
+        self.ui_progress.setRange(0, nb_total)
+        self.ui_progress.setValue(nb_done)
+        self.ui_lbl_status.setText("Indexing %i/%i files..."%(nb_done, nb_total))
+
+    def indexUpdated(self, dict_stat):
+        self.ui_but_update.setEnabled(True)
+        self.ui_progress.setVisible(False)
+        self.updateChoices()
+        self.search()
+        self.ui_lbl_status.setText("%i files scanned in %.2f s: %i indexed, %i unchanged, %i removed, %i unreadable"% \
+                                   (dict_stat["scanned"], dict_stat["time_s"], dict_stat["indexed"], \
+                                    dict_stat["unchanged"] + dict_stat["touched"], dict_stat["removed"], dict_stat["errors"]))
+
+    def indexFailed(self, msg):
+        self.ui_but_update.setEnabled(True)
+        self.ui_progress.setVisible(False)
+        self.ui_lbl_status.setText("Index update failed: %s"%msg)
+
+    def search(self):
+        """
+        Requête sur l'index à partir des critères saisis
+        """
+        def toFloat(text):
+            try:
+                return float(text)
+            except:
+                return None
+
+        tolerance = toFloat(self.ui_le_tolerance.text())
+        lst_res = self.library.query(text=self.ui_le_text.text().strip(), \
+                                     power_MVA=toFloat(self.ui_le_power.text()), \
+                                     voltage_kV=toFloat(self.ui_le_voltage.text()), \
+                                     vector_group=self.ui_cb_vectorGroup.currentText(), \
+                                     cooling_mode=self.ui_cb_cooling.currentText(), \
+                                     freq_Hz=int(self.ui_cb_freq.currentText()) if self.ui_cb_freq.currentText() != "" else None, \
+                                     phase_nb=int(self.ui_cb_phase.currentText()) if self.ui_cb_phase.currentText() != "" else None, \
+                                     tolerance=tolerance/100 if not tolerance is None else 0.1)
+
+        self.model.removeRows(0, self.model.rowCount())
+        for res in lst_res:
+            lst_item = []
+            for _, col in LST_DISPLAY:
+                if col == "coils":
+                    text = ", ".join("%s (%i)"%(name, nb) for name, nb in res["coils"])
+                else:
+                    text = str(res[col]) if not res[col] is None else ""
+                lst_item.append(QStandardItem(text))
+            lst_item[0].setData(res["path"], Qt.UserRole)
+            lst_item[0].setToolTip(res["study_name"])
+            self.model.appendRow(lst_item)
+
+        self.ui_lbl_status.setText("%i designs found (%i indexed)"%(len(lst_res), self.library.count()))
+
+    def accept(self):
+        lst_index = self.ui_tab_results.selectionModel().selectedRows()
+        if len(lst_index) == 0:
+            return
+        self.path_selected = self.model.item(lst_index[0].row(), 0).data(Qt.UserRole)
+        super().accept()
+
+    def done(self, r):
+        if not self.worker is None:
+            self.worker.wait()
+        self.library.close()
+        super().done(r)
+
+if __name__ == "__main__":
+    from PySide6.QtWidgets import QApplication
+    app = QApplication(sys.argv)
+    app.setOrganizationName("TT")
+    app.setApplicationName("TransfoTron - Design Data")
+
+    win = UI_DesignLibrary()
+    win.show()
+    app.exec()
@@ -2,13 +2,21 @@
 from functools import partial
 from statistics import mean
 from math import pi, acos, sin, cos
-from numpy import array
-
-from PySide6.QtGui import QDoubleValidator, QPen, QFont, QPainterPath, QColor, QPolygonF, QPainter
-from PySide6.QtCore import Qt, Signal, QLocale, QObject, QRectF, QSizeF, QLineF, QPointF
-from PySide6.QtWidgets import QVBoxLayout, QGraphicsItem, QColorDialog, QGraphicsRectItem, QMenu, QLabel, QWidgetAction, QWidget, QHBoxLayout, QGraphicsLineItem, QGraphicsObject
+from time import perf_counter
+from weakref import WeakSet
+from os import makedirs, remove, replace
+from os.path import join, exists
+from numpy import save as saveNpy, load as loadNpy
+from numpy import array, zeros, ones, full, int8, int16, int64, nan, isnan, cumsum, where, flatnonzero, insert, delete, \
+                  concatenate, arange, tile, unique, argsort, atleast_1d, searchsorted, bincount, nansum, linspace, interp, split
+
+from PySide6.QtGui import QDoubleValidator, QPen, QFont, QPainterPath, QColor, QPolygonF, QPainter, QKeySequence, QUndoStack, QUndoCommand, QBrush, QPixmapCache
+from PySide6.QtCore import Qt, Signal, QLocale, QObject, QRectF, QSizeF, QLineF, QPointF, QSettings, QCoreApplication
+from PySide6.QtWidgets import QVBoxLayout, QGraphicsItem, QColorDialog, QGraphicsRectItem, QMenu, QLabel, QWidgetAction, QWidget, QHBoxLayout, QGraphicsLineItem, QGraphicsObject, \
+                              QStyleOptionGraphicsItem, QInputDialog, QToolTip
 
 from . import gui_utils
+from ..model.design import addXMLTreeStack, ITEM_DISC, ITEM_DUCT, ITEM_PRESSBOARD, GUIDE_NO, GUIDE_INNER, GUIDE_OUTER, LST_GUIDE_NAME
 
 ### Couleurs
 # Non défini
@@ -43,6 +51,28 @@ def getPseudoRandomColor(text,thickness):
     color = QColor.fromRgb(R,G,B)
     return color
 
+def getColorMap(nb):
+    """
+    Echelle de nb couleurs interpolées entre bleu, cyan, vert, jaune et rouge (valeurs croissantes)
+    """
+    x = linspace(0.0, 1.0, nb)
+    xp = [0.0, 0.25, 0.5, 0.75, 1.0]
+    R = interp(x, xp, [0, 0, 0, 255, 255])
+    G = interp(x, xp, [0, 255, 255, 255, 0])
+    B = interp(x, xp, [255, 255, 0, 0, 0])
+    return [QColor(int(r), int(g), int(b)) for r, g, b in zip(R, G, B)]
+
+### Superposition des résultats sur la bobine
+# Echelle précalculée : les éléments ne portent que leur indice dans la table
+LST_COLOR_HEAT = getColorMap(256)
+# Grandeurs : key=nom ; value=(libellé, unité) ; les canaux sont toujours colorés par la vitesse moyenne
+DICT_OVERLAY = {"maxTR": ("Max. temperature rise", "K"), "averageTR": ("Average temperature rise", "K"), \
+                "loss_density": ("Loss density", "W/m3"), "averageVelocity": ("Average velocity", "m/s")}
+LST_OVERLAY_DISC = ["maxTR", "averageTR", "loss_density"]
+
+### Nombre de modifications annulables par bobine par défaut (réglage "coilUndoLimit", 0 : pas de limite)
+UNDO_LIMIT = 100
+
 COLOR_currentHue = 0.0
 def getRandomColor():
     """
@@ -53,13 +83,683 @@ def getRandomColor():
     COLOR_currentHue = (COLOR_currentHue + 0.618033988749895) % 1.0
     return color
 
-
 # =============================================================================
 # Classes pour les représentations graphiques
 # =============================================================================
+def getDiffRange(lst_a, lst_b):
+    """
+    Zone différente entre deux suites de tableaux de même structure (plus grands préfixe et suffixe communs)
+    Renvoie (début, fin dans a, fin dans b)
+    """
+    nb_a = lst_a[0].shape[0]
+    nb_b = lst_b[0].shape[0]
+    nb = min(nb_a, nb_b)
+
+    # Préfixe commun
+    diff = zeros(nb, dtype=bool)
+    for a, b in zip(lst_a, lst_b):
+        diff = diff | (a[:nb] != b[:nb])
+    k_start = int(diff.argmax()) if diff.any() else nb
+
+    # Suffixe commun (sans recouvrir le préfixe)
+    diff = zeros(nb, dtype=bool)
+    for a, b in zip(lst_a, lst_b):
+        diff = diff | (a[nb_a - nb:][::-1] != b[nb_b - nb:][::-1])
+    nb_suffix = min(int(diff.argmax()) if diff.any() else nb, nb - k_start)
+
+    return k_start, nb_a - nb_suffix, nb_b - nb_suffix
+
+def spliceRanges(arr, lst_range, lst_part, axis=0):
+    """
+    Tableau arr dont les zones [k_start, k_end[ de lst_range (croissantes, disjointes) suivant axis sont remplacées par lst_part
+    Modifié sur place si aucune zone ne change de longueur, sinon une seule nouvelle allocation
+    """
+    before = (slice(None),)*axis
+    if all(k_end - k_start == part.shape[axis] for (k_start, k_end), part in zip(lst_range, lst_part)):
+        for (k_start, k_end), part in zip(lst_range, lst_part):
+            arr[before + (slice(k_start, k_end),)] = part
+        return arr
+
+    lst_seg = []
+    k_prev = 0
+    for (k_start, k_end), part in zip(lst_range, lst_part):
+        lst_seg.extend([arr[before + (slice(k_prev, k_start),)], part])
+        k_prev = k_end
+    lst_seg.append(arr[before + (slice(k_prev, None),)])
+    return concatenate(lst_seg, axis=axis)
+
+class CoilResults():
+    """
+    Résultats des calculs sur les éléments d'un empilement : un tableau par grandeur, axe 0 = calcul, axe 1 = élément
+    Chaque calcul occupe une ligne (slot) réutilisable : ajout et suppression d'un calcul sans recopie des autres
+    averageTR, maxTR, averageVelocity : NaN si pas de valeur
+    loss_W : pertes par cable (calcul x élément x cable) ; loss_n : nombre de cables (-1 si pas de pertes)
+    """
+    LST_SCALAR = ["averageTR", "maxTR", "averageVelocity"]
+    LST_NAME = LST_SCALAR + ["loss_W", "loss_n"]
+
+    def __init__(self, nb_item=0):
+        self.nb_item = nb_item
+        # key=id_calcul ; value=ligne des tableaux
+        self.dict_slot = {}
+        self.lst_free = []
+        self.dict_arr = self.getEmptyArrays(0)
+
+    def getEmptyArrays(self, nb_slot, nb_cable=0):
+        dict_arr = {name: full((nb_slot, self.nb_item), nan) for name in self.LST_SCALAR}
+        dict_arr["loss_W"] = full((nb_slot, self.nb_item, nb_cable), nan)
+        dict_arr["loss_n"] = full((nb_slot, self.nb_item), -1, dtype=int16)
+        return dict_arr
+
+    def copy(self):
+        results = CoilResults(self.nb_item)
+        results.dict_slot = dict(self.dict_slot)
+        results.lst_free = list(self.lst_free)
+        results.dict_arr = {name: arr.copy() for name, arr in self.dict_arr.items()}
+        return results
+
+    def getIds(self):
+        return list(self.dict_slot)
+
+    ### Calculs (axe 0)
+    def getSlot(self, id_calcul, isCreated=False):
+        """
+        Ligne du calcul id_calcul, créée si besoin avec isCreated (None sinon)
+        La capacité est doublée quand toutes les lignes sont occupées
+        """
+        if id_calcul in self.dict_slot:
+            return self.dict_slot[id_calcul]
+        if not isCreated:
+            return None
+
+        if len(self.lst_free) == 0:
+            nb_slot = self.dict_arr["loss_n"].shape[0]
+            nb_new = max(nb_slot, 1)
+            dict_new = self.getEmptyArrays(nb_new, self.dict_arr["loss_W"].shape[2])
+            for name in self.LST_NAME:
+                self.dict_arr[name] = concatenate([self.dict_arr[name], dict_new[name]])
+            self.lst_free = list(range(nb_slot + nb_new - 1, nb_slot - 1, -1))
+        slot = self.lst_free.pop()
+        self.dict_slot[id_calcul] = slot
+        return slot
+
+    def resetSlot(self, slot, lst_name=None):
+        for name in self.LST_NAME if lst_name is None else lst_name:
+            self.dict_arr[name][slot] = -1 if name == "loss_n" else nan
+
+    def removeCalcul(self, id_calcul):
+        """
+        Suppression d'un calcul : sa ligne est libérée pour un prochain calcul
+        """
+        slot = self.dict_slot.pop(id_calcul, None)
+        if not slot is None:
+            self.resetSlot(slot)
+            self.lst_free.append(slot)
+
+    ### Eléments (axe 1)
+    def insertItems(self, index):
+        for name in self.LST_NAME:
+            self.dict_arr[name] = insert(self.dict_arr[name], index, -1 if name == "loss_n" else nan, axis=1)
+        self.nb_item = self.dict_arr["loss_n"].shape[1]
+
+    def removeItems(self, lst_index):
+        for name in self.LST_NAME:
+            self.dict_arr[name] = delete(self.dict_arr[name], lst_index, axis=1)
+        self.nb_item = self.dict_arr["loss_n"].shape[1]
+
+    def takeItems(self, order, is_copy=None):
+        for name in self.LST_NAME:
+            arr = self.dict_arr[name][:, order]
+            if not is_copy is None:
+                arr[:, is_copy] = -1 if name == "loss_n" else nan
+            self.dict_arr[name] = arr
+        self.nb_item = self.dict_arr["loss_n"].shape[1]
+
+    def hasSameLayout(self, other):
+        """
+        Mêmes calculs sur les mêmes lignes et même nombre de cables que other (résultats comparables élément par élément)
+        """
+        return self.dict_slot == other.dict_slot and \
+               all(self.dict_arr[name].shape[::2] == other.dict_arr[name].shape[::2] for name in self.LST_NAME)
+
+    def getColumns(self):
+        """
+        Résultats élément par élément sous forme de tableaux 1D (flottants vus en entiers : NaN égal à NaN), cf. getDiffRange
+        """
+        lst_col = []
+        for slot in self.dict_slot.values():
+            for name in self.LST_NAME:
+                arr = self.dict_arr[name][slot]
+                lst_col.extend(arr.T if arr.ndim == 2 else [arr])
+        return [col.view(int64) if col.dtype == float else col for col in lst_col]
+
+    def getItems(self, lst_index):
+        """
+        Copie des résultats des éléments lst_index : {id_calcul: {grandeur: tableau}}, cf. replaceRanges et setItems
+        """
+        return {i: {name: self.dict_arr[name][slot, lst_index] for name in self.LST_NAME} for i, slot in self.dict_slot.items()}
+
+    def setItems(self, lst_index, dict_part):
+        """
+        Remise des résultats dict_part (cf. getItems) sur les éléments lst_index
+        """
+        for i, dict_val in dict_part.items():
+            if i in self.dict_slot:
+                for name in self.LST_NAME:
+                    arr = self.dict_arr[name]
+                    val = dict_val[name]
+                    if name == "loss_W":
+                        if arr.shape[2] < val.shape[1]:
+                            arr = concatenate([arr, full(arr.shape[:2] + (val.shape[1] - arr.shape[2],), nan)], axis=2)
+                            self.dict_arr[name] = arr
+                        arr[self.dict_slot[i], lst_index, :] = nan
+                        arr[self.dict_slot[i], lst_index, :val.shape[1]] = val
+                    else:
+                        arr[self.dict_slot[i], lst_index] = val
+
+    def replaceRanges(self, lst_range, lst_nb, lst_part):
+        """
+        Remplacement sur place des éléments [k_start, k_end[ de chaque zone de lst_range par lst_nb éléments de résultats lst_part
+        (cf. getItems) ; les calculs absents d'une partie n'ont pas de valeur sur ses éléments
+        """
+        nb_cable = max([self.dict_arr["loss_W"].shape[2]] + [p["loss_W"].shape[1] for part in lst_part for p in part.values()])
+        if self.dict_arr["loss_W"].shape[2] < nb_cable:
+            arr = self.dict_arr["loss_W"]
+            self.dict_arr["loss_W"] = concatenate([arr, full(arr.shape[:2] + (nb_cable - arr.shape[2],), nan)], axis=2)
+        nb_slot = self.dict_arr["loss_n"].shape[0]
+        for name in self.LST_NAME:
+            arr = self.dict_arr[name]
+            fill = -1 if name == "loss_n" else nan
+            lst_new = []
+            for nb, part in zip(lst_nb, lst_part):
+                arr_part = full((nb_slot, nb) + arr.shape[2:], fill, dtype=arr.dtype)
+                for i, dict_val in part.items():
+                    if i in self.dict_slot:
+                        val = dict_val[name]
+                        if name == "loss_W":
+                            arr_part[self.dict_slot[i], :, :val.shape[1]] = val
+                        else:
+                            arr_part[self.dict_slot[i]] = val
+                lst_new.append(arr_part)
+            self.dict_arr[name] = spliceRanges(arr, lst_range, lst_new, axis=1)
+        self.nb_item = self.dict_arr["loss_n"].shape[1]
+
+    ### Valeurs
+    def getValue(self, id_calcul, name, index):
+        """
+        Valeur d'une grandeur scalaire d'un élément, None si absente
+        """
+        slot = self.getSlot(id_calcul)
+        if slot is None:
+            return None
+        val = self.dict_arr[name][slot, index]
+        if isnan(val):
+            return None
+        return float(val)
+
+    def setValue(self, id_calcul, name, index, value):
+        # Ligne créée avant d'accéder au tableau (getSlot peut l'agrandir)
+        slot = self.getSlot(id_calcul, True)
+        self.dict_arr[name][slot, index] = value
+
+    def getLossCable(self, id_calcul, index):
+        slot = self.getSlot(id_calcul)
+        if slot is None:
+            return None
+        nb = self.dict_arr["loss_n"][slot, index]
+        if nb < 0:
+            return None
+        return [float(l) for l in self.dict_arr["loss_W"][slot, index, :nb]]
+
+    def getLossArray(self, id_calcul, lst_index, nb_cable):
+        slot = self.getSlot(id_calcul)
+        if slot is None:
+            return None
+        loss_W = self.dict_arr["loss_W"][slot, lst_index, :nb_cable]
+        if loss_W.shape[1] < nb_cable:
+            loss_W = concatenate([loss_W, full((loss_W.shape[0], nb_cable - loss_W.shape[1]), nan)], axis=1)
+        return loss_W
+
+    def setLossArray(self, id_calcul, lst_index, loss_W, loss_n):
+        slot = self.getSlot(id_calcul, True)
+        nb_cable = self.dict_arr["loss_W"].shape[2]
+        if nb_cable < loss_W.shape[1]:
+            # Elargissement au nombre de cables
+            self.dict_arr["loss_W"] = concatenate([self.dict_arr["loss_W"], \
+                                                   full(self.dict_arr["loss_n"].shape + (loss_W.shape[1] - nb_cable,), nan)], axis=2)
+        self.dict_arr["loss_W"][slot, lst_index, :] = nan
+        self.dict_arr["loss_W"][slot, lst_index, :loss_W.shape[1]] = loss_W
+        self.dict_arr["loss_n"][slot, lst_index] = loss_n
+
+    def clearItem(self, id_calcul, index):
+        """
+        Effacement des résultats d'un calcul (de tous si id_calcul est None) pour un élément
+        """
+        lst_slot = list(self.dict_slot.values()) if id_calcul is None else [self.getSlot(id_calcul)]
+        for slot in lst_slot:
+            if not slot is None:
+                for name in self.LST_NAME:
+                    self.dict_arr[name][slot, index] = -1 if name == "loss_n" else nan
+
+    def removeResult(self, id_calcul=None, lst_name=None):
+        """
+        Suppression des résultats d'un calcul (de tous si id_calcul est None), éventuellement limitée aux grandeurs lst_name
+        """
+        for i in self.getIds() if id_calcul is None else [id_calcul]:
+            if lst_name is None:
+                self.removeCalcul(i)
+            elif i in self.dict_slot:
+                self.resetSlot(self.dict_slot[i], lst_name)
+
+    ### Comparaison entre calculs
+    def getArray(self, name, lst_id=None):
+        """
+        Tableau de la grandeur name pour les calculs lst_id (tous par défaut), axe 0 = calcul
+        """
+        if lst_id is None:
+            lst_id = self.getIds()
+        return self.dict_arr[name][[self.dict_slot[i] for i in lst_id]]
+
+    def getDifference(self, name, id_a, id_b):
+        """
+        Ecart de la grandeur name entre les calculs id_a et id_b pour chaque élément (NaN si absente de l'un des deux)
+        """
+        return self.dict_arr[name][self.dict_slot[id_a]] - self.dict_arr[name][self.dict_slot[id_b]]
+
+    def getMaxDifference(self, name, id_a, id_b):
+        """
+        Plus grand écart en valeur absolue de la grandeur name entre deux calculs : (écart, indice de l'élément)
+        (None, None) si aucun élément n'a de valeur dans les deux calculs
+        """
+        diff = abs(self.getDifference(name, id_a, id_b)).reshape(self.nb_item, -1)
+        diff = where(isnan(diff), -1.0, diff).max(axis=1, initial=-1.0)
+        if diff.shape[0] == 0 or diff.max() < 0:
+            return None, None
+        k = int(diff.argmax())
+        return float(diff[k]), k
+
+    ### Persistance
+    def getArrays(self):
+        """
+        Tableaux des calculs (dans l'ordre de getIds) pour écriture (cf. TTXWriter.writeArrays ou saveArrays)
+        """
+        dict_arr = {"id_calcul": array([str(i) for i in self.getIds()], dtype=str)}
+        for name in self.LST_NAME:
+            dict_arr[name] = self.getArray(name)
+        return dict_arr
+
+    def setArrays(self, dict_arr):
+        """
+        Remplacement de tous les résultats par ceux de dict_arr (cf. getArrays), les tableaux sont utilisés tels quels
+        """
+        if dict_arr["loss_n"].shape[1] != self.nb_item:
+            raise Exception("Incoherence entre les resultats et le nombre d'elements")
+        self.dict_slot = {str(i): k for k, i in enumerate(dict_arr["id_calcul"].tolist())}
+        self.lst_free = []
+        self.dict_arr = {name: dict_arr[name] for name in self.LST_NAME}
+
+    def saveArrays(self, path_dir):
+        """
+        Ecriture d'un fichier .npy par grandeur dans le dossier path_dir (à côté du ttx)
+        Chaque fichier est écrit à part puis remplace l'ancien : les tableaux projetés depuis ce dossier restent valides
+        """
+        if not exists(path_dir):
+            makedirs(path_dir)
+        for name, arr in self.getArrays().items():
+            path_npy = join(path_dir, name + ".npy")
+            with open(path_npy + ".tmp", "wb") as f:
+                saveNpy(f, arr, allow_pickle=False)
+            replace(path_npy + ".tmp", path_npy)
+
+    @staticmethod
+    def loadArrays(path_dir, mmap_mode="c"):
+        """
+        Lecture des fichiers .npy du dossier path_dir, projetés en mémoire (copie à l'écriture par défaut)
+        None si le dossier ne contient pas de résultats
+        """
+        if not exists(join(path_dir, "id_calcul.npy")):
+            return None
+        return {name: loadNpy(join(path_dir, name + ".npy"), mmap_mode=mmap_mode, allow_pickle=False) \
+                for name in ["id_calcul"] + CoilResults.LST_NAME}
+
+    @staticmethod
+    def removeArrays(path_dir):
+        """
+        Suppression des fichiers .npy écrits par saveArrays dans le dossier path_dir
+        """
+        for name in ["id_calcul"] + CoilResults.LST_NAME:
+            if exists(join(path_dir, name + ".npy")):
+                remove(join(path_dir, name + ".npy"))
+
+class CoilStack():
+    """
+    Empilement de la partie centrale d'une bobine, du bas vers le haut, sous forme de tableaux (longueurs en mm)
+    Les éléments graphiques (Disc, Duct, Pressboard) ne sont que des vues sur un indice de ces tableaux
+    """
+
+    def __init__(self):
+        self.kind = zeros(0, dtype=int8)
+        # Epaisseur suivant z et largeur radiale
+        self.thickness = zeros(0)
+        self.height = zeros(0)
+        # Indice du type de disc dans Coil.lst_type_ui (-1 si pas un disc)
+        self.disc_type = zeros(0, dtype=int16)
+        self.guides = zeros(0, dtype=int8)
+
+        # Résultats des calculs, cf. CoilResults
+        self.results = CoilResults()
+        # Indice de chaque élément dans l'empilement copié (-1 si ajouté depuis), None si inconnu, cf. copy
+        self.origin = None
+
+    def __len__(self):
+        return self.kind.shape[0]
+
+    def copy(self):
+        stack = CoilStack()
+        stack.kind = self.kind.copy()
+        stack.thickness = self.thickness.copy()
+        stack.height = self.height.copy()
+        stack.disc_type = self.disc_type.copy()
+        stack.guides = self.guides.copy()
+        stack.results = self.results.copy()
+        stack.origin = arange(len(self))
+        return stack
+
+    def getArrays(self):
+        return [self.kind, self.thickness, self.height, self.disc_type, self.guides]
+
+    def getDiffRange(self, other):
+        """
+        Zone modifiée entre cet empilement et other, cf. getDiffRange
+        """
+        return getDiffRange(self.getArrays(), other.getArrays())
+
+    def getColumns(self):
+        """
+        Tableaux et résultats élément par élément, pour repérer les éléments modifiés entre deux empilements
+        """
+        return self.getArrays() + self.results.getColumns()
+
+    def getItems(self, lst_index):
+        """
+        Copie des éléments lst_index (tableaux et résultats), cf. replaceRanges et setItemsAt
+        """
+        return {"arrays": [arr[lst_index] for arr in self.getArrays()], "results": self.results.getItems(lst_index)}
+
+    def setItemsAt(self, lst_index, part):
+        """
+        Les éléments lst_index reprennent les valeurs part (cf. getItems)
+        """
+        for arr, arr_part in zip(self.getArrays(), part["arrays"]):
+            arr[lst_index] = arr_part
+        self.results.setItems(lst_index, part["results"])
+
+    def replaceRanges(self, lst_range, lst_part, results=None):
+        """
+        Remplacement sur place des éléments [k_start, k_end[ de chaque zone de lst_range (croissantes, disjointes) par lst_part (cf. getItems)
+        results : résultats de tout l'empilement s'ils ne sont pas comparables élément par élément (cf. CoilResults.hasSameLayout)
+        """
+        self.kind, self.thickness, self.height, self.disc_type, self.guides = \
+            [spliceRanges(arr, lst_range, [part["arrays"][k] for part in lst_part]) for k, arr in enumerate(self.getArrays())]
+        if results is None:
+            self.results.replaceRanges(lst_range, [part["arrays"][0].shape[0] for part in lst_part], [part["results"] for part in lst_part])
+        else:
+            self.results = results.copy()
+        self.origin = None
+
+    def getZCenter(self):
+        """
+        Cotes des centres des éléments (somme cumulée des épaisseurs), 0 en bas du premier élément
+        """
+        return cumsum(self.thickness) - self.thickness/2
+
+    def getTotalThickness(self):
+        return float(self.thickness.sum())
+
+    def getIndex(self, kind):
+        return flatnonzero(self.kind == kind)
+
+    def getDiscNumber(self):
+        """
+        Numéro de chaque disc en partant du bas (à partir de 1), 0 pour les autres éléments
+        """
+        is_disc = self.kind == ITEM_DISC
+        return where(is_disc, cumsum(is_disc), 0)
+
+    def setItems(self, kind, thickness, height, disc_type, guides):
+        """
+        Remplacement de tout l'empilement (les résultats sont perdus)
+        """
+        self.kind = array(kind, dtype=int8)
+        self.thickness = array(thickness, dtype=float)
+        self.height = array(height, dtype=float)
+        self.disc_type = array(disc_type, dtype=int16)
+        self.guides = array(guides, dtype=int8)
+        self.results = CoilResults(len(self))
+        self.origin = None
+
+    def insertItems(self, index, kind, thickness, height, disc_type=-1, guides=GUIDE_NO):
+        """
+        Insertion d'éléments avant les indices index (cf. numpy.insert : plusieurs éléments au même indice gardent leur ordre)
+        """
+        kind = atleast_1d(kind)
+        index = atleast_1d(index)
+        if index.shape[0] == 1:
+            index = full(kind.shape[0], index[0])
+        self.kind = insert(self.kind, index, kind)
+        self.thickness = insert(self.thickness, index, thickness)
+        self.height = insert(self.height, index, height)
+        self.disc_type = insert(self.disc_type, index, disc_type)
+        self.guides = insert(self.guides, index, guides)
+        self.results.insertItems(index)
+        if not self.origin is None:
+            self.origin = insert(self.origin, index, -1)
+
+    def removeItems(self, lst_index):
+        self.kind = delete(self.kind, lst_index)
+        self.thickness = delete(self.thickness, lst_index)
+        self.height = delete(self.height, lst_index)
+        self.disc_type = delete(self.disc_type, lst_index)
+        self.guides = delete(self.guides, lst_index)
+        self.results.removeItems(lst_index)
+        if not self.origin is None:
+            self.origin = delete(self.origin, lst_index)
+
+    def takeItems(self, order, is_copy=None):
+        """
+        Réorganisation des éléments suivant order (un élément peut être dupliqué)
+        is_copy : éléments nouvellement créés, sans résultats
+        """
+        self.kind = self.kind[order]
+        self.thickness = self.thickness[order]
+        self.height = self.height[order]
+        self.disc_type = self.disc_type[order]
+        self.guides = self.guides[order]
+        self.results.takeItems(order, is_copy)
+        if not self.origin is None:
+            self.origin = self.origin[order]
+            if not is_copy is None:
+                self.origin[is_copy] = -1
+
+    ### Blocs
+    def getBlocks(self):
+        """
+        Découpage run-length de l'empilement en blocs
+        Un motif commence par un disc et va jusqu'au disc suivant (les éléments sous le premier disc forment un motif à part),
+        un bloc est une suite de motifs identiques
+        Renvoie les tableaux (indice de début, nombre d'éléments du motif, nombre de répétitions) des blocs
+        """
+        nb = len(self)
+        if nb == 0:
+            return zeros(0, dtype=int), zeros(0, dtype=int), zeros(0, dtype=int)
+
+        # Début et longueur des motifs
+        is_start = self.kind == ITEM_DISC
+        is_start[0] = True
+        unit_start = flatnonzero(is_start)
+        unit_len = concatenate([unit_start[1:], [nb]]) - unit_start
+
+        # Un motif est identique au précédent s'il a la même longueur et les mêmes éléments (décalés d'une longueur)
+        unit = cumsum(is_start) - 1
+        k_prev = arange(nb) - unit_len[unit]
+        isDiff = k_prev < 0
+        k_prev[isDiff] = 0
+        for arr in self.getArrays():
+            isDiff = isDiff | (arr != arr[k_prev])
+        nb_diff = bincount(unit, weights=isDiff, minlength=unit_start.shape[0])
+        isSame = concatenate([[False], (unit_len[1:] == unit_len[:-1]) & (nb_diff[1:] == 0)])
+
+        block_unit = flatnonzero(~isSame)
+        repeat = concatenate([block_unit[1:], [unit_start.shape[0]]]) - block_unit
+        return unit_start[block_unit], unit_len[block_unit], repeat
+
+    def getBlockOf(self, index):
+        """
+        Bloc contenant l'élément index : (indice de début, nombre d'éléments du motif, nombre de répétitions)
+        """
+        lst_start, lst_len, lst_repeat = self.getBlocks()
+        b = int(searchsorted(lst_start, index, side="right")) - 1
+        return int(lst_start[b]), int(lst_len[b]), int(lst_repeat[b])
+
+    def setBlockRepeat(self, index, repeat):
+        """
+        Nombre de répétitions du bloc contenant l'élément index (les nouveaux motifs sont sans résultats)
+        """
+        start, nb_item, old_repeat = self.getBlockOf(index)
+        k_keep = start + nb_item*min(repeat, old_repeat)
+        order = concatenate([arange(k_keep), tile(arange(start, start + nb_item), max(repeat - old_repeat, 0)), \
+                             arange(start + nb_item*old_repeat, len(self))])
+        is_copy = zeros(order.shape[0], dtype=bool)
+        is_copy[k_keep:start + nb_item*repeat] = True
+        self.takeItems(order, is_copy)
+
+    ### Résultats (cf. CoilResults)
+    def getResult(self, id_calcul, name, index):
+        """
+        Valeur d'une grandeur scalaire (averageTR, maxTR, averageVelocity) d'un élément, None si absente
+        """
+        return self.results.getValue(id_calcul, name, index)
+
+    def setResult(self, id_calcul, name, index, value):
+        self.results.setValue(id_calcul, name, index, value)
+
+    def getLossCable(self, id_calcul, index):
+        """
+        Pertes par cable (W) d'un élément, None si pas de pertes
+        """
+        return self.results.getLossCable(id_calcul, index)
+
+    def setLossCable(self, id_calcul, index, lst_loss):
+        self.setLossArray(id_calcul, [index], array(lst_loss, dtype=float).reshape(1, -1), [len(lst_loss)])
+
+    def getLossArray(self, id_calcul, lst_index, nb_cable):
+        """
+        Pertes par cable (W) des éléments lst_index sur nb_cable colonnes (NaN sans pertes), None si aucune perte
+        """
+        return self.results.getLossArray(id_calcul, lst_index, nb_cable)
+
+    def setLossArray(self, id_calcul, lst_index, loss_W, loss_n):
+        """
+        Pertes par cable (W) des éléments lst_index en une opération
+        loss_W : tableau élément x cable (NaN au-delà du nombre de cables), loss_n : nombre de cables (-1 pour effacer)
+        """
+        self.results.setLossArray(id_calcul, lst_index, loss_W, loss_n)
+
+    def clearResult(self, id_calcul, index):
+        """
+        Effacement des résultats d'un calcul (de tous si id_calcul est None) pour un élément
+        """
+        self.results.clearItem(id_calcul, index)
+
+    def removeResult(self, id_calcul=None, lst_name=None):
+        """
+        Suppression des résultats d'un calcul (de tous si id_calcul est None), éventuellement limitée aux grandeurs lst_name
+        """
+        self.results.removeResult(id_calcul, lst_name)
+
+class CoilEditCommand(QUndoCommand):
+    """
+    Modification de l'empilement d'une bobine pour la pile d'annulation (cf. Coil.pushEdit)
+    Seules les zones modifiées sont mémorisées, avant et après, avec les canaux verticaux et le nombre de discs :
+    zones entre les éléments conservés non modifiés si leur ordre est inchangé (cf. CoilStack.origin),
+    sinon zone entre les plus grands préfixe et suffixe communs
+    L'annulation et le rétablissement remplacent ces zones sur place dans l'empilement de la bobine
+    """
+
+    def __init__(self, coil, text, stack, nb_disc=None):
+        super().__init__(text)
+
+        self.coil = coil
+        old = coil.stack
+        # Calculs différents : les résultats ne sont pas comparables élément par élément et sont mémorisés entiers
+        if old.results.hasSameLayout(stack.results):
+            self.results_old = None
+            self.results_new = None
+            lst_col_old = old.getColumns()
+            lst_col_new = stack.getColumns()
+        else:
+            self.results_old = old.results.copy()
+            self.results_new = stack.results.copy()
+            lst_col_old = old.getArrays()
+            lst_col_new = stack.getArrays()
+
+        # Zones modifiées (début avant, fin avant, début après, fin après)
+        origin = stack.origin
+        kept_new = flatnonzero(origin >= 0) if not origin is None else zeros(0, dtype=int)
+        kept_old = origin[kept_new] if not origin is None else zeros(0, dtype=int)
+        if not origin is None and (kept_old < len(old)).all() and (kept_old[1:] > kept_old[:-1]).all():
+            # Ancres : éléments conservés et non modifiés, les zones sont entre deux ancres consécutives
+            same = ones(kept_new.shape[0], dtype=bool)
+            for a, b in zip(lst_col_old, lst_col_new):
+                same = same & (a[kept_old] == b[kept_new])
+            anchor_old = concatenate([[-1], kept_old[same], [len(old)]])
+            anchor_new = concatenate([[-1], kept_new[same], [len(stack)]])
+            gap = flatnonzero((anchor_old[1:] - anchor_old[:-1] > 1) | (anchor_new[1:] - anchor_new[:-1] > 1))
+            self.lst_hunk = list(zip((anchor_old[gap] + 1).tolist(), anchor_old[gap + 1].tolist(), \
+                                     (anchor_new[gap] + 1).tolist(), anchor_new[gap + 1].tolist()))
+        else:
+            k_start, old_end, new_end = getDiffRange(lst_col_old, lst_col_new)
+            self.lst_hunk = [(k_start, old_end, k_start, new_end)] if k_start != old_end or k_start != new_end else []
+
+        # Eléments des zones sans les résultats s'ils sont mémorisés entiers
+        self.lst_part_old = []
+        self.lst_part_new = []
+        for old_start, old_end, new_start, new_end in self.lst_hunk:
+            for lst_part, st, k_start, k_end in [(self.lst_part_old, old, old_start, old_end), (self.lst_part_new, stack, new_start, new_end)]:
+                part = st.getItems(arange(k_start, k_end))
+                if not self.results_new is None:
+                    part["results"] = {}
+                lst_part.append(part)
+
+        # Canaux verticaux lors du dernier affichage (les actions peuvent les avoir déjà modifiés)
+        self.vertical_old = (coil.view["inner_t"], coil.view["outer_t"])
+        self.vertical_new = (coil.inner_duct.thickness, coil.outer_duct.thickness)
+        self.nb_disc_old = coil.nb_disc
+        self.nb_disc_new = coil.nb_disc if nb_disc is None else nb_disc
+
+        # Empilement construit par l'action, appliqué tel quel lors de l'ajout à la pile
+        self.stack = stack
+
+        # Rien de modifié : la commande sera retirée de la pile après son application
+        if len(self.lst_hunk) == 0 and self.results_new is None and self.vertical_old == self.vertical_new \
+           and self.nb_disc_old == self.nb_disc_new:
+            self.setObsolete(True)
+
+    def redo(self):
+        stack = self.stack
+        self.stack = None
+        self.coil.applyEdit(self.lst_hunk, self.lst_part_new, self.results_new, self.vertical_new, self.nb_disc_new, stack)
+
+    def undo(self):
+        lst_hunk = [(new_start, new_end, old_start, old_end) for old_start, old_end, new_start, new_end in self.lst_hunk]
+        self.coil.applyEdit(lst_hunk, self.lst_part_old, self.results_old, self.vertical_old, self.nb_disc_old)
+
 class Coil(QObject):
     """
     Classe gérant la représentation graphique d'une bobine
+    L'empilement est stocké dans self.stack (CoilStack) et self.view contient les tableaux affichés lors du
+    dernier updateCoil ; toute la partie centrale est dessinée par un seul élément graphique (CoilRenderer)
+    self.lst_center contient des vues (Disc, Duct, Pressboard) sur chaque indice de l'empilement
     """
 
     # Signal quand la bobine est mise à jour
@@ -67,6 +767,8 @@ class Coil(QObject):
     coilUpdated = Signal()
     # Signal quand la bobine est modifiée par l'utilisateur (non programmatiquement)
     isModified = Signal()
+    # Signal quand la liste des calculs chargés change
+    calculsChanged = Signal()
 
     def __init__(self, scene_coil, scene_lgd, ui_coil):
         super().__init__()
@@ -80,11 +782,26 @@ class Coil(QObject):
         self.lst_ui_disc = []
         self.isFrozen = False
 
-        # Listes d'éléments graphiques empilés du bas vers le haut
+        # Empilement et vues correspondantes (du bas vers le haut)
         self.inner_duct = None
+        self.stack = CoilStack()
         self.lst_center = []
         self.outer_duct = None
-
+        self.view = self.getEmptyView()
+        self.renderer = None
+        # Visibilité par type d'élément
+        self.dict_visible = {ITEM_DISC: True, ITEM_DUCT: True, ITEM_PRESSBOARD: True}
+        # Eléments sélectionnés (indices de self.view) et zone de sélection en cours (rubber band)
+        self.selection = zeros(0, dtype=bool)
+        self.rect_band = None
+
+        # Types de disc utilisés par l'empilement (indices de stack.disc_type) et leurs descriptions
+        self.lst_type_ui = []
+        self.lst_type_desc = []
+
+        # Compteurs de la légende, tenus à jour à chaque modification de l'empilement (cf. applyStack)
+        # key=("disc", id du type) ou ("duct"/"pressboard", épaisseur) ou ("guide", None) ; value=nombre
+        self.dict_count = {}
         self.legend = None
 
         # Données
@@ -93,9 +810,22 @@ class Coil(QObject):
         self.dict_colorPressboard = {}
         self.disc_width = 1.0
         self.ep_duct_defaut = 1.0
+        self.font_disc = QFont()
 
         # Liste des calculs chargés
         self.lst_calcul_loaded = []
+        # Volumes de cuivre par type de disc et par cable : (clé de validité, tableau), cf. getCopperVolumeTable
+        self.cache_copper = None
+        # Résultats superposés : (id_calcul, grandeur) ou None, indice dans LST_COLOR_HEAT par élément (-1 sans valeur)
+        # et bornes de l'échelle par grandeur, cf. updateOverlay
+        self.overlay = None
+        self.overlay_index = zeros(0, dtype=int16)
+        self.overlay_range = {}
+
+        # Modifications annulables de l'empilement, cf. pushEdit
+        self.undoStack = QUndoStack(self)
+        settings = QSettings(QCoreApplication.organizationName(), QCoreApplication.applicationName())
+        self.undoStack.setUndoLimit(settings.value("coilUndoLimit", UNDO_LIMIT, type=int))
 
         # Connection
         self.ui_coil.ui_chk_discs.stateChanged.connect(self.updateCoil)
@@ -107,6 +837,16 @@ class Coil(QObject):
         self.ui_coil.ui_btn_symBT.clicked.connect(self.isModified.emit)
         self.ui_coil.ui_btn_symTB.clicked.connect(self.isModified.emit)
 
+        # Sélection par zone sur les vues de la scène
+        for v in self.scene_coil.views():
+            v.rubberBandChanged.connect(self.rubberBandChanged)
+
+    def getEmptyView(self):
+        return {"kind": zeros(0, dtype=int8), "x": zeros(0), "y": zeros(0), "z_top": zeros(0), "z_bottom": zeros(0), \
+                "disc_index": zeros(0, dtype=int), "thickness": zeros(0), \
+                "height": zeros(0), "guides": zeros(0, dtype=int8), "type": zeros(0, dtype=int16), \
+                "number": zeros(0, dtype=int16), "inner_t": 0.0, "outer_t": 0.0, "type_desc": []}
+
     def freezeDesign(self, isFrozen):
         """
         Action lors du (dé)gelage du design
@@ -128,6 +868,7 @@ class Coil(QObject):
 
         if add:
             self.lst_calcul_loaded.append(dico_param)
+            self.calculsChanged.emit()
 
     def removeLoadedCalcul(self, id_calcul=None):
         """
@@ -149,8 +890,8 @@ class Coil(QObject):
                 del self.lst_calcul_loaded[k_delete]
 
         # Et des éléments
-        for dd in self.lst_center:
-            dd.removeLoadedCalcul(id_calcul)
+        self.stack.removeResult(id_calcul)
+        self.calculsChanged.emit()
 
     def addUIDisc(self, ui_disc):
         """
@@ -164,6 +905,38 @@ class Coil(QObject):
         """
         self.lst_ui_disc.remove(ui_disc)
 
+    def getTypeId(self, ui_disc):
+        """
+        Indice du type de disc ui_disc dans l'empilement (ajouté si besoin)
+        """
+        for k, ui in enumerate(self.lst_type_ui):
+            if ui is ui_disc:
+                return k
+        self.lst_type_ui.append(ui_disc)
+        self.lst_type_desc.append(ui_disc.getDisc())
+        return len(self.lst_type_ui) - 1
+
+    def updateDiscTypes(self, stack=None):
+        """
+        MAJ des descriptions des types de disc et des dimensions des discs de chaque type (de stack, par défaut self.stack)
+        Renvoie False si une description utilisée est invalide (la bobine est alors réinitialisée)
+        """
+        self.lst_type_desc = [ui.getDisc() if ui in self.lst_ui_disc else {} for ui in self.lst_type_ui]
+
+        if stack is None:
+            stack = self.stack
+        is_disc = stack.kind == ITEM_DISC
+        for t_id in unique(stack.disc_type[is_disc]):
+            desc = self.lst_type_desc[t_id]
+            if desc == {}:
+                self.resetAll()
+                return False
+            mask = is_disc & (stack.disc_type == t_id)
+            stack.thickness[mask] = desc["t_cable"]
+            stack.height[mask] = desc["N_cables"]*desc["h_cable"]
+
+        return True
+
     def updateDiscCalculation(self):
         """
         MAJ du calcul des dimensions des discs
@@ -176,14 +949,25 @@ class Coil(QObject):
         """
         Reset des infos de la bobine (en cas d'erreur de définition)
         """
-
-        while len(self.lst_center) > 0:
-            self.scene_coil.removeItem(self.lst_center.pop(0))
-        self.scene_coil.removeItem(self.inner_duct)
+        self.lst_center = []
+        self.stack = CoilStack()
+        self.dict_count = {}
+        self.view = self.getEmptyView()
+        self.selection = zeros(0, dtype=bool)
+        self.overlay_index = zeros(0, dtype=int16)
+        self.overlay_range = {}
+        self.undoStack.clear()
+        if not self.renderer is None:
+            self.scene_coil.removeItem(self.renderer)
+        self.renderer = None
+        if not self.inner_duct is None:
+            self.scene_coil.removeItem(self.inner_duct)
         self.inner_duct = None
-        self.scene_coil.removeItem(self.outer_duct)
+        if not self.outer_duct is None:
+            self.scene_coil.removeItem(self.outer_duct)
         self.outer_duct = None
-        self.scene_coil.removeItem(self.legend)
+        if not self.legend is None:
+            self.scene_lgd.removeItem(self.legend)
         self.legend = None
 
     def setDiscNumber(self, nb_disc):
@@ -217,15 +1001,12 @@ class Coil(QObject):
             lst_tmp_cable_thick.append(d.getDisc()["t_cable"])
         self.ep_duct_defaut = round(mean(lst_tmp_cable_thick)/2, 1)
 
-        if len(self.lst_center) == 0:
+        if len(self.stack) == 0:
             # 1er affichage
             self.buildCoil()
         else:
-            # MAJ des données de la coil
             self.updateCoilData()
 
-        self.updateCoil()
-
     def buildCoil(self):
         """
         Construction initiale de la bobine à partir des données
@@ -238,329 +1019,286 @@ class Coil(QObject):
         self.dict_colorDuct[self.ep_duct_defaut] = COLOR_oil
         self.dict_colorPressboard[self.ep_duct_defaut] = COLOR_pressboard
 
-        ### Partie centrale
-        # Canal du bas
-        tmp = Duct(self)
-        tmp.setSize(self.disc_width, self.ep_duct_defaut)
-        tmp.setFlag(QGraphicsItem.ItemIsSelectable, True)
-        tmp.setZValue(1)
-        self.scene_coil.addItem(tmp)
-        self.lst_center.append(tmp)
-
-        # Disques + canaux supérieurs
-        for k in range(self.nb_disc):
-            # Disque
-            tmp = Disc(self)
-            tmp.setDisc(self.lst_ui_disc[0])
-            tmp.setInnerDuctThickness(self.ep_duct_defaut)
-            tmp.setOuterDuctThickness(self.ep_duct_defaut)
-            tmp.setFlag(QGraphicsItem.ItemIsSelectable, True)
-            tmp.setZValue(2)
-            self.scene_coil.addItem(tmp)
-            self.lst_center.append(tmp)
-
-            # Canal supérieur
-            tmp = Duct(self)
-            tmp.setSize(self.disc_width, self.ep_duct_defaut)
-            tmp.setFlag(QGraphicsItem.ItemIsSelectable, True)
-            tmp.setZValue(1)
-            self.scene_coil.addItem(tmp)
-            self.lst_center.append(tmp)
+        ### Partie centrale : canal du bas puis disques + canaux supérieurs
+        self.lst_type_ui = []
+        self.lst_type_desc = []
+        id0 = self.getTypeId(self.lst_ui_disc[0])
+        nb_item = 2*self.nb_disc + 1
+        kind = full(nb_item, ITEM_DUCT, dtype=int8)
+        kind[1::2] = ITEM_DISC
+        disc_type = where(kind == ITEM_DISC, id0, -1)
+        stack = CoilStack()
+        stack.setItems(kind, full(nb_item, self.ep_duct_defaut), full(nb_item, self.disc_width), disc_type, zeros(nb_item))
+        self.updateDiscTypes(stack)
+
+        # Rendu de la partie centrale
+        self.renderer = CoilRenderer(self)
+        self.renderer.setZValue(1)
+        self.scene_coil.addItem(self.renderer)
 
         ### Canaux verticaux
-        # Calcul de la hauteur de la partie centrale
-        tmp_height = 0.0
-        for k in self.lst_center:
-            tmp_height = tmp_height + k.thickness
+        # Hauteur de la partie centrale
+        tmp_height = stack.getTotalThickness()
 
         # Canal intérieur
-        self.inner_duct = Duct(self)
+        self.inner_duct = VerticalDuct(self)
         self.inner_duct.setSize(tmp_height, self.ep_duct_defaut)
-        self.inner_duct.rotate(False)
         self.inner_duct.setFlag(QGraphicsItem.ItemIsSelectable, True)
         self.inner_duct.setZValue(0)
         self.scene_coil.addItem(self.inner_duct)
 
         # Canal extérieur
-        self.outer_duct = Duct(self)
+        self.outer_duct = VerticalDuct(self)
         self.outer_duct.setSize(tmp_height, self.ep_duct_defaut)
-        self.outer_duct.rotate(False)
         self.outer_duct.setFlag(QGraphicsItem.ItemIsSelectable, True)
         self.outer_duct.setZValue(0)
         self.scene_coil.addItem(self.outer_duct)
 
+        self.applyStack(stack)
+
     def updateCoilData(self):
         """
         Mise à jour suite à chgt du nb_disc et/ou de lst_ui_disc
+        Renvoie False si la bobine a dû être réinitialisée
         """
-        # Parcours des éléments centraux
-        num_disc = 1
-        virer = False
-
-        k = 0
-        while k < len(self.lst_center):
-
-            if isinstance(self.lst_center[k], Disc):
-                if num_disc > self.nb_disc:
-                    virer = True
-                num_disc = num_disc + 1
-
-                if not self.lst_center[k].ui_disc in self.lst_ui_disc:
-                    # Si la description du disc n'existe plus -> disc[0] + MAJ
-                    self.lst_center[k].setDisc(self.lst_ui_disc[0])
-                else:
-                    # Mise à jour du disc existant
-                    self.lst_center[k].updateDisc()
-
-            if isinstance(self.lst_center[k], Duct):
-                # MAJ taille du duct
-                self.lst_center[k].setSize(self.disc_width, None)
-
-            if isinstance(self.lst_center[k], Pressboard):
-                # MAJ taille du pressboard
-                self.lst_center[k].setSize(self.disc_width, None)
-
-            if virer:
-                self.scene_coil.removeItem(self.lst_center.pop(k))
-            else:
-                k = k + 1
-
-        # Ajout de disc s'il en manque
-        for k in range(self.nb_disc - num_disc + 1):
-            # Disque
-            tmp = Disc(self)
-            tmp.setDisc(self.lst_ui_disc[0])
-            tmp.setInnerDuctThickness(self.inner_duct.thickness)
-            tmp.setOuterDuctThickness(self.outer_duct.thickness)
-            tmp.setFlag(QGraphicsItem.ItemIsSelectable, True)
-            tmp.setZValue(2)
-            self.scene_coil.addItem(tmp)
-            self.lst_center.append(tmp)
-
-            # Canal supérieur
-            tmp = Duct(self)
-            tmp.setSize(self.disc_width, self.ep_duct_defaut)
-            tmp.setFlag(QGraphicsItem.ItemIsSelectable, True)
-            tmp.setZValue(1)
-            self.scene_coil.addItem(tmp)
-            self.lst_center.append(tmp)
+        stack = self.stack.copy()
+
+        # Les discs dont la description n'existe plus passent sur la première description
+        id0 = self.getTypeId(self.lst_ui_disc[0])
+        for t_id, ui_disc in enumerate(self.lst_type_ui):
+            if not ui_disc in self.lst_ui_disc:
+                stack.disc_type[stack.disc_type == t_id] = id0
+
+        # Dimensions des discs
+        if not self.updateDiscTypes(stack):
+            return False
+
+        # Largeur des canaux et des cartons
+        stack.height[stack.kind != ITEM_DISC] = self.disc_width
+
+        # Discs en trop : suppression à partir du (nb_disc+1)ème disc
+        idx_disc = stack.getIndex(ITEM_DISC)
+        if len(idx_disc) > self.nb_disc:
+            stack.removeItems(arange(idx_disc[self.nb_disc], len(stack)))
+
+        # Ajout de disc (+ canal supérieur) s'il en manque
+        nb_add = self.nb_disc - len(idx_disc)
+        if nb_add > 0:
+            desc0 = self.lst_type_desc[id0]
+            kind = tile(array([ITEM_DISC, ITEM_DUCT], dtype=int8), nb_add)
+            stack.insertItems(len(stack), kind, \
+                              where(kind == ITEM_DISC, desc0["t_cable"], self.ep_duct_defaut), \
+                              where(kind == ITEM_DISC, desc0["N_cables"]*desc0["h_cable"], self.disc_width), \
+                              where(kind == ITEM_DISC, id0, -1), GUIDE_NO)
+
+        self.applyStack(stack)
+        return True
 
     def symmetryCoil(self, sensSym):
         """
         Symétrie des éléments de la bobine selon le sens indiqué
         Le milieu est donné par le disque milieu
         """
-        num_disc_milieu = int(self.nb_disc/2)
-        num_disc = 1
-        virer = False
-        virerNext = False
-
-        if sensSym == "BT":
-            # Sens bas -> haut
-            # Suppression des éléments supérieurs
-            k = 0
-            while k < len(self.lst_center):
-
-                if isinstance(self.lst_center[k], Disc):
-                    if num_disc > num_disc_milieu:
-                        virer = True
-                    num_disc = num_disc + 1
-
-                if virer and self.nb_disc%2 == 0 or virerNext and self.nb_disc%2 == 1:
-                    self.scene_coil.removeItem(self.lst_center.pop(k))
-                else:
-                    k = k + 1
+        if len(self.stack) == 0:
+            return
 
-                if virer:
-                    virerNext = True
-
-            # Ajout des éléments par symétrie
-            for d in list(reversed(self.lst_center))[1:]:
-                if isinstance(d, Disc):
-                    tmp = Disc(self)
-                    tmp.setDisc(d.ui_disc)
-                    tmp.setInnerDuctThickness(d.inner_duct_thickness)
-                    tmp.setOuterDuctThickness(d.outer_duct_thickness)
-                    tmp.setInnerGuide(d.inner_guide)
-                    tmp.setOuterGuide(d.outer_guide)
-                    tmp.setFlag(QGraphicsItem.ItemIsSelectable, True)
-                    tmp.setZValue(2)
-                    self.scene_coil.addItem(tmp)
-                    self.lst_center.append(tmp)
-
-                elif isinstance(d, Duct):
-                    tmp = Duct(self)
-                    tmp.setSize(d.height, d.thickness)
-                    tmp.setFlag(QGraphicsItem.ItemIsSelectable, True)
-                    tmp.setZValue(1)
-                    self.scene_coil.addItem(tmp)
-                    self.lst_center.append(tmp)
-
-                elif isinstance(d, Pressboard):
-                    tmp = Pressboard(self)
-                    tmp.setSize(d.height, d.thickness)
-                    tmp.setInnerDuctThickness(d.inner_duct_thickness)
-                    tmp.setOuterDuctThickness(d.outer_duct_thickness)
-                    tmp.setInnerGuide(d.inner_guide)
-                    tmp.setOuterGuide(d.outer_guide)
-                    tmp.setFlag(QGraphicsItem.ItemIsSelectable, True)
-                    tmp.setZValue(2)
-                    self.scene_coil.addItem(tmp)
-                    self.lst_center.append(tmp)
+        num_disc_milieu = int(self.nb_disc/2)
 
-                else:
-                    raise Exception("Objet inconnu")
-        else:
-            # Sens haut -> bas
-            # Suppression des éléments inférieurs
-            lst_a_virer = []
-            k = len(self.lst_center)-1
-            while k >= 0:
-
-                if isinstance(self.lst_center[k], Disc):
-                    if num_disc > num_disc_milieu:
-                        virer = True
-                    num_disc = num_disc + 1
-
-                if virer and self.nb_disc%2 == 0 or virerNext and self.nb_disc%2 == 1:
-                    lst_a_virer.append(self.lst_center[k])
-                k = k - 1
-
-                if virer:
-                    virerNext = True
-
-            # On vire
-            for d in lst_a_virer:
-                self.lst_center.remove(d)
-                self.scene_coil.removeItem(d)
-
-            # Ajout des éléments par symétrie
-            for d in list(self.lst_center)[1:]:
-                if isinstance(d, Disc):
-                    tmp = Disc(self)
-                    tmp.setDisc(d.ui_disc)
-                    tmp.setInnerDuctThickness(d.inner_duct_thickness)
-                    tmp.setOuterDuctThickness(d.outer_duct_thickness)
-                    tmp.setInnerGuide(d.inner_guide)
-                    tmp.setOuterGuide(d.outer_guide)
-                    tmp.setFlag(QGraphicsItem.ItemIsSelectable, True)
-                    tmp.setZValue(2)
-                    self.scene_coil.addItem(tmp)
-                    self.lst_center.insert(0, tmp)
-
-                elif isinstance(d, Duct):
-                    tmp = Duct(self)
-                    tmp.setSize(d.height, d.thickness)
-                    tmp.setFlag(QGraphicsItem.ItemIsSelectable, True)
-                    tmp.setZValue(1)
-                    self.scene_coil.addItem(tmp)
-                    self.lst_center.insert(0, tmp)
-
-                elif isinstance(d, Pressboard):
-                    tmp = Pressboard(self)
-                    tmp.setSize(d.height, d.thickness)
-                    tmp.setInnerDuctThickness(d.inner_duct_thickness)
-                    tmp.setOuterDuctThickness(d.outer_duct_thickness)
-                    tmp.setInnerGuide(d.inner_guide)
-                    tmp.setOuterGuide(d.outer_guide)
-                    tmp.setFlag(QGraphicsItem.ItemIsSelectable, True)
-                    tmp.setZValue(2)
-                    self.scene_coil.addItem(tmp)
-                    self.lst_center.insert(0, tmp)
+        # Sens haut -> bas : même traitement sur l'empilement retourné
+        order = arange(len(self.stack))
+        if sensSym != "BT":
+            order = order[::-1]
 
-                else:
-                    raise Exception("Objet inconnu")
+        # Conservation jusqu'au disque suivant le milieu (exclu si nombre pair de discs)
+        idx_disc = flatnonzero(self.stack.kind[order] == ITEM_DISC)
+        nb_keep = idx_disc[num_disc_milieu] + self.nb_disc%2
+        keep = order[:nb_keep]
 
-        self.updateCoil()
+        # Ajout des éléments par symétrie
+        order = concatenate([keep, keep[::-1][1:]])
+        is_copy = concatenate([zeros(nb_keep, dtype=bool), ones(nb_keep - 1, dtype=bool)])
+        if sensSym != "BT":
+            order = order[::-1]
+            is_copy = is_copy[::-1]
+        stack = self.stack.copy()
+        stack.takeItems(order, is_copy)
 
+        self.pushEdit("Symmetry", stack)
 
-    def setLegend(self):
+    def countItems(self, stack, index, sign):
         """
-        Construction et application de la legende
+        Ajout (sign=1) ou retrait (sign=-1) des éléments index (slice ou indices) de stack aux compteurs de la légende
         """
-        dico_lgd = {}
+        dict_count = self.dict_count
 
-        for d in self.lst_center + [self.inner_duct, self.outer_duct]:
-            if isinstance(d, Disc):
-                tmp = "Disc " + d.currentDescDisc["name"]
-                if not tmp in dico_lgd.keys():
-                    dico_lgd[tmp] = [1, d.currentDescDisc["color"]]
-                else:
-                    dico_lgd[tmp][0] = dico_lgd[tmp][0] + 1
+        def addCount(key, nb):
+            nb = dict_count.get(key, 0) + sign*nb
+            if nb == 0:
+                dict_count.pop(key, None)
+            else:
+                dict_count[key] = nb
 
-                if d.inner_guide or d.outer_guide:
-                    tmp = "Oil guide"
-                    if not tmp in dico_lgd.keys():
-                        dico_lgd[tmp] = [1, COLOR_oilGuide]
-                    else:
-                        dico_lgd[tmp][0] = dico_lgd[tmp][0] + 1
+        kind = stack.kind[index]
+        for name, kd, values in [("disc", ITEM_DISC, stack.disc_type), ("duct", ITEM_DUCT, stack.thickness), \
+                                 ("pressboard", ITEM_PRESSBOARD, stack.thickness)]:
+            lst_val, lst_nb = unique(values[index][kind == kd], return_counts=True)
+            for val, nb in zip(lst_val.tolist(), lst_nb.tolist()):
+                addCount((name, val), nb)
 
-            elif isinstance(d, Duct):
-                tmp = "Duct %.1f mm"%d.thickness
-                if not tmp in dico_lgd.keys():
-                    dico_lgd[tmp] = [1, self.getColorDuctThickness(d.thickness)]
-                else:
-                    dico_lgd[tmp][0] = dico_lgd[tmp][0] + 1
+        # Chicanes
+        nb = int(((stack.guides[index] != GUIDE_NO) & (kind != ITEM_DUCT)).sum())
+        if nb > 0:
+            addCount(("guide", None), nb)
 
-            elif isinstance(d, Pressboard):
-                tmp = "Pressboard %.1f mm"%d.thickness
-                if not tmp in dico_lgd.keys():
-                    dico_lgd[tmp] = [1, self.getColorPressboardThickness(d.thickness)]
-                else:
-                    dico_lgd[tmp][0] = dico_lgd[tmp][0] + 1
+    def getFirstIndex(self, kind, thickness, lst_vert):
+        """
+        Indice du premier élément de type kind et d'épaisseur thickness (les canaux verticaux lst_vert à la suite)
+        """
+        stack = self.stack
+        idx = flatnonzero((stack.kind == kind) & (stack.thickness == thickness))
+        return int(idx[0]) if idx.shape[0] > 0 else len(stack) + lst_vert.index(thickness)
 
-                if d.inner_guide or d.outer_guide:
-                    tmp = "Oil guide"
-                    if not tmp in dico_lgd.keys():
-                        dico_lgd[tmp] = [1, COLOR_oilGuide]
-                    else:
-                        dico_lgd[tmp][0] = dico_lgd[tmp][0] + 1
+    def setLegend(self):
+        """
+        Construction et application de la legende à partir des compteurs
+        La légende n'est redessinée que si elle a changé
+        """
+        dico_lgd = {}
 
+        def addLegend(key, nb, color):
+            if not key in dico_lgd.keys():
+                dico_lgd[key] = [nb, color]
             else:
-                raise Exception("Objet inconnu")
+                dico_lgd[key][0] = dico_lgd[key][0] + nb
+
+        # Discs par type
+        for t_id in sorted(val for (name, val) in self.dict_count if name == "disc"):
+            addLegend("Disc " + self.lst_type_desc[t_id]["name"], self.dict_count[("disc", t_id)], self.lst_type_desc[t_id]["color"])
+
+        # Chicanes
+        if ("guide", None) in self.dict_count:
+            addLegend("Oil guide", self.dict_count[("guide", None)], COLOR_oilGuide)
+
+        # Canaux (dont verticaux) et cartons par épaisseur
+        for name, kind, text, getColor, lst_vert in [("duct", ITEM_DUCT, "Duct %.1f mm", self.getColorDuctThickness, \
+                                                      [self.inner_duct.thickness, self.outer_duct.thickness]), \
+                                                     ("pressboard", ITEM_PRESSBOARD, "Pressboard %.1f mm", self.getColorPressboardThickness, [])]:
+            dict_thick = {val: nb for (n, val), nb in self.dict_count.items() if n == name}
+            for thick in lst_vert:
+                dict_thick[thick] = dict_thick.get(thick, 0) + 1
+            # Epaisseurs de même libellé : couleur de la première rencontrée dans l'empilement
+            dict_text = {}
+            for thick in dict_thick:
+                dict_text.setdefault(text%thick, []).append(thick)
+            for key, lst_thick in dict_text.items():
+                if len(lst_thick) > 1:
+                    lst_thick.sort(key=lambda t: self.getFirstIndex(kind, t, lst_vert))
+                addLegend(key, sum(dict_thick[t] for t in lst_thick), getColor(lst_thick[0]))
+
+        # Bornes des échelles des résultats superposés
+        for name, (v_min, v_max) in self.overlay_range.items():
+            label, unit = DICT_OVERLAY[name]
+            addLegend("%s min: %.4g %s"%(label, v_min, unit), 0, LST_COLOR_HEAT[0])
+            addLegend("%s max: %.4g %s"%(label, v_max, unit), 0, LST_COLOR_HEAT[-1])
+
+        if dico_lgd != self.legend.dico_lgd:
+            self.legend.setLegend(dico_lgd)
+
+    def syncItems(self, old_kind, lst_hunk=None):
+        """
+        Vues sur les éléments de l'empilement, reconstruites seulement si la suite des types a changé
+        lst_hunk : zones modifiées (cf. CoilEditCommand), seules leurs vues sont reconstruites
+        """
+        kind = self.stack.kind
+        dict_class = {ITEM_DISC: Disc, ITEM_DUCT: Duct, ITEM_PRESSBOARD: Pressboard}
+        if not lst_hunk is None and len(self.lst_center) == old_kind.shape[0]:
+            # Du haut vers le bas : les indices des zones suivantes ne sont pas encore décalés
+            for old_start, old_end, new_start, new_end in reversed(lst_hunk):
+                self.lst_center[old_start:old_end] = [dict_class[kd](self, k) for k, kd in enumerate(kind[new_start:new_end].tolist(), new_start)]
+            # Eléments décalés après la première zone qui change de longueur
+            lst_shift = [new_end for old_start, old_end, new_start, new_end in lst_hunk if old_end - old_start != new_end - new_start]
+            if len(lst_shift) > 0:
+                for k in range(lst_shift[0], len(self.lst_center)):
+                    self.lst_center[k].index = k
+            return
+        if old_kind.shape == kind.shape and (old_kind == kind).all():
+            return
+        self.lst_center = [dict_class[kd](self, k) for k, kd in enumerate(kind.tolist())]
 
-        self.legend.setLegend(dico_lgd)
+    def applyStack(self, stack, isEdit=False):
+        """
+        Remplacement de l'empilement par stack (construit à part, cf. CoilStack.copy) en une seule transaction
+        Seule la zone modifiée est comparée à l'ancien empilement : la sélection est conservée en dehors
+        et les compteurs de la légende ne sont mis à jour que sur cette zone
+        Hors des modifications enregistrées (isEdit, cf. pushEdit), l'historique d'annulation est effacé si l'empilement change
+        """
+        k_start, old_end, new_end = self.stack.getDiffRange(stack)
+        if not isEdit and (k_start != old_end or k_start != new_end):
+            self.undoStack.clear()
+        self.countItems(self.stack, slice(k_start, old_end), -1)
+        self.countItems(stack, slice(k_start, new_end), 1)
+        if self.selection.shape[0] == len(self.stack):
+            self.selection = concatenate([self.selection[:k_start], zeros(new_end - k_start, dtype=bool), \
+                                          self.selection[old_end:]])
+
+        self.stack = stack
+        self.updateCoil()
+        self.renderer.setSelectedQuiet(bool(self.selection.any()))
 
-    def updateCoil(self):
+    def updateCoil(self, lst_hunk=None):
         """
-        MAJ des positions des éléments (ne s'appuie pas sur les données initiales)
-        Prend en compte
-            - Les listes d'objets graphiques (lst_center, inner_duct, outer_duct)
-            - Les dimensions des objets graphiques
+        MAJ des positions des éléments à partir de l'empilement
+        Les positions sont calculées sur les tableaux, seule la bande modifiée de la partie centrale est redessinée
+        lst_hunk : zones modifiées depuis le dernier affichage si elles sont connues (cf. applyEdit)
         """
+        stack = self.stack
+        nb_item = len(stack)
+        old = self.view
+
         # Origine : en bas à l'intérieur de la bobine
         x0 = 0
         y0 = 0
 
-        ### Partie centrale (disc + duct)
+        ### Partie centrale (disc + duct + pressboard)
         x = x0 + self.inner_duct.thickness
-        y = y0
-        tmp_height = 0.0
-        num_disc = 1
-
-        for dd in self.lst_center:
-            # Geometrie
-            dd.setCenter(x + dd.height/2, y - dd.thickness/2)
-            if isinstance(dd, Disc) or isinstance(dd, Pressboard):
-                dd.setInnerDuctThickness(self.inner_duct.thickness)
-                dd.setOuterDuctThickness(self.outer_duct.thickness)
-
-            # Tooltip
-            if isinstance(dd, Disc):
-                dd.setDiscNumber(num_disc)
-                num_disc = num_disc + 1
-
-            # Visibilité
-            if isinstance(dd, Disc):
-                dd.setVisible(self.ui_coil.ui_chk_discs.isChecked())
-            if isinstance(dd, Duct):
-                dd.setVisible(self.ui_coil.ui_chk_ducts.isChecked())
-            if isinstance(dd, Pressboard):
-                dd.setVisible(self.ui_coil.ui_chk_pressboards.isChecked())
-
-            tmp_height = tmp_height + dd.thickness
-            y = y - dd.thickness
-        x = x + dd.height
+        z_top = cumsum(stack.thickness)
+        tmp_height = stack.getTotalThickness()
+        # Index en z (bornes triées) et indices des discs : recherches dichotomiques, cf. getIndexAtZ
+        self.view = {"kind": stack.kind.copy(), "x": x + stack.height/2, "y": y0 - (z_top - stack.thickness/2), \
+                     "z_top": z_top, "z_bottom": concatenate([[0.], z_top[:-1]]), \
+                     "disc_index": stack.getIndex(ITEM_DISC), "thickness": stack.thickness.copy(), "height": stack.height.copy(), \
+                     "guides": stack.guides.copy(), "type": stack.disc_type.copy(), "number": stack.getDiscNumber(), \
+                     "inner_t": self.inner_duct.thickness, "outer_t": self.outer_duct.thickness, \
+                     "type_desc": list(self.lst_type_desc)}
+        self.syncItems(old["kind"], lst_hunk)
+
+        # La sélection ne survit pas à un changement du nombre d'éléments
+        if self.selection.shape[0] != nb_item:
+            self.setSelection(zeros(nb_item, dtype=bool))
+
+        # Visibilité
+        old_visible = self.dict_visible
+        self.dict_visible = {ITEM_DISC: self.ui_coil.ui_chk_discs.isChecked(), \
+                             ITEM_DUCT: self.ui_coil.ui_chk_ducts.isChecked(), \
+                             ITEM_PRESSBOARD: self.ui_coil.ui_chk_pressboards.isChecked()}
+
+        # Emprise (les chicanes débordent sur les canaux verticaux)
+        if nb_item > 0:
+            x_min = float((self.view["x"] - stack.height/2).min()) - self.inner_duct.thickness
+            x_max = float((self.view["x"] + stack.height/2).max()) + self.outer_duct.thickness
+        else:
+            x_min = x
+            x_max = x
+        self.renderer.setRect(QRectF(x_min, y0 - tmp_height, x_max - x_min, tmp_height))
+        self.renderer.k_hover = None
+        # Résultats superposés (suivent l'empilement) : tout est redessiné si l'échelle change
+        old_range = self.overlay_range
+        self.updateOverlay()
+        if self.overlay_range != old_range:
+            self.renderer.update()
+        else:
+            self.renderer.update(self.getDirtyRect(old, old_visible, lst_hunk))
+        x = x + (stack.height[-1] if nb_item > 0 else self.disc_width)
 
         ### Canal intérieur
         self.inner_duct.setSize(tmp_height, None)
@@ -585,119 +1323,516 @@ class Coil(QObject):
         # Signal
         self.coilUpdated.emit()
 
+    def getDirtyRect(self, old, old_visible, lst_hunk=None):
+        """
+        Bande de la partie centrale à redessiner entre l'ancienne vue old et la vue courante
+        Tout est redessiné si la visibilité, les canaux verticaux ou les descriptions de disc ont changé
+        lst_hunk : zones modifiées connues (cf. applyEdit), sinon elles sont recherchées sur les vues
+        """
+        view = self.view
+        rect = self.renderer.boundingRect()
+        if old_visible != self.dict_visible or old["inner_t"] != view["inner_t"] or old["outer_t"] != view["outer_t"] \
+           or old["type_desc"] != view["type_desc"]:
+            return rect
+
+        if lst_hunk is None:
+            lst_key = ["kind", "y", "thickness", "height", "guides", "type", "number"]
+            k_start, old_end, new_end = getDiffRange([old[key] for key in lst_key], [view[key] for key in lst_key])
+        elif len(lst_hunk) == 0:
+            k_start, old_end, new_end = 0, 0, 0
+        else:
+            k_start, old_end, new_end = lst_hunk[0][0], lst_hunk[-1][1], lst_hunk[-1][3]
+            # Les éléments au-dessus sont décalés en z ou renumérotés : redessinés jusqu'en haut
+            z_old = float(old["z_top"][old_end - 1]) if old_end > 0 else 0.
+            z_new = float(view["z_top"][new_end - 1]) if new_end > 0 else 0.
+            if z_old != z_new or searchsorted(old["disc_index"], old_end) != searchsorted(view["disc_index"], new_end):
+                old_end, new_end = old["kind"].shape[0], view["kind"].shape[0]
+        if k_start == old_end and k_start == new_end:
+            return QRectF()
+
+        # Bande en z : du bas du premier élément modifié au plus haut des deux empilements modifiés
+        z_bottom = float(view["z_top"][k_start - 1]) if k_start > 0 else 0.
+        z_top = max(float(old["z_top"][old_end - 1]) if old_end > 0 else 0., \
+                    float(view["z_top"][new_end - 1]) if new_end > 0 else 0.)
+        return QRectF(rect.left(), -z_top - 1, rect.width(), z_top - z_bottom + 2)
+
+    ### Recherche par position (bornes triées de la vue, recherche dichotomique)
+    def getIndexAtZ(self, z):
+        """
+        Indice de l'élément contenant la hauteur z (mm depuis le bas de la bobine), None en dehors
+        """
+        k = int(searchsorted(self.view["z_top"], z, side="right"))
+        if z < 0 or k >= self.view["kind"].shape[0]:
+            return None
+        return k
+
+    def getIndexOfDisc(self, number):
+        """
+        Indice du disc numéro number (à partir de 1 en partant du bas), None s'il n'existe pas
+        """
+        if number < 1 or number > self.view["disc_index"].shape[0]:
+            return None
+        return int(self.view["disc_index"][number - 1])
+
+    def getRangeBetween(self, z_min, z_max):
+        """
+        Indices (début, fin) des éléments coupant l'intervalle [z_min, z_max] (mm depuis le bas de la bobine)
+        """
+        k_start = int(searchsorted(self.view["z_top"], z_min, side="right"))
+        k_end = int(searchsorted(self.view["z_bottom"], z_max, side="left"))
+        return k_start, max(k_start, k_end)
+
+    def getItemsBetween(self, z_min, z_max, kind=None):
+        """
+        Indices des éléments (de type kind, tous par défaut) coupant l'intervalle [z_min, z_max] (mm depuis le bas)
+        """
+        k_start, k_end = self.getRangeBetween(z_min, z_max)
+        lst_index = arange(k_start, k_end)
+        if not kind is None:
+            lst_index = lst_index[self.view["kind"][k_start:k_end] == kind]
+        return lst_index
+
+    def getItemInfo(self, k):
+        """
+        Description de l'élément k pour l'inspecteur : géométrie puis résultats des calculs chargés
+        """
+        view = self.view
+        kind = view["kind"][k]
+        if kind == ITEM_DISC:
+            lst_line = ["Disc n°%i (%s)"%(view["number"][k], self.lst_type_desc[view["type"][k]]["name"])]
+        elif kind == ITEM_DUCT:
+            lst_line = ["Horizontal duct"]
+        else:
+            lst_line = ["Pressboard"]
+        lst_line.append("Thickness: %.2f mm"%view["thickness"][k])
+        lst_line.append("z: %.2f - %.2f mm"%(view["z_bottom"][k], view["z_top"][k]))
+        if kind != ITEM_DUCT:
+            lst_line.append("Oil guide: " + ["no", "inner", "outer"][view["guides"][k]])
+
+        # Résultats
+        results = self.stack.results
+        for id_calcul in results.getIds():
+            lst_val = []
+            for name in CoilResults.LST_SCALAR:
+                val = results.getValue(id_calcul, name, k)
+                if not val is None:
+                    lst_val.append("%s %.4g %s"%(DICT_OVERLAY[name][0], val, DICT_OVERLAY[name][1]))
+            lst_loss = results.getLossCable(id_calcul, k)
+            if not lst_loss is None:
+                lst_val.append("Losses %.4g W"%sum(lst_loss))
+            if len(lst_val) > 0:
+                lst_line.append("%s: %s"%(id_calcul, ", ".join(lst_val)))
+
+        return "\n".join(lst_line)
+
+    ### Sélection
+    def getIndexAt(self, pos):
+        """
+        Indice de l'élément visible sous le point pos (coordonnées de la scène), None sinon
+        """
+        view = self.view
+        k = self.getIndexAtZ(-pos.y())
+        if k is None or not self.dict_visible[view["kind"][k]]:
+            return None
+        x_min = view["x"][k] - view["height"][k]/2
+        x_max = view["x"][k] + view["height"][k]/2
+        if view["guides"][k] == GUIDE_INNER:
+            x_min = x_min - view["inner_t"]
+        elif view["guides"][k] == GUIDE_OUTER:
+            x_max = x_max + view["outer_t"]
+        if pos.x() < x_min or pos.x() > x_max:
+            return None
+        return k
+
+    def getIndexInRect(self, rect):
+        """
+        Masque des éléments visibles coupant le rectangle rect (coordonnées de la scène)
+        """
+        view = self.view
+        mask = zeros(view["kind"].shape[0], dtype=bool)
+        k_start, k_end = self.getRangeBetween(-rect.bottom(), -rect.top())
+        x = view["x"][k_start:k_end]
+        height = view["height"][k_start:k_end]
+        mask[k_start:k_end] = (view["z_bottom"][k_start:k_end] < -rect.top()) & (view["z_top"][k_start:k_end] > -rect.bottom()) & \
+                              (x - height/2 < rect.right()) & (x + height/2 > rect.left())
+        return mask & self.getVisibleMask()
+
+    def getVisibleMask(self):
+        mask = zeros(self.view["kind"].shape[0], dtype=bool)
+        for kind, isVisible in self.dict_visible.items():
+            if isVisible:
+                mask = mask | (self.view["kind"] == kind)
+        return mask
+
+    def setSelection(self, selection):
+        """
+        Application de la sélection des éléments centraux (masque sur self.view)
+        """
+        self.selection = selection
+        if not self.renderer is None:
+            self.renderer.setSelectedQuiet(bool(selection.any()))
+            self.renderer.update()
+
+    def rubberBandChanged(self, rect_viewport, pos_from, pos_to):
+        """
+        Sélection par zone : les éléments coupant la zone sont sélectionnés
+        """
+        if rect_viewport.isNull():
+            self.rect_band = None
+            return
+        self.rect_band = QRectF(pos_from, pos_to).normalized()
+        if not self.renderer is None:
+            self.setSelection(self.getIndexInRect(self.rect_band))
+
+    def getSelectedIndex(self, type_obj):
+        """
+        Indices dans l'empilement des éléments sélectionnés de type type_obj
+        """
+        return flatnonzero(self.selection & (self.view["kind"] == type_obj.kind))
+
     def actChangeThickness(self, le_thickness, type_obj):
         """
         Action de changement de l'epaisseur d'un element en se basant sur le QLineEdit
         Ne s'applique que sur les objets de type type_obj
         """
-        for c in self.scene_coil.selectedItems():
-            if type(c) == type_obj:
-                c.setSize(None, float(le_thickness.text()))
+        thickness = float(le_thickness.text())
+        stack = self.stack.copy()
+        stack.thickness[self.getSelectedIndex(type_obj)] = thickness
+        # Canaux verticaux
+        if type_obj == Duct:
+            for c in self.scene_coil.selectedItems():
+                if isinstance(c, VerticalDuct):
+                    c.setSize(None, thickness)
 
         # On déselectionne tout
         self.scene_coil.clearSelection()
 
-        self.updateCoil()
+        self.pushEdit("Change thickness", stack)
 
     def actChangeDisc(self, desc, type_obj):
         """
         Action de changement du type de disc
         Ne s'applique que sur les objets de type type_obj
         """
-        for c in self.scene_coil.selectedItems():
-            if type(c) == type_obj:
-                c.setDisc(desc)
+        stack = self.stack.copy()
+        stack.disc_type[self.getSelectedIndex(type_obj)] = self.getTypeId(desc)
+        self.updateDiscTypes(stack)
 
         # On déselectionne tout
         self.scene_coil.clearSelection()
 
-        self.updateCoil()
+        self.pushEdit("Change disc type", stack)
 
     def actOilGuide(self, side, type_obj):
         """
         Action d'application d'une chicane
         Ne s'applique que sur les objets de type type_obj
+        Il ne peut pas y avoir simultanément des chicanes à l'intérieur et à l'extérieur
         """
-        for c in self.scene_coil.selectedItems():
-            if type(c) == type_obj:
-                if side == "inner":
-                    c.setInnerGuide()
-                elif side == "outer":
-                    c.setOuterGuide()
-                elif side == "remove":
-                    c.setInnerGuide(False)
-                    c.setOuterGuide(False)
-                else:
-                    raise Exception("Side inconnu")
+        lst_index = self.getSelectedIndex(type_obj)
+        stack = self.stack.copy()
+        guides = stack.guides[lst_index]
+        if side == "inner":
+            stack.guides[lst_index] = where(guides == GUIDE_INNER, GUIDE_NO, GUIDE_INNER)
+        elif side == "outer":
+            stack.guides[lst_index] = where(guides == GUIDE_OUTER, GUIDE_NO, GUIDE_OUTER)
+        elif side == "remove":
+            stack.guides[lst_index] = GUIDE_NO
+        else:
+            raise Exception("Side inconnu")
 
         # On déselectionne tout
         self.scene_coil.clearSelection()
 
-        # Pas besoin d'updateCoil
-        self.setLegend()
+        self.pushEdit("Oil guide", stack)
 
     def actInsertPressboard(self, position, type_obj):
         """
-        Action d'ajout d'un carton à la position par rapport à l'objet
+        Action d'ajout d'un carton (+ canal) à la position par rapport à l'objet
         Ne s'applique que sur les objets de type type_obj
         """
-        for c in self.scene_coil.selectedItems():
-            if type(c) == type_obj:
-
-                pos_objet = self.lst_center.index(c)
-
-                # Pressboard
-                tmp_p = Pressboard(self)
-                tmp_p.setSize(self.disc_width, self.ep_duct_defaut)
-                tmp_p.setInnerDuctThickness(self.inner_duct.thickness)
-                tmp_p.setOuterDuctThickness(self.outer_duct.thickness)
-                tmp_p.setFlag(QGraphicsItem.ItemIsSelectable, True)
-                tmp_p.setZValue(2)
-                self.scene_coil.addItem(tmp_p)
-
-                # Canal supérieur
-                tmp_d = Duct(self)
-                tmp_d.setSize(self.disc_width, self.ep_duct_defaut)
-                tmp_d.setFlag(QGraphicsItem.ItemIsSelectable, True)
-                tmp_d.setZValue(1)
-                self.scene_coil.addItem(tmp_d)
-
-                if position == "above":
-                    self.lst_center.insert(pos_objet + 1, tmp_d)
-                    self.lst_center.insert(pos_objet + 2, tmp_p)
-                elif position == "under":
-                    self.lst_center.insert(pos_objet, tmp_p)
-                    self.lst_center.insert(pos_objet + 1, tmp_d)
-                else:
-                    raise Exception("Position inconnue")
+        lst_index = self.getSelectedIndex(type_obj)
+        if position == "above":
+            # Canal puis carton au-dessus de l'objet
+            index = (lst_index + 1).repeat(2)
+            kind = tile(array([ITEM_DUCT, ITEM_PRESSBOARD], dtype=int8), len(lst_index))
+        elif position == "under":
+            # Carton puis canal sous l'objet
+            index = lst_index.repeat(2)
+            kind = tile(array([ITEM_PRESSBOARD, ITEM_DUCT], dtype=int8), len(lst_index))
+        else:
+            raise Exception("Position inconnue")
+
+        # Toutes les insertions en une passe
+        stack = self.stack.copy()
+        if len(index) > 0:
+            stack.insertItems(index, kind, self.ep_duct_defaut, self.disc_width, -1, GUIDE_NO)
 
         # On déselectionne tout
         self.scene_coil.clearSelection()
 
-        self.updateCoil()
+        self.pushEdit("Insert pressboard", stack)
 
-    def resetLoss(self):
+    def actSelectBlock(self, index):
         """
-        Réinitialisation de toutes les pertes de la bobine
+        Sélection de toutes les répétitions du bloc contenant l'élément index
+        Les actions suivantes s'appliquent ainsi à tout le bloc en une seule opération
         """
-        for dd in self.lst_center:
-            if isinstance(dd, Disc):
-                dd.dict_loss = {}
-        self.lst_calcul_loaded = []
+        start, nb_item, repeat = self.stack.getBlockOf(index)
+        selection = zeros(len(self.stack), dtype=bool)
+        selection[start:start + nb_item*repeat] = True
+        self.setSelection(selection & self.getVisibleMask())
 
-    def actColorDisc(self, ui_disc):
+    def actRepeatBlock(self, index):
         """
-        Changement de la couleur des discs par description
+        Changement du nombre de répétitions du bloc contenant l'élément index
         """
-
-        # Fenêtre de choix de la couleur
-        color = QColorDialog.getColor()
-        if not color.isValid():
+        _, _, repeat = self.stack.getBlockOf(index)
+        spBox = self.ui_coil.ui_spBox_nbreDiscs
+        # Un motif contient un seul disc
+        repeat_new, ok = QInputDialog.getInt(None, "Block", "Number of repeats:", repeat, 1, \
+                                             spBox.maximum() - self.nb_disc + repeat)
+        if not ok or repeat_new == repeat:
             return
 
-        # Application
+        stack = self.stack.copy()
+        stack.setBlockRepeat(index, repeat_new)
+
+        # On déselectionne tout
+        self.scene_coil.clearSelection()
+
+        self.pushEdit("Repeat block", stack, int(stack.getIndex(ITEM_DISC).shape[0]))
+        self.isModified.emit()
+
+    ### Annulation
+    def setUndoLimit(self, nb):
+        """
+        Nombre maximal de modifications annulables (0 : pas de limite), l'historique est effacé
+        """
+        self.undoStack.clear()
+        self.undoStack.setUndoLimit(nb)
+
+    def pushEdit(self, text, stack, nb_disc=None):
+        """
+        Application d'une modification de l'utilisateur (empilement stack construit à part, cf. applyStack)
+        enregistrée dans la pile d'annulation par sa seule zone modifiée (cf. CoilEditCommand)
+        """
+        self.undoStack.push(CoilEditCommand(self, text, stack, nb_disc))
+
+    def applyEdit(self, lst_hunk, lst_part, results, vertical, nb_disc, stack=None):
+        """
+        Application d'une modification enregistrée (cf. CoilEditCommand) : épaisseurs des canaux verticaux, nombre de discs
+        et zones lst_hunk [(début avant, fin avant, début après, fin après)] de l'empilement remplacées sur place par lst_part
+        stack : empilement déjà construit par l'action (premier passage), utilisé tel quel
+        Seules les zones modifiées sont recomptées dans la légende, désélectionnées et redessinées
+        """
+        self.inner_duct.setSize(None, vertical[0])
+        self.outer_duct.setSize(None, vertical[1])
+        if nb_disc != self.nb_disc:
+            self.nb_disc = nb_disc
+            spBox = self.ui_coil.ui_spBox_nbreDiscs
+            spBox.blockSignals(True)
+            spBox.setValue(nb_disc)
+            spBox.blockSignals(False)
+
+        lst_range = [(old_start, old_end) for old_start, old_end, _, _ in lst_hunk]
+        self.countItems(self.stack, concatenate([arange(k_start, k_end) for k_start, k_end in lst_range] + [zeros(0, dtype=int)]), -1)
+        if self.selection.shape[0] == len(self.stack):
+            self.selection = spliceRanges(self.selection, lst_range, \
+                                          [zeros(new_end - new_start, dtype=bool) for _, _, new_start, new_end in lst_hunk])
+        if stack is None:
+            self.stack.replaceRanges(lst_range, lst_part, results)
+        else:
+            self.stack = stack
+        self.countItems(self.stack, concatenate([arange(k_start, k_end) for _, _, k_start, k_end in lst_hunk] + [zeros(0, dtype=int)]), 1)
+
+        self.updateCoil(lst_hunk)
+        self.renderer.setSelectedQuiet(bool(self.selection.any()))
+
+    def undo(self):
+        if self.isFrozen or not self.undoStack.canUndo():
+            return
+        self.undoStack.undo()
+        self.isModified.emit()
+
+    def redo(self):
+        if self.isFrozen or not self.undoStack.canRedo():
+            return
+        self.undoStack.redo()
+        self.isModified.emit()
+
+    ### Pertes
+    def getCopperVolumeTable(self):
+        """
+        Volumes de cuivre (m3) par type de disc (lignes, cf. lst_type_desc) et par cable (colonnes, NaN au-delà de N_cables)
+        Recalculés seulement si le rayon intérieur ou les descriptions des discs (cables) ont changé
+        """
+        r_inner = self.ui_coil.getInnerRadius()*1e-3
+        key = (r_inner, [(d["N_cables"], d["h_cable"], d["cable_origin"]["N_strands"], d["cable_origin"]["h_strand"], \
+                          d["cable_origin"]["t_strand"]) if d != {} else None for d in self.lst_type_desc])
+        if self.cache_copper is None or self.cache_copper[0] != key:
+            nb_cable = max([d[0] for d in key[1] if not d is None], default=0)
+            table = full((len(key[1]), nb_cable), nan)
+            for t_id, d in enumerate(key[1]):
+                if d is None:
+                    continue
+                N_cables, h_cable, N_strands, h_strand, t_strand = d
+                # Section de cuivre par cable et rayon de chaque cable
+                Sc = N_strands*h_strand*t_strand*1e-6
+                Rc = r_inner + (arange(N_cables) + 0.5)*h_cable*1e-3
+                table[t_id, :N_cables] = Sc*2*pi*Rc
+            self.cache_copper = (key, table)
+
+        return self.cache_copper[1]
+
+    def getCopperVolumes(self, lst_index=None):
+        """
+        Volumes de cuivre (m3) par disc (lignes : discs lst_index de l'empilement, tous par défaut) et par cable
+        """
+        if lst_index is None:
+            lst_index = self.stack.getIndex(ITEM_DISC)
+        return self.getCopperVolumeTable()[self.stack.disc_type[lst_index]]
+
+    def getLossArray(self, id_calcul, loss_unit="W", lst_index=None):
+        """
+        Pertes par disc (lignes : discs lst_index, tous par défaut) et par cable (colonnes) en W ou W/m3
+        NaN pour les discs sans pertes et au-delà du nombre de cables
+        """
+        if lst_index is None:
+            lst_index = self.stack.getIndex(ITEM_DISC)
+        Vc = self.getCopperVolumes(lst_index)
+        loss = self.stack.getLossArray(id_calcul, lst_index, Vc.shape[1])
+        if loss is None:
+            loss = full(Vc.shape, nan)
+
+        if loss_unit == "W":
+            return loss
+        elif loss_unit == "W/m3":
+            return loss/Vc
+        else:
+            raise Exception("Unite des pertes inconnue")
+
+    def setLossArray(self, id_calcul, loss, loss_unit="W", lst_index=None):
+        """
+        Définition des pertes des discs lst_index (tous par défaut) en une opération
+        loss : tableau disc x cable en W ou W/m3 (une ligne NaN efface les pertes du disc)
+               ou pertes par disc (1D), réparties à pertes volumiques uniformes sur les cables
+        """
+        if lst_index is None:
+            lst_index = self.stack.getIndex(ITEM_DISC)
+        lst_index = atleast_1d(lst_index)
+        Vc = self.getCopperVolumes(lst_index)
+        loss = array(loss, dtype=float)
+        if loss.shape[0] != lst_index.shape[0]:
+            raise Exception("Incoherence entre les pertes et le nombre de discs")
+
+        if not loss_unit in ["W", "W/m3"]:
+            raise Exception("Unite des pertes inconnue")
+        if loss.ndim == 1:
+            # Pertes volumiques du disc
+            if loss_unit == "W":
+                loss = loss/nansum(Vc, axis=1)
+            loss = loss.reshape(-1, 1)*Vc
+        else:
+            # Colonnes ramenées au nombre de cables maximum
+            if loss.shape[1] > Vc.shape[1]:
+                if not isnan(loss[:, Vc.shape[1]:]).all():
+                    raise Exception("Incoherence entre la liste des pertes et le nombre de cables")
+                loss = loss[:, :Vc.shape[1]]
+            elif loss.shape[1] < Vc.shape[1]:
+                loss = concatenate([loss, full((loss.shape[0], Vc.shape[1] - loss.shape[1]), nan)], axis=1)
+            if loss_unit == "W/m3":
+                loss = loss*Vc
+
+        # Chaque disc a des pertes sur tous ses cables ou sur aucun
+        isCable = ~isnan(Vc)
+        hasLoss = ~isnan(loss).all(axis=1)
+        if (isnan(loss) & isCable)[hasLoss].any() or (~isnan(loss) & ~isCable).any():
+            raise Exception("Incoherence entre la liste des pertes et le nombre de cables")
+
+        self.stack.setLossArray(id_calcul, lst_index, loss, where(hasLoss, isCable.sum(axis=1), -1))
+
+    def resetLoss(self):
+        """
+        Réinitialisation de toutes les pertes de la bobine
+        """
+        self.stack.removeResult(None, ["loss_W", "loss_n"])
+        self.lst_calcul_loaded = []
+        self.calculsChanged.emit()
+
+    ### Superposition des résultats
+    def setOverlay(self, id_calcul=None, name=None):
+        """
+        Coloration des discs et cartons par la grandeur name (cf. LST_OVERLAY_DISC) du calcul id_calcul
+        et des canaux par leur vitesse moyenne ; sans calcul ou sans grandeur, retour aux couleurs de définition
+        """
+        if not name is None and not name in LST_OVERLAY_DISC:
+            raise Exception("Grandeur '" + str(name) + "' inconnue")
+        self.overlay = None if id_calcul is None or name is None else (id_calcul, name)
+        if self.renderer is None:
+            return
+
+        self.updateOverlay()
+        self.setLegend()
+        # Un seul redessin de la partie centrale
+        self.renderer.update()
+
+    def refreshOverlay(self, id_calcul):
+        """
+        Nouvelle application des résultats superposés si ceux du calcul id_calcul ont été modifiés
+        """
+        if not self.overlay is None and self.overlay[0] == id_calcul:
+            self.setOverlay(*self.overlay)
+
+    def updateOverlay(self):
+        """
+        Indices des couleurs des éléments dans LST_COLOR_HEAT, calculés sur les tableaux de résultats
+        Chaque grandeur a sa propre échelle, de son minimum à son maximum sur la bobine
+        """
+        stack = self.stack
+        nb_item = len(stack)
+        self.overlay_index = full(nb_item, -1, dtype=int16)
+        self.overlay_range = {}
+        if self.overlay is None or nb_item == 0 or stack.results.getSlot(self.overlay[0]) is None:
+            return
+
+        id_calcul, name = self.overlay
+        if name == "loss_density":
+            # Pertes du disc rapportées à son volume de cuivre
+            value = full(nb_item, nan)
+            idx_disc = stack.getIndex(ITEM_DISC)
+            loss = self.getLossArray(id_calcul, "W", idx_disc)
+            hasLoss = ~isnan(loss).all(axis=1)
+            value[idx_disc[hasLoss]] = nansum(loss[hasLoss], axis=1)/nansum(self.getCopperVolumes(idx_disc[hasLoss]), axis=1)
+        else:
+            value = where(stack.kind == ITEM_DUCT, nan, stack.results.getArray(name, [id_calcul])[0])
+        velocity = where(stack.kind == ITEM_DUCT, stack.results.getArray("averageVelocity", [id_calcul])[0], nan)
+
+        nb_color = len(LST_COLOR_HEAT)
+        for key, val in [(name, value), ("averageVelocity", velocity)]:
+            isValue = ~isnan(val)
+            if not isValue.any():
+                continue
+            v_min = float(val[isValue].min())
+            v_max = float(val[isValue].max())
+            scale = (nb_color - 1)/(v_max - v_min) if v_max > v_min else 0.0
+            self.overlay_index[isValue] = ((val[isValue] - v_min)*scale + 0.5).astype(int16)
+            self.overlay_range[key] = (v_min, v_max)
+
+    def actColorDisc(self, ui_disc):
+        """
+        Changement de la couleur des discs par description
+        """
+
+        # Fenêtre de choix de la couleur
+        color = QColorDialog.getColor()
+        if not color.isValid():
+            return
+
+        # Application
         ui_disc.setDiscColor(color)
         self.updateCoilData()
+        self.scene_coil.update()
 
         # On déselectionne tout
         self.scene_coil.clearSelection()
@@ -717,6 +1852,7 @@ class Coil(QObject):
 
         # Application aux canaux
         self.dict_colorDuct[obj.thickness] = color
+        self.scene_coil.update()
 
         # On déselectionne tout
         self.scene_coil.clearSelection()
@@ -743,6 +1879,7 @@ class Coil(QObject):
 
         # Application aux canaux
         self.dict_colorPressboard[obj.thickness] = color
+        self.scene_coil.update()
 
         # On déselectionne tout
         self.scene_coil.clearSelection()
@@ -761,105 +1898,24 @@ class Coil(QObject):
         Suppression des objets et du canal supérieur à celui-ci
         Ne s'applique que sur les objets de type type_obj
         """
-        for c in self.scene_coil.selectedItems():
-            if type(c) == type_obj:
-
-                pos_objet = self.lst_center.index(c)
-                self.scene_coil.removeItem(self.lst_center.pop(pos_objet)) # Objet
-                self.scene_coil.removeItem(self.lst_center.pop(pos_objet)) # Canal supérieur
+        lst_index = self.getSelectedIndex(type_obj)
+        stack = self.stack.copy()
+        stack.removeItems(concatenate([lst_index, lst_index + 1]))
 
         # On déselectionne tout
         self.scene_coil.clearSelection()
 
-        self.updateCoil()
+        self.pushEdit("Remove", stack)
 
-    def addXMLTreeDesign(self, tag_coil, docDom):
+    def addXMLTreeDesign(self, tag_coil, docDom, isBlocks=False):
         """
         Ajout des données au fichier XML de design
+        isBlocks : empilement écrit par blocs (cf. CoilStack.getBlocks) plutôt qu'élément par élément
         """
-
-        if self.inner_duct == None or self.outer_duct == None:
+        dict_stack = self.getStackArrays()
+        if dict_stack is None:
             return
-
-        tag_tmp = docDom.createElement('width_m')
-        tag_tmp.appendChild(docDom.createTextNode("%e"%(self.disc_width*1e-3)))
-        tag_coil.appendChild(tag_tmp)
-
-        tag_vduct = docDom.createElement('vertical_ducts')
-        tag_coil.appendChild(tag_vduct)
-        tag_d = docDom.createElement('duct')
-        tag_vduct.appendChild(tag_d)
-        tag_tmp = docDom.createElement('t_duct_m')
-        tag_tmp.appendChild(docDom.createTextNode("%e"%(self.inner_duct.thickness*1e-3)))
-        tag_d.appendChild(tag_tmp)
-        tag_tmp = docDom.createElement('r_center_m')
-        tag_tmp.appendChild(docDom.createTextNode("%e"%(self.inner_duct.x_center*1e-3)))
-        tag_d.appendChild(tag_tmp)
-        tag_d = docDom.createElement('duct')
-        tag_vduct.appendChild(tag_d)
-        tag_tmp = docDom.createElement('t_duct_m')
-        tag_tmp.appendChild(docDom.createTextNode("%e"%(self.outer_duct.thickness*1e-3)))
-        tag_d.appendChild(tag_tmp)
-        tag_tmp = docDom.createElement('r_center_m')
-        tag_tmp.appendChild(docDom.createTextNode("%e"%(self.outer_duct.x_center*1e-3)))
-        tag_d.appendChild(tag_tmp)
-
-        # Listes des éléments centraux
-        lst_discs = [d for d in self.lst_center if isinstance(d, Disc)]
-        lst_ducts = [d for d in self.lst_center if isinstance(d, Duct)]
-        lst_pressboards = [d for d in self.lst_center if isinstance(d, Pressboard)]
-
-        tag_disc = docDom.createElement('discs')
-        tag_coil.appendChild(tag_disc)
-        for d in lst_discs:
-            tag_d = docDom.createElement('disc')
-            tag_disc.appendChild(tag_d)
-            tag_tmp = docDom.createElement('type')
-            tag_tmp.appendChild(docDom.createTextNode(d.currentDescDisc["name"]))
-            tag_d.appendChild(tag_tmp)
-            tag_tmp = docDom.createElement('z_center_m')
-            tag_tmp.appendChild(docDom.createTextNode("%e"%(-d.y_center*1e-3)))
-            tag_d.appendChild(tag_tmp)
-            tag_tmp = docDom.createElement('oil_guides')
-            if d.inner_guide and not d.outer_guide:
-                tag_tmp.appendChild(docDom.createTextNode("inner"))
-            elif d.outer_guide and not d.inner_guide:
-                tag_tmp.appendChild(docDom.createTextNode("outer"))
-            else:
-                tag_tmp.appendChild(docDom.createTextNode("no"))
-            tag_d.appendChild(tag_tmp)
-
-        tag_duct = docDom.createElement('horizontal_ducts')
-        tag_coil.appendChild(tag_duct)
-        for d in lst_ducts:
-            tag_d = docDom.createElement('duct')
-            tag_duct.appendChild(tag_d)
-            tag_tmp = docDom.createElement('t_duct_m')
-            tag_tmp.appendChild(docDom.createTextNode("%e"%(d.thickness*1e-3)))
-            tag_d.appendChild(tag_tmp)
-            tag_tmp = docDom.createElement('z_center_m')
-            tag_tmp.appendChild(docDom.createTextNode("%e"%(-d.y_center*1e-3)))
-            tag_d.appendChild(tag_tmp)
-
-        tag_pressboard = docDom.createElement('pressboards')
-        tag_coil.appendChild(tag_pressboard)
-        for d in lst_pressboards:
-            tag_d = docDom.createElement('pressboard')
-            tag_pressboard.appendChild(tag_d)
-            tag_tmp = docDom.createElement('t_pressboard_m')
-            tag_tmp.appendChild(docDom.createTextNode("%e"%(d.thickness*1e-3)))
-            tag_d.appendChild(tag_tmp)
-            tag_tmp = docDom.createElement('z_center_m')
-            tag_tmp.appendChild(docDom.createTextNode("%e"%(-d.y_center*1e-3)))
-            tag_d.appendChild(tag_tmp)
-            tag_tmp = docDom.createElement('oil_guides')
-            if d.inner_guide and not d.outer_guide:
-                tag_tmp.appendChild(docDom.createTextNode("inner"))
-            elif d.outer_guide and not d.inner_guide:
-                tag_tmp.appendChild(docDom.createTextNode("outer"))
-            else:
-                tag_tmp.appendChild(docDom.createTextNode("no"))
-            tag_d.appendChild(tag_tmp)
+        addXMLTreeStack(tag_coil, docDom, dict_stack, self.stack.getBlocks() if isBlocks else None)
 
     def addXMLTreeResult(self, id_calcul, tag_coil, docDom):
         """
@@ -871,373 +1927,442 @@ class Coil(QObject):
         tag_vduct = docDom.createElement('vertical_ducts')
         tag_coil.appendChild(tag_vduct)
 
-        # Listes des éléments centraux
-        lst_discs = [d for d in self.lst_center if isinstance(d, Disc)]
-        lst_ducts = [d for d in self.lst_center if isinstance(d, Duct)]
-        lst_pressboards = [d for d in self.lst_center if isinstance(d, Pressboard)]
+        stack = self.stack
+
+        def addResult(tag_d, name, tag):
+            val = stack.getResult(id_calcul, name, k)
+            if not val is None:
+                tag_tmp = docDom.createElement(tag)
+                tag_tmp.appendChild(docDom.createTextNode("%f"%val))
+                tag_d.appendChild(tag_tmp)
 
         tag_disc = docDom.createElement('discs')
         tag_coil.appendChild(tag_disc)
-        for d in lst_discs:
+        for k in stack.getIndex(ITEM_DISC).tolist():
             tag_d = docDom.createElement('disc')
             tag_disc.appendChild(tag_d)
 
             # Pertes
-            l_disc = d.getLossCable(id_calcul)
+            l_disc = stack.getLossCable(id_calcul, k)
             if l_disc is not None:
-                for kk in range(len(l_disc)):
+                for loss in l_disc:
                     tag_c = docDom.createElement('cable')
                     tag_d.appendChild(tag_c)
                     tag_l = docDom.createElement('loss_W')
-                    tag_l.appendChild(docDom.createTextNode("%f"%l_disc[kk]))
+                    tag_l.appendChild(docDom.createTextNode("%f"%loss))
                     tag_c.appendChild(tag_l)
 
-            # Echauffement moyen
-            if id_calcul in d.dict_averageTR.keys():
-                tag_tmp = docDom.createElement('averageTR_K')
-                tag_tmp.appendChild(docDom.createTextNode("%f"%d.dict_averageTR[id_calcul]))
-                tag_d.appendChild(tag_tmp)
-
-            # Echauffement maximum
-            if id_calcul in d.dict_maxTR.keys():
-                tag_tmp = docDom.createElement('maxTR_K')
-                tag_tmp.appendChild(docDom.createTextNode("%f"%d.dict_maxTR[id_calcul]))
-                tag_d.appendChild(tag_tmp)
+            # Echauffements moyen et maximum
+            addResult(tag_d, "averageTR", 'averageTR_K')
+            addResult(tag_d, "maxTR", 'maxTR_K')
 
         tag_duct = docDom.createElement('horizontal_ducts')
         tag_coil.appendChild(tag_duct)
-        for d in lst_ducts:
+        for k in stack.getIndex(ITEM_DUCT).tolist():
             tag_d = docDom.createElement('duct')
             tag_duct.appendChild(tag_d)
 
-            # Echauffement moyen
-            if id_calcul in d.dict_averageTR.keys():
-                tag_tmp = docDom.createElement('averageTR_K')
-                tag_tmp.appendChild(docDom.createTextNode("%f"%d.dict_averageTR[id_calcul]))
-                tag_d.appendChild(tag_tmp)
-
-            # Vitesse moyenne moyen
-            if id_calcul in d.dict_averageVelocity.keys():
-                tag_tmp = docDom.createElement('averageVelocity_m.s-1')
-                tag_tmp.appendChild(docDom.createTextNode("%f"%d.dict_averageVelocity[id_calcul]))
-                tag_d.appendChild(tag_tmp)
+            # Echauffement moyen et vitesse moyenne
+            addResult(tag_d, "averageTR", 'averageTR_K')
+            addResult(tag_d, "averageVelocity", 'averageVelocity_m.s-1')
 
         tag_pressboard = docDom.createElement('pressboards')
         tag_coil.appendChild(tag_pressboard)
-        for d in lst_pressboards:
+        for k in stack.getIndex(ITEM_PRESSBOARD).tolist():
             tag_d = docDom.createElement('pressboard')
             tag_pressboard.appendChild(tag_d)
 
-            # Echauffement moyen
-            if id_calcul in d.dict_averageTR.keys():
-                tag_tmp = docDom.createElement('averageTR_K')
-                tag_tmp.appendChild(docDom.createTextNode("%f"%d.dict_averageTR[id_calcul]))
-                tag_d.appendChild(tag_tmp)
-
-            # Echauffement maximum
-            if id_calcul in d.dict_maxTR.keys():
-                tag_tmp = docDom.createElement('maxTR_K')
-                tag_tmp.appendChild(docDom.createTextNode("%f"%d.dict_maxTR[id_calcul]))
-                tag_d.appendChild(tag_tmp)
+            # Echauffements moyen et maximum
+            addResult(tag_d, "averageTR", 'averageTR_K')
+            addResult(tag_d, "maxTR", 'maxTR_K')
 
     def loadXMLTreeResult(self, coil_elt, id_calcul):
         """
         Chargement des résultats sur la coil
         """
-        # La géométrie a déjà été chargée par loadXMLTree
-
-        ### Valeurs locales
-#        e_vd = coil_elt.firstChildElement("vertical_ducts")
-        e_discs = coil_elt.firstChildElement("discs")
-        n_disc = e_discs.firstChildElement("disc")
-        e_hducts = coil_elt.firstChildElement("horizontal_ducts")
-        n_hduct = e_hducts.firstChildElement("duct")
-        e_pressboards = coil_elt.firstChildElement("pressboards")
-        n_pressboard = e_pressboards.firstChildElement("pressboard")
-        for dd in self.lst_center:
-
-            ### Discs
-            if isinstance(dd, Disc) and not n_disc.isNull():
-                e_disc = n_disc.toElement()
-
-                # Pertes
-                lst_loss = []
-                n_c = e_disc.firstChildElement("cable")
-                while not n_c.isNull():
-                    e_c = n_c.toElement()
-                    lst_loss.append(float(e_c.firstChildElement("loss_W").text()))
-                    n_c = n_c.nextSiblingElement("cable")
-                if len(lst_loss) > 0:
-                    dd.setLossCable(id_calcul, lst_loss)
-                    self.addLoadedCalcul({"id_calcul": id_calcul, "calculation_type": "loss"})
-
-                # Average TR
-                n_tmp = e_disc.firstChildElement("averageTR_K")
-                if not n_tmp.isNull():
-                    dd.setAverageTR(id_calcul, float(n_tmp.text()))
-                    self.addLoadedCalcul({"id_calcul": id_calcul, "calculation_type": "thermoHydro"})
-
-                # Max TR
-                n_tmp = e_disc.firstChildElement("maxTR_K")
-                if not n_tmp.isNull():
-                    dd.setMaxTemp(id_calcul, float(n_tmp.text()))
-                    self.addLoadedCalcul({"id_calcul": id_calcul, "calculation_type": "thermoHydro"})
-
-                n_disc = n_disc.nextSiblingElement("disc")
-
-            ### Ducts
-            elif isinstance(dd, Duct) and not n_hduct.isNull():
-                e_hduct = n_hduct.toElement()
-
-                # Average TR
-                n_tmp = e_hduct.firstChildElement("averageTR_K")
-                if not n_tmp.isNull():
-                    dd.setAverageTR(id_calcul, float(n_tmp.text()))
-                    self.addLoadedCalcul({"id_calcul": id_calcul, "calculation_type": "thermoHydro"})
-
-                # Average velocity
-                n_tmp = e_hduct.firstChildElement("averageVelocity_m.s-1")
-                if not n_tmp.isNull():
-                    dd.setAverageVelocity(id_calcul, float(n_tmp.text()))
-                    self.addLoadedCalcul({"id_calcul": id_calcul, "calculation_type": "thermoHydro"})
-
-                n_hduct = n_hduct.nextSiblingElement("duct")
-
-            ### Pressboards
-            elif isinstance(dd, Pressboard) and not n_pressboard.isNull():
-                e_pressboard = n_pressboard.toElement()
-
-                # Average TR
-                n_tmp = e_pressboard.firstChildElement("averageTR_K")
-                if not n_tmp.isNull():
-                    dd.setAverageTR(id_calcul, float(n_tmp.text()))
-                    self.addLoadedCalcul({"id_calcul": id_calcul, "calculation_type": "thermoHydro"})
-
-                # Max TR
-                n_tmp = e_pressboard.firstChildElement("maxTR_K")
-                if not n_tmp.isNull():
-                    dd.setMaxTemp(id_calcul, float(n_tmp.text()))
-                    self.addLoadedCalcul({"id_calcul": id_calcul, "calculation_type": "thermoHydro"})
-
-                n_pressboard = n_pressboard.nextSiblingElement("pressboard")
-
-    def loadXMLTree(self, coil_elt):
-        """
-        Chargement de l'arbre XML
+        # La géométrie a déjà été chargée par loadStack
+        stack = self.stack
+
+        def loadResult(e_item, tag, name, k):
+            n_tmp = e_item.firstChildElement(tag)
+            if not n_tmp.isNull():
+                stack.setResult(id_calcul, name, k, float(n_tmp.text()))
+                self.addLoadedCalcul({"id_calcul": id_calcul, "calculation_type": "thermoHydro"})
+
+        ### Discs
+        # Pertes lues puis appliquées à toute la coil en une opération
+        lst_index_loss = []
+        lst_loss_disc = []
+        n_disc = coil_elt.firstChildElement("discs").firstChildElement("disc")
+        for k in stack.getIndex(ITEM_DISC).tolist():
+            if n_disc.isNull():
+                break
+            e_disc = n_disc.toElement()
+
+            # Pertes
+            lst_loss = []
+            n_c = e_disc.firstChildElement("cable")
+            while not n_c.isNull():
+                lst_loss.append(float(n_c.toElement().firstChildElement("loss_W").text()))
+                n_c = n_c.nextSiblingElement("cable")
+            if len(lst_loss) > 0:
+                lst_index_loss.append(k)
+                lst_loss_disc.append(lst_loss)
+                self.addLoadedCalcul({"id_calcul": id_calcul, "calculation_type": "loss"})
+
+            loadResult(e_disc, "averageTR_K", "averageTR", k)
+            loadResult(e_disc, "maxTR_K", "maxTR", k)
+            n_disc = n_disc.nextSiblingElement("disc")
+
+        if len(lst_index_loss) > 0:
+            loss = full((len(lst_loss_disc), max(len(l) for l in lst_loss_disc)), nan)
+            for row, lst_loss in zip(loss, lst_loss_disc):
+                row[:len(lst_loss)] = lst_loss
+            self.setLossArray(id_calcul, loss, "W", lst_index_loss)
+
+        ### Ducts
+        n_hduct = coil_elt.firstChildElement("horizontal_ducts").firstChildElement("duct")
+        for k in stack.getIndex(ITEM_DUCT).tolist():
+            if n_hduct.isNull():
+                break
+            e_hduct = n_hduct.toElement()
+            loadResult(e_hduct, "averageTR_K", "averageTR", k)
+            loadResult(e_hduct, "averageVelocity_m.s-1", "averageVelocity", k)
+            n_hduct = n_hduct.nextSiblingElement("duct")
+
+        ### Pressboards
+        n_pressboard = coil_elt.firstChildElement("pressboards").firstChildElement("pressboard")
+        for k in stack.getIndex(ITEM_PRESSBOARD).tolist():
+            if n_pressboard.isNull():
+                break
+            e_pressboard = n_pressboard.toElement()
+            loadResult(e_pressboard, "averageTR_K", "averageTR", k)
+            loadResult(e_pressboard, "maxTR_K", "maxTR", k)
+            n_pressboard = n_pressboard.nextSiblingElement("pressboard")
+
+        self.refreshOverlay(id_calcul)
+
+    def getArraysResult(self):
         """
-        # Chargement à partir de l'élément de bobine
-        # Un setCoilData a déjà été fait par coilDefinition
+        Résultats de tous les calculs sous forme de tableaux (cf. CoilResults.getArrays)
+        A écrire dans le ttx (TTXWriter.writeArrays) ou à côté (CoilResults.saveArrays)
+        """
+        return self.stack.results.getArrays()
 
-        ### Duct verticaux
-        e_vd = coil_elt.firstChildElement("vertical_ducts")
-        lst_tmp = []
-        n = e_vd.firstChildElement("duct")
-        while not n.isNull():
-            e_duct = n.toElement()
-            d_tmp = {"t_duct": float(e_duct.firstChildElement("t_duct_m").text())*1e3, \
-                     "r_center": float(e_duct.firstChildElement("r_center_m").text())*1e3}
-            lst_tmp.append(d_tmp)
-            n = n.nextSiblingElement("duct")
-
-        lst_tmp = sorted(lst_tmp, key = lambda i: i['r_center'])
+    def loadArraysResult(self, dict_arr):
+        """
+        Chargement des résultats lus par TTXReader.readArrays ou CoilResults.loadArrays (projetés en mémoire)
+        La géométrie a déjà été chargée par loadStack
+        """
+        results = self.stack.results
+        results.setArrays(dict_arr)
+        for id_calcul in results.getIds():
+            slot = results.getSlot(id_calcul)
+            if (results.dict_arr["loss_n"][slot] >= 0).any():
+                self.addLoadedCalcul({"id_calcul": id_calcul, "calculation_type": "loss"})
+            elif any((~isnan(results.dict_arr[name][slot])).any() for name in CoilResults.LST_SCALAR):
+                self.addLoadedCalcul({"id_calcul": id_calcul, "calculation_type": "thermoHydro"})
+            self.refreshOverlay(id_calcul)
+
+    def getMaxDifference(self, name, id_a, id_b):
+        """
+        Plus grand écart de la grandeur name entre deux calculs chargés : (écart, vue sur l'élément)
+        """
+        diff, k = self.stack.results.getMaxDifference(name, id_a, id_b)
+        if k is None:
+            return None, None
+        return diff, self.lst_center[k]
+
+    def getStackArrays(self):
+        """
+        Description colonnaire de l'empilement (du bas vers le haut), longueurs en m
+        kind : 0 disc, 1 duct, 2 pressboard ; oil_guides : 0 no, 1 inner, 2 outer
+        disc_type : indice dans disc_types (-1 si pas un disc)
+        """
+        if self.inner_duct == None or self.outer_duct == None:
+            return None
+
+        view = self.view
+        kind = self.stack.kind.copy()
+
+        # Types de disc renumérotés dans l'ordre d'apparition
+        idx_discs = flatnonzero(kind == ITEM_DISC)
+        arr_name = array([d["name"] for d in self.lst_type_desc], dtype=str)[view["type"][idx_discs]]
+        lst_types, first, inverse = unique(arr_name, return_index=True, return_inverse=True)
+        order = argsort(first, kind="stable")
+        rank = zeros(order.shape[0], dtype=int16)
+        rank[order] = arange(order.shape[0])
+        disc_type = full(kind.shape[0], -1, dtype=int16)
+        disc_type[idx_discs] = rank[inverse]
+        lst_types = lst_types[order].tolist()
+
+        oil_guides = view["guides"].astype(int8)
+        oil_guides[kind == ITEM_DUCT] = GUIDE_NO
+
+        return {"width_m": array([self.disc_width*1e-3]), \
+                "vertical_ducts_m": array([[self.inner_duct.thickness, self.inner_duct.x_center], \
+                                           [self.outer_duct.thickness, self.outer_duct.x_center]])*1e-3, \
+                "kind": kind, "thickness_m": view["thickness"]*1e-3, "z_center_m": -view["y"]*1e-3, \
+                "disc_type": disc_type, "disc_types": array(lst_types, dtype=str), "oil_guides": oil_guides}
+
+    def loadStackArrays(self, dict_stack):
+        """
+        Chargement de l'empilement à partir de sa description colonnaire (cf. getStackArrays)
+        """
+        vd = dict_stack["vertical_ducts_m"]*1e3
+        lst_vduct = [{"t_duct": vd[k, 0], "r_center": vd[k, 1]} for k in range(vd.shape[0])]
+
+        kind = dict_stack["kind"]
+        thickness = dict_stack["thickness_m"]*1e3
+        z_center = dict_stack["z_center_m"]*1e3
+        lst_types = [str(t) for t in dict_stack["disc_types"]]
+
+        lst_item = []
+        lst_hduct = []
+        for k in range(kind.shape[0]):
+            if kind[k] == ITEM_DISC:
+                lst_item.append({"item": "disc", "type": lst_types[dict_stack["disc_type"][k]], \
+                                 "z_center": z_center[k], "oil_guides": LST_GUIDE_NAME[dict_stack["oil_guides"][k]]})
+            elif kind[k] == ITEM_PRESSBOARD:
+                lst_item.append({"item": "pressboard", "t_pressboard": thickness[k], \
+                                 "z_center": z_center[k], "oil_guides": LST_GUIDE_NAME[dict_stack["oil_guides"][k]]})
+            else:
+                lst_hduct.append({"t_duct": thickness[k], "z_center": z_center[k]})
+
+        self.loadStack(lst_vduct, lst_item, lst_hduct)
+
+    def loadVerticalDucts(self, lst_vduct):
+        lst_tmp = sorted(lst_vduct, key = lambda i: i['r_center'])
         if len(lst_tmp) > 0:
             self.inner_duct.setSize(None, lst_tmp[0]["t_duct"])
             if len(lst_tmp) > 1:
                 self.outer_duct.setSize(None, lst_tmp[1]["t_duct"])
 
-        ### Discs & Pressboard
-        lst_tmp = []
-        # Discs
-        e_d = coil_elt.firstChildElement("discs")
-        n = e_d.firstChildElement("disc")
-        while not n.isNull():
-            e_disc = n.toElement()
-            d_tmp = {"item": "disc", \
-                     "type": e_disc.firstChildElement("type").text(), \
-                     "z_center": float(e_disc.firstChildElement("z_center_m").text())*1e3, \
-                     "oil_guides": e_disc.firstChildElement("oil_guides").text()}
-            lst_tmp.append(d_tmp)
-            n = n.nextSiblingElement("disc")
-        # Pressboards
-        e_p = coil_elt.firstChildElement("pressboards")
-        n = e_p.firstChildElement("pressboard")
-        while not n.isNull():
-            e_pressboard = n.toElement()
-            d_tmp = {"item": "pressboard", \
-                     "t_pressboard": float(e_pressboard.firstChildElement("t_pressboard_m").text())*1e3, \
-                     "z_center": float(e_pressboard.firstChildElement("z_center_m").text())*1e3, \
-                     "oil_guides": e_pressboard.firstChildElement("oil_guides").text()}
-            lst_tmp.append(d_tmp)
-            n = n.nextSiblingElement("pressboard")
-        # On range tout ça
-        lst_tmp = sorted(lst_tmp, key = lambda i: i['z_center'])
-
-        # On parcourt la liste de disc et de pressboard
-        k_lst_center = 0
-        for kk in range(len(lst_tmp)):
-
-            if lst_tmp[kk]["item"] == "disc":
-                while not isinstance(self.lst_center[k_lst_center], Disc):
-                    k_lst_center = k_lst_center + 1
-                    if k_lst_center > len(self.lst_center):
-                        break
+    def getDictTypeId(self):
+        """
+        Types de disc par nom (le premier ui_disc d'un nom donné est retenu)
+        """
+        dict_type = {}
+        for ui_disc in reversed(self.lst_ui_disc):
+            dict_type[ui_disc.getDisc()["name"]] = self.getTypeId(ui_disc)
+        return dict_type
+
+    def loadStackBlocks(self, lst_vduct, lst_block):
+        """
+        Application de l'empilement chargé par blocs (cf. model.design.addStackRecord), longueurs en mm
+        Chaque motif est construit une fois puis répété
+        """
+        if self.inner_duct == None or self.outer_duct == None:
+            return
 
-                # On charge le 1er disc trouvé
-                ui_disc = [d for d in self.lst_ui_disc if d.getDisc()["name"] == lst_tmp[kk]["type"]]
-                if len(ui_disc) > 0:
-                    self.lst_center[k_lst_center].setDisc(ui_disc[0])
-                if lst_tmp[kk]["oil_guides"] == "inner":
-                    self.lst_center[k_lst_center].setInnerGuide()
-                elif lst_tmp[kk]["oil_guides"] == "outer":
-                    self.lst_center[k_lst_center].setOuterGuide()
+        self.loadVerticalDucts(lst_vduct)
+
+        dict_type = self.getDictTypeId()
+        id0 = self.getTypeId(self.lst_ui_disc[0])
+        dict_guides = {"inner": GUIDE_INNER, "outer": GUIDE_OUTER}
+
+        # kind, thickness, height, disc_type, guides
+        lst_arr = [[], [], [], [], []]
+        for block in lst_block:
+            lst_unit = [[], [], [], [], []]
+            for item in block["items"]:
+                if item["item"] == "disc":
+                    lst_val = [ITEM_DISC, item["t_disc"], self.disc_width, dict_type.get(item["type"], id0), \
+                               dict_guides.get(item["oil_guides"], GUIDE_NO)]
+                elif item["item"] == "pressboard":
+                    lst_val = [ITEM_PRESSBOARD, item["t_pressboard"], self.disc_width, -1, dict_guides.get(item["oil_guides"], GUIDE_NO)]
                 else:
-                    self.lst_center[k_lst_center].setInnerGuide(False)
-                    self.lst_center[k_lst_center].setOuterGuide(False)
+                    lst_val = [ITEM_DUCT, item["t_duct"], self.disc_width, -1, GUIDE_NO]
+                for lst, val in zip(lst_unit, lst_val):
+                    lst.append(val)
+            for lst, lst_val in zip(lst_arr, lst_unit):
+                lst.append(tile(array(lst_val, dtype=float), block["repeat"]))
 
-                k_lst_center = k_lst_center + 1
+        stack = CoilStack()
+        stack.setItems(*[concatenate(lst) if len(lst) > 0 else zeros(0) for lst in lst_arr])
+        self.updateDiscTypes(stack)
 
-            elif lst_tmp[kk]["item"] == "pressboard":
-                while not isinstance(self.lst_center[k_lst_center], Duct):
-                    k_lst_center = k_lst_center + 1
-                    if k_lst_center > len(self.lst_center):
-                        break
+        self.applyStack(stack)
 
-                # Pressboard
-                tmp_p = Pressboard(self)
-                tmp_p.setSize(self.disc_width, lst_tmp[kk]["t_pressboard"])
-                tmp_p.setInnerDuctThickness(self.inner_duct.thickness)
-                tmp_p.setOuterDuctThickness(self.outer_duct.thickness)
-                tmp_p.setFlag(QGraphicsItem.ItemIsSelectable, True)
-                tmp_p.setZValue(2)
-                if lst_tmp[kk]["oil_guides"] == "inner":
-                    tmp_p.setInnerGuide()
-                elif lst_tmp[kk]["oil_guides"] == "outer":
-                    tmp_p.setOuterGuide()
-                else:
-                    tmp_p.setInnerGuide(False)
-                    tmp_p.setOuterGuide(False)
-                self.scene_coil.addItem(tmp_p)
-                self.lst_center.insert(k_lst_center + 1, tmp_p)
+    def loadStack(self, lst_vduct, lst_item, lst_hduct):
+        """
+        Application de l'empilement chargé (XML ou colonnaire), longueurs en mm
+        """
+        # Chargement à partir de l'élément de bobine
+        # Un setCoilData a déjà été fait par coilDefinition
+        if self.inner_duct == None or self.outer_duct == None:
+            return
+
+        ### Duct verticaux
+        self.loadVerticalDucts(lst_vduct)
+
+        ### Discs & Pressboard
+        # Types de disc par nom
+        dict_type = self.getDictTypeId()
+        dict_guides = {"inner": GUIDE_INNER, "outer": GUIDE_OUTER}
+
+        # Fusion en une passe de l'empilement courant et de la liste de disc et de pressboard rangée suivant z
+        stack = self.stack
+        src = [arr.tolist() for arr in stack.getArrays()]
+        nb_src = len(src[0])
+        kind, thickness, height, disc_type, guides = [], [], [], [], []
+        lst_out = [kind, thickness, height, disc_type, guides]
+
+        def copyUntil(k_end):
+            for lst, lst_src in zip(lst_out, src):
+                lst.extend(lst_src[k_src:k_end])
+            return k_end
+
+        k_src = 0
+        # Un pressboard suivant un pressboard est inséré après le canal ajouté avec le premier
+        isNewDuct = False
+        for item in sorted(lst_item, key = lambda i: i['z_center']):
+
+            if item["item"] == "disc":
+                k = k_src
+                while k < nb_src and src[0][k] != ITEM_DISC:
+                    k = k + 1
+                if k >= nb_src:
+                    break
+                k_src = copyUntil(k + 1)
+                isNewDuct = False
+
+                # Type du disc (inchangé si inconnu) et chicanes
+                if item["type"] in dict_type:
+                    disc_type[-1] = dict_type[item["type"]]
+                guides[-1] = dict_guides.get(item["oil_guides"], GUIDE_NO)
+
+            elif item["item"] == "pressboard":
+                if not isNewDuct:
+                    k = k_src
+                    while k < nb_src and src[0][k] != ITEM_DUCT:
+                        k = k + 1
+                    if k >= nb_src:
+                        break
+                    k_src = copyUntil(k + 1)
 
-                # Canal supérieur
-                tmp_d = Duct(self)
-                tmp_d.setSize(self.disc_width, self.ep_duct_defaut)
-                tmp_d.setFlag(QGraphicsItem.ItemIsSelectable, True)
-                tmp_d.setZValue(1)
-                self.scene_coil.addItem(tmp_d)
-                self.lst_center.insert(k_lst_center + 2, tmp_d)
+                # Pressboard puis canal supérieur après le canal trouvé
+                for lst, val in zip(lst_out, [[ITEM_PRESSBOARD, ITEM_DUCT], [item["t_pressboard"], self.ep_duct_defaut], \
+                                              [self.disc_width, self.disc_width], [-1, -1], \
+                                              [dict_guides.get(item["oil_guides"], GUIDE_NO), GUIDE_NO]]):
+                    lst.extend(val)
+                isNewDuct = True
 
-                k_lst_center = k_lst_center + 2
+        copyUntil(nb_src)
+        stack = CoilStack()
+        stack.setItems(kind, thickness, height, disc_type, guides)
+        self.updateDiscTypes(stack)
 
         ### Duct horizontaux
-        lst_tmp = []
-        e_hd = coil_elt.firstChildElement("horizontal_ducts")
-        n = e_hd.firstChildElement("duct")
-        while not n.isNull():
-            e_duct = n.toElement()
-            d_tmp = {"t_duct": float(e_duct.firstChildElement("t_duct_m").text())*1e3, \
-                     "z_center": float(e_duct.firstChildElement("z_center_m").text())*1e3}
-            lst_tmp.append(d_tmp)
-            n = n.nextSiblingElement("duct")
-        lst_tmp = sorted(lst_tmp, key = lambda i: i['z_center'])
-
-        # Application
-        k_d = 0
-        for d in self.lst_center:
-            if isinstance(d, Duct) and k_d < len(lst_tmp):
-                d.setSize(None, lst_tmp[k_d]["t_duct"])
+        lst_tmp = sorted(lst_hduct, key = lambda i: i['z_center'])
+        idx_duct = stack.getIndex(ITEM_DUCT)[:len(lst_tmp)]
+        stack.thickness[idx_duct] = [d["t_duct"] for d in lst_tmp[:len(idx_duct)]]
 
-                k_d = k_d + 1
+        self.applyStack(stack)
 
-class Disc(QGraphicsRectItem):
+class CoilItem():
     """
-    Objet graphique représentant un disque
+    Elément de la partie centrale d'une bobine
+    Vue sur l'indice index des tableaux affichés par la bobine (Coil.view, mis à jour par Coil.updateCoil)
     """
+    kind = None
 
-    def __init__(self, coil, parent=None):
-        super().__init__(parent)
-
+    def __init__(self, coil, index):
         self.coil = coil
+        self.index = index
 
-        # Données
-        # Disc construit suivant x, bool_horizontal sens des cables
-        self.bool_horizontal = True
-        self.h_cable = 1.0
-        self.t_cable = 1.0
-        self.N_cables = 1
-        self.x_center = 0.0
-        self.y_center = 0.0
-        self.currentDescDisc = {}
-        self.discNumber = 0
-        self.ui_disc = None
+    @property
+    def x_center(self):
+        return self.coil.view["x"][self.index]
 
-        # Pour les résultats de calculs
-        self.dict_loss = {} # key=id_calcul ; data=liste des pertes en W par cable
-        self.dict_maxTR = {} # key=id_calcul ; data=max TR du disc
-        self.dict_averageTR = {} # key=id_calcul ; data=average TR du disc
+    @property
+    def y_center(self):
+        return self.coil.view["y"][self.index]
 
-        # Chicanes
-        self.inner_guide = False
-        self.outer_guide = False
-        self.inner_duct_thickness = 1.0
-        self.outer_duct_thickness = 1.0
+    @property
+    def height(self):
+        return self.coil.view["height"][self.index]
 
-        # Crayon fin par défaut
-        self.pen_defaut = QPen(Qt.black, 0.5)
-        self.pen_selected = QPen(Qt.red, 0.75, Qt.DashLine)
+    @property
+    def thickness(self):
+        return self.coil.view["thickness"][self.index]
 
-        # Font
-        self.font = QFont()
+    @property
+    def inner_guide(self):
+        return self.coil.view["guides"][self.index] == GUIDE_INNER
 
-        self.pen_used = self.pen_defaut # Par défaut
+    @property
+    def outer_guide(self):
+        return self.coil.view["guides"][self.index] == GUIDE_OUTER
+
+    def getResult(self, id_calcul, name):
+        return self.coil.stack.getResult(id_calcul, name, self.index)
 
     def removeLoadedCalcul(self, id_calcul=None):
         """
         Retrait d'un calcul des calculs chargés
         """
-        if id_calcul == None:
-            # On supprime tout
-            self.dict_loss = {}
-            self.dict_maxTR = {}
-            self.dict_averageTR = {}
-            return
+        self.coil.stack.clearResult(id_calcul, self.index)
 
-        if id_calcul in self.dict_loss.keys():
-            del self.dict_loss[id_calcul]
-        if id_calcul in self.dict_maxTR.keys():
-            del self.dict_maxTR[id_calcul]
-        if id_calcul in self.dict_averageTR.keys():
-            del self.dict_averageTR[id_calcul]
+    def setAverageTR(self, id_calcul, aveTR):
+        """
+        Définition du TR moyen de l'élément
+        """
+        self.coil.stack.setResult(id_calcul, "averageTR", self.index, aveTR)
 
-    def getLossCable(self, id_calcul, loss_unit="W"):
+    def getXYsize(self):
         """
-        Récupération des pertes par cable du disc
+        Renvoie les dimensions en X et Y (x=height ; y=thickness)
         """
-        if not id_calcul in self.dict_loss:
-            return None
+        return [self.height, self.thickness]
 
-        if loss_unit == "W":
-            return self.dict_loss[id_calcul]
+    def execMenu(self, screenPos):
+        pass
 
-        elif loss_unit == "W/m3":
-            # Section de cuivre par cable du disc
-            Sc = self.currentDescDisc['cable_origin']['N_strands']*self.currentDescDisc['cable_origin']['h_strand']*self.currentDescDisc['cable_origin']['t_strand']*1e-6
+class Disc(CoilItem):
+    """
+    Vue sur un disque
+    """
+    kind = ITEM_DISC
+
+    @property
+    def ui_disc(self):
+        return self.coil.lst_type_ui[self.coil.view["type"][self.index]]
 
-            resu = []
-            for nc in range(self.N_cables):
-                # Rayon du cable
-                Rc = self.coil.ui_coil.getInnerRadius()*1e-3 + (nc + 0.5)*self.h_cable*1e-3
-                # Volume de cuivre du cable
-                Vc = Sc*2*pi*Rc
+    @property
+    def currentDescDisc(self):
+        return self.coil.lst_type_desc[self.coil.view["type"][self.index]]
 
-                # Enregistrement en W
-                resu.append(self.dict_loss[id_calcul][nc]/Vc)
+    @property
+    def discNumber(self):
+        return int(self.coil.view["number"][self.index])
 
-            # Renvoi en W/m3
-            return resu
+    @property
+    def h_cable(self):
+        return self.currentDescDisc["h_cable"]
 
-        else:
-            raise Exception("Unite des pertes inconnue")
+    @property
+    def t_cable(self):
+        return self.currentDescDisc["t_cable"]
+
+    @property
+    def N_cables(self):
+        return self.currentDescDisc["N_cables"]
+
+    def getCopperVolume(self):
+        """
+        Volumes de cuivre par cable du disc (m3), cf. Coil.getCopperVolumes
+        """
+        return self.coil.getCopperVolumes([self.index])[0, :self.N_cables].tolist()
+
+    def getLossCable(self, id_calcul, loss_unit="W"):
+        """
+        Récupération des pertes par cable du disc
+        """
+        if self.coil.stack.getLossCable(id_calcul, self.index) is None:
+            return None
+
+        return self.coil.getLossArray(id_calcul, loss_unit, [self.index])[0, :self.N_cables].tolist()
 
     def setLossCable(self, id_calcul, lst_loss, loss_unit="W"):
         """
@@ -1246,56 +2371,28 @@ class Disc(QGraphicsRectItem):
 
         if len(lst_loss) == 0:
             # Reset des pertes
-            self.dict_loss[id_calcul] = lst_loss
+            self.coil.stack.setLossCable(id_calcul, self.index, [])
             return
 
         if len(lst_loss) != self.N_cables:
             raise Exception("Incoherence entre la liste des pertes et le nombre de cables")
 
-        if loss_unit == "W":
-            self.dict_loss[id_calcul] = lst_loss
-
-        elif loss_unit == "W/m3":
-            # Section de cuivre par cable du disc
-            Sc = self.currentDescDisc['cable_origin']['N_strands']*self.currentDescDisc['cable_origin']['h_strand']*self.currentDescDisc['cable_origin']['t_strand']*1e-6
-
-            self.dict_loss[id_calcul] = []
-            for nc in range(self.N_cables):
-                # Rayon du cable
-                Rc = self.coil.ui_coil.getInnerRadius()*1e-3 + (nc + 0.5)*self.h_cable*1e-3
-                # Volume de cuivre du cable
-                Vc = Sc*2*pi*Rc
-
-                # Enregistrement en W
-                self.dict_loss[id_calcul].append(lst_loss[nc]*Vc)
-
-        else:
-            raise Exception("Unite des pertes inconnue")
+        self.coil.setLossArray(id_calcul, [lst_loss], loss_unit, [self.index])
 
     def getLossDisc(self, id_calcul, loss_unit="W"):
         """
         Récupération des pertes du disc
         """
-        if not id_calcul in self.dict_loss:
+        lst_loss = self.coil.stack.getLossCable(id_calcul, self.index)
+        if lst_loss is None:
             return None
 
         if loss_unit == "W":
-            return sum(self.dict_loss[id_calcul])
+            return sum(lst_loss)
 
         elif loss_unit == "W/m3":
-            # Section de cuivre par cable du disc
-            Sc = self.currentDescDisc['cable_origin']['N_strands']*self.currentDescDisc['cable_origin']['h_strand']*self.currentDescDisc['cable_origin']['t_strand']*1e-6
-
-            # Volume de cuivre du disc
-            Vc_disc = 0
-            for nc in range(self.N_cables):
-                # Rayon du cable
-                Rc = self.coil.ui_coil.getInnerRadius()*1e-3 + (nc + 0.5)*self.h_cable*1e-3
-                # Volume de cuivre
-                Vc_disc = Vc_disc + Sc*2*pi*Rc
-
             # Renvoi en W/m3
-            return sum(self.dict_loss[id_calcul])/Vc_disc
+            return sum(lst_loss)/sum(self.getCopperVolume())
 
         else:
             raise Exception("Unite des pertes inconnue")
@@ -1304,250 +2401,32 @@ class Disc(QGraphicsRectItem):
         """
         Définition des pertes (en W) par cable uniformément sur le disc à partir de la valeur globale
         """
-
         # Les pertes volumiques sont uniformes sur tous les cables
-        if loss_unit == "W":
-            # Section de cuivre par cable du disc
-            Sc = self.currentDescDisc['cable_origin']['N_strands']*self.currentDescDisc['cable_origin']['h_strand']*self.currentDescDisc['cable_origin']['t_strand']*1e-6
-
-            # Volume de cuivre du disc
-            Vc_disc = 0
-            for nc in range(self.N_cables):
-                # Rayon du cable
-                Rc = self.coil.ui_coil.getInnerRadius()*1e-3 + (nc + 0.5)*self.h_cable*1e-3
-                # Volume de cuivre
-                Vc_disc = Vc_disc + Sc*2*pi*Rc
-
-            # Pertes volumiques du disc
-            loss_disc_volumic = loss_disc/Vc_disc
-
-        elif loss_unit == "W/m3":
-            loss_disc_volumic = loss_disc
-
-        else:
-            raise Exception("Unite des pertes inconnue")
-
-        # Application
-        lst_loss = [loss_disc_volumic]*self.N_cables
-        self.setLossCable(id_calcul, lst_loss, "W/m3")
-
-    def setAverageTR(self, id_calcul, aveTR):
-        """
-        Définition du TR moyen du disque
-        """
-        self.dict_averageTR[id_calcul] = aveTR
+        self.coil.setLossArray(id_calcul, [loss_disc], loss_unit, [self.index])
 
     def setMaxTemp(self, id_calcul, maxTR):
         """
         Définition du TR max du disque
         """
-        self.dict_maxTR[id_calcul] = maxTR
-
-    def setDiscNumber(self, number):
-        """
-        Definition du numero du disc
-        """
-        self.discNumber = number
-        self.setToolTip("Disc n°" + "%i"%self.discNumber)
+        self.coil.stack.setResult(id_calcul, "maxTR", self.index, maxTR)
 
-    def setDisc(self, ui_disc):
+    def execMenu(self, screenPos):
         """
-        Changement du type de disque
+        Menu contextuel des discs sélectionnés
         """
-        self.ui_disc = ui_disc
-        self.updateDisc()
-
-    def updateDisc(self):
-        """
-        MAJ de la description du disc
-        """
-        desc_disc = self.ui_disc.getDisc()
-        if desc_disc != {}:
-            self.currentDescDisc = desc_disc
-            self.setSize(self.currentDescDisc["h_cable"], self.currentDescDisc["t_cable"], self.currentDescDisc["N_cables"])
-        else:
-            self.currentDescDisc = {}
-            self.coil.resetAll()
+        # Création du menu
+        menu = QMenu()
 
-    def setSize(self, h_cable, t_cable, N_cables):
-        self.prepareGeometryChange()
-        self.h_cable = h_cable
-        self.t_cable = t_cable
-        self.N_cables = N_cables
-        self.font.setPointSizeF(0.7*min(self.h_cable, self.t_cable))
-
-    def setInnerGuide(self, bool_guide=None):
-        """
-        Placement d'une chicane à l'interieur
-            True : mettre la chicane
-            False : enlever la chicane
-            None : inverse de la situation courante
-        Il ne peut pas y avoir simultanément des chicanes à l'intérieur et à l'extérieur
-        """
-        if bool_guide == None:
-            bool_guide = not self.inner_guide
-
-        self.prepareGeometryChange()
-        if self.outer_guide and bool_guide:
-            # On retire la chicane exterieure
-            self.outer_guide = False
-        self.inner_guide = bool_guide
-
-    def setOuterGuide(self, bool_guide=None):
-        """
-        Placement d'une chicane à l'exterieur
-            True : mettre la chicane
-            False : enlever la chicane
-            None : inverse de la situation courante
-        Il ne peut pas y avoir simultanément des chicanes à l'intérieur et à l'extérieur
-        """
-        if bool_guide == None:
-            bool_guide = not self.outer_guide
-        self.prepareGeometryChange()
-        if self.inner_guide and bool_guide:
-            # On retire la chicane interieure
-            self.inner_guide = False
-        self.outer_guide = bool_guide
-
-    def setInnerDuctThickness(self, inner_duct_thickness):
-        self.prepareGeometryChange()
-        self.inner_duct_thickness = inner_duct_thickness
-
-    def setOuterDuctThickness(self, outer_duct_thickness):
-        self.prepareGeometryChange()
-        self.outer_duct_thickness = outer_duct_thickness
-
-    def setCenter(self, x_center, y_center):
-        self.prepareGeometryChange()
-        self.x_center = x_center
-        self.y_center = y_center
-
-    def rotate(self, bool_horizontal):
-        self.prepareGeometryChange()
-        self.bool_horizontal = bool_horizontal
-
-    def getXYsize(self):
-        """
-        Renvoie les dimensions en X et Y en tenant compte de l'orientation
-        """
-        if self.bool_horizontal:
-            # Cable horizontal
-            return [self.N_cables*self.h_cable, self.t_cable]
-        else:
-            # Cable vertical
-            return [self.N_cables*self.t_cable, self.h_cable]
-
-    @property
-    def height(self):
-        if self.bool_horizontal:
-            return self.N_cables*self.h_cable
-        else:
-            return self.N_cables*self.t_cable
-
-    @property
-    def thickness(self):
-        if self.bool_horizontal:
-            return self.t_cable
-        else:
-            return self.h_cable
-
-    def boundingRect(self):
-        [x_size, y_size] = self.getXYsize()
-
-        penWidth = self.pen_used.widthF()
-        tmp_graph = QRectF(self.x_center - x_size/2 - penWidth/2, self.y_center - y_size/2 - penWidth/2, x_size + penWidth, y_size + penWidth)
-        if self.inner_guide:
-            tmp_graph.adjust(-self.inner_duct_thickness, 0, self.inner_duct_thickness, 0)
-        if self.outer_guide:
-            tmp_graph.adjust(0, 0, self.outer_duct_thickness, 0)
-
-        return tmp_graph
-
-    def shape(self):
-        # Contour de la forme
-        self.path = QPainterPath()
-        self.path.addRect(self.boundingRect())
-        return self.path
-
-    def paint(self, painter, option, widget=None):
-
-        [x_size, y_size] = self.getXYsize()
-
-        # Point de départ
-        x = self.x_center - x_size/2
-        y = self.y_center - y_size/2
-        # Dimensions du cable
-        if self.bool_horizontal:
-            x_size_cable = self.h_cable
-            y_size_cable = self.t_cable
-        else:
-            x_size_cable = self.t_cable
-            y_size_cable = self.h_cable
-
-        # Crayon
-        if self.isSelected() and not self.coil.isFrozen:
-            painter.setPen(self.pen_selected)
-            self.pen_used = self.pen_selected
-        else:
-            painter.setPen(self.pen_defaut)
-            self.pen_used = self.pen_defaut
-
-        # Représentation des cables
-        painter.setBrush(self.currentDescDisc["color"])
-        for kk in range(self.N_cables):
-            tmp_graph = QRectF(x, y, x_size_cable, y_size_cable)
-            painter.drawRect(tmp_graph)
-            x = x + x_size_cable
-
-        # Numéro du disc
-        tmp_graph = QRectF(self.x_center - x_size/2 + 1, self.y_center - y_size/2, x_size_cable - 1, y_size_cable)
-        painter.setPen(self.pen_defaut)
-        painter.setFont(self.font)
-        painter.drawText(tmp_graph, Qt.AlignCenter | Qt.TextDontClip, "%i" % self.discNumber)
-        painter.setPen(self.pen_used)
-
-        # Représentation des chicanes
-        if self.inner_guide:
-            painter.setBrush(COLOR_oilGuide)
-            tmp_graph = QRectF(self.x_center - x_size/2 - self.inner_duct_thickness, y, self.inner_duct_thickness, y_size_cable/5)
-            painter.drawRect(tmp_graph)
-        if self.outer_guide:
-            painter.setBrush(COLOR_oilGuide)
-            tmp_graph = QRectF(self.x_center + x_size/2, y, self.outer_duct_thickness, y_size_cable/5)
-            painter.drawRect(tmp_graph)
-
-    def contextMenuEvent(self, event):
-        """
-        Menu contextuel lors d'un clic droit
-        """
-        if self.coil.isFrozen: return
-
-        # Si il n'y a personne de sélectionné, on sélectionne l'objet cliqué
-        if len(self.scene().selectedItems()) == 0:
-            self.setSelected(True)
-
-        # On n'affiche le menu que si on est sélectionné
-        if not self.isSelected():
-            return
-
-        # Création du menu
-        menu = QMenu()
-
-        # Infos diverses
-        layout = QVBoxLayout()
-        lbl = QLabel()
-        lbl.setText("Disc settings")
-        lbl.setStyleSheet("font-weight: bold")
-        lbl.setAlignment(Qt.AlignCenter)
-        layout.addWidget(lbl)
+        # Infos diverses
+        layout = QVBoxLayout()
+        lbl = QLabel()
+        lbl.setText("Disc settings")
+        lbl.setStyleSheet("font-weight: bold")
+        lbl.setAlignment(Qt.AlignCenter)
+        layout.addWidget(lbl)
 
         # Liste des discs sélectionnés
-        lst_num_selected = []
-        for d in self.scene().selectedItems():
-            if type(d) == type(self):
-                lst_num_selected.append(d.discNumber)
-
-        lst_num_selected = sorted(lst_num_selected)
+        lst_num_selected = sorted(self.coil.view["number"][self.coil.getSelectedIndex(Disc)].tolist())
         lst_deb_fin = []
         k_deb = 0
         for k in range(1, len(lst_num_selected)):
@@ -1613,150 +2492,122 @@ class Disc(QGraphicsRectItem):
         act = sub_pressboard.addAction("Insert under")
         act.triggered.connect(partial(self.coil.actInsertPressboard, "under", type(self)))
         act.triggered.connect(self.coil.isModified.emit)
+        # Bloc de motifs identiques contenant le disc
+        _, _, repeat = self.coil.stack.getBlockOf(self.index)
+        sub_block = menu.addMenu("Block (x%i)"%repeat)
+        act = sub_block.addAction("Select block")
+        act.triggered.connect(partial(self.coil.actSelectBlock, self.index))
+        act = sub_block.addAction("Repeat...")
+        act.triggered.connect(partial(self.coil.actRepeatBlock, self.index))
 
         # Changement de la couleur
         act = menu.addAction("Color")
         act.triggered.connect(partial(self.coil.actColorDisc, self.ui_disc))
 
         # Exécution
-        menu.exec_(event.screenPos())
+        menu.exec_(screenPos)
 
-class Duct(QGraphicsRectItem):
+class Duct(CoilItem):
     """
-    Objet graphique représentant un canal
+    Vue sur un canal horizontal
     """
+    kind = ITEM_DUCT
 
-    def __init__(self, coil, parent=None):
-        super().__init__(parent)
-
-        self.coil = coil
-
-        # Données (par défaut, x=height ; y=thickness)
-        self.bool_horizontal = True
-        self.height = 1.0
-        self.thickness = 1.0
-        self.x_center = 0.0
-        self.y_center = 0.0
-
-        # Pour les résultats de calculs
-        self.dict_averageVelocity = {} # key=id_calcul ; data=average velocity du duct
-        self.dict_averageTR = {} # key=id_calcul ; data=average TR du duct
-
-        # Crayon fin par défaut
-        self.pen_defaut = QPen(Qt.NoPen)
-        self.pen_defaut.setWidth(0.)
-        self.pen_selected = QPen(Qt.red, 0.75, Qt.DashLine)
-
-        self.pen_used = self.pen_defaut # Par défaut
-
-    def removeLoadedCalcul(self, id_calcul=None):
-        """
-        Retrait d'un calcul des calculs chargés
-        """
-        if id_calcul == None:
-            # On supprime tout
-            self.dict_averageVelocity = {}
-            self.dict_averageTR = {}
-            return
-
-        if id_calcul in self.dict_averageVelocity.keys():
-            del self.dict_averageVelocity[id_calcul]
-        if id_calcul in self.dict_averageTR.keys():
-            del self.dict_averageTR[id_calcul]
+    @property
+    def inner_guide(self):
+        return False
 
-    def setAverageTR(self, id_calcul, aveTR):
-        """
-        Définition du TR moyen du duct
-        """
-        self.dict_averageTR[id_calcul] = aveTR
+    @property
+    def outer_guide(self):
+        return False
 
     def setAverageVelocity(self, id_calcul, aveVelo):
         """
         Définition de la vitesse moyenne du duct
         """
-        self.dict_averageVelocity[id_calcul] = aveVelo
-
-    def setSize(self, height, thickness):
-        if height != None:
-            self.height = height
-        if thickness != None:
-            self.thickness = thickness
-
-    def setCenter(self, x_center, y_center):
-        self.prepareGeometryChange()
-        self.x_center = x_center
-        self.y_center = y_center
-
-    def rotate(self, bool_horizontal):
-        self.prepareGeometryChange()
-        self.bool_horizontal = bool_horizontal
+        self.coil.stack.setResult(id_calcul, "averageVelocity", self.index, aveVelo)
 
-    def getXYsize(self):
+    def execMenu(self, screenPos):
         """
-        Renvoie les dimensions en X et Y en tenant compte de l'orientation
+        Menu contextuel des canaux sélectionnés (horizontaux et verticaux)
         """
-        if self.bool_horizontal:
-            # Cable horizontal
-            return [self.height, self.thickness]
-        else:
-            # Cable vertical
-            return [self.thickness, self.height]
+        # Création du menu
+        menu = QMenu()
 
-    def boundingRect(self):
-        [x_size, y_size] = self.getXYsize()
+        # Infos diverses
+        lbl = QLabel()
+        lbl.setText("Duct settings")
+        lbl.setStyleSheet("font-weight: bold")
+        lbl.setAlignment(Qt.AlignCenter)
+        a = QWidgetAction(menu)
+        a.setDefaultWidget(lbl)
+        menu.addAction(a)
 
-        penWidth = self.pen_used.widthF()
-        tmp_graph = QRectF(self.x_center - x_size/2 - penWidth/2, self.y_center - y_size/2 - penWidth/2, x_size + penWidth, y_size + penWidth)
+        menu.addSeparator()
 
-        return tmp_graph
+        # Changement de l'épaisseur du canal
+        locale = QLocale("en")
+        locale.setNumberOptions(QLocale.RejectGroupSeparator)
+        validator_float = QDoubleValidator(1.0, 100.0, 3)
+        validator_float.setNotation(QDoubleValidator.StandardNotation) # Pas de notation scientifique
+        validator_float.setLocale(locale)
 
-    def shape(self):
-        # Contour de la forme
-        self.path = QPainterPath()
-        self.path.addRect(self.boundingRect())
-        return self.path
+        layout = QHBoxLayout()
+        lbl = QLabel()
+        lbl.setText("Thickness")
+        layout.addWidget(lbl)
 
-    def paint(self, painter, option, widget=None):
+        le = gui_utils.QLineEditFormat()
+        le.setDisplayFormat("%.2f")
+        le.setValidator(validator_float)
+        le.setText(self.thickness)
+        layout.addWidget(le)
 
-        [x_size, y_size] = self.getXYsize()
+        lbl = QLabel()
+        lbl.setText("mm")
+        layout.addWidget(lbl)
 
-        # Point de départ
-        x = self.x_center - x_size/2
-        y = self.y_center - y_size/2
+        wdg = QWidget()
+        wdg.setLayout(layout)
+        a = QWidgetAction(menu)
+        a.setDefaultWidget(wdg)
+        menu.addAction(a)
 
-        # Crayon
-        if self.isSelected() and not self.coil.isFrozen:
-            painter.setPen(self.pen_selected)
-            self.pen_used = self.pen_selected
-        else:
-            painter.setPen(self.pen_defaut)
-            self.pen_used = self.pen_defaut
+        # Changement de la couleur
+        act = menu.addAction("Color")
+        act.triggered.connect(partial(self.coil.actColorDuct, self))
+        act.triggered.connect(self.coil.isModified.emit)
 
-        # Mode de représentation simple
-        tmp_graph = QRectF(x, y, x_size, y_size)
-        painter.setBrush(self.coil.getColorDuctThickness(self.thickness))
-        painter.drawRect(tmp_graph)
+        # Connection
+        le.editingFinished.connect(partial(self.coil.actChangeThickness, le, Duct))
+        le.editingFinished.connect(self.coil.isModified.emit)
+        le.editingFinished.connect(menu.close)
 
-    def contextMenuEvent(self, event):
-        """
-        Menu contextuel lors d'un clic droit
-        """
-        if self.coil.isFrozen: return
+        # Exécution
+        menu.exec_(screenPos)
 
-        # Si il n'y a personne de sélectionné, on sélectionne l'objet cliqué
-        if len(self.scene().selectedItems()) == 0:
-            self.setSelected(True)
+class Pressboard(CoilItem):
+    """
+    Vue sur un carton
+    """
+    kind = ITEM_PRESSBOARD
 
-        # On n'affiche le menu que si on est sélectionné
-        if not self.isSelected():
-            return
+    def setMaxTemp(self, id_calcul, maxTR):
+        """
+        Définition du TR max du carton
+        """
+        self.coil.stack.setResult(id_calcul, "maxTR", self.index, maxTR)
 
+    def execMenu(self, screenPos):
+        """
+        Menu contextuel des cartons sélectionnés
+        """
         # Création du menu
         menu = QMenu()
 
         # Infos diverses
         lbl = QLabel()
-        lbl.setText("Duct settings")
+        lbl.setText("Pressboard settings")
         lbl.setStyleSheet("font-weight: bold")
         lbl.setAlignment(Qt.AlignCenter)
         a = QWidgetAction(menu)
@@ -1793,9 +2644,27 @@ class Duct(QGraphicsRectItem):
         a.setDefaultWidget(wdg)
         menu.addAction(a)
 
+        # Chicanes
+        sub_chgDisc = menu.addMenu("Oil guide")
+        act = sub_chgDisc.addAction("Inner")
+        act.triggered.connect(partial(self.coil.actOilGuide, "inner", type(self)))
+        act.triggered.connect(self.coil.isModified.emit)
+        act = sub_chgDisc.addAction("Outer")
+        act.triggered.connect(partial(self.coil.actOilGuide, "outer", type(self)))
+        act.triggered.connect(self.coil.isModified.emit)
+        if self.inner_guide or self.outer_guide:
+            act = sub_chgDisc.addAction("Remove")
+            act.triggered.connect(partial(self.coil.actOilGuide, "remove", type(self)))
+            act.triggered.connect(self.coil.isModified.emit)
+
         # Changement de la couleur
         act = menu.addAction("Color")
-        act.triggered.connect(partial(self.coil.actColorDuct, self))
+        act.triggered.connect(partial(self.coil.actColorPressboard, self))
+
+        # Pour la suppression du carton
+        menu.addSeparator()
+        act = menu.addAction("Remove pressboard")
+        act.triggered.connect(partial(self.coil.actRemove, type(self)))
         act.triggered.connect(self.coil.isModified.emit)
 
         # Connection
@@ -1804,11 +2673,11 @@ class Duct(QGraphicsRectItem):
         le.editingFinished.connect(menu.close)
 
         # Exécution
-        menu.exec_(event.screenPos())
+        menu.exec_(screenPos)
 
-class Pressboard(QGraphicsRectItem):
+class VerticalDuct(QGraphicsRectItem):
     """
-    Objet graphique représentant un carton
+    Objet graphique représentant un canal vertical (intérieur ou extérieur), hors empilement
     """
 
     def __init__(self, coil, parent=None):
@@ -1816,56 +2685,21 @@ class Pressboard(QGraphicsRectItem):
 
         self.coil = coil
 
-        # Données (par défaut, x=height ; y=thickness)
-        self.bool_horizontal = True
+        # Données (x=thickness ; y=height)
         self.height = 1.0
         self.thickness = 1.0
         self.x_center = 0.0
         self.y_center = 0.0
 
-        # Chicanes
-        self.inner_guide = False
-        self.outer_guide = False
-        self.inner_duct_thickness = 1.0
-        self.outer_duct_thickness = 1.0
-
-        # Pour les résultats de calculs
-        self.dict_maxTR = {} # key=id_calcul ; data=max TR du disc
-        self.dict_averageTR = {} # key=id_calcul ; data=average TR du disc
-
         # Crayon fin par défaut
-        self.pen_defaut = QPen(Qt.black, 0.5)
+        self.pen_defaut = QPen(Qt.NoPen)
+        self.pen_defaut.setWidth(0.)
         self.pen_selected = QPen(Qt.red, 0.75, Qt.DashLine)
 
         self.pen_used = self.pen_defaut # Par défaut
-        self.setToolTip("Pressboard")
-
-    def removeLoadedCalcul(self, id_calcul=None):
-        """
-        Retrait d'un calcul des calculs chargés
-        """
-        if id_calcul == None:
-            # On supprime tout
-            self.dict_maxTR = {}
-            self.dict_averageTR = {}
-            return
 
-        if id_calcul in self.dict_maxTR.keys():
-            del self.dict_maxTR[id_calcul]
-        if id_calcul in self.dict_averageTR.keys():
-            del self.dict_averageTR[id_calcul]
-
-    def setAverageTR(self, id_calcul, aveTR):
-        """
-        Définition du TR moyen du disque
-        """
-        self.dict_averageTR[id_calcul] = aveTR
-
-    def setMaxTemp(self, id_calcul, maxTR):
-        """
-        Définition du TR max du disque
-        """
-        self.dict_maxTR[id_calcul] = maxTR
+    # Même menu que les canaux horizontaux
+    execMenu = Duct.execMenu
 
     def setSize(self, height, thickness):
         self.prepareGeometryChange()
@@ -1874,74 +2708,15 @@ class Pressboard(QGraphicsRectItem):
         if thickness != None:
             self.thickness = thickness
 
-    def setInnerGuide(self, bool_guide=None):
-        """
-        Placement d'une chicane à l'interieur
-            True : mettre la chicane
-            False : enlever la chicane
-            None : inverse de la situation courante
-        Il ne peut pas y avoir simultanément des chicanes à l'intérieur et à l'extérieur
-        """
-        if bool_guide == None:
-            bool_guide = not self.inner_guide
-
-        self.prepareGeometryChange()
-        if self.outer_guide and bool_guide:
-            # On retire la chicane exterieure
-            self.outer_guide = False
-        self.inner_guide = bool_guide
-
-    def setOuterGuide(self, bool_guide=None):
-        """
-        Placement d'une chicane à l'exterieur
-            True : mettre la chicane
-            False : enlever la chicane
-            None : inverse de la situation courante
-        Il ne peut pas y avoir simultanément des chicanes à l'intérieur et à l'extérieur
-        """
-        if bool_guide == None:
-            bool_guide = not self.outer_guide
-        self.prepareGeometryChange()
-        if self.inner_guide and bool_guide:
-            # On retire la chicane interieure
-            self.inner_guide = False
-        self.outer_guide = bool_guide
-
-    def setInnerDuctThickness(self, inner_duct_thickness):
-        self.prepareGeometryChange()
-        self.inner_duct_thickness = inner_duct_thickness
-
-    def setOuterDuctThickness(self, outer_duct_thickness):
-        self.prepareGeometryChange()
-        self.outer_duct_thickness = outer_duct_thickness
-
     def setCenter(self, x_center, y_center):
         self.prepareGeometryChange()
         self.x_center = x_center
         self.y_center = y_center
 
-    def getXYsize(self):
-        """
-        Renvoie les dimensions en X et Y en tenant compte de l'orientation
-        """
-        if self.bool_horizontal:
-            # Cable horizontal
-            return [self.height, self.thickness]
-        else:
-            # Cable vertical
-            return [self.thickness, self.height]
-
     def boundingRect(self):
-        [x_size, y_size] = self.getXYsize()
-
         penWidth = self.pen_used.widthF()
-        tmp_graph = QRectF(self.x_center - x_size/2 - penWidth/2, self.y_center - y_size/2 - penWidth/2, x_size + penWidth, y_size + penWidth)
-        if self.inner_guide:
-            tmp_graph.adjust(-self.inner_duct_thickness, 0, self.inner_duct_thickness, 0)
-        if self.outer_guide:
-            tmp_graph.adjust(0, 0, self.outer_duct_thickness, 0)
-
-        return tmp_graph
+        return QRectF(self.x_center - self.thickness/2 - penWidth/2, self.y_center - self.height/2 - penWidth/2, \
+                      self.thickness + penWidth, self.height + penWidth)
 
     def shape(self):
         # Contour de la forme
@@ -1951,35 +2726,18 @@ class Pressboard(QGraphicsRectItem):
 
     def paint(self, painter, option, widget=None):
 
-        [x_size, y_size] = self.getXYsize()
-
-        # Point de départ
-        x = self.x_center - x_size/2
-        y = self.y_center - y_size/2
-
         # Crayon
         if self.isSelected() and not self.coil.isFrozen:
-            painter.setPen(self.pen_selected)
             self.pen_used = self.pen_selected
         else:
-            painter.setPen(self.pen_defaut)
             self.pen_used = self.pen_defaut
+        painter.setPen(self.pen_used)
 
-        # Carton
-        tmp_graph = QRectF(x, y, x_size, y_size)
-        painter.setBrush(self.coil.getColorPressboardThickness(self.thickness))
+        # Mode de représentation simple
+        tmp_graph = QRectF(self.x_center - self.thickness/2, self.y_center - self.height/2, self.thickness, self.height)
+        painter.setBrush(self.coil.getColorDuctThickness(self.thickness))
         painter.drawRect(tmp_graph)
 
-        # Représentation des chicanes
-        if self.inner_guide:
-            painter.setBrush(COLOR_oilGuide)
-            tmp_graph = QRectF(self.x_center - x_size/2 - self.inner_duct_thickness, y, self.inner_duct_thickness, y_size/5)
-            painter.drawRect(tmp_graph)
-        if self.outer_guide:
-            painter.setBrush(COLOR_oilGuide)
-            tmp_graph = QRectF(self.x_center + x_size/2, y, self.outer_duct_thickness, y_size/5)
-            painter.drawRect(tmp_graph)
-
     def contextMenuEvent(self, event):
         """
         Menu contextuel lors d'un clic droit
@@ -1994,78 +2752,278 @@ class Pressboard(QGraphicsRectItem):
         if not self.isSelected():
             return
 
-        # Création du menu
-        menu = QMenu()
+        self.execMenu(event.screenPos())
 
-        # Infos diverses
-        lbl = QLabel()
-        lbl.setText("Pressboard settings")
-        lbl.setStyleSheet("font-weight: bold")
-        lbl.setAlignment(Qt.AlignCenter)
-        a = QWidgetAction(menu)
-        a.setDefaultWidget(lbl)
-        menu.addAction(a)
+class CoilRenderer(QGraphicsItem):
+    """
+    Objet graphique dessinant toute la partie centrale d'une bobine à partir des tableaux de Coil.view
+    Le niveau de détail dépend de la taille à l'écran : cables et numéros ne sont dessinés que s'ils sont lisibles,
+    sinon un rectangle par élément, voire un rectangle par suite de discs de même type
+    La sélection est portée par élément (Coil.selection), l'objet est sélectionné si un élément l'est
+    """
 
-        menu.addSeparator()
+    # Seuils en pixels à l'écran
+    LOD_CABLE = 4.0 # épaisseur de disc minimale pour dessiner les cables
+    LOD_TEXT = 8.0 # épaisseur de cable minimale pour écrire le numéro des discs
+    LOD_MERGE = 1.0 # épaisseur moyenne d'élément en dessous de laquelle les discs sont regroupés
 
-        # Changement de l'épaisseur du canal
-        locale = QLocale("en")
-        locale.setNumberOptions(QLocale.RejectGroupSeparator)
-        validator_float = QDoubleValidator(1.0, 100.0, 3)
-        validator_float.setNotation(QDoubleValidator.StandardNotation) # Pas de notation scientifique
-        validator_float.setLocale(locale)
+    def __init__(self, coil, parent=None):
+        super().__init__(parent)
 
-        layout = QHBoxLayout()
-        lbl = QLabel()
-        lbl.setText("Thickness")
-        layout.addWidget(lbl)
+        self.coil = coil
+        self.rect = QRectF()
+        # Sélection modifiée par la bobine (et non par la scène)
+        self.isSelecting = False
+        # Dernier élément cliqué (sélection avec Shift) et élément survolé (inspecteur)
+        self.k_anchor = None
+        self.k_hover = None
+
+        # Crayons
+        self.pen_defaut = QPen(Qt.black, 0.5)
+        self.pen_selected = QPen(Qt.red, 0.75, Qt.DashLine)
+        self.pen_selectedLow = QPen(Qt.red, 1.0, Qt.DashLine)
+        self.pen_selectedLow.setCosmetic(True)
 
-        le = gui_utils.QLineEditFormat()
-        le.setDisplayFormat("%.2f")
-        le.setValidator(validator_float)
-        le.setText(self.thickness)
-        layout.addWidget(le)
+        self.setFlag(QGraphicsItem.ItemIsSelectable, True)
+        self.setFlag(QGraphicsItem.ItemIsFocusable, True)
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption, True)
+        self.setAcceptHoverEvents(True)
+
+    def setRect(self, rect):
+        rect = rect.adjusted(-1, -1, 1, 1)
+        if rect != self.rect:
+            self.prepareGeometryChange()
+            self.rect = rect
+
+    def boundingRect(self):
+        return self.rect
+
+    def setSelectedQuiet(self, isSelected):
+        self.isSelecting = True
+        self.setSelected(isSelected)
+        self.isSelecting = False
+
+    def itemChange(self, change, value):
+        if change == QGraphicsItem.ItemSelectedHasChanged and not self.isSelecting:
+            # Sélection par la scène : zone en cours, tout (Ctrl+A) ou rien
+            if not bool(value):
+                self.coil.selection = zeros(self.coil.selection.shape[0], dtype=bool)
+            elif not self.coil.rect_band is None:
+                self.coil.selection = self.coil.getIndexInRect(self.coil.rect_band)
+            else:
+                self.coil.selection = self.coil.getVisibleMask()
+            self.update()
+        return super().itemChange(change, value)
+
+    ### Souris et clavier
+    def mousePressEvent(self, event):
+        if event.button() != Qt.LeftButton:
+            event.ignore()
+            return
+        k = self.coil.getIndexAt(event.scenePos())
+        if k is None:
+            # Zone vide : sélection par zone
+            event.ignore()
+            return
+
+        selection = self.coil.selection.copy()
+        if event.modifiers() & Qt.ControlModifier:
+            selection[k] = not selection[k]
+        elif event.modifiers() & Qt.ShiftModifier and not self.k_anchor is None and self.k_anchor < selection.shape[0]:
+            k_min = min(k, self.k_anchor)
+            k_max = max(k, self.k_anchor)
+            selection[k_min:k_max + 1] = selection[k_min:k_max + 1] | self.coil.getVisibleMask()[k_min:k_max + 1]
+        else:
+            self.isSelecting = True
+            self.scene().clearSelection()
+            self.isSelecting = False
+            selection[:] = False
+            selection[k] = True
+        self.k_anchor = k
+        self.coil.setSelection(selection)
+        self.setFocus()
+        event.accept()
+
+    def mouseReleaseEvent(self, event):
+        event.accept()
+
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.SelectAll):
+            self.coil.setSelection(self.coil.getVisibleMask())
+            event.accept()
+        else:
+            event.ignore()
+
+    def hoverMoveEvent(self, event):
+        # Inspecteur affiché immédiatement, mis à jour seulement au changement d'élément survolé
+        k = self.coil.getIndexAt(event.scenePos())
+        if k != self.k_hover:
+            self.k_hover = k
+            if k is None:
+                QToolTip.hideText()
+            else:
+                QToolTip.showText(event.screenPos(), self.coil.getItemInfo(k), event.widget())
+
+    def hoverLeaveEvent(self, event):
+        self.k_hover = None
+        QToolTip.hideText()
+
+    def contextMenuEvent(self, event):
+        """
+        Menu contextuel lors d'un clic droit, suivant le type de l'élément cliqué
+        """
+        if self.coil.isFrozen: return
+
+        k = self.coil.getIndexAt(event.scenePos())
+        if k is None:
+            return
+
+        # Si il n'y a personne de sélectionné, on sélectionne l'élément cliqué
+        if len(self.scene().selectedItems()) == 0:
+            selection = zeros(self.coil.selection.shape[0], dtype=bool)
+            selection[k] = True
+            self.coil.setSelection(selection)
+
+        # On n'affiche le menu que si l'élément est sélectionné
+        if not self.coil.selection[k]:
+            return
 
-        lbl = QLabel()
-        lbl.setText("mm")
-        layout.addWidget(lbl)
+        self.coil.lst_center[k].execMenu(event.screenPos())
 
-        wdg = QWidget()
-        wdg.setLayout(layout)
-        a = QWidgetAction(menu)
-        a.setDefaultWidget(wdg)
-        menu.addAction(a)
+    ### Dessin
+    def getVisibleRange(self, rect):
+        """
+        Indices (début, fin) des éléments coupant la zone rect suivant z
+        """
+        return self.coil.getRangeBetween(-rect.bottom(), -rect.top())
 
-        # Chicanes
-        sub_chgDisc = menu.addMenu("Oil guide")
-        act = sub_chgDisc.addAction("Inner")
-        act.triggered.connect(partial(self.coil.actOilGuide, "inner", type(self)))
-        act.triggered.connect(self.coil.isModified.emit)
-        act = sub_chgDisc.addAction("Outer")
-        act.triggered.connect(partial(self.coil.actOilGuide, "outer", type(self)))
-        act.triggered.connect(self.coil.isModified.emit)
-        if self.inner_guide or self.outer_guide:
-            act = sub_chgDisc.addAction("Remove")
-            act.triggered.connect(partial(self.coil.actOilGuide, "remove", type(self)))
-            act.triggered.connect(self.coil.isModified.emit)
+    def getRects(self, lst_index, x_left, y_top, x_size, y_size):
+        return [QRectF(x_left[k], y_top[k], x_size[k], y_size[k]) for k in lst_index]
 
-        # Changement de la couleur
-        act = menu.addAction("Color")
-        act.triggered.connect(partial(self.coil.actColorPressboard, self))
+    def splitOverlay(self, idx, overlay):
+        """
+        Découpage des indices idx en éléments sans résultat superposé et groupes [(couleur, indices)] de même couleur
+        """
+        if overlay is None:
+            return idx, []
+        color = overlay[idx]
+        idx_value = idx[color >= 0]
+        color_value = color[color >= 0]
+        order = argsort(color_value, kind="stable")
+        idx_value = idx_value[order]
+        color_value = color_value[order]
+        lst_cut = flatnonzero(color_value[1:] != color_value[:-1]) + 1
+        return idx[color < 0], [(LST_COLOR_HEAT[int(c[0])], i) for c, i in zip(split(color_value, lst_cut), split(idx_value, lst_cut)) \
+                                if len(i) > 0]
 
-        # Pour la suppression du carton
-        menu.addSeparator()
-        act = menu.addAction("Remove pressboard")
-        act.triggered.connect(partial(self.coil.actRemove, type(self)))
-        act.triggered.connect(self.coil.isModified.emit)
+    def paint(self, painter, option, widget=None):
+        coil = self.coil
+        view = coil.view
+        if view["kind"].shape[0] == 0:
+            return
 
-        # Connection
-        le.editingFinished.connect(partial(self.coil.actChangeThickness, le, type(self)))
-        le.editingFinished.connect(self.coil.isModified.emit)
-        le.editingFinished.connect(menu.close)
+        # Pixels par mm et éléments exposés (QGraphicsScene.render n'utilise que le clip)
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        rect = option.exposedRect
+        if painter.hasClipping():
+            rect = rect.intersected(painter.clipBoundingRect())
+        k_start, k_end = self.getVisibleRange(rect)
+        if k_end <= k_start:
+            return
+        kind = view["kind"][k_start:k_end]
+        height = view["height"][k_start:k_end]
+        thickness = view["thickness"][k_start:k_end]
+        x_left = view["x"][k_start:k_end] - height/2
+        y_top = view["y"][k_start:k_end] - thickness/2
+        disc_type = view["type"][k_start:k_end]
+        guides = view["guides"][k_start:k_end]
+        overlay = coil.overlay_index[k_start:k_end] if not coil.overlay is None else None
+
+        idx_duct = flatnonzero(kind == ITEM_DUCT) if coil.dict_visible[ITEM_DUCT] else zeros(0, dtype=int)
+        idx_pressboard = flatnonzero(kind == ITEM_PRESSBOARD) if coil.dict_visible[ITEM_PRESSBOARD] else zeros(0, dtype=int)
+        idx_disc = flatnonzero(kind == ITEM_DISC) if coil.dict_visible[ITEM_DISC] else zeros(0, dtype=int)
+
+        # Niveau de détail
+        isDetailed = len(idx_disc) > 0 and lod*thickness[idx_disc].min() >= self.LOD_CABLE
+        isMerged = not isDetailed and lod*thickness.mean() < self.LOD_MERGE
+        pen = self.pen_defaut if isDetailed else QPen(Qt.NoPen)
+
+        ### Canaux (sans contour), par épaisseur ou par couleur du résultat superposé
+        painter.setPen(Qt.NoPen)
+        idx_plain, lst_overlay = self.splitOverlay(idx_duct, overlay)
+        thick_duct = thickness[idx_plain]
+        for thick in unique(thick_duct):
+            painter.setBrush(coil.getColorDuctThickness(float(thick)))
+            painter.drawRects(self.getRects(idx_plain[thick_duct == thick].tolist(), x_left, y_top, height, thickness))
+        for color, idx in lst_overlay:
+            painter.setBrush(color)
+            painter.drawRects(self.getRects(idx.tolist(), x_left, y_top, height, thickness))
+
+        ### Cartons, par épaisseur ou par couleur du résultat superposé
+        painter.setPen(pen)
+        idx_plain, lst_overlay = self.splitOverlay(idx_pressboard, overlay)
+        thick_pressboard = thickness[idx_plain]
+        for thick in unique(thick_pressboard):
+            painter.setBrush(coil.getColorPressboardThickness(float(thick)))
+            painter.drawRects(self.getRects(idx_plain[thick_pressboard == thick].tolist(), x_left, y_top, height, thickness))
+        for color, idx in lst_overlay:
+            painter.setBrush(color)
+            painter.drawRects(self.getRects(idx.tolist(), x_left, y_top, height, thickness))
+
+        ### Discs, par type puis par couleur du résultat superposé
+        type_disc = disc_type[idx_disc]
+        for t_id in unique(type_disc).tolist():
+            desc = coil.lst_type_desc[t_id]
+            idx_plain, lst_overlay = self.splitOverlay(idx_disc[type_disc == t_id], overlay)
+            for color, idx in [(desc["color"], idx_plain)] + lst_overlay:
+                if len(idx) > 0:
+                    painter.setBrush(color)
+                    if isMerged and overlay is None:
+                        # Suites de discs consécutifs de même type : un seul rectangle du bas du premier au haut du dernier
+                        is_start = concatenate([[True], (disc_type[idx_disc][1:] != disc_type[idx_disc][:-1])])
+                        is_end = concatenate([is_start[1:], [True]])
+                        idx_start = idx_disc[is_start & (disc_type[idx_disc] == t_id)]
+                        idx_end = idx_disc[is_end & (disc_type[idx_disc] == t_id)]
+                        painter.drawRects([QRectF(x_left[k0], y_top[k1], height[k0], y_top[k0] + thickness[k0] - y_top[k1]) \
+                                           for k0, k1 in zip(idx_start.tolist(), idx_end.tolist())])
+
+                    elif isDetailed:
+                        # Cables
+                        h_cable = desc["h_cable"]
+                        lst_rect = []
+                        for k in idx.tolist():
+                            lst_rect.extend([QRectF(x_left[k] + c*h_cable, y_top[k], h_cable, thickness[k]) for c in range(desc["N_cables"])])
+                        painter.drawRects(lst_rect)
+
+                        # Numéros (s'ils sont lisibles)
+                        if lod*min(h_cable, desc["t_cable"]) >= self.LOD_TEXT:
+                            painter.setPen(self.pen_defaut)
+                            coil.font_disc.setPointSizeF(0.7*min(h_cable, desc["t_cable"]))
+                            painter.setFont(coil.font_disc)
+                            for k in idx.tolist():
+                                painter.drawText(QRectF(x_left[k] + 1, y_top[k], h_cable - 1, thickness[k]), \
+                                                 Qt.AlignCenter | Qt.TextDontClip, "%i"%view["number"][k_start + k])
 
-        # Exécution
-        menu.exec_(event.screenPos())
+                    else:
+                        painter.drawRects(self.getRects(idx.tolist(), x_left, y_top, height, thickness))
+
+        ### Chicanes (discs et cartons)
+        painter.setBrush(COLOR_oilGuide)
+        idx_guide = concatenate([idx_disc, idx_pressboard])
+        idx_inner = idx_guide[guides[idx_guide] == GUIDE_INNER].tolist()
+        idx_outer = idx_guide[guides[idx_guide] == GUIDE_OUTER].tolist()
+        painter.drawRects([QRectF(x_left[k] - view["inner_t"], y_top[k], view["inner_t"], thickness[k]/5) for k in idx_inner] + \
+                          [QRectF(x_left[k] + height[k], y_top[k], view["outer_t"], thickness[k]/5) for k in idx_outer])
+
+        ### Sélection
+        if not coil.isFrozen:
+            isVisible = zeros(kind.shape[0], dtype=bool)
+            isVisible[concatenate([idx_duct, idx_pressboard, idx_disc])] = True
+            idx_selected = flatnonzero(coil.selection[k_start:k_end] & isVisible)
+            if len(idx_selected) > 0:
+                painter.setPen(self.pen_selected if isDetailed else self.pen_selectedLow)
+                painter.setBrush(Qt.NoBrush)
+                painter.drawRects(self.getRects(idx_selected.tolist(), x_left, y_top, height, thickness))
 
 class Legend(QGraphicsRectItem):
     """
@@ -2133,6 +3091,62 @@ class Legend(QGraphicsRectItem):
             x = x
             y = y + self.H_lgd + self.margin
 
+# Modes de cache du rendu des dessins statiques (vue du transformateur, section des cables) :
+#   - "device" : image dans le repère de la vue, refaite au zoom
+#   - "item" : image dans le repère de l'objet, mise à l'échelle au zoom
+#   - "none" : dessin à chaque affichage
+DICT_RENDER_CACHE = {"device": QGraphicsItem.DeviceCoordinateCache, "item": QGraphicsItem.ItemCoordinateCache, "none": QGraphicsItem.NoCache}
+RENDER_CACHE_MODE = "device"
+# Budget du cache des images (ko), cf. QPixmapCache
+RENDER_CACHE_LIMIT_KB = 65536
+
+# Objets dont le rendu peut être mis en cache
+SET_RENDER_CACHE = WeakSet()
+# Compteurs des dessins effectifs par classe : {nom: [nombre, durée (s)]}
+DICT_PAINT_STAT = {}
+
+def getRenderCacheMode():
+    settings = QSettings(QCoreApplication.organizationName(), QCoreApplication.applicationName())
+    mode = settings.value("renderCacheMode", RENDER_CACHE_MODE)
+    return mode if mode in DICT_RENDER_CACHE else RENDER_CACHE_MODE
+
+def setRenderCacheMode(mode):
+    """
+    Choix du mode de cache du rendu (enregistré), appliqué à tous les dessins statiques existants
+    """
+    if not mode in DICT_RENDER_CACHE:
+        raise Exception("Mode de cache du rendu inconnu: %s"%mode)
+    settings = QSettings(QCoreApplication.organizationName(), QCoreApplication.applicationName())
+    settings.setValue("renderCacheMode", mode)
+    for item in SET_RENDER_CACHE:
+        item.setCacheMode(DICT_RENDER_CACHE[mode])
+
+def setupRenderCache(item):
+    """
+    Mode de cache du rendu de l'objet et budget du cache des images selon les préférences (renderCacheMode, renderCacheLimitKB)
+    """
+    settings = QSettings(QCoreApplication.organizationName(), QCoreApplication.applicationName())
+    QPixmapCache.setCacheLimit(settings.value("renderCacheLimitKB", RENDER_CACHE_LIMIT_KB, type=int))
+    item.setCacheMode(DICT_RENDER_CACHE[getRenderCacheMode()])
+    SET_RENDER_CACHE.add(item)
+
+def addPaintStat(item, t0):
+    """
+    Dessin effectif de l'objet commencé à t0 (cf. perf_counter)
+    """
+    stat = DICT_PAINT_STAT.setdefault(type(item).__name__, [0, 0.0])
+    stat[0] += 1
+    stat[1] += perf_counter() - t0
+
+def getPaintStats():
+    """
+    Nombre de dessins effectifs et durée totale (s) par classe depuis le dernier resetPaintStats
+    """
+    return {name: tuple(stat) for name, stat in DICT_PAINT_STAT.items()}
+
+def resetPaintStats():
+    DICT_PAINT_STAT.clear()
+
 class Arrow(QGraphicsLineItem):
     """
     Objet graphique représentant un fleche
@@ -2179,21 +3193,80 @@ class Arrow(QGraphicsLineItem):
         self.setLine(QLineF(QPointF(self.x2, self.y2), QPointF(self.x1, self.y1)))
         line = self.line()
 
+        self.arrowHead = self.getArrowHead(line, self.arrowSize)
+
+        painter.drawLine(line)
+        painter.drawPolygon(self.arrowHead)
+
+    @staticmethod
+    def getArrowHead(line, arrowSize):
+        """
+        Tête de la flèche au point line.p1()
+        """
         angle = acos(line.dx() / line.length())
         if line.dy() >= 0:
             angle = (pi * 2.0) - angle
 
-        arrowP1 = line.p1() + QPointF(sin(angle + pi / 3.0) * self.arrowSize,
-                                        cos(angle + pi / 3) * self.arrowSize)
-        arrowP2 = line.p1() + QPointF(sin(angle + pi - pi / 3.0) * self.arrowSize,
-                                        cos(angle + pi - pi / 3.0) * self.arrowSize)
+        arrowP1 = line.p1() + QPointF(sin(angle + pi / 3.0) * arrowSize,
+                                        cos(angle + pi / 3) * arrowSize)
+        arrowP2 = line.p1() + QPointF(sin(angle + pi - pi / 3.0) * arrowSize,
+                                        cos(angle + pi - pi / 3.0) * arrowSize)
 
-        self.arrowHead.clear()
-        for point in [line.p1(), arrowP1, arrowP2]:
-            self.arrowHead.append(point)
+        return QPolygonF([line.p1(), arrowP1, arrowP2])
 
-        painter.drawLine(line)
-        painter.drawPolygon(self.arrowHead)
+class WindingPlot():
+    """
+    Dessin d'une bobine enregistré sous forme de contours (QPainterPath), cf. Winding.plot_coil
+    Reprend les appels au QPainter : les lignes sont regroupées avec l'élément rempli qui les précède (même ordre de dessin)
+    """
+
+    def __init__(self):
+        # Contours dans l'ordre du dessin : [[brush, path]]
+        self.lst_path = []
+        self.brush = QBrush(Qt.NoBrush)
+        # Contour de l'enroulement (sélection)
+        self.contour = QPainterPath()
+
+    def setBrush(self, color):
+        self.brush = QBrush(color)
+
+    def getPath(self, isFilled=True):
+        """
+        Contour auquel ajouter un élément (une ligne n'est pas remplie et peut rejoindre le contour précédent)
+        """
+        if len(self.lst_path) == 0 or isFilled:
+            self.lst_path.append([self.brush, QPainterPath()])
+        return self.lst_path[-1][1]
+
+    def drawRect(self, rect):
+        self.getPath().addRect(rect)
+
+    def drawPolygon(self, polygon):
+        path = self.getPath()
+        path.addPolygon(polygon)
+        path.closeSubpath()
+
+    def drawLine(self, line):
+        path = self.getPath(False)
+        path.moveTo(line.p1())
+        path.lineTo(line.p2())
+
+    def drawArrow(self, x1, y1, x2, y2, arrowSize):
+        """
+        Flèche de (x1, y1) vers (x2, y2), cf. Arrow
+        """
+        self.setBrush(Qt.black)
+        line = QLineF(QPointF(x2, y2), QPointF(x1, y1))
+        self.drawLine(line)
+        self.drawPolygon(Arrow.getArrowHead(line, arrowSize))
+
+    def addContour(self, rect):
+        self.contour.addRect(rect)
+
+    def paint(self, painter):
+        for brush, path in self.lst_path:
+            painter.setBrush(brush)
+            painter.drawPath(path)
 
 class Winding(QGraphicsObject):
     """
@@ -2206,11 +3279,17 @@ class Winding(QGraphicsObject):
     def __init__(self, H_wind, L_coil, shape_winding="simple", winding_dir=None, parent=None):
         super().__init__(parent)
 
+        # Dessins enregistrés des bobines (un par position) et contour de l'enroulement, cf. getLstPlot
+        self.lst_plot = None
+        self.path = QPainterPath()
+
         # Données
         self.lst_pos_center = array([[0, 0, True]]) # [x, y, side]
+        self.H_wind = None
         self.set_H_wind(H_wind)
         self.L_coil = L_coil
-        self.shape_winding = shape_winding
+        self.shape_winding = None
+        self.setShapeWinding(shape_winding)
         self.winding_dir = winding_dir
 
         self.arrowSize = self.L_coil/2.
@@ -2226,8 +3305,8 @@ class Winding(QGraphicsObject):
         # Couleur non définie par défaut
         self.myColor = COLOR_undefined
 
-        # Contour de l'enroulement
-        self.path = QPainterPath()
+        # Rendu mis en cache jusqu'à la prochaine modification, cf. resetPlot
+        setupRenderCache(self)
 
     def itemChange(self, change, value):
 
@@ -2237,70 +3316,57 @@ class Winding(QGraphicsObject):
         return value
 
     def set_H_wind(self, H_wind):
-        self.H_wind = H_wind
-        self.prepareGeometryChange()
+        if H_wind != self.H_wind:
+            self.H_wind = H_wind
+            self.resetPlot()
 
     def set_lst_pos_center(self, lst_pos_center):
-        self.lst_pos_center = array(lst_pos_center)
-        self.prepareGeometryChange()
+        lst_pos_center = array(lst_pos_center)
+        if lst_pos_center.shape != self.lst_pos_center.shape or (lst_pos_center != self.lst_pos_center).any():
+            self.lst_pos_center = lst_pos_center
+            self.resetPlot()
 
     def getShapeWinding(self):
         return self.shape_winding
 
     def setShapeWinding(self, shape_winding):
-        self.shape_winding = shape_winding
-        self.prepareGeometryChange()
+        if shape_winding != self.shape_winding:
+            if not shape_winding in DICT_SHAPE_WINDING:
+                raise Exception("Shape du winding non reconnue: %s"%shape_winding)
+            self.shape_winding = shape_winding
+            # Description de la shape (dimensions et dessin), cf. DICT_SHAPE_WINDING
+            self.shape_desc = DICT_SHAPE_WINDING[shape_winding]
+            self.resetPlot()
 
     def setWindingDirection(self, winding_dir):
-        self.winding_dir = winding_dir
-        self.prepareGeometryChange()
+        if winding_dir != self.winding_dir:
+            self.winding_dir = winding_dir
+            self.resetPlot()
 
     def getWindingDirection(self):
         return self.winding_dir
 
-    def getCoilRectF(self):
-
-        if self.getShapeWinding() == "simple":
-            tmp_rect = QRectF(- self.L_coil/2, - self.H_wind/2, self.L_coil, self.H_wind)
-
-        elif self.getShapeWinding() == "classic":
-            tmp_rect = QRectF(- self.L_coil/2, - self.H_wind/2 - self.arrowLength, self.L_coil, self.H_wind + 2*self.arrowLength)
-
-        elif self.getShapeWinding() == "double-classic":
-            tmp_rect = QRectF(- 5*self.L_coil/4, - self.H_wind/2 - self.arrowLength, 5*self.L_coil/2, self.H_wind + self.arrowLength + self.arrowLength1)
-
-        elif self.getShapeWinding() == "middle-entry":
-            tmp_rect = QRectF(- self.L_coil/2 - self.arrowLength1 - self.arrowSize/2, - self.H_wind/2 - self.arrowLength, self.L_coil + 2*self.arrowLength1 + self.arrowSize/2, self.H_wind + 2*self.arrowLength)
-
-        elif self.getShapeWinding() == "one-axial-split":
-            tmp_rect = QRectF(- 6*self.L_coil/4, - self.H_wind/2 - self.arrowLength - 3*self.arrowLength2/2, 6*self.L_coil/2, self.H_wind + self.arrowLength + self.arrowLength1 + 3*self.arrowLength2)
-
-        elif self.getShapeWinding() == "two-axial-split-top" or self.getShapeWinding() == "two-axial-split-bottom":
-            # Hauteur complète pour calcul taille fenetre CM & largeur divisée par 2
-            tmp_rect = QRectF(- 5*self.L_coil/4, - self.H_wind - self.arrowLength - 3*self.arrowLength2/2, 5*self.L_coil/2, 2*self.H_wind + 2*self.arrowLength + 3*self.arrowLength2)
-
-        elif self.getShapeWinding() == "fine-coarse":
-            tmp_rect = QRectF(- 2*self.L_coil, - self.H_wind/2 - self.arrowLength, 4*self.L_coil, self.H_wind + 2*self.arrowLength)
-
-        elif self.getShapeWinding() == "shell-simple-classic-in" or self.getShapeWinding() == "shell-simple-classic-out":
-            tmp_rect = QRectF(- 3*self.L_coil, - self.H_wind/2 - self.arrowLength, 6*self.L_coil, self.H_wind + self.arrowLength + self.arrowLength1)
-
-        elif self.getShapeWinding() in ["shell-simple-diabolo-in", "shell-simple-diabolo-out", "shell-double-diabolo-in", "shell-double-diabolo-left", "shell-double-diabolo-right"]:
-            tmp_rect = QRectF(- 6*self.L_coil - self.arrowSize/2, - self.H_wind/2 - self.arrowLength, 12*self.L_coil + self.arrowSize/2, self.H_wind + self.arrowLength + self.arrowLength1)
-
-        elif self.getShapeWinding() in ["shell-double-classic-in", "shell-double-classic-out", "shell-double-classic-right"]:
-            tmp_rect = QRectF(- 5*self.L_coil, - self.H_wind/2 - self.arrowLength, 10*self.L_coil, self.H_wind + self.arrowLength + self.arrowLength1)
-
-        elif self.getShapeWinding() in ["shell-triple-classic-in", "shell-triple-classic-out", "shell-triple-classic-left", "shell-triple-classic-right"]:
-            tmp_rect = QRectF(- 7*self.L_coil, - self.H_wind/2 - self.arrowLength, 14*self.L_coil, self.H_wind + self.arrowLength + self.arrowLength1)
-
-        elif self.getShapeWinding() in ["shell-simple-barrel-in", "shell-simple-barrel-out", "shell-double-barrel-in", "shell-double-barrel-left", "shell-double-barrel-right"]:
-            tmp_rect = QRectF(- 6*self.L_coil, - self.H_wind/2 - self.arrowLength, 12*self.L_coil, self.H_wind + 2*self.arrowLength)
+    def resetPlot(self):
+        """
+        Dessin des bobines à refaire au prochain affichage
+        """
+        self.prepareGeometryChange()
+        self.lst_plot = None
+        self.update()
 
-        else:
-            raise Exception("Shape du winding non reconnue: %s"%self.getShapeWinding())
+    def getLstPlot(self):
+        """
+        Dessins enregistrés des bobines pour chaque position de lst_pos_center (cf. plot_coil), refaits après une modification
+        """
+        if self.lst_plot is None:
+            self.lst_plot = [self.plot_coil(pos[0], pos[1], pos[2]) for pos in self.lst_pos_center]
+            self.path = QPainterPath()
+            for plot in self.lst_plot:
+                self.path.addPath(plot.contour)
+        return self.lst_plot
 
-        return tmp_rect
+    def getCoilRectF(self):
+        return QRectF(*self.shape_desc["rect"](self))
 
     def boundingRect(self):
         x_min = min(self.lst_pos_center[:,0])
@@ -2309,169 +3375,22 @@ class Winding(QGraphicsObject):
         y_max = max(self.lst_pos_center[:,1])
         penWidth = self.pen_used.widthF()
 
-        if self.getShapeWinding() == "simple":
-            rect_wind = QRectF(x_min - self.L_coil/2 - penWidth/2,
-                               y_min - self.H_wind/2 - penWidth/2,
-                               x_max - x_min + self.L_coil + penWidth,
-                               y_max - y_min + self.H_wind + penWidth)
-
-        elif self.getShapeWinding() == "classic":
-            rect_wind = QRectF(x_min - self.L_coil/2 - penWidth/2,
-                               y_min - self.H_wind/2  - self.arrowLength - penWidth/2,
-                               x_max - x_min + self.L_coil + penWidth,
-                               y_max - y_min + self.H_wind + penWidth + 2*self.arrowLength)
-
-        elif self.getShapeWinding() == "double-classic":
-            rect_wind = QRectF(x_min - 5*self.L_coil/4 - penWidth/2,
-                               y_min - self.H_wind/2  - self.arrowLength - penWidth/2,
-                               x_max - x_min + 5*self.L_coil/2 + penWidth,
-                               y_max - y_min + self.H_wind + penWidth + self.arrowLength + self.arrowLength1)
-
-        elif self.getShapeWinding() == "fine-coarse":
-            rect_wind = QRectF(x_min - 2*self.L_coil - penWidth/2,
-                               y_min - self.H_wind/2  - self.arrowLength - penWidth/2,
-                               x_max - x_min + 4*self.L_coil + penWidth,
-                               y_max - y_min + self.H_wind + penWidth + 2*self.arrowLength)
-
-        elif self.getShapeWinding() == "middle-entry":
-            rect_wind = QRectF(x_min - self.L_coil/2 - self.arrowLength1 - self.arrowSize/2 - penWidth/2,
-                               y_min - self.H_wind/2  - self.arrowLength - penWidth/2,
-                               x_max - x_min + self.L_coil + 2*self.arrowLength1 + self.arrowSize/2 + penWidth,
-                               y_max - y_min + self.H_wind + penWidth + 2*self.arrowLength)
-
-        elif self.getShapeWinding() == "one-axial-split":
-            rect_wind = QRectF(x_min - 6*self.L_coil/4 - penWidth/2,
-                               y_min - self.H_wind/2  - self.arrowLength - 3*self.arrowLength2/2 - penWidth/2,
-                               x_max - x_min + 6*self.L_coil/2 + penWidth,
-                               y_max - y_min + self.H_wind + penWidth + self.arrowLength + self.arrowLength1 + 3*self.arrowLength2)
-
-        elif self.getShapeWinding() == "two-axial-split-top":
-            rect_wind = QRectF(x_min - 5*self.L_coil/4 - penWidth/2,
-                               y_min - self.H_wind  - self.arrowLength - penWidth/2,
-                               x_max - x_min + 5*self.L_coil/2 + penWidth,
-                               y_max - y_min + 2*self.H_wind + penWidth + self.arrowLength + self.arrowLength2)
-
-        elif self.getShapeWinding() == "two-axial-split-bottom":
-            rect_wind = QRectF(x_min - 5*self.L_coil/4 - penWidth/2,
-                               y_min - self.H_wind  - self.arrowLength2/2 - penWidth/2,
-                               x_max - x_min + 5*self.L_coil/2 + penWidth,
-                               y_max - y_min + 2*self.H_wind + penWidth + self.arrowLength + self.arrowLength2)
-
-        elif self.getShapeWinding() == "shell-simple-classic-in":
-            rect_wind = QRectF(x_min - self.L_coil - penWidth/2,
-                               y_min - self.H_wind/2 - self.arrowLength - penWidth/2,
-                               x_max - x_min + 2*self.L_coil + penWidth,
-                               y_max - y_min + self.H_wind + self.arrowLength + penWidth)
-
-        elif self.getShapeWinding() == "shell-simple-classic-out":
-            rect_wind = QRectF(x_min - 3*self.L_coil - penWidth/2,
-                               y_min - self.H_wind/2 - self.arrowLength - penWidth/2,
-                               x_max - x_min + 6*self.L_coil + penWidth,
-                               y_max - y_min + self.H_wind + self.arrowLength + self.arrowLength1 + penWidth)
-
-        elif self.getShapeWinding() == "shell-simple-diabolo-in" or self.getShapeWinding() == "shell-double-diabolo-in":
-            rect_wind = QRectF(x_min - 6*self.L_coil - penWidth/2 - self.arrowSize/2,
-                               y_min - self.H_wind/2 - self.arrowLength - penWidth/2,
-                               x_max - x_min + 12*self.L_coil + penWidth + self.arrowSize/2,
-                               y_max - y_min + self.H_wind + self.arrowLength + penWidth)
-
-        elif self.getShapeWinding() == "shell-simple-diabolo-out":
-            rect_wind = QRectF(x_min - 4*self.L_coil - penWidth/2,
-                               y_min - self.H_wind/2 - penWidth/2,
-                               x_max - x_min + 8*self.L_coil + penWidth,
-                               y_max - y_min + self.H_wind + self.arrowLength + penWidth)
-
-        elif self.getShapeWinding() == "shell-double-diabolo-left":
-            rect_wind = QRectF(x_min - 4*self.L_coil - penWidth/2,
-                               y_min - self.H_wind/2 - penWidth/2,
-                               x_max - x_min + self.L_coil + penWidth,
-                               y_max - y_min + self.H_wind + self.arrowLength + penWidth)
-
-        elif self.getShapeWinding() == "shell-double-diabolo-right":
-            rect_wind = QRectF(x_min + 3*self.L_coil - penWidth/2,
-                               y_min - self.H_wind/2 - penWidth/2,
-                               x_max - x_min + self.L_coil + penWidth,
-                               y_max - y_min + self.H_wind + self.arrowLength + penWidth)
-
-        elif self.getShapeWinding() == "shell-double-classic-in":
-            rect_wind = QRectF(x_min - 7*self.L_coil/2 - penWidth/2,
-                               y_min - self.H_wind/2 - self.arrowLength - penWidth/2,
-                               x_max - x_min + 7*self.L_coil + penWidth,
-                               y_max - y_min + self.H_wind + self.arrowLength + penWidth)
-
-        elif self.getShapeWinding() == "shell-double-classic-out":
-            rect_wind = QRectF(x_min - 5*self.L_coil - penWidth/2,
-                               y_min - self.H_wind/2 - self.arrowLength - penWidth/2,
-                               x_max - x_min + 10*self.L_coil + penWidth,
-                               y_max - y_min + self.H_wind + self.arrowLength + self.arrowLength1 + penWidth)
-
-        elif self.getShapeWinding() == "shell-double-classic-right":
-            rect_wind = QRectF(x_min - self.L_coil/2 - penWidth/2,
-                               y_min - self.H_wind/2 - penWidth/2,
-                               x_max - x_min + self.L_coil + penWidth,
-                               y_max - y_min + self.H_wind + self.arrowLength + penWidth)
-
-        elif self.getShapeWinding() == "shell-triple-classic-in":
-            rect_wind = QRectF(x_min - 11*self.L_coil/2 - penWidth/2,
-                               y_min - self.H_wind/2 - self.arrowLength - penWidth/2,
-                               x_max - x_min + 11*self.L_coil + penWidth,
-                               y_max - y_min + self.H_wind + self.arrowLength + penWidth)
-
-        elif self.getShapeWinding() == "shell-triple-classic-out":
-            rect_wind = QRectF(x_min - 7*self.L_coil - penWidth/2,
-                               y_min - self.H_wind/2 - self.arrowLength - penWidth/2,
-                               x_max - x_min + 14*self.L_coil + penWidth,
-                               y_max - y_min + self.H_wind + self.arrowLength + self.arrowLength1 + penWidth)
-
-        elif self.getShapeWinding() == "shell-triple-classic-left":
-            rect_wind = QRectF(x_min - 5*self.L_coil/2 - penWidth/2,
-                               y_min - self.H_wind/2 - penWidth/2,
-                               x_max - x_min + self.L_coil + penWidth,
-                               y_max - y_min + self.H_wind + self.arrowLength + penWidth)
-
-        elif self.getShapeWinding() == "shell-triple-classic-right":
-            rect_wind = QRectF(x_min + 5*self.L_coil/2 - penWidth/2,
-                               y_min - self.H_wind/2 - penWidth/2,
-                               x_max - x_min + self.L_coil + penWidth,
-                               y_max - y_min + self.H_wind + self.arrowLength + penWidth)
-
-        elif self.getShapeWinding() in ["shell-simple-barrel-in", "shell-double-barrel-in"]:
-            rect_wind = QRectF(x_min - 4*self.L_coil - penWidth/2,
-                               y_min - self.H_wind/2 - self.arrowLength - penWidth/2,
-                               x_max - x_min + 8*self.L_coil + penWidth,
-                               y_max - y_min + self.H_wind + self.arrowLength + penWidth)
-
-        elif self.getShapeWinding() == "shell-simple-barrel-out":
-            rect_wind = QRectF(x_min - 6*self.L_coil - penWidth/2,
-                               y_min - self.H_wind/2 - penWidth/2,
-                               x_max - x_min + 12*self.L_coil + penWidth,
-                               y_max - y_min + self.H_wind + self.arrowLength + penWidth)
-
-        elif self.getShapeWinding() == "shell-double-barrel-left":
-            rect_wind = QRectF(x_min - 6*self.L_coil - penWidth/2,
-                               y_min - self.H_wind/2 - penWidth/2,
-                               x_max - x_min + 6*self.L_coil + penWidth,
-                               y_max - y_min + self.H_wind + self.arrowLength + penWidth)
-
-        elif self.getShapeWinding() == "shell-double-barrel-right":
-            rect_wind = QRectF(x_min - penWidth/2,
-                               y_min - self.H_wind/2 - penWidth/2,
-                               x_max - x_min + 6*self.L_coil + penWidth,
-                               y_max - y_min + self.H_wind + self.arrowLength + penWidth)
-
-        else:
-            raise Exception("Shape du winding non reconnue: %s"%self.getShapeWinding())
+        # Marges autour des centres propres à la shape
+        left, top, width, height = self.shape_desc["bound"](self)
+        rect_wind = QRectF(x_min + left - penWidth/2,
+                           y_min + top - penWidth/2,
+                           x_max - x_min + width + penWidth,
+                           y_max - y_min + height + penWidth)
 
         return rect_wind
 
     def shape(self):
         # Contour de la forme
+        self.getLstPlot()
         return self.path
 
     def paint(self, painter, option, widget=None):
-
-        # Reset du contour
-        self.path = QPainterPath()
+        t0 = perf_counter()
 
         # Crayon fin en tirets lorsque sélectionné
         if self.isSelected():
@@ -2481,12 +3400,14 @@ class Winding(QGraphicsObject):
             painter.setPen(self.pen_defaut)
             self.pen_used = self.pen_defaut
 
-        for pos in self.lst_pos_center:
-            self.plot_coil(painter, pos[0], pos[1], pos[2], option, widget)
+        for plot in self.getLstPlot():
+            plot.paint(painter)
+
+        addPaintStat(self, t0)
 
-    def plot_coil(self, painter, x_center, y_center, side, option, widget):
+    def plot_coil(self, x_center, y_center, side):
         """
-        Fonction de dessin d'une bobine:
+        Fonction de dessin d'une bobine, enregistré pour les affichages suivants (cf. WindingPlot):
             - x_center ; y_center : les coordonnées de son centre
             - side : côté de la représentation de la bobine /° colonne (bool) -> pour respecter la symétrie (non nécessaire à toutes les shapes)
         """
@@ -2503,805 +3424,826 @@ class Winding(QGraphicsObject):
             color_2 = COLOR_undefined
             color_1 = COLOR_undefined
 
-        # Traitement
-        if self.getShapeWinding() == "simple":
-
-            # Rectangle
-            tmp_rect = QRectF(x_center - self.L_coil/2, y_center - self.H_wind/2, self.L_coil, self.H_wind)
-            painter.setBrush(color_1)
-            painter.drawRect(tmp_rect)
-            self.path.addRect(tmp_rect)
-
-        elif self.getShapeWinding() == "classic":
-
-            # Rectangle
-            tmp_graph = QRectF(x_center - self.L_coil/2, y_center - self.H_wind/2, self.L_coil, self.H_wind)
-            painter.setBrush(color_1)
-            painter.drawRect(tmp_graph)
-
-            if side: # Connexions que du côté x+
-                # Flèche 1
-                tmp_graph = Arrow(x_center, y_center - self.H_wind/2 - self.arrowLength, x_center, y_center - self.H_wind/2, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-
-                # Flèche 2
-                tmp_graph = Arrow(x_center, y_center + self.H_wind/2, x_center, y_center + self.H_wind/2 + self.arrowLength, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-
-            tmp_rect = QRectF(x_center - self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength, self.L_coil, self.H_wind + 2*self.arrowLength)
-            self.path.addRect(tmp_rect)
-
-        elif self.getShapeWinding() == "double-classic":
-
-            if side:
-                color_in = color_1
-                color_out = color_2
-            else:
-                color_in = color_2
-                color_out = color_1
-
-            # Rectangles
-            tmp_graph = QRectF(x_center - 5*self.L_coil/4, y_center - self.H_wind/2, self.L_coil, self.H_wind)
-            painter.setBrush(color_in)
-            painter.drawRect(tmp_graph)
-            tmp_graph = QRectF(x_center + self.L_coil/4, y_center - self.H_wind/2, self.L_coil, self.H_wind)
-            painter.setBrush(color_out)
-            painter.drawRect(tmp_graph)
-
-            if side: # Connexions que du côté x+
-                # Flèche 1
-                tmp_graph = Arrow(x_center - 3*self.L_coil/4, y_center - self.H_wind/2 - self.arrowLength, x_center - 3*self.L_coil/4, y_center - self.H_wind/2, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
+        # Dessin propre à la shape, cf. DICT_SHAPE_WINDING
+        plot = WindingPlot()
+        self.shape_desc["plot"](self, plot, x_center, y_center, side, color_1, color_2)
 
-                # lignes
-                tmp_graph = QLineF(x_center - 3*self.L_coil/4, y_center + self.H_wind/2, x_center - 3*self.L_coil/4, y_center + self.H_wind/2 + self.arrowLength1)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 3*self.L_coil/4, y_center + self.H_wind/2 + self.arrowLength1, x_center - 3*self.L_coil/4, y_center + self.H_wind/2 + self.arrowLength1)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 3*self.L_coil/4, y_center + self.H_wind/2 + self.arrowLength1, x_center + 3*self.L_coil/4, y_center + self.H_wind/2)
-                painter.drawLine(tmp_graph)
+        return plot
 
-                # Flèche 2
-                tmp_graph = Arrow(x_center + 3*self.L_coil/4, y_center - self.H_wind/2, x_center + 3*self.L_coil/4, y_center - self.H_wind/2 - self.arrowLength, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
+    ### Dessin des shapes, cf. DICT_SHAPE_WINDING
 
-            tmp_rect = QRectF(x_center - 5*self.L_coil/4, y_center - self.H_wind/2 - self.arrowLength, 5*self.L_coil/2, self.H_wind + self.arrowLength + self.arrowLength1)
-            self.path.addRect(tmp_rect)
+    def plotSimple(self, plot, x_center, y_center, side, color_1, color_2):
+        # Rectangle
+        tmp_rect = QRectF(x_center - self.L_coil/2, y_center - self.H_wind/2, self.L_coil, self.H_wind)
+        plot.setBrush(color_1)
+        plot.drawRect(tmp_rect)
+        plot.addContour(tmp_rect)
 
-        elif self.getShapeWinding() == "fine-coarse":
+    def plotClassic(self, plot, x_center, y_center, side, color_1, color_2):
+        # Rectangle
+        tmp_graph = QRectF(x_center - self.L_coil/2, y_center - self.H_wind/2, self.L_coil, self.H_wind)
+        plot.setBrush(color_1)
+        plot.drawRect(tmp_graph)
 
-            if side:
-                color_in = color_1
-                color_out = color_2
-            else:
-                color_in = color_2
-                color_out = color_1
-
-            # Rectangles
-            tmp_graph = QRectF(x_center - 2*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
-            painter.setBrush(color_in)
-            painter.drawRect(tmp_graph)
-            tmp_graph = QRectF(x_center - self.L_coil/2, y_center - self.H_wind/2, self.L_coil, self.H_wind)
-            painter.setBrush(color_out)
-            painter.drawRect(tmp_graph)
-            tmp_graph = QRectF(x_center + self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
-            painter.setBrush(color_in)
-            painter.drawRect(tmp_graph)
-
-            if side: # Connexions que du côté x+
-                # Flèche 1
-                tmp_graph = Arrow(x_center - 3*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength, x_center - 3*self.L_coil/2, y_center - self.H_wind/2, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-
-                # Lignes + inter
-                tmp_graph = QLineF(x_center - 3*self.L_coil/2, y_center + self.H_wind/2, x_center - 3*self.L_coil/2, y_center + self.H_wind/2 + 3*self.arrowLength1/4)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center - 3*self.L_coil/2, y_center + self.H_wind/2 + 3*self.arrowLength1/4, x_center - self.L_coil, y_center + self.H_wind/2 + 3*self.arrowLength1/4)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center, y_center + self.H_wind/2, x_center, y_center + self.H_wind/2 + self.arrowLength1/2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center - self.L_coil/2, y_center + self.H_wind/2 + self.arrowLength1/2, x_center, y_center + self.H_wind/2 + self.arrowLength1/2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center - self.L_coil/2, y_center + self.H_wind/2 + self.arrowLength1, x_center + 3*self.L_coil/4, y_center + self.H_wind/2 + self.arrowLength1)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 3*self.L_coil/4, y_center + self.H_wind/2 + self.arrowLength1, x_center + 3*self.L_coil/4, y_center - self.H_wind/2 - self.arrowLength1)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center - self.L_coil, y_center + self.H_wind/2 + 3*self.arrowLength1/4, x_center - self.L_coil/2, y_center + self.H_wind/2 + self.arrowLength1/2)
-                painter.drawLine(tmp_graph)
-
-                # Lignes + regroupement
-                tmp_graph = QLineF(x_center, y_center - self.H_wind/2, x_center, y_center - self.H_wind/2 - self.arrowLength1)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center, y_center - self.H_wind/2 - self.arrowLength1, x_center + 3*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 3*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1, x_center + 3*self.L_coil/2, y_center - self.H_wind/2)
-                painter.drawLine(tmp_graph)
-
-                # Flèche 2
-                tmp_graph = Arrow(x_center + 3*self.L_coil/2, y_center + self.H_wind/2, x_center + 3*self.L_coil/2, y_center + self.H_wind/2 + self.arrowLength, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-
-            tmp_rect = QRectF(x_center - 5*self.L_coil/4, y_center - self.H_wind/2 - self.arrowLength, 5*self.L_coil/2, self.H_wind + self.arrowLength + self.arrowLength1)
-            self.path.addRect(tmp_rect)
-
-        elif self.getShapeWinding() == "middle-entry":
-
-            # Rectangle 1
-            tmp_graph = QRectF(x_center - self.L_coil/2, y_center - self.H_wind/2, self.L_coil, self.H_wind/2)
-            painter.setBrush(color_1)
-            painter.drawRect(tmp_graph)
-
-            # Rectangle 2
-            tmp_graph = QRectF(x_center - self.L_coil/2, y_center, self.L_coil, self.H_wind/2)
-            painter.setBrush(color_2)
-            painter.drawRect(tmp_graph)
-
-            if side: # Connexions que du côté x+
-                # Entrée
-                tmp_graph = QLineF(x_center + self.L_coil/2 + self.arrowLength1, y_center - self.H_wind/2 - self.arrowLength, x_center + self.L_coil/2 + self.arrowLength1, y_center)
-                painter.drawLine(tmp_graph)
-                tmp_graph = Arrow(x_center + self.L_coil/2 + self.arrowLength1, y_center, x_center + self.L_coil/2, y_center, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-
-                # Sortie
-                tmp_graph = QLineF(x_center, y_center - self.H_wind/2, x_center, y_center - self.H_wind/2 - self.arrowLength1)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center, y_center - self.H_wind/2 - self.arrowLength1, x_center - (self.L_coil/2 + self.arrowLength1), y_center - self.H_wind/2 - self.arrowLength1)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center, y_center + self.H_wind/2, x_center, y_center + self.H_wind/2 + self.arrowLength1)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center, y_center + self.H_wind/2 + self.arrowLength1, x_center - (self.L_coil/2 + self.arrowLength1), y_center + self.H_wind/2 + self.arrowLength1)
-                painter.drawLine(tmp_graph)
-                tmp_graph = Arrow(x_center - (self.L_coil/2 + self.arrowLength1), y_center - self.H_wind/2 - self.arrowLength1, x_center - (self.L_coil/2 + self.arrowLength1), y_center + self.H_wind/2 + self.arrowLength, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-
-            if side:
-                tmp_rect = QRectF(x_center - self.L_coil/2 - self.arrowLength1 - 2*self.arrowSize/4, y_center - self.H_wind/2 - self.arrowLength, self.L_coil + 2*self.arrowLength1 + self.arrowSize/2, self.H_wind + 2*self.arrowLength)
-            else:
-                tmp_rect = QRectF(x_center - self.L_coil/2 - self.arrowLength1, y_center - self.H_wind/2 - self.arrowLength, self.L_coil + 2*self.arrowLength1 + self.arrowSize/2, self.H_wind + 2*self.arrowLength)
-            self.path.addRect(tmp_rect)
-
-        elif self.getShapeWinding() == "one-axial-split":
-
-            if side:
-                color_in_haut = color_1
-                color_in_bas = color_2
-                color_out_haut = color_2
-                color_out_bas = color_1
-            else:
-                color_in_haut = color_2
-                color_in_bas = color_1
-                color_out_haut = color_1
-                color_out_bas = color_2
-
-            # En raison de l'espace entre les 2 parties, on modifie la hauteur de l'enroulement pour le dessin
-            H_wind_bis = self.H_wind - 3*self.arrowLength2
-
-            ### Haut
-            # Rectangles
-            tmp_graph = QRectF(x_center - 5*self.L_coil/4, y_center - H_wind_bis/2 - 3*self.arrowLength2/2, self.L_coil, H_wind_bis/2)
-            painter.setBrush(color_in_haut)
-            painter.drawRect(tmp_graph)
-            tmp_graph = QRectF(x_center + self.L_coil/4, y_center - H_wind_bis/2 - 3*self.arrowLength2/2, self.L_coil, H_wind_bis/2)
-            painter.setBrush(color_out_haut)
-            painter.drawRect(tmp_graph)
-
-            if side: # Connexions que du côté x+
-                # Flèches et lignes
-                tmp_graph = Arrow(x_center - 3*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength - 3*self.arrowLength2/2, x_center - 3*self.L_coil/4, y_center - H_wind_bis/2 - 3*self.arrowLength2/2, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-                tmp_graph = QLineF(x_center - 3*self.L_coil/4, y_center - 3*self.arrowLength2/2, x_center - 3*self.L_coil/4, y_center - self.arrowLength2/2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 3*self.L_coil/4, y_center - self.arrowLength2/2, x_center - 3*self.L_coil/4, y_center - self.arrowLength2/2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 3*self.L_coil/4, y_center - self.arrowLength2/2, x_center + 3*self.L_coil/4, y_center - 3*self.arrowLength2/2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = Arrow(x_center + 3*self.L_coil/4, y_center - H_wind_bis/2 - 3*self.arrowLength2/2, x_center + 3*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength - 3*self.arrowLength2/2, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-
-            ### Bas
-            # Rectangles
-            tmp_graph = QRectF(x_center - 5*self.L_coil/4, y_center + 3*self.arrowLength2/2, self.L_coil, H_wind_bis/2)
-            painter.setBrush(color_in_bas)
-            painter.drawRect(tmp_graph)
-            tmp_graph = QRectF(x_center + self.L_coil/4, y_center + 3*self.arrowLength2/2, self.L_coil, H_wind_bis/2)
-            painter.setBrush(color_out_bas)
-            painter.drawRect(tmp_graph)
-
-            if side: # Connexions que du côté x+
-                # Lignes
-                tmp_graph = QLineF(x_center - 3*self.L_coil/4, y_center + H_wind_bis/2 + self.arrowLength1 + 3*self.arrowLength2/2, x_center - 3*self.L_coil/4, y_center + H_wind_bis/2 + 3*self.arrowLength2/2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center - 3*self.L_coil/4, y_center + 3*self.arrowLength2/2, x_center - 3*self.L_coil/4, y_center + self.arrowLength2/2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 3*self.L_coil/4, y_center + self.arrowLength2/2, x_center - 3*self.L_coil/4, y_center + self.arrowLength2/2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 3*self.L_coil/4, y_center + self.arrowLength2/2, x_center + 3*self.L_coil/4, y_center + 3*self.arrowLength2/2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 3*self.L_coil/4, y_center + H_wind_bis/2 + 3*self.arrowLength2/2, x_center + 3*self.L_coil/4, y_center + H_wind_bis/2 + self.arrowLength1 + 3*self.arrowLength2/2)
-                painter.drawLine(tmp_graph)
-
-            ### Autres lignes
-            if side: # Connexions que du côté x+
-                # Lignes
-                tmp_graph = QLineF(x_center - 3*self.L_coil/4, y_center + H_wind_bis/2 + self.arrowLength1 + 3*self.arrowLength2/2, x_center - 6*self.L_coil/4, y_center + H_wind_bis/2 + self.arrowLength1 + 3*self.arrowLength2/2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 3*self.L_coil/4, y_center + H_wind_bis/2 + self.arrowLength1 + 3*self.arrowLength2/2, x_center + 6*self.L_coil/4, y_center + H_wind_bis/2 + self.arrowLength1 + 3*self.arrowLength2/2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center - 6*self.L_coil/4, y_center + H_wind_bis/2 + self.arrowLength1 + 3*self.arrowLength2/2, x_center - 6*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength1 - 3*self.arrowLength2/2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 6*self.L_coil/4, y_center + H_wind_bis/2 + self.arrowLength1 + 3*self.arrowLength2/2, x_center + 6*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength1 - 3*self.arrowLength2/2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center - 3*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength1 - 3*self.arrowLength2/2, x_center - 6*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength1 - 3*self.arrowLength2/2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 3*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength1 - 3*self.arrowLength2/2, x_center + 6*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength1 - 3*self.arrowLength2/2)
-                painter.drawLine(tmp_graph)
-
-            tmp_rect = QRectF(x_center - 6*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength - 3*self.arrowLength2/2, 6*self.L_coil/2, H_wind_bis + self.arrowLength + self.arrowLength1 + 3*self.arrowLength2)
-            self.path.addRect(tmp_rect)
-
-        elif self.getShapeWinding() == "two-axial-split-top":
-
-            if side:
-                color_in_haut = color_1
-                color_out_haut = color_2
-            else:
-                color_in_haut = color_2
-                color_out_haut = color_1
-
-            y_center = y_center - 3*self.arrowLength2/4 - self.H_wind/2
-
-            # En raison de l'espace entre les 2 parties, on modifie la hauteur de l'enroulement pour le dessin
-            H_wind_bis = self.H_wind - 3*self.arrowLength2/2
-
-            ### Haut
-            # Rectangles
-            tmp_graph = QRectF(x_center - 5*self.L_coil/4, y_center - H_wind_bis/2, self.L_coil, H_wind_bis)
-            painter.setBrush(color_in_haut)
-            painter.drawRect(tmp_graph)
-            tmp_graph = QRectF(x_center + self.L_coil/4, y_center - H_wind_bis/2, self.L_coil, H_wind_bis)
-            painter.setBrush(color_out_haut)
-            painter.drawRect(tmp_graph)
-
-            if side: # Connexions que du côté x+
-                # Flèches et lignes
-                tmp_graph = Arrow(x_center - 3*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength, x_center - 3*self.L_coil/4, y_center - H_wind_bis/2, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-                tmp_graph = QLineF(x_center - 3*self.L_coil/4, y_center + H_wind_bis/2, x_center - 3*self.L_coil/4, y_center + H_wind_bis/2 + self.arrowLength2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 3*self.L_coil/4, y_center + H_wind_bis/2 + self.arrowLength2, x_center - 3*self.L_coil/4, y_center + H_wind_bis/2 + self.arrowLength2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 3*self.L_coil/4, y_center + H_wind_bis/2 + self.arrowLength2, x_center + 3*self.L_coil/4, y_center + H_wind_bis/2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = Arrow(x_center + 3*self.L_coil/4, y_center - H_wind_bis/2, x_center + 3*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-
-            tmp_rect = QRectF(x_center - 5*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength, 5*self.L_coil/2, H_wind_bis + self.arrowLength + self.arrowLength2)
-            self.path.addRect(tmp_rect)
-
-        elif self.getShapeWinding() == "two-axial-split-bottom":
-
-            if side:
-                color_in_bas = color_2
-                color_out_bas = color_1
-            else:
-                color_in_bas = color_1
-                color_out_bas = color_2
-
-            y_center = y_center + 3*self.arrowLength2/4 + self.H_wind/2
-
-            # En raison de l'espace entre les 2 parties, on modifie la hauteur de l'enroulement pour le dessin
-            H_wind_bis = self.H_wind - 3*self.arrowLength2/2
-
-            ### Bas
-            # Rectangles
-            tmp_graph = QRectF(x_center - 5*self.L_coil/4, y_center - H_wind_bis/2, self.L_coil, H_wind_bis)
-            painter.setBrush(color_in_bas)
-            painter.drawRect(tmp_graph)
-            tmp_graph = QRectF(x_center + self.L_coil/4, y_center - H_wind_bis/2, self.L_coil, H_wind_bis)
-            painter.setBrush(color_out_bas)
-            painter.drawRect(tmp_graph)
-
-            if side: # Connexions que du côté x+
-                # Flèches et lignes
-                tmp_graph = Arrow(x_center - 3*self.L_coil/4, y_center + H_wind_bis/2 + self.arrowLength, x_center - 3*self.L_coil/4, y_center + H_wind_bis/2, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-                tmp_graph = QLineF(x_center - 3*self.L_coil/4, y_center - H_wind_bis/2, x_center - 3*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 3*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength2, x_center - 3*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 3*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength2, x_center + 3*self.L_coil/4, y_center - H_wind_bis/2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = Arrow(x_center + 3*self.L_coil/4, y_center + H_wind_bis/2, x_center + 3*self.L_coil/4, y_center + H_wind_bis/2 + self.arrowLength, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-
-            tmp_rect = QRectF(x_center - 5*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength2, 5*self.L_coil/2, H_wind_bis + self.arrowLength + self.arrowLength2)
-            self.path.addRect(tmp_rect)
-
-        elif self.getShapeWinding() == "shell-simple-classic-in":
-
-            # Polygone
-            tmp_graph = QPolygonF([QPointF(x_center - self.L_coil, y_center + self.L_coil), QPointF(x_center - self.L_coil, y_center - self.L_coil), QPointF(x_center + self.L_coil, y_center - self.H_wind/2), QPointF(x_center + self.L_coil, y_center + self.H_wind/2)])
-            painter.setBrush(color_1)
-            painter.drawPolygon(tmp_graph)
-
-            if side: # Connexions que du côté x+
-                # Flèches et lignes
-                tmp_graph = Arrow(x_center - self.L_coil, y_center - self.H_wind/2 - self.arrowLength, x_center - self.L_coil, y_center - self.L_coil, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-                tmp_graph = Arrow(x_center + self.L_coil, y_center - self.H_wind/2, x_center + self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-
-            tmp_rect = QRectF(x_center - self.L_coil, y_center - self.H_wind/2 - self.arrowLength, 2*self.L_coil, self.H_wind + self.arrowLength)
-            self.path.addRect(tmp_rect)
-
-        elif self.getShapeWinding() == "shell-simple-classic-out":
-
-            # Rectangles
-            tmp_graph = QRectF(x_center - 3*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
-            painter.setBrush(color_2)
-            painter.drawRect(tmp_graph)
-            tmp_graph = QRectF(x_center + 2*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
-            painter.setBrush(color_2)
-            painter.drawRect(tmp_graph)
-
-            if side: # Connexions que du côté x+
-                # Flèches et lignes
-                tmp_graph = Arrow(x_center - 2*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, x_center - 2*self.L_coil, y_center - self.H_wind/2, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-                tmp_graph = Arrow(x_center + 2*self.L_coil, y_center - self.H_wind/2, x_center + 2*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-
-                tmp_graph = QLineF(x_center - 3*self.L_coil, y_center + self.H_wind/2, x_center - 3*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center - 3*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1, x_center + 3*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 3*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1, x_center + 3*self.L_coil, y_center + self.H_wind/2)
-                painter.drawLine(tmp_graph)
-
-            tmp_rect = QRectF(x_center - 3*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.L_coil, self.H_wind + self.arrowLength + self.arrowLength1)
-            self.path.addRect(tmp_rect)
-            tmp_rect = QRectF(x_center + 2*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.L_coil, self.H_wind + self.arrowLength + self.arrowLength1)
-            self.path.addRect(tmp_rect)
-
-        elif self.getShapeWinding() == "shell-simple-diabolo-in" or self.getShapeWinding() == "shell-double-diabolo-in":
-
-            # Polygones
-            tmp_graph = QPolygonF([QPointF(x_center, y_center + self.L_coil), QPointF(x_center, y_center - self.L_coil), QPointF(x_center + 2*self.L_coil, y_center - self.H_wind/2), QPointF(x_center + 2*self.L_coil, y_center + self.H_wind/2)])
-            painter.setBrush(color_1)
-            painter.drawPolygon(tmp_graph)
-            tmp_graph = QPolygonF([QPointF(x_center, y_center + self.L_coil), QPointF(x_center, y_center - self.L_coil), QPointF(x_center - 2*self.L_coil, y_center - self.H_wind/2), QPointF(x_center - 2*self.L_coil, y_center + self.H_wind/2)])
-            painter.setBrush(color_2)
-            painter.drawPolygon(tmp_graph)
-
-            # Rectangles
-            tmp_graph = QRectF(x_center + 5*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
-            painter.setBrush(color_1)
-            painter.drawRect(tmp_graph)
-            tmp_graph = QRectF(x_center - 6*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
-            painter.setBrush(color_2)
-            painter.drawRect(tmp_graph)
-
-            if side: # Connexions que du côté x+
-                # Flèches et lignes
-                tmp_graph = Arrow(x_center, y_center - self.H_wind/2 - self.arrowLength, x_center, y_center - self.L_coil, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-                tmp_graph = Arrow(x_center - 6*self.L_coil, y_center - self.H_wind/2, x_center - 6*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-
-                tmp_graph = QLineF(x_center + 2*self.L_coil, y_center - self.H_wind/2, x_center + 2*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1/2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 2*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1/2, x_center + 5*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1/2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 5*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1/2, x_center + 5*self.L_coil, y_center - self.H_wind/2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center - 2*self.L_coil, y_center - self.H_wind/2, x_center - 2*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1/2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center - 2*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1/2, x_center - 5*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1/2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center - 5*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1/2, x_center - 5*self.L_coil, y_center - self.H_wind/2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 6*self.L_coil, y_center - self.H_wind/2, x_center + 6*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 6*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1, x_center - 6*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1)
-                painter.drawLine(tmp_graph)
-
-            tmp_rect = QRectF(x_center - 2*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, 4*self.L_coil, self.H_wind + self.arrowLength)
-            self.path.addRect(tmp_rect)
-            tmp_rect = QRectF(x_center - 6*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.L_coil, self.H_wind + self.arrowLength)
-            self.path.addRect(tmp_rect)
-            tmp_rect = QRectF(x_center + 5*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.L_coil, self.H_wind + self.arrowLength)
-            self.path.addRect(tmp_rect)
-
-        elif self.getShapeWinding() == "shell-simple-diabolo-out":
-
-            # Rectangles
-            tmp_graph = QRectF(x_center + 3*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
-            painter.setBrush(color_2)
-            painter.drawRect(tmp_graph)
-            tmp_graph = QRectF(x_center - 4*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
-            painter.setBrush(color_1)
-            painter.drawRect(tmp_graph)
-
-            if side: # Connexions que du côté x+
-                # Flèches et lignes
-                tmp_graph = Arrow(x_center - 4*self.L_coil, y_center + self.H_wind/2 + self.arrowLength, x_center - 4*self.L_coil, y_center + self.H_wind/2, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-                tmp_graph = Arrow(x_center - 3*self.L_coil, y_center + self.H_wind/2, x_center - 3*self.L_coil, y_center + self.H_wind/2 + self.arrowLength, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-
-                tmp_graph = QLineF(x_center - 4*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1, x_center + 4*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 4*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1, x_center + 4*self.L_coil, y_center + self.H_wind/2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center - 3*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1/2, x_center + 3*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1/2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 3*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1/2, x_center + 3*self.L_coil, y_center + self.H_wind/2)
-                painter.drawLine(tmp_graph)
-
-            tmp_rect = QRectF(x_center - 4*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind + self.arrowLength)
-            self.path.addRect(tmp_rect)
-            tmp_rect = QRectF(x_center + 3*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind + self.arrowLength)
-            self.path.addRect(tmp_rect)
-
-        elif self.getShapeWinding() == "shell-double-diabolo-left":
-
-            # Rectangles
-            tmp_graph = QRectF(x_center - 4*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
-            painter.setBrush(color_1)
-            painter.drawRect(tmp_graph)
-
-            if side: # Connexions que du côté x+
-                # Flèches et lignes
-                tmp_graph = Arrow(x_center - 4*self.L_coil, y_center + self.H_wind/2 + self.arrowLength, x_center - 4*self.L_coil, y_center + self.H_wind/2, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-                tmp_graph = Arrow(x_center - 3*self.L_coil, y_center + self.H_wind/2, x_center - 3*self.L_coil, y_center + self.H_wind/2 + self.arrowLength, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-
-            tmp_rect = QRectF(x_center - 4*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind + self.arrowLength)
-            self.path.addRect(tmp_rect)
-
-        elif self.getShapeWinding() == "shell-double-diabolo-right":
-
-            # Rectangles
-            tmp_graph = QRectF(x_center + 3*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
-            painter.setBrush(color_2)
-            painter.drawRect(tmp_graph)
-
-            if side: # Connexions que du côté x+
-                # Flèches et lignes
-                tmp_graph = Arrow(x_center + 4*self.L_coil, y_center + self.H_wind/2 + self.arrowLength, x_center + 4*self.L_coil, y_center + self.H_wind/2, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-                tmp_graph = Arrow(x_center + 3*self.L_coil, y_center + self.H_wind/2, x_center + 3*self.L_coil, y_center + self.H_wind/2 + self.arrowLength, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-
-            tmp_rect = QRectF(x_center + 3*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind + self.arrowLength)
-            self.path.addRect(tmp_rect)
-
-        elif self.getShapeWinding() == "shell-double-classic-in":
-
-            # Polygone
-            tmp_graph = QPolygonF([QPointF(x_center - 7*self.L_coil/2, y_center + self.L_coil), QPointF(x_center - 7*self.L_coil/2, y_center - self.L_coil), QPointF(x_center - 3*self.L_coil/2, y_center - self.H_wind/2), QPointF(x_center - 3*self.L_coil/2, y_center + self.H_wind/2)])
-            painter.setBrush(color_1)
-            painter.drawPolygon(tmp_graph)
-            # Rectangle
-            tmp_graph = QRectF(x_center + 3*self.L_coil/2, y_center - self.H_wind/2, 2*self.L_coil, self.H_wind)
-            painter.setBrush(color_1)
-            painter.drawRect(tmp_graph)
-
-            if side: # Connexions que du côté x+
-                # Flèches et lignes
-                tmp_graph = Arrow(x_center - 7*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength, x_center - 7*self.L_coil/2, y_center - self.L_coil, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-                tmp_graph = Arrow(x_center + 7*self.L_coil/2, y_center - self.H_wind/2, x_center + 7*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-
-                tmp_graph = QLineF(x_center - 3*self.L_coil/2, y_center - self.H_wind/2, x_center - 3*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center - 3*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1, x_center + 3*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 3*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1, x_center + 3*self.L_coil/2, y_center - self.H_wind/2)
-                painter.drawLine(tmp_graph)
-
-            tmp_rect = QRectF(x_center - 7*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength, 2*self.L_coil, self.H_wind + self.arrowLength)
-            self.path.addRect(tmp_rect)
-            tmp_rect = QRectF(x_center + 3*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength, 2*self.L_coil, self.H_wind + self.arrowLength)
-            self.path.addRect(tmp_rect)
-
-        elif self.getShapeWinding() == "shell-double-classic-out":
-
-            # Rectangles
-            tmp_graph = QRectF(x_center - 5*self.L_coil, y_center - self.H_wind/2, self.L_coil/2, self.H_wind)
-            painter.setBrush(color_2)
-            painter.drawRect(tmp_graph)
-            tmp_graph = QRectF(x_center + 9*self.L_coil/2, y_center - self.H_wind/2, self.L_coil/2, self.H_wind)
-            painter.setBrush(color_2)
-            painter.drawRect(tmp_graph)
-
-            if side: # Connexions que du côté x+
-                # Flèches et lignes
-                tmp_graph = Arrow(x_center - 9*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength, x_center - 9*self.L_coil/2, y_center - self.H_wind/2, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-                tmp_graph = Arrow(x_center + 9*self.L_coil/2, y_center - self.H_wind/2, x_center + 9*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-
-                tmp_graph = QLineF(x_center - 5*self.L_coil, y_center + self.H_wind/2, x_center - 5*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center - 5*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1, x_center + 5*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 5*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1, x_center + 5*self.L_coil, y_center + self.H_wind/2)
-                painter.drawLine(tmp_graph)
-
-            tmp_rect = QRectF(x_center - 5*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.L_coil/2, self.H_wind + self.arrowLength + self.arrowLength1)
-            self.path.addRect(tmp_rect)
-            tmp_rect = QRectF(x_center + 9*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength, self.L_coil/2, self.H_wind + self.arrowLength + self.arrowLength1)
-            self.path.addRect(tmp_rect)
-
-        elif self.getShapeWinding() == "shell-double-classic-right":
-
-            # Rectangle
-            tmp_graph = QRectF(x_center - self.L_coil/2, y_center - self.H_wind/2, self.L_coil, self.H_wind)
-            painter.setBrush(color_2)
-            painter.drawRect(tmp_graph)
-
-            if side: # Connexions que du côté x+
-                # Flèches et lignes
-                tmp_graph = Arrow(x_center - self.L_coil/2, y_center + self.H_wind/2, x_center - self.L_coil/2, y_center + self.H_wind/2 + self.arrowLength, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-                tmp_graph = Arrow(x_center + self.L_coil/2, y_center + self.H_wind/2 + self.arrowLength, x_center + self.L_coil/2, y_center + self.H_wind/2, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-
-            tmp_rect = QRectF(x_center - self.L_coil/2, y_center - self.H_wind/2, self.L_coil, self.H_wind + self.arrowLength)
-            self.path.addRect(tmp_rect)
-
-        elif self.getShapeWinding() == "shell-triple-classic-in":
-
-            # Polygones
-            tmp_graph = QPolygonF([QPointF(x_center - 11*self.L_coil/2, y_center + self.L_coil), QPointF(x_center - 11*self.L_coil/2, y_center - self.L_coil), QPointF(x_center - 7*self.L_coil/2, y_center - self.H_wind/2), QPointF(x_center - 7*self.L_coil/2, y_center + self.H_wind/2)])
-            painter.setBrush(color_1)
-            painter.drawPolygon(tmp_graph)
-            tmp_graph = QPolygonF([QPointF(x_center + 9*self.L_coil/2, y_center + self.H_wind/2), QPointF(x_center + 9*self.L_coil/2, y_center - self.H_wind/2), QPointF(x_center + 11*self.L_coil/2, y_center - self.L_coil), QPointF(x_center + 11*self.L_coil/2, y_center + self.L_coil)])
-            painter.setBrush(color_1)
-            painter.drawPolygon(tmp_graph)
-            # Rectangle
-            tmp_graph = QRectF(x_center - self.L_coil/2, y_center - self.H_wind/2, 2*self.L_coil, self.H_wind)
-            painter.setBrush(color_1)
-            painter.drawRect(tmp_graph)
-
-            if side: # Connexions que du côté x+
-                # Flèches et lignes
-                tmp_graph = Arrow(x_center - 11*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength, x_center - 11*self.L_coil/2, y_center - self.L_coil, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-                tmp_graph = Arrow(x_center + 3*self.L_coil/2, y_center - self.H_wind/2, x_center + 3*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-
-                tmp_graph = QLineF(x_center - 7*self.L_coil/2, y_center - self.H_wind/2, x_center - 7*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center - 7*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1, x_center + 11*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 11*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1, x_center + 11*self.L_coil/2, y_center - self.L_coil)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center - self.L_coil/2, y_center - self.H_wind/2, x_center - self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1/2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center - self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1/2, x_center + 9*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1/2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 9*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1/2, x_center + 9*self.L_coil/2, y_center - self.H_wind/2)
-                painter.drawLine(tmp_graph)
-
-            tmp_rect = QRectF(x_center - 11*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength, 2*self.L_coil, self.H_wind + self.arrowLength)
-            self.path.addRect(tmp_rect)
-            tmp_rect = QRectF(x_center - self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1/2, 2*self.L_coil, self.H_wind + self.arrowLength1/2)
-            self.path.addRect(tmp_rect)
-            tmp_rect = QRectF(x_center + 9*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1, self.L_coil, self.H_wind + self.arrowLength1)
-            self.path.addRect(tmp_rect)
-
-        elif self.getShapeWinding() == "shell-triple-classic-out":
-
-            # Rectangles
-            tmp_graph = QRectF(x_center - 7*self.L_coil, y_center - self.H_wind/2, self.L_coil/2, self.H_wind)
-            painter.setBrush(color_2)
-            painter.drawRect(tmp_graph)
-            tmp_graph = QRectF(x_center + 13*self.L_coil/2, y_center - self.H_wind/2, self.L_coil/2, self.H_wind)
-            painter.setBrush(color_2)
-            painter.drawRect(tmp_graph)
-
-            if side: # Connexions que du côté x+
-                # Flèches et lignes
-                tmp_graph = Arrow(x_center - 13*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength, x_center - 13*self.L_coil/2, y_center - self.H_wind/2, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-                tmp_graph = Arrow(x_center + 13*self.L_coil/2, y_center - self.H_wind/2, x_center + 13*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-
-                tmp_graph = QLineF(x_center - 7*self.L_coil, y_center + self.H_wind/2, x_center - 7*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center - 7*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1, x_center + 7*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 7*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1, x_center + 7*self.L_coil, y_center + self.H_wind/2)
-                painter.drawLine(tmp_graph)
-
-            tmp_rect = QRectF(x_center - 7*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.L_coil/2, self.H_wind + self.arrowLength + self.arrowLength1)
-            self.path.addRect(tmp_rect)
-            tmp_rect = QRectF(x_center + 13*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength, self.L_coil/2, self.H_wind + self.arrowLength + self.arrowLength1)
-            self.path.addRect(tmp_rect)
-
-        elif self.getShapeWinding() == "shell-triple-classic-left":
-
-            # Rectangle
-            tmp_graph = QRectF(x_center - 5*self.L_coil/2, y_center - self.H_wind/2, self.L_coil, self.H_wind)
-            painter.setBrush(color_2)
-            painter.drawRect(tmp_graph)
-
-            if side: # Connexions que du côté x+
-                # Flèches et lignes
-                tmp_graph = Arrow(x_center - 5*self.L_coil/2, y_center + self.H_wind/2 + self.arrowLength, x_center - 5*self.L_coil/2, y_center + self.H_wind/2, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-                tmp_graph = Arrow(x_center - 3*self.L_coil/2, y_center + self.H_wind/2, x_center - 3*self.L_coil/2, y_center + self.H_wind/2 + self.arrowLength, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-
-            tmp_rect = QRectF(x_center - 5*self.L_coil/2, y_center - self.H_wind/2, self.L_coil, self.H_wind + self.arrowLength)
-            self.path.addRect(tmp_rect)
+        if side: # Connexions que du côté x+
+            # Flèche 1
+            plot.drawArrow(x_center, y_center - self.H_wind/2 - self.arrowLength, x_center, y_center - self.H_wind/2, self.arrowSize)
 
-        elif self.getShapeWinding() == "shell-triple-classic-right":
+            # Flèche 2
+            plot.drawArrow(x_center, y_center + self.H_wind/2, x_center, y_center + self.H_wind/2 + self.arrowLength, self.arrowSize)
 
-            # Rectangle
-            tmp_graph = QRectF(x_center + 5*self.L_coil/2, y_center - self.H_wind/2, self.L_coil, self.H_wind)
-            painter.setBrush(color_2)
-            painter.drawRect(tmp_graph)
-
-            if side: # Connexions que du côté x+
-                # Flèches et lignes
-                tmp_graph = Arrow(x_center + 5*self.L_coil/2, y_center + self.H_wind/2 + self.arrowLength, x_center + 5*self.L_coil/2, y_center + self.H_wind/2, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-                tmp_graph = Arrow(x_center + 7*self.L_coil/2, y_center + self.H_wind/2, x_center + 7*self.L_coil/2, y_center + self.H_wind/2 + self.arrowLength, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-
-            tmp_rect = QRectF(x_center + 5*self.L_coil/2, y_center - self.H_wind/2, self.L_coil, self.H_wind + self.arrowLength)
-            self.path.addRect(tmp_rect)
-
-        elif self.getShapeWinding() == "shell-simple-barrel-in" or self.getShapeWinding() == "shell-double-barrel-in":
-
-            # Polygone
-            tmp_graph = QPolygonF([QPointF(x_center - 4*self.L_coil, y_center + self.L_coil), QPointF(x_center - 4*self.L_coil, y_center - self.L_coil), QPointF(x_center - 2*self.L_coil, y_center - self.H_wind/2), QPointF(x_center - 2*self.L_coil, y_center + self.H_wind/2)])
-            painter.setBrush(color_1)
-            painter.drawPolygon(tmp_graph)
-            tmp_graph = QPolygonF([QPointF(x_center + 2*self.L_coil, y_center + self.H_wind/2), QPointF(x_center + 2*self.L_coil, y_center - self.H_wind/2), QPointF(x_center + 4*self.L_coil, y_center - self.L_coil), QPointF(x_center + 4*self.L_coil, y_center + self.L_coil)])
-            painter.setBrush(color_1)
-            painter.drawPolygon(tmp_graph)
-
-            if side: # Connexions que du côté x+
-                # Flèches et lignes
-                tmp_graph = Arrow(x_center - 4*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, x_center - 4*self.L_coil, y_center - self.L_coil, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-                tmp_graph = Arrow(x_center - 2*self.L_coil, y_center - self.H_wind/2, x_center - 2*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-
-                tmp_graph = QLineF(x_center - 2*self.L_coil, y_center - self.H_wind/2, x_center - 2*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1/2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center - 2*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1/2, x_center + 2*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1/2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 2*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1/2, x_center + 2*self.L_coil, y_center - self.H_wind/2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center - 4*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1, x_center + 4*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 4*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1, x_center + 4*self.L_coil, y_center - self.L_coil)
-                painter.drawLine(tmp_graph)
-
-            tmp_rect = QRectF(x_center - 4*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, 2*self.L_coil, self.H_wind + self.arrowLength)
-            self.path.addRect(tmp_rect)
-            tmp_rect = QRectF(x_center + 2*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, 2*self.L_coil, self.H_wind + self.arrowLength)
-            self.path.addRect(tmp_rect)
-
-        elif self.getShapeWinding() == "shell-simple-barrel-out":
-
-            # Rectangles
-            tmp_graph = QRectF(x_center - 6*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
-            painter.setBrush(color_2)
-            painter.drawRect(tmp_graph)
-            tmp_graph = QRectF(x_center + 5*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
-            painter.setBrush(color_2)
-            painter.drawRect(tmp_graph)
-            tmp_graph = QRectF(x_center - self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
-            painter.setBrush(color_2)
-            painter.drawRect(tmp_graph)
-            tmp_graph = QRectF(x_center, y_center - self.H_wind/2, self.L_coil, self.H_wind)
-            painter.setBrush(color_2)
-            painter.drawRect(tmp_graph)
-
-            if side: # Connexions que du côté x+
-                # Flèches et lignes
-                tmp_graph = Arrow(x_center - 5*self.L_coil, y_center + self.H_wind/2 + self.arrowLength, x_center - 5*self.L_coil, y_center + self.H_wind/2, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-                tmp_graph = Arrow(x_center - self.L_coil, y_center + self.H_wind/2, x_center - self.L_coil, y_center + self.H_wind/2 + self.arrowLength, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-
-                tmp_graph = QLineF(x_center - self.L_coil, y_center + self.H_wind/2 + self.arrowLength1/3, x_center + self.L_coil, y_center + self.H_wind/2 + self.arrowLength1/3)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + self.L_coil, y_center + self.H_wind/2 + self.arrowLength1/3, x_center + self.L_coil, y_center + self.H_wind/2)
-                painter.drawLine(tmp_graph)
-
-                tmp_graph = QLineF(x_center - 6*self.L_coil, y_center + self.H_wind/2, x_center - 6*self.L_coil, y_center + self.H_wind/2 + 2*self.arrowLength1/3)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center - 6*self.L_coil, y_center + self.H_wind/2 + 2*self.arrowLength1/3, x_center + 6*self.L_coil, y_center + self.H_wind/2 + 2*self.arrowLength1/3)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 6*self.L_coil, y_center + self.H_wind/2 + 2*self.arrowLength1/3, x_center + 6*self.L_coil, y_center + self.H_wind/2)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center, y_center + self.H_wind/2 + 2*self.arrowLength1/3, x_center, y_center + self.H_wind/2)
-                painter.drawLine(tmp_graph)
-
-                tmp_graph = QLineF(x_center - 5*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1, x_center + 5*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center + 5*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1, x_center + 5*self.L_coil, y_center + self.H_wind/2)
-                painter.drawLine(tmp_graph)
-
-            tmp_rect = QRectF(x_center - 6*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.L_coil, self.H_wind + 2*self.arrowLength)
-            self.path.addRect(tmp_rect)
-            tmp_rect = QRectF(x_center + 5*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.L_coil, self.H_wind + 2*self.arrowLength)
-            self.path.addRect(tmp_rect)
-            tmp_rect = QRectF(x_center - self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.L_coil, self.H_wind + 2*self.arrowLength)
-            self.path.addRect(tmp_rect)
-            tmp_rect = QRectF(x_center, y_center - self.H_wind/2 - self.arrowLength, self.L_coil, self.H_wind + 2*self.arrowLength)
-            self.path.addRect(tmp_rect)
-
-        elif self.getShapeWinding() == "shell-double-barrel-left":
-
-            # Rectangles
-            tmp_graph = QRectF(x_center - 6*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
-            painter.setBrush(color_2)
-            painter.drawRect(tmp_graph)
-            tmp_graph = QRectF(x_center - self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
-            painter.setBrush(color_2)
-            painter.drawRect(tmp_graph)
-
-            if side: # Connexions que du côté x+
-                # Flèches et lignes
-                tmp_graph = Arrow(x_center - 5*self.L_coil, y_center + self.H_wind/2 + self.arrowLength, x_center - 5*self.L_coil, y_center + self.H_wind/2, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-                tmp_graph = Arrow(x_center - self.L_coil, y_center + self.H_wind/2, x_center - self.L_coil, y_center + self.H_wind/2 + self.arrowLength, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-
-                tmp_graph = QLineF(x_center - 6*self.L_coil, y_center + self.H_wind/2, x_center - 6*self.L_coil, y_center + self.H_wind/2 + 2*self.arrowLength1/3)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center - 6*self.L_coil, y_center + self.H_wind/2 + 2*self.arrowLength1/3, x_center, y_center + self.H_wind/2 + 2*self.arrowLength1/3)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center, y_center + self.H_wind/2 + 2*self.arrowLength1/3, x_center, y_center + self.H_wind/2)
-                painter.drawLine(tmp_graph)
-
-            tmp_rect = QRectF(x_center - 6*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.L_coil, self.H_wind + 2*self.arrowLength)
-            self.path.addRect(tmp_rect)
-            tmp_rect = QRectF(x_center - self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.L_coil, self.H_wind + 2*self.arrowLength)
-            self.path.addRect(tmp_rect)
-
-        elif self.getShapeWinding() == "shell-double-barrel-right":
-
-            # Rectangles
-            tmp_graph = QRectF(x_center + 5*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
-            painter.setBrush(color_2)
-            painter.drawRect(tmp_graph)
-            tmp_graph = QRectF(x_center, y_center - self.H_wind/2, self.L_coil, self.H_wind)
-            painter.setBrush(color_2)
-            painter.drawRect(tmp_graph)
-
-            if side: # Connexions que du côté x+
-                # Flèches et lignes
-                tmp_graph = Arrow(x_center + 5*self.L_coil, y_center + self.H_wind/2 + self.arrowLength, x_center + 5*self.L_coil, y_center + self.H_wind/2, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-                tmp_graph = Arrow(x_center + self.L_coil, y_center + self.H_wind/2, x_center + self.L_coil, y_center + self.H_wind/2 + self.arrowLength, self.arrowSize)
-                tmp_graph.paint(painter, option, widget)
-
-                tmp_graph = QLineF(x_center + 6*self.L_coil, y_center + self.H_wind/2, x_center + 6*self.L_coil, y_center + self.H_wind/2 + 2*self.arrowLength1/3)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center, y_center + self.H_wind/2 + 2*self.arrowLength1/3, x_center + 6*self.L_coil, y_center + self.H_wind/2 + 2*self.arrowLength1/3)
-                painter.drawLine(tmp_graph)
-                tmp_graph = QLineF(x_center, y_center + self.H_wind/2 + 2*self.arrowLength1/3, x_center, y_center + self.H_wind/2)
-                painter.drawLine(tmp_graph)
-
-            tmp_rect = QRectF(x_center + 5*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.L_coil, self.H_wind + 2*self.arrowLength)
-            self.path.addRect(tmp_rect)
-            tmp_rect = QRectF(x_center, y_center - self.H_wind/2 - self.arrowLength, self.L_coil, self.H_wind + 2*self.arrowLength)
-            self.path.addRect(tmp_rect)
+        tmp_rect = QRectF(x_center - self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength, self.L_coil, self.H_wind + 2*self.arrowLength)
+        plot.addContour(tmp_rect)
 
+    def plotDoubleClassic(self, plot, x_center, y_center, side, color_1, color_2):
+        if side:
+            color_in = color_1
+            color_out = color_2
+        else:
+            color_in = color_2
+            color_out = color_1
+
+        # Rectangles
+        tmp_graph = QRectF(x_center - 5*self.L_coil/4, y_center - self.H_wind/2, self.L_coil, self.H_wind)
+        plot.setBrush(color_in)
+        plot.drawRect(tmp_graph)
+        tmp_graph = QRectF(x_center + self.L_coil/4, y_center - self.H_wind/2, self.L_coil, self.H_wind)
+        plot.setBrush(color_out)
+        plot.drawRect(tmp_graph)
+
+        if side: # Connexions que du côté x+
+            # Flèche 1
+            plot.drawArrow(x_center - 3*self.L_coil/4, y_center - self.H_wind/2 - self.arrowLength, x_center - 3*self.L_coil/4, y_center - self.H_wind/2, self.arrowSize)
+
+            # lignes
+            tmp_graph = QLineF(x_center - 3*self.L_coil/4, y_center + self.H_wind/2, x_center - 3*self.L_coil/4, y_center + self.H_wind/2 + self.arrowLength1)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 3*self.L_coil/4, y_center + self.H_wind/2 + self.arrowLength1, x_center - 3*self.L_coil/4, y_center + self.H_wind/2 + self.arrowLength1)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 3*self.L_coil/4, y_center + self.H_wind/2 + self.arrowLength1, x_center + 3*self.L_coil/4, y_center + self.H_wind/2)
+            plot.drawLine(tmp_graph)
+
+            # Flèche 2
+            plot.drawArrow(x_center + 3*self.L_coil/4, y_center - self.H_wind/2, x_center + 3*self.L_coil/4, y_center - self.H_wind/2 - self.arrowLength, self.arrowSize)
+
+        tmp_rect = QRectF(x_center - 5*self.L_coil/4, y_center - self.H_wind/2 - self.arrowLength, 5*self.L_coil/2, self.H_wind + self.arrowLength + self.arrowLength1)
+        plot.addContour(tmp_rect)
+
+    def plotFineCoarse(self, plot, x_center, y_center, side, color_1, color_2):
+        if side:
+            color_in = color_1
+            color_out = color_2
+        else:
+            color_in = color_2
+            color_out = color_1
+
+        # Rectangles
+        tmp_graph = QRectF(x_center - 2*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
+        plot.setBrush(color_in)
+        plot.drawRect(tmp_graph)
+        tmp_graph = QRectF(x_center - self.L_coil/2, y_center - self.H_wind/2, self.L_coil, self.H_wind)
+        plot.setBrush(color_out)
+        plot.drawRect(tmp_graph)
+        tmp_graph = QRectF(x_center + self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
+        plot.setBrush(color_in)
+        plot.drawRect(tmp_graph)
+
+        if side: # Connexions que du côté x+
+            # Flèche 1
+            plot.drawArrow(x_center - 3*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength, x_center - 3*self.L_coil/2, y_center - self.H_wind/2, self.arrowSize)
+
+            # Lignes + inter
+            tmp_graph = QLineF(x_center - 3*self.L_coil/2, y_center + self.H_wind/2, x_center - 3*self.L_coil/2, y_center + self.H_wind/2 + 3*self.arrowLength1/4)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center - 3*self.L_coil/2, y_center + self.H_wind/2 + 3*self.arrowLength1/4, x_center - self.L_coil, y_center + self.H_wind/2 + 3*self.arrowLength1/4)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center, y_center + self.H_wind/2, x_center, y_center + self.H_wind/2 + self.arrowLength1/2)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center - self.L_coil/2, y_center + self.H_wind/2 + self.arrowLength1/2, x_center, y_center + self.H_wind/2 + self.arrowLength1/2)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center - self.L_coil/2, y_center + self.H_wind/2 + self.arrowLength1, x_center + 3*self.L_coil/4, y_center + self.H_wind/2 + self.arrowLength1)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 3*self.L_coil/4, y_center + self.H_wind/2 + self.arrowLength1, x_center + 3*self.L_coil/4, y_center - self.H_wind/2 - self.arrowLength1)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center - self.L_coil, y_center + self.H_wind/2 + 3*self.arrowLength1/4, x_center - self.L_coil/2, y_center + self.H_wind/2 + self.arrowLength1/2)
+            plot.drawLine(tmp_graph)
+
+            # Lignes + regroupement
+            tmp_graph = QLineF(x_center, y_center - self.H_wind/2, x_center, y_center - self.H_wind/2 - self.arrowLength1)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center, y_center - self.H_wind/2 - self.arrowLength1, x_center + 3*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 3*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1, x_center + 3*self.L_coil/2, y_center - self.H_wind/2)
+            plot.drawLine(tmp_graph)
+
+            # Flèche 2
+            plot.drawArrow(x_center + 3*self.L_coil/2, y_center + self.H_wind/2, x_center + 3*self.L_coil/2, y_center + self.H_wind/2 + self.arrowLength, self.arrowSize)
+
+        tmp_rect = QRectF(x_center - 5*self.L_coil/4, y_center - self.H_wind/2 - self.arrowLength, 5*self.L_coil/2, self.H_wind + self.arrowLength + self.arrowLength1)
+        plot.addContour(tmp_rect)
+
+    def plotMiddleEntry(self, plot, x_center, y_center, side, color_1, color_2):
+        # Rectangle 1
+        tmp_graph = QRectF(x_center - self.L_coil/2, y_center - self.H_wind/2, self.L_coil, self.H_wind/2)
+        plot.setBrush(color_1)
+        plot.drawRect(tmp_graph)
+
+        # Rectangle 2
+        tmp_graph = QRectF(x_center - self.L_coil/2, y_center, self.L_coil, self.H_wind/2)
+        plot.setBrush(color_2)
+        plot.drawRect(tmp_graph)
+
+        if side: # Connexions que du côté x+
+            # Entrée
+            tmp_graph = QLineF(x_center + self.L_coil/2 + self.arrowLength1, y_center - self.H_wind/2 - self.arrowLength, x_center + self.L_coil/2 + self.arrowLength1, y_center)
+            plot.drawLine(tmp_graph)
+            plot.drawArrow(x_center + self.L_coil/2 + self.arrowLength1, y_center, x_center + self.L_coil/2, y_center, self.arrowSize)
+
+            # Sortie
+            tmp_graph = QLineF(x_center, y_center - self.H_wind/2, x_center, y_center - self.H_wind/2 - self.arrowLength1)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center, y_center - self.H_wind/2 - self.arrowLength1, x_center - (self.L_coil/2 + self.arrowLength1), y_center - self.H_wind/2 - self.arrowLength1)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center, y_center + self.H_wind/2, x_center, y_center + self.H_wind/2 + self.arrowLength1)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center, y_center + self.H_wind/2 + self.arrowLength1, x_center - (self.L_coil/2 + self.arrowLength1), y_center + self.H_wind/2 + self.arrowLength1)
+            plot.drawLine(tmp_graph)
+            plot.drawArrow(x_center - (self.L_coil/2 + self.arrowLength1), y_center - self.H_wind/2 - self.arrowLength1, x_center - (self.L_coil/2 + self.arrowLength1), y_center + self.H_wind/2 + self.arrowLength, self.arrowSize)
+
+        if side:
+            tmp_rect = QRectF(x_center - self.L_coil/2 - self.arrowLength1 - 2*self.arrowSize/4, y_center - self.H_wind/2 - self.arrowLength, self.L_coil + 2*self.arrowLength1 + self.arrowSize/2, self.H_wind + 2*self.arrowLength)
         else:
-            raise Exception("Shape du winding non reconnue")
+            tmp_rect = QRectF(x_center - self.L_coil/2 - self.arrowLength1, y_center - self.H_wind/2 - self.arrowLength, self.L_coil + 2*self.arrowLength1 + self.arrowSize/2, self.H_wind + 2*self.arrowLength)
+        plot.addContour(tmp_rect)
+
+    def plotOneAxialSplit(self, plot, x_center, y_center, side, color_1, color_2):
+        if side:
+            color_in_haut = color_1
+            color_in_bas = color_2
+            color_out_haut = color_2
+            color_out_bas = color_1
+        else:
+            color_in_haut = color_2
+            color_in_bas = color_1
+            color_out_haut = color_1
+            color_out_bas = color_2
+
+        # En raison de l'espace entre les 2 parties, on modifie la hauteur de l'enroulement pour le dessin
+        H_wind_bis = self.H_wind - 3*self.arrowLength2
+
+        ### Haut
+        # Rectangles
+        tmp_graph = QRectF(x_center - 5*self.L_coil/4, y_center - H_wind_bis/2 - 3*self.arrowLength2/2, self.L_coil, H_wind_bis/2)
+        plot.setBrush(color_in_haut)
+        plot.drawRect(tmp_graph)
+        tmp_graph = QRectF(x_center + self.L_coil/4, y_center - H_wind_bis/2 - 3*self.arrowLength2/2, self.L_coil, H_wind_bis/2)
+        plot.setBrush(color_out_haut)
+        plot.drawRect(tmp_graph)
+
+        if side: # Connexions que du côté x+
+            # Flèches et lignes
+            plot.drawArrow(x_center - 3*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength - 3*self.arrowLength2/2, x_center - 3*self.L_coil/4, y_center - H_wind_bis/2 - 3*self.arrowLength2/2, self.arrowSize)
+            tmp_graph = QLineF(x_center - 3*self.L_coil/4, y_center - 3*self.arrowLength2/2, x_center - 3*self.L_coil/4, y_center - self.arrowLength2/2)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 3*self.L_coil/4, y_center - self.arrowLength2/2, x_center - 3*self.L_coil/4, y_center - self.arrowLength2/2)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 3*self.L_coil/4, y_center - self.arrowLength2/2, x_center + 3*self.L_coil/4, y_center - 3*self.arrowLength2/2)
+            plot.drawLine(tmp_graph)
+            plot.drawArrow(x_center + 3*self.L_coil/4, y_center - H_wind_bis/2 - 3*self.arrowLength2/2, x_center + 3*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength - 3*self.arrowLength2/2, self.arrowSize)
+
+        ### Bas
+        # Rectangles
+        tmp_graph = QRectF(x_center - 5*self.L_coil/4, y_center + 3*self.arrowLength2/2, self.L_coil, H_wind_bis/2)
+        plot.setBrush(color_in_bas)
+        plot.drawRect(tmp_graph)
+        tmp_graph = QRectF(x_center + self.L_coil/4, y_center + 3*self.arrowLength2/2, self.L_coil, H_wind_bis/2)
+        plot.setBrush(color_out_bas)
+        plot.drawRect(tmp_graph)
+
+        if side: # Connexions que du côté x+
+            # Lignes
+            tmp_graph = QLineF(x_center - 3*self.L_coil/4, y_center + H_wind_bis/2 + self.arrowLength1 + 3*self.arrowLength2/2, x_center - 3*self.L_coil/4, y_center + H_wind_bis/2 + 3*self.arrowLength2/2)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center - 3*self.L_coil/4, y_center + 3*self.arrowLength2/2, x_center - 3*self.L_coil/4, y_center + self.arrowLength2/2)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 3*self.L_coil/4, y_center + self.arrowLength2/2, x_center - 3*self.L_coil/4, y_center + self.arrowLength2/2)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 3*self.L_coil/4, y_center + self.arrowLength2/2, x_center + 3*self.L_coil/4, y_center + 3*self.arrowLength2/2)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 3*self.L_coil/4, y_center + H_wind_bis/2 + 3*self.arrowLength2/2, x_center + 3*self.L_coil/4, y_center + H_wind_bis/2 + self.arrowLength1 + 3*self.arrowLength2/2)
+            plot.drawLine(tmp_graph)
+
+        ### Autres lignes
+        if side: # Connexions que du côté x+
+            # Lignes
+            tmp_graph = QLineF(x_center - 3*self.L_coil/4, y_center + H_wind_bis/2 + self.arrowLength1 + 3*self.arrowLength2/2, x_center - 6*self.L_coil/4, y_center + H_wind_bis/2 + self.arrowLength1 + 3*self.arrowLength2/2)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 3*self.L_coil/4, y_center + H_wind_bis/2 + self.arrowLength1 + 3*self.arrowLength2/2, x_center + 6*self.L_coil/4, y_center + H_wind_bis/2 + self.arrowLength1 + 3*self.arrowLength2/2)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center - 6*self.L_coil/4, y_center + H_wind_bis/2 + self.arrowLength1 + 3*self.arrowLength2/2, x_center - 6*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength1 - 3*self.arrowLength2/2)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 6*self.L_coil/4, y_center + H_wind_bis/2 + self.arrowLength1 + 3*self.arrowLength2/2, x_center + 6*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength1 - 3*self.arrowLength2/2)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center - 3*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength1 - 3*self.arrowLength2/2, x_center - 6*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength1 - 3*self.arrowLength2/2)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 3*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength1 - 3*self.arrowLength2/2, x_center + 6*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength1 - 3*self.arrowLength2/2)
+            plot.drawLine(tmp_graph)
+
+        tmp_rect = QRectF(x_center - 6*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength - 3*self.arrowLength2/2, 6*self.L_coil/2, H_wind_bis + self.arrowLength + self.arrowLength1 + 3*self.arrowLength2)
+        plot.addContour(tmp_rect)
+
+    def plotTwoAxialSplitTop(self, plot, x_center, y_center, side, color_1, color_2):
+        if side:
+            color_in_haut = color_1
+            color_out_haut = color_2
+        else:
+            color_in_haut = color_2
+            color_out_haut = color_1
+
+        y_center = y_center - 3*self.arrowLength2/4 - self.H_wind/2
+
+        # En raison de l'espace entre les 2 parties, on modifie la hauteur de l'enroulement pour le dessin
+        H_wind_bis = self.H_wind - 3*self.arrowLength2/2
+
+        ### Haut
+        # Rectangles
+        tmp_graph = QRectF(x_center - 5*self.L_coil/4, y_center - H_wind_bis/2, self.L_coil, H_wind_bis)
+        plot.setBrush(color_in_haut)
+        plot.drawRect(tmp_graph)
+        tmp_graph = QRectF(x_center + self.L_coil/4, y_center - H_wind_bis/2, self.L_coil, H_wind_bis)
+        plot.setBrush(color_out_haut)
+        plot.drawRect(tmp_graph)
+
+        if side: # Connexions que du côté x+
+            # Flèches et lignes
+            plot.drawArrow(x_center - 3*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength, x_center - 3*self.L_coil/4, y_center - H_wind_bis/2, self.arrowSize)
+            tmp_graph = QLineF(x_center - 3*self.L_coil/4, y_center + H_wind_bis/2, x_center - 3*self.L_coil/4, y_center + H_wind_bis/2 + self.arrowLength2)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 3*self.L_coil/4, y_center + H_wind_bis/2 + self.arrowLength2, x_center - 3*self.L_coil/4, y_center + H_wind_bis/2 + self.arrowLength2)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 3*self.L_coil/4, y_center + H_wind_bis/2 + self.arrowLength2, x_center + 3*self.L_coil/4, y_center + H_wind_bis/2)
+            plot.drawLine(tmp_graph)
+            plot.drawArrow(x_center + 3*self.L_coil/4, y_center - H_wind_bis/2, x_center + 3*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength, self.arrowSize)
+
+        tmp_rect = QRectF(x_center - 5*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength, 5*self.L_coil/2, H_wind_bis + self.arrowLength + self.arrowLength2)
+        plot.addContour(tmp_rect)
+
+    def plotTwoAxialSplitBottom(self, plot, x_center, y_center, side, color_1, color_2):
+        if side:
+            color_in_bas = color_2
+            color_out_bas = color_1
+        else:
+            color_in_bas = color_1
+            color_out_bas = color_2
+
+        y_center = y_center + 3*self.arrowLength2/4 + self.H_wind/2
+
+        # En raison de l'espace entre les 2 parties, on modifie la hauteur de l'enroulement pour le dessin
+        H_wind_bis = self.H_wind - 3*self.arrowLength2/2
+
+        ### Bas
+        # Rectangles
+        tmp_graph = QRectF(x_center - 5*self.L_coil/4, y_center - H_wind_bis/2, self.L_coil, H_wind_bis)
+        plot.setBrush(color_in_bas)
+        plot.drawRect(tmp_graph)
+        tmp_graph = QRectF(x_center + self.L_coil/4, y_center - H_wind_bis/2, self.L_coil, H_wind_bis)
+        plot.setBrush(color_out_bas)
+        plot.drawRect(tmp_graph)
+
+        if side: # Connexions que du côté x+
+            # Flèches et lignes
+            plot.drawArrow(x_center - 3*self.L_coil/4, y_center + H_wind_bis/2 + self.arrowLength, x_center - 3*self.L_coil/4, y_center + H_wind_bis/2, self.arrowSize)
+            tmp_graph = QLineF(x_center - 3*self.L_coil/4, y_center - H_wind_bis/2, x_center - 3*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength2)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 3*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength2, x_center - 3*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength2)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 3*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength2, x_center + 3*self.L_coil/4, y_center - H_wind_bis/2)
+            plot.drawLine(tmp_graph)
+            plot.drawArrow(x_center + 3*self.L_coil/4, y_center + H_wind_bis/2, x_center + 3*self.L_coil/4, y_center + H_wind_bis/2 + self.arrowLength, self.arrowSize)
+
+        tmp_rect = QRectF(x_center - 5*self.L_coil/4, y_center - H_wind_bis/2 - self.arrowLength2, 5*self.L_coil/2, H_wind_bis + self.arrowLength + self.arrowLength2)
+        plot.addContour(tmp_rect)
+
+    def plotShellSimpleClassicIn(self, plot, x_center, y_center, side, color_1, color_2):
+        # Polygone
+        tmp_graph = QPolygonF([QPointF(x_center - self.L_coil, y_center + self.L_coil), QPointF(x_center - self.L_coil, y_center - self.L_coil), QPointF(x_center + self.L_coil, y_center - self.H_wind/2), QPointF(x_center + self.L_coil, y_center + self.H_wind/2)])
+        plot.setBrush(color_1)
+        plot.drawPolygon(tmp_graph)
+
+        if side: # Connexions que du côté x+
+            # Flèches et lignes
+            plot.drawArrow(x_center - self.L_coil, y_center - self.H_wind/2 - self.arrowLength, x_center - self.L_coil, y_center - self.L_coil, self.arrowSize)
+            plot.drawArrow(x_center + self.L_coil, y_center - self.H_wind/2, x_center + self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.arrowSize)
+
+        tmp_rect = QRectF(x_center - self.L_coil, y_center - self.H_wind/2 - self.arrowLength, 2*self.L_coil, self.H_wind + self.arrowLength)
+        plot.addContour(tmp_rect)
+
+    def plotShellSimpleClassicOut(self, plot, x_center, y_center, side, color_1, color_2):
+        # Rectangles
+        tmp_graph = QRectF(x_center - 3*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
+        plot.setBrush(color_2)
+        plot.drawRect(tmp_graph)
+        tmp_graph = QRectF(x_center + 2*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
+        plot.setBrush(color_2)
+        plot.drawRect(tmp_graph)
+
+        if side: # Connexions que du côté x+
+            # Flèches et lignes
+            plot.drawArrow(x_center - 2*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, x_center - 2*self.L_coil, y_center - self.H_wind/2, self.arrowSize)
+            plot.drawArrow(x_center + 2*self.L_coil, y_center - self.H_wind/2, x_center + 2*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.arrowSize)
+
+            tmp_graph = QLineF(x_center - 3*self.L_coil, y_center + self.H_wind/2, x_center - 3*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center - 3*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1, x_center + 3*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 3*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1, x_center + 3*self.L_coil, y_center + self.H_wind/2)
+            plot.drawLine(tmp_graph)
+
+        tmp_rect = QRectF(x_center - 3*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.L_coil, self.H_wind + self.arrowLength + self.arrowLength1)
+        plot.addContour(tmp_rect)
+        tmp_rect = QRectF(x_center + 2*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.L_coil, self.H_wind + self.arrowLength + self.arrowLength1)
+        plot.addContour(tmp_rect)
+
+    def plotShellSimpleDiaboloIn(self, plot, x_center, y_center, side, color_1, color_2):
+        # Polygones
+        tmp_graph = QPolygonF([QPointF(x_center, y_center + self.L_coil), QPointF(x_center, y_center - self.L_coil), QPointF(x_center + 2*self.L_coil, y_center - self.H_wind/2), QPointF(x_center + 2*self.L_coil, y_center + self.H_wind/2)])
+        plot.setBrush(color_1)
+        plot.drawPolygon(tmp_graph)
+        tmp_graph = QPolygonF([QPointF(x_center, y_center + self.L_coil), QPointF(x_center, y_center - self.L_coil), QPointF(x_center - 2*self.L_coil, y_center - self.H_wind/2), QPointF(x_center - 2*self.L_coil, y_center + self.H_wind/2)])
+        plot.setBrush(color_2)
+        plot.drawPolygon(tmp_graph)
+
+        # Rectangles
+        tmp_graph = QRectF(x_center + 5*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
+        plot.setBrush(color_1)
+        plot.drawRect(tmp_graph)
+        tmp_graph = QRectF(x_center - 6*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
+        plot.setBrush(color_2)
+        plot.drawRect(tmp_graph)
+
+        if side: # Connexions que du côté x+
+            # Flèches et lignes
+            plot.drawArrow(x_center, y_center - self.H_wind/2 - self.arrowLength, x_center, y_center - self.L_coil, self.arrowSize)
+            plot.drawArrow(x_center - 6*self.L_coil, y_center - self.H_wind/2, x_center - 6*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.arrowSize)
+
+            tmp_graph = QLineF(x_center + 2*self.L_coil, y_center - self.H_wind/2, x_center + 2*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1/2)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 2*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1/2, x_center + 5*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1/2)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 5*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1/2, x_center + 5*self.L_coil, y_center - self.H_wind/2)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center - 2*self.L_coil, y_center - self.H_wind/2, x_center - 2*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1/2)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center - 2*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1/2, x_center - 5*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1/2)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center - 5*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1/2, x_center - 5*self.L_coil, y_center - self.H_wind/2)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 6*self.L_coil, y_center - self.H_wind/2, x_center + 6*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 6*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1, x_center - 6*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1)
+            plot.drawLine(tmp_graph)
+
+        tmp_rect = QRectF(x_center - 2*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, 4*self.L_coil, self.H_wind + self.arrowLength)
+        plot.addContour(tmp_rect)
+        tmp_rect = QRectF(x_center - 6*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.L_coil, self.H_wind + self.arrowLength)
+        plot.addContour(tmp_rect)
+        tmp_rect = QRectF(x_center + 5*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.L_coil, self.H_wind + self.arrowLength)
+        plot.addContour(tmp_rect)
+
+    def plotShellSimpleDiaboloOut(self, plot, x_center, y_center, side, color_1, color_2):
+        # Rectangles
+        tmp_graph = QRectF(x_center + 3*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
+        plot.setBrush(color_2)
+        plot.drawRect(tmp_graph)
+        tmp_graph = QRectF(x_center - 4*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
+        plot.setBrush(color_1)
+        plot.drawRect(tmp_graph)
+
+        if side: # Connexions que du côté x+
+            # Flèches et lignes
+            plot.drawArrow(x_center - 4*self.L_coil, y_center + self.H_wind/2 + self.arrowLength, x_center - 4*self.L_coil, y_center + self.H_wind/2, self.arrowSize)
+            plot.drawArrow(x_center - 3*self.L_coil, y_center + self.H_wind/2, x_center - 3*self.L_coil, y_center + self.H_wind/2 + self.arrowLength, self.arrowSize)
+
+            tmp_graph = QLineF(x_center - 4*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1, x_center + 4*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 4*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1, x_center + 4*self.L_coil, y_center + self.H_wind/2)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center - 3*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1/2, x_center + 3*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1/2)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 3*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1/2, x_center + 3*self.L_coil, y_center + self.H_wind/2)
+            plot.drawLine(tmp_graph)
+
+        tmp_rect = QRectF(x_center - 4*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind + self.arrowLength)
+        plot.addContour(tmp_rect)
+        tmp_rect = QRectF(x_center + 3*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind + self.arrowLength)
+        plot.addContour(tmp_rect)
+
+    def plotShellDoubleDiaboloLeft(self, plot, x_center, y_center, side, color_1, color_2):
+        # Rectangles
+        tmp_graph = QRectF(x_center - 4*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
+        plot.setBrush(color_1)
+        plot.drawRect(tmp_graph)
+
+        if side: # Connexions que du côté x+
+            # Flèches et lignes
+            plot.drawArrow(x_center - 4*self.L_coil, y_center + self.H_wind/2 + self.arrowLength, x_center - 4*self.L_coil, y_center + self.H_wind/2, self.arrowSize)
+            plot.drawArrow(x_center - 3*self.L_coil, y_center + self.H_wind/2, x_center - 3*self.L_coil, y_center + self.H_wind/2 + self.arrowLength, self.arrowSize)
+
+        tmp_rect = QRectF(x_center - 4*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind + self.arrowLength)
+        plot.addContour(tmp_rect)
+
+    def plotShellDoubleDiaboloRight(self, plot, x_center, y_center, side, color_1, color_2):
+        # Rectangles
+        tmp_graph = QRectF(x_center + 3*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
+        plot.setBrush(color_2)
+        plot.drawRect(tmp_graph)
+
+        if side: # Connexions que du côté x+
+            # Flèches et lignes
+            plot.drawArrow(x_center + 4*self.L_coil, y_center + self.H_wind/2 + self.arrowLength, x_center + 4*self.L_coil, y_center + self.H_wind/2, self.arrowSize)
+            plot.drawArrow(x_center + 3*self.L_coil, y_center + self.H_wind/2, x_center + 3*self.L_coil, y_center + self.H_wind/2 + self.arrowLength, self.arrowSize)
+
+        tmp_rect = QRectF(x_center + 3*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind + self.arrowLength)
+        plot.addContour(tmp_rect)
+
+    def plotShellDoubleClassicIn(self, plot, x_center, y_center, side, color_1, color_2):
+        # Polygone
+        tmp_graph = QPolygonF([QPointF(x_center - 7*self.L_coil/2, y_center + self.L_coil), QPointF(x_center - 7*self.L_coil/2, y_center - self.L_coil), QPointF(x_center - 3*self.L_coil/2, y_center - self.H_wind/2), QPointF(x_center - 3*self.L_coil/2, y_center + self.H_wind/2)])
+        plot.setBrush(color_1)
+        plot.drawPolygon(tmp_graph)
+        # Rectangle
+        tmp_graph = QRectF(x_center + 3*self.L_coil/2, y_center - self.H_wind/2, 2*self.L_coil, self.H_wind)
+        plot.setBrush(color_1)
+        plot.drawRect(tmp_graph)
+
+        if side: # Connexions que du côté x+
+            # Flèches et lignes
+            plot.drawArrow(x_center - 7*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength, x_center - 7*self.L_coil/2, y_center - self.L_coil, self.arrowSize)
+            plot.drawArrow(x_center + 7*self.L_coil/2, y_center - self.H_wind/2, x_center + 7*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength, self.arrowSize)
+
+            tmp_graph = QLineF(x_center - 3*self.L_coil/2, y_center - self.H_wind/2, x_center - 3*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center - 3*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1, x_center + 3*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 3*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1, x_center + 3*self.L_coil/2, y_center - self.H_wind/2)
+            plot.drawLine(tmp_graph)
+
+        tmp_rect = QRectF(x_center - 7*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength, 2*self.L_coil, self.H_wind + self.arrowLength)
+        plot.addContour(tmp_rect)
+        tmp_rect = QRectF(x_center + 3*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength, 2*self.L_coil, self.H_wind + self.arrowLength)
+        plot.addContour(tmp_rect)
+
+    def plotShellDoubleClassicOut(self, plot, x_center, y_center, side, color_1, color_2):
+        # Rectangles
+        tmp_graph = QRectF(x_center - 5*self.L_coil, y_center - self.H_wind/2, self.L_coil/2, self.H_wind)
+        plot.setBrush(color_2)
+        plot.drawRect(tmp_graph)
+        tmp_graph = QRectF(x_center + 9*self.L_coil/2, y_center - self.H_wind/2, self.L_coil/2, self.H_wind)
+        plot.setBrush(color_2)
+        plot.drawRect(tmp_graph)
+
+        if side: # Connexions que du côté x+
+            # Flèches et lignes
+            plot.drawArrow(x_center - 9*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength, x_center - 9*self.L_coil/2, y_center - self.H_wind/2, self.arrowSize)
+            plot.drawArrow(x_center + 9*self.L_coil/2, y_center - self.H_wind/2, x_center + 9*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength, self.arrowSize)
+
+            tmp_graph = QLineF(x_center - 5*self.L_coil, y_center + self.H_wind/2, x_center - 5*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center - 5*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1, x_center + 5*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 5*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1, x_center + 5*self.L_coil, y_center + self.H_wind/2)
+            plot.drawLine(tmp_graph)
+
+        tmp_rect = QRectF(x_center - 5*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.L_coil/2, self.H_wind + self.arrowLength + self.arrowLength1)
+        plot.addContour(tmp_rect)
+        tmp_rect = QRectF(x_center + 9*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength, self.L_coil/2, self.H_wind + self.arrowLength + self.arrowLength1)
+        plot.addContour(tmp_rect)
+
+    def plotShellDoubleClassicRight(self, plot, x_center, y_center, side, color_1, color_2):
+        # Rectangle
+        tmp_graph = QRectF(x_center - self.L_coil/2, y_center - self.H_wind/2, self.L_coil, self.H_wind)
+        plot.setBrush(color_2)
+        plot.drawRect(tmp_graph)
+
+        if side: # Connexions que du côté x+
+            # Flèches et lignes
+            plot.drawArrow(x_center - self.L_coil/2, y_center + self.H_wind/2, x_center - self.L_coil/2, y_center + self.H_wind/2 + self.arrowLength, self.arrowSize)
+            plot.drawArrow(x_center + self.L_coil/2, y_center + self.H_wind/2 + self.arrowLength, x_center + self.L_coil/2, y_center + self.H_wind/2, self.arrowSize)
+
+        tmp_rect = QRectF(x_center - self.L_coil/2, y_center - self.H_wind/2, self.L_coil, self.H_wind + self.arrowLength)
+        plot.addContour(tmp_rect)
+
+    def plotShellTripleClassicIn(self, plot, x_center, y_center, side, color_1, color_2):
+        # Polygones
+        tmp_graph = QPolygonF([QPointF(x_center - 11*self.L_coil/2, y_center + self.L_coil), QPointF(x_center - 11*self.L_coil/2, y_center - self.L_coil), QPointF(x_center - 7*self.L_coil/2, y_center - self.H_wind/2), QPointF(x_center - 7*self.L_coil/2, y_center + self.H_wind/2)])
+        plot.setBrush(color_1)
+        plot.drawPolygon(tmp_graph)
+        tmp_graph = QPolygonF([QPointF(x_center + 9*self.L_coil/2, y_center + self.H_wind/2), QPointF(x_center + 9*self.L_coil/2, y_center - self.H_wind/2), QPointF(x_center + 11*self.L_coil/2, y_center - self.L_coil), QPointF(x_center + 11*self.L_coil/2, y_center + self.L_coil)])
+        plot.setBrush(color_1)
+        plot.drawPolygon(tmp_graph)
+        # Rectangle
+        tmp_graph = QRectF(x_center - self.L_coil/2, y_center - self.H_wind/2, 2*self.L_coil, self.H_wind)
+        plot.setBrush(color_1)
+        plot.drawRect(tmp_graph)
+
+        if side: # Connexions que du côté x+
+            # Flèches et lignes
+            plot.drawArrow(x_center - 11*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength, x_center - 11*self.L_coil/2, y_center - self.L_coil, self.arrowSize)
+            plot.drawArrow(x_center + 3*self.L_coil/2, y_center - self.H_wind/2, x_center + 3*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength, self.arrowSize)
+
+            tmp_graph = QLineF(x_center - 7*self.L_coil/2, y_center - self.H_wind/2, x_center - 7*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center - 7*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1, x_center + 11*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 11*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1, x_center + 11*self.L_coil/2, y_center - self.L_coil)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center - self.L_coil/2, y_center - self.H_wind/2, x_center - self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1/2)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center - self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1/2, x_center + 9*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1/2)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 9*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1/2, x_center + 9*self.L_coil/2, y_center - self.H_wind/2)
+            plot.drawLine(tmp_graph)
+
+        tmp_rect = QRectF(x_center - 11*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength, 2*self.L_coil, self.H_wind + self.arrowLength)
+        plot.addContour(tmp_rect)
+        tmp_rect = QRectF(x_center - self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1/2, 2*self.L_coil, self.H_wind + self.arrowLength1/2)
+        plot.addContour(tmp_rect)
+        tmp_rect = QRectF(x_center + 9*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength1, self.L_coil, self.H_wind + self.arrowLength1)
+        plot.addContour(tmp_rect)
+
+    def plotShellTripleClassicOut(self, plot, x_center, y_center, side, color_1, color_2):
+        # Rectangles
+        tmp_graph = QRectF(x_center - 7*self.L_coil, y_center - self.H_wind/2, self.L_coil/2, self.H_wind)
+        plot.setBrush(color_2)
+        plot.drawRect(tmp_graph)
+        tmp_graph = QRectF(x_center + 13*self.L_coil/2, y_center - self.H_wind/2, self.L_coil/2, self.H_wind)
+        plot.setBrush(color_2)
+        plot.drawRect(tmp_graph)
+
+        if side: # Connexions que du côté x+
+            # Flèches et lignes
+            plot.drawArrow(x_center - 13*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength, x_center - 13*self.L_coil/2, y_center - self.H_wind/2, self.arrowSize)
+            plot.drawArrow(x_center + 13*self.L_coil/2, y_center - self.H_wind/2, x_center + 13*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength, self.arrowSize)
+
+            tmp_graph = QLineF(x_center - 7*self.L_coil, y_center + self.H_wind/2, x_center - 7*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center - 7*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1, x_center + 7*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 7*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1, x_center + 7*self.L_coil, y_center + self.H_wind/2)
+            plot.drawLine(tmp_graph)
+
+        tmp_rect = QRectF(x_center - 7*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.L_coil/2, self.H_wind + self.arrowLength + self.arrowLength1)
+        plot.addContour(tmp_rect)
+        tmp_rect = QRectF(x_center + 13*self.L_coil/2, y_center - self.H_wind/2 - self.arrowLength, self.L_coil/2, self.H_wind + self.arrowLength + self.arrowLength1)
+        plot.addContour(tmp_rect)
+
+    def plotShellTripleClassicLeft(self, plot, x_center, y_center, side, color_1, color_2):
+        # Rectangle
+        tmp_graph = QRectF(x_center - 5*self.L_coil/2, y_center - self.H_wind/2, self.L_coil, self.H_wind)
+        plot.setBrush(color_2)
+        plot.drawRect(tmp_graph)
+
+        if side: # Connexions que du côté x+
+            # Flèches et lignes
+            plot.drawArrow(x_center - 5*self.L_coil/2, y_center + self.H_wind/2 + self.arrowLength, x_center - 5*self.L_coil/2, y_center + self.H_wind/2, self.arrowSize)
+            plot.drawArrow(x_center - 3*self.L_coil/2, y_center + self.H_wind/2, x_center - 3*self.L_coil/2, y_center + self.H_wind/2 + self.arrowLength, self.arrowSize)
+
+        tmp_rect = QRectF(x_center - 5*self.L_coil/2, y_center - self.H_wind/2, self.L_coil, self.H_wind + self.arrowLength)
+        plot.addContour(tmp_rect)
+
+    def plotShellTripleClassicRight(self, plot, x_center, y_center, side, color_1, color_2):
+        # Rectangle
+        tmp_graph = QRectF(x_center + 5*self.L_coil/2, y_center - self.H_wind/2, self.L_coil, self.H_wind)
+        plot.setBrush(color_2)
+        plot.drawRect(tmp_graph)
+
+        if side: # Connexions que du côté x+
+            # Flèches et lignes
+            plot.drawArrow(x_center + 5*self.L_coil/2, y_center + self.H_wind/2 + self.arrowLength, x_center + 5*self.L_coil/2, y_center + self.H_wind/2, self.arrowSize)
+            plot.drawArrow(x_center + 7*self.L_coil/2, y_center + self.H_wind/2, x_center + 7*self.L_coil/2, y_center + self.H_wind/2 + self.arrowLength, self.arrowSize)
+
+        tmp_rect = QRectF(x_center + 5*self.L_coil/2, y_center - self.H_wind/2, self.L_coil, self.H_wind + self.arrowLength)
+        plot.addContour(tmp_rect)
+
+    def plotShellSimpleBarrelIn(self, plot, x_center, y_center, side, color_1, color_2):
+        # Polygone
+        tmp_graph = QPolygonF([QPointF(x_center - 4*self.L_coil, y_center + self.L_coil), QPointF(x_center - 4*self.L_coil, y_center - self.L_coil), QPointF(x_center - 2*self.L_coil, y_center - self.H_wind/2), QPointF(x_center - 2*self.L_coil, y_center + self.H_wind/2)])
+        plot.setBrush(color_1)
+        plot.drawPolygon(tmp_graph)
+        tmp_graph = QPolygonF([QPointF(x_center + 2*self.L_coil, y_center + self.H_wind/2), QPointF(x_center + 2*self.L_coil, y_center - self.H_wind/2), QPointF(x_center + 4*self.L_coil, y_center - self.L_coil), QPointF(x_center + 4*self.L_coil, y_center + self.L_coil)])
+        plot.setBrush(color_1)
+        plot.drawPolygon(tmp_graph)
+
+        if side: # Connexions que du côté x+
+            # Flèches et lignes
+            plot.drawArrow(x_center - 4*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, x_center - 4*self.L_coil, y_center - self.L_coil, self.arrowSize)
+            plot.drawArrow(x_center - 2*self.L_coil, y_center - self.H_wind/2, x_center - 2*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.arrowSize)
+
+            tmp_graph = QLineF(x_center - 2*self.L_coil, y_center - self.H_wind/2, x_center - 2*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1/2)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center - 2*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1/2, x_center + 2*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1/2)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 2*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1/2, x_center + 2*self.L_coil, y_center - self.H_wind/2)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center - 4*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1, x_center + 4*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 4*self.L_coil, y_center - self.H_wind/2 - self.arrowLength1, x_center + 4*self.L_coil, y_center - self.L_coil)
+            plot.drawLine(tmp_graph)
+
+        tmp_rect = QRectF(x_center - 4*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, 2*self.L_coil, self.H_wind + self.arrowLength)
+        plot.addContour(tmp_rect)
+        tmp_rect = QRectF(x_center + 2*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, 2*self.L_coil, self.H_wind + self.arrowLength)
+        plot.addContour(tmp_rect)
+
+    def plotShellSimpleBarrelOut(self, plot, x_center, y_center, side, color_1, color_2):
+        # Rectangles
+        tmp_graph = QRectF(x_center - 6*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
+        plot.setBrush(color_2)
+        plot.drawRect(tmp_graph)
+        tmp_graph = QRectF(x_center + 5*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
+        plot.setBrush(color_2)
+        plot.drawRect(tmp_graph)
+        tmp_graph = QRectF(x_center - self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
+        plot.setBrush(color_2)
+        plot.drawRect(tmp_graph)
+        tmp_graph = QRectF(x_center, y_center - self.H_wind/2, self.L_coil, self.H_wind)
+        plot.setBrush(color_2)
+        plot.drawRect(tmp_graph)
+
+        if side: # Connexions que du côté x+
+            # Flèches et lignes
+            plot.drawArrow(x_center - 5*self.L_coil, y_center + self.H_wind/2 + self.arrowLength, x_center - 5*self.L_coil, y_center + self.H_wind/2, self.arrowSize)
+            plot.drawArrow(x_center - self.L_coil, y_center + self.H_wind/2, x_center - self.L_coil, y_center + self.H_wind/2 + self.arrowLength, self.arrowSize)
+
+            tmp_graph = QLineF(x_center - self.L_coil, y_center + self.H_wind/2 + self.arrowLength1/3, x_center + self.L_coil, y_center + self.H_wind/2 + self.arrowLength1/3)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + self.L_coil, y_center + self.H_wind/2 + self.arrowLength1/3, x_center + self.L_coil, y_center + self.H_wind/2)
+            plot.drawLine(tmp_graph)
+
+            tmp_graph = QLineF(x_center - 6*self.L_coil, y_center + self.H_wind/2, x_center - 6*self.L_coil, y_center + self.H_wind/2 + 2*self.arrowLength1/3)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center - 6*self.L_coil, y_center + self.H_wind/2 + 2*self.arrowLength1/3, x_center + 6*self.L_coil, y_center + self.H_wind/2 + 2*self.arrowLength1/3)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 6*self.L_coil, y_center + self.H_wind/2 + 2*self.arrowLength1/3, x_center + 6*self.L_coil, y_center + self.H_wind/2)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center, y_center + self.H_wind/2 + 2*self.arrowLength1/3, x_center, y_center + self.H_wind/2)
+            plot.drawLine(tmp_graph)
+
+            tmp_graph = QLineF(x_center - 5*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1, x_center + 5*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center + 5*self.L_coil, y_center + self.H_wind/2 + self.arrowLength1, x_center + 5*self.L_coil, y_center + self.H_wind/2)
+            plot.drawLine(tmp_graph)
+
+        tmp_rect = QRectF(x_center - 6*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.L_coil, self.H_wind + 2*self.arrowLength)
+        plot.addContour(tmp_rect)
+        tmp_rect = QRectF(x_center + 5*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.L_coil, self.H_wind + 2*self.arrowLength)
+        plot.addContour(tmp_rect)
+        tmp_rect = QRectF(x_center - self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.L_coil, self.H_wind + 2*self.arrowLength)
+        plot.addContour(tmp_rect)
+        tmp_rect = QRectF(x_center, y_center - self.H_wind/2 - self.arrowLength, self.L_coil, self.H_wind + 2*self.arrowLength)
+        plot.addContour(tmp_rect)
+
+    def plotShellDoubleBarrelLeft(self, plot, x_center, y_center, side, color_1, color_2):
+        # Rectangles
+        tmp_graph = QRectF(x_center - 6*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
+        plot.setBrush(color_2)
+        plot.drawRect(tmp_graph)
+        tmp_graph = QRectF(x_center - self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
+        plot.setBrush(color_2)
+        plot.drawRect(tmp_graph)
+
+        if side: # Connexions que du côté x+
+            # Flèches et lignes
+            plot.drawArrow(x_center - 5*self.L_coil, y_center + self.H_wind/2 + self.arrowLength, x_center - 5*self.L_coil, y_center + self.H_wind/2, self.arrowSize)
+            plot.drawArrow(x_center - self.L_coil, y_center + self.H_wind/2, x_center - self.L_coil, y_center + self.H_wind/2 + self.arrowLength, self.arrowSize)
+
+            tmp_graph = QLineF(x_center - 6*self.L_coil, y_center + self.H_wind/2, x_center - 6*self.L_coil, y_center + self.H_wind/2 + 2*self.arrowLength1/3)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center - 6*self.L_coil, y_center + self.H_wind/2 + 2*self.arrowLength1/3, x_center, y_center + self.H_wind/2 + 2*self.arrowLength1/3)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center, y_center + self.H_wind/2 + 2*self.arrowLength1/3, x_center, y_center + self.H_wind/2)
+            plot.drawLine(tmp_graph)
+
+        tmp_rect = QRectF(x_center - 6*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.L_coil, self.H_wind + 2*self.arrowLength)
+        plot.addContour(tmp_rect)
+        tmp_rect = QRectF(x_center - self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.L_coil, self.H_wind + 2*self.arrowLength)
+        plot.addContour(tmp_rect)
+
+    def plotShellDoubleBarrelRight(self, plot, x_center, y_center, side, color_1, color_2):
+        # Rectangles
+        tmp_graph = QRectF(x_center + 5*self.L_coil, y_center - self.H_wind/2, self.L_coil, self.H_wind)
+        plot.setBrush(color_2)
+        plot.drawRect(tmp_graph)
+        tmp_graph = QRectF(x_center, y_center - self.H_wind/2, self.L_coil, self.H_wind)
+        plot.setBrush(color_2)
+        plot.drawRect(tmp_graph)
+
+        if side: # Connexions que du côté x+
+            # Flèches et lignes
+            plot.drawArrow(x_center + 5*self.L_coil, y_center + self.H_wind/2 + self.arrowLength, x_center + 5*self.L_coil, y_center + self.H_wind/2, self.arrowSize)
+            plot.drawArrow(x_center + self.L_coil, y_center + self.H_wind/2, x_center + self.L_coil, y_center + self.H_wind/2 + self.arrowLength, self.arrowSize)
+
+            tmp_graph = QLineF(x_center + 6*self.L_coil, y_center + self.H_wind/2, x_center + 6*self.L_coil, y_center + self.H_wind/2 + 2*self.arrowLength1/3)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center, y_center + self.H_wind/2 + 2*self.arrowLength1/3, x_center + 6*self.L_coil, y_center + self.H_wind/2 + 2*self.arrowLength1/3)
+            plot.drawLine(tmp_graph)
+            tmp_graph = QLineF(x_center, y_center + self.H_wind/2 + 2*self.arrowLength1/3, x_center, y_center + self.H_wind/2)
+            plot.drawLine(tmp_graph)
+
+        tmp_rect = QRectF(x_center + 5*self.L_coil, y_center - self.H_wind/2 - self.arrowLength, self.L_coil, self.H_wind + 2*self.arrowLength)
+        plot.addContour(tmp_rect)
+        tmp_rect = QRectF(x_center, y_center - self.H_wind/2 - self.arrowLength, self.L_coil, self.H_wind + 2*self.arrowLength)
+        plot.addContour(tmp_rect)
+
+# Description des shapes de winding, en fonction du winding w :
+#   - "rect" : rectangle (x, y, largeur, hauteur) d'une bobine centrée en (0, 0), cf. Winding.getCoilRectF
+#   - "bound" : marges (x, y, largeur, hauteur) autour des centres des bobines, cf. Winding.boundingRect
+#   - "plot" : dessin d'une bobine, cf. Winding.plot_coil
+#   - "nb_nested" : nombre de windings superposés ou imbriqués se partageant la largeur, cf. MagneticCircuit.get_L_fen
+DICT_SHAPE_WINDING = {
+    "simple": {"rect": lambda w: (- w.L_coil/2, - w.H_wind/2, w.L_coil, w.H_wind),
+               "bound": lambda w: (- w.L_coil/2, - w.H_wind/2, w.L_coil, w.H_wind),
+               "plot": Winding.plotSimple, "nb_nested": 1},
+    "classic": {"rect": lambda w: (- w.L_coil/2, - w.H_wind/2 - w.arrowLength, w.L_coil, w.H_wind + 2*w.arrowLength),
+                "bound": lambda w: (- w.L_coil/2, - w.H_wind/2 - w.arrowLength, w.L_coil, w.H_wind + 2*w.arrowLength),
+                "plot": Winding.plotClassic, "nb_nested": 1},
+    "double-classic": {"rect": lambda w: (- 5*w.L_coil/4, - w.H_wind/2 - w.arrowLength, 5*w.L_coil/2, w.H_wind + w.arrowLength + w.arrowLength1),
+                       "bound": lambda w: (- 5*w.L_coil/4, - w.H_wind/2 - w.arrowLength, 5*w.L_coil/2, w.H_wind + w.arrowLength + w.arrowLength1),
+                       "plot": Winding.plotDoubleClassic, "nb_nested": 1},
+    "fine-coarse": {"rect": lambda w: (- 2*w.L_coil, - w.H_wind/2 - w.arrowLength, 4*w.L_coil, w.H_wind + 2*w.arrowLength),
+                    "bound": lambda w: (- 2*w.L_coil, - w.H_wind/2 - w.arrowLength, 4*w.L_coil, w.H_wind + 2*w.arrowLength),
+                    "plot": Winding.plotFineCoarse, "nb_nested": 1},
+    "middle-entry": {"rect": lambda w: (- w.L_coil/2 - w.arrowLength1 - w.arrowSize/2, - w.H_wind/2 - w.arrowLength, w.L_coil + 2*w.arrowLength1 + w.arrowSize/2, w.H_wind + 2*w.arrowLength),
+                     "bound": lambda w: (- w.L_coil/2 - w.arrowLength1 - w.arrowSize/2, - w.H_wind/2 - w.arrowLength, w.L_coil + 2*w.arrowLength1 + w.arrowSize/2, w.H_wind + 2*w.arrowLength),
+                     "plot": Winding.plotMiddleEntry, "nb_nested": 1},
+    "one-axial-split": {"rect": lambda w: (- 6*w.L_coil/4, - w.H_wind/2 - w.arrowLength - 3*w.arrowLength2/2, 6*w.L_coil/2, w.H_wind + w.arrowLength + w.arrowLength1 + 3*w.arrowLength2),
+                        "bound": lambda w: (- 6*w.L_coil/4, - w.H_wind/2 - w.arrowLength - 3*w.arrowLength2/2, 6*w.L_coil/2, w.H_wind + w.arrowLength + w.arrowLength1 + 3*w.arrowLength2),
+                        "plot": Winding.plotOneAxialSplit, "nb_nested": 1},
+    # Hauteur complète pour calcul taille fenetre CM & largeur divisée par 2
+    "two-axial-split-top": {"rect": lambda w: (- 5*w.L_coil/4, - w.H_wind - w.arrowLength - 3*w.arrowLength2/2, 5*w.L_coil/2, 2*w.H_wind + 2*w.arrowLength + 3*w.arrowLength2),
+                            "bound": lambda w: (- 5*w.L_coil/4, - w.H_wind - w.arrowLength, 5*w.L_coil/2, 2*w.H_wind + w.arrowLength + w.arrowLength2),
+                            "plot": Winding.plotTwoAxialSplitTop, "nb_nested": 2},
+    "two-axial-split-bottom": {"rect": lambda w: (- 5*w.L_coil/4, - w.H_wind - w.arrowLength - 3*w.arrowLength2/2, 5*w.L_coil/2, 2*w.H_wind + 2*w.arrowLength + 3*w.arrowLength2),
+                               "bound": lambda w: (- 5*w.L_coil/4, - w.H_wind - w.arrowLength2/2, 5*w.L_coil/2, 2*w.H_wind + w.arrowLength + w.arrowLength2),
+                               "plot": Winding.plotTwoAxialSplitBottom, "nb_nested": 2},
+    "shell-simple-classic-in": {"rect": lambda w: (- 3*w.L_coil, - w.H_wind/2 - w.arrowLength, 6*w.L_coil, w.H_wind + w.arrowLength + w.arrowLength1),
+                                "bound": lambda w: (- w.L_coil, - w.H_wind/2 - w.arrowLength, 2*w.L_coil, w.H_wind + w.arrowLength),
+                                "plot": Winding.plotShellSimpleClassicIn, "nb_nested": 2},
+    "shell-simple-classic-out": {"rect": lambda w: (- 3*w.L_coil, - w.H_wind/2 - w.arrowLength, 6*w.L_coil, w.H_wind + w.arrowLength + w.arrowLength1),
+                                 "bound": lambda w: (- 3*w.L_coil, - w.H_wind/2 - w.arrowLength, 6*w.L_coil, w.H_wind + w.arrowLength + w.arrowLength1),
+                                 "plot": Winding.plotShellSimpleClassicOut, "nb_nested": 2},
+    "shell-simple-diabolo-in": {"rect": lambda w: (- 6*w.L_coil - w.arrowSize/2, - w.H_wind/2 - w.arrowLength, 12*w.L_coil + w.arrowSize/2, w.H_wind + w.arrowLength + w.arrowLength1),
+                                "bound": lambda w: (- 6*w.L_coil - w.arrowSize/2, - w.H_wind/2 - w.arrowLength, 12*w.L_coil + w.arrowSize/2, w.H_wind + w.arrowLength),
+                                "plot": Winding.plotShellSimpleDiaboloIn, "nb_nested": 2},
+    "shell-simple-diabolo-out": {"rect": lambda w: (- 6*w.L_coil - w.arrowSize/2, - w.H_wind/2 - w.arrowLength, 12*w.L_coil + w.arrowSize/2, w.H_wind + w.arrowLength + w.arrowLength1),
+                                 "bound": lambda w: (- 4*w.L_coil, - w.H_wind/2, 8*w.L_coil, w.H_wind + w.arrowLength),
+                                 "plot": Winding.plotShellSimpleDiaboloOut, "nb_nested": 2},
+    "shell-double-diabolo-in": {"rect": lambda w: (- 6*w.L_coil - w.arrowSize/2, - w.H_wind/2 - w.arrowLength, 12*w.L_coil + w.arrowSize/2, w.H_wind + w.arrowLength + w.arrowLength1),
+                                "bound": lambda w: (- 6*w.L_coil - w.arrowSize/2, - w.H_wind/2 - w.arrowLength, 12*w.L_coil + w.arrowSize/2, w.H_wind + w.arrowLength),
+                                "plot": Winding.plotShellSimpleDiaboloIn, "nb_nested": 3},
+    "shell-double-diabolo-left": {"rect": lambda w: (- 6*w.L_coil - w.arrowSize/2, - w.H_wind/2 - w.arrowLength, 12*w.L_coil + w.arrowSize/2, w.H_wind + w.arrowLength + w.arrowLength1),
+                                  "bound": lambda w: (- 4*w.L_coil, - w.H_wind/2, w.L_coil, w.H_wind + w.arrowLength),
+                                  "plot": Winding.plotShellDoubleDiaboloLeft, "nb_nested": 3},
+    "shell-double-diabolo-right": {"rect": lambda w: (- 6*w.L_coil - w.arrowSize/2, - w.H_wind/2 - w.arrowLength, 12*w.L_coil + w.arrowSize/2, w.H_wind + w.arrowLength + w.arrowLength1),
+                                   "bound": lambda w: (3*w.L_coil, - w.H_wind/2, w.L_coil, w.H_wind + w.arrowLength),
+                                   "plot": Winding.plotShellDoubleDiaboloRight, "nb_nested": 3},
+    "shell-double-classic-in": {"rect": lambda w: (- 5*w.L_coil, - w.H_wind/2 - w.arrowLength, 10*w.L_coil, w.H_wind + w.arrowLength + w.arrowLength1),
+                                "bound": lambda w: (- 7*w.L_coil/2, - w.H_wind/2 - w.arrowLength, 7*w.L_coil, w.H_wind + w.arrowLength),
+                                "plot": Winding.plotShellDoubleClassicIn, "nb_nested": 3},
+    "shell-double-classic-out": {"rect": lambda w: (- 5*w.L_coil, - w.H_wind/2 - w.arrowLength, 10*w.L_coil, w.H_wind + w.arrowLength + w.arrowLength1),
+                                 "bound": lambda w: (- 5*w.L_coil, - w.H_wind/2 - w.arrowLength, 10*w.L_coil, w.H_wind + w.arrowLength + w.arrowLength1),
+                                 "plot": Winding.plotShellDoubleClassicOut, "nb_nested": 3},
+    "shell-double-classic-right": {"rect": lambda w: (- 5*w.L_coil, - w.H_wind/2 - w.arrowLength, 10*w.L_coil, w.H_wind + w.arrowLength + w.arrowLength1),
+                                   "bound": lambda w: (- w.L_coil/2, - w.H_wind/2, w.L_coil, w.H_wind + w.arrowLength),
+                                   "plot": Winding.plotShellDoubleClassicRight, "nb_nested": 3},
+    "shell-triple-classic-in": {"rect": lambda w: (- 7*w.L_coil, - w.H_wind/2 - w.arrowLength, 14*w.L_coil, w.H_wind + w.arrowLength + w.arrowLength1),
+                                "bound": lambda w: (- 11*w.L_coil/2, - w.H_wind/2 - w.arrowLength, 11*w.L_coil, w.H_wind + w.arrowLength),
+                                "plot": Winding.plotShellTripleClassicIn, "nb_nested": 4},
+    "shell-triple-classic-out": {"rect": lambda w: (- 7*w.L_coil, - w.H_wind/2 - w.arrowLength, 14*w.L_coil, w.H_wind + w.arrowLength + w.arrowLength1),
+                                 "bound": lambda w: (- 7*w.L_coil, - w.H_wind/2 - w.arrowLength, 14*w.L_coil, w.H_wind + w.arrowLength + w.arrowLength1),
+                                 "plot": Winding.plotShellTripleClassicOut, "nb_nested": 4},
+    "shell-triple-classic-left": {"rect": lambda w: (- 7*w.L_coil, - w.H_wind/2 - w.arrowLength, 14*w.L_coil, w.H_wind + w.arrowLength + w.arrowLength1),
+                                  "bound": lambda w: (- 5*w.L_coil/2, - w.H_wind/2, w.L_coil, w.H_wind + w.arrowLength),
+                                  "plot": Winding.plotShellTripleClassicLeft, "nb_nested": 4},
+    "shell-triple-classic-right": {"rect": lambda w: (- 7*w.L_coil, - w.H_wind/2 - w.arrowLength, 14*w.L_coil, w.H_wind + w.arrowLength + w.arrowLength1),
+                                   "bound": lambda w: (5*w.L_coil/2, - w.H_wind/2, w.L_coil, w.H_wind + w.arrowLength),
+                                   "plot": Winding.plotShellTripleClassicRight, "nb_nested": 4},
+    "shell-simple-barrel-in": {"rect": lambda w: (- 6*w.L_coil, - w.H_wind/2 - w.arrowLength, 12*w.L_coil, w.H_wind + 2*w.arrowLength),
+                               "bound": lambda w: (- 4*w.L_coil, - w.H_wind/2 - w.arrowLength, 8*w.L_coil, w.H_wind + w.arrowLength),
+                               "plot": Winding.plotShellSimpleBarrelIn, "nb_nested": 2},
+    "shell-simple-barrel-out": {"rect": lambda w: (- 6*w.L_coil, - w.H_wind/2 - w.arrowLength, 12*w.L_coil, w.H_wind + 2*w.arrowLength),
+                                "bound": lambda w: (- 6*w.L_coil, - w.H_wind/2, 12*w.L_coil, w.H_wind + w.arrowLength),
+                                "plot": Winding.plotShellSimpleBarrelOut, "nb_nested": 2},
+    "shell-double-barrel-in": {"rect": lambda w: (- 6*w.L_coil, - w.H_wind/2 - w.arrowLength, 12*w.L_coil, w.H_wind + 2*w.arrowLength),
+                               "bound": lambda w: (- 4*w.L_coil, - w.H_wind/2 - w.arrowLength, 8*w.L_coil, w.H_wind + w.arrowLength),
+                               "plot": Winding.plotShellSimpleBarrelIn, "nb_nested": 3},
+    "shell-double-barrel-left": {"rect": lambda w: (- 6*w.L_coil, - w.H_wind/2 - w.arrowLength, 12*w.L_coil, w.H_wind + 2*w.arrowLength),
+                                 "bound": lambda w: (- 6*w.L_coil, - w.H_wind/2, 6*w.L_coil, w.H_wind + w.arrowLength),
+                                 "plot": Winding.plotShellDoubleBarrelLeft, "nb_nested": 3},
+    "shell-double-barrel-right": {"rect": lambda w: (- 6*w.L_coil, - w.H_wind/2 - w.arrowLength, 12*w.L_coil, w.H_wind + 2*w.arrowLength),
+                                  "bound": lambda w: (0, - w.H_wind/2, 6*w.L_coil, w.H_wind + w.arrowLength),
+                                  "plot": Winding.plotShellDoubleBarrelRight, "nb_nested": 3},
+}
 
 class MagneticCircuit(QGraphicsRectItem):
     """
@@ -3331,23 +4273,66 @@ class MagneticCircuit(QGraphicsRectItem):
         # Contour de l'enroulement
         self.path = QPainterPath()
 
+        # Dimensions de la fenêtre et centres des colonnes, calculés une fois par modification (cf. getGeometry)
+        self.geometry = None
+        # Nombre de modifications de la géométrie, pour les vues qui en dépendent
+        self.nb_change = 0
+
+        # Rendu mis en cache jusqu'à la prochaine modification, cf. resetGeometry
+        setupRenderCache(self)
+
     def set_lst_windings(self, lst_windings):
+        # Toujours recalculé : les windings de la liste peuvent avoir été modifiés
         self.lst_windings = lst_windings
-        self.prepareGeometryChange()
+        self.resetGeometry()
 
     def set_nb_phases(self, nb_phases):
-        self.nb_phases = nb_phases
-        self.prepareGeometryChange()
+        if nb_phases != self.nb_phases:
+            self.nb_phases = nb_phases
+            self.resetGeometry()
 
     def set_nb_limbs(self, nb_limbs):
-        self.nb_limbs = nb_limbs
-        self.prepareGeometryChange()
+        if nb_limbs != self.nb_limbs:
+            self.nb_limbs = nb_limbs
+            self.resetGeometry()
 
     def set_core_type(self, isCoreType):
-        self.isCoreType = isCoreType
+        if isCoreType != self.isCoreType:
+            self.isCoreType = isCoreType
+            self.resetGeometry()
+
+    def resetGeometry(self):
+        """
+        Géométrie à recalculer après une modification
+        """
         self.prepareGeometryChange()
+        self.geometry = None
+        self.nb_change += 1
+        self.update()
+
+    def getGeometry(self):
+        """
+        Largeur et hauteur de la fenêtre et centres des colonnes, mis en cache jusqu'à la prochaine modification
+        """
+        if self.geometry is None:
+            L_fen = self.calc_L_fen()
+            H_fen = self.calc_H_fen()
+            self.geometry = {"L_fen": L_fen, "H_fen": H_fen, "center_col": self.calc_center_col(L_fen, H_fen)}
+        return self.geometry
 
     def get_H_fen(self):
+        return self.getGeometry()["H_fen"]
+
+    def get_L_fen(self):
+        return self.getGeometry()["L_fen"]
+
+    def get_center_col(self):
+        """
+        Coordonnées des centres des colonnes pour le tracé des enroulements : (lst_x_center_col, lst_y_center_col)
+        """
+        return self.getGeometry()["center_col"]
+
+    def calc_H_fen(self):
         """
         Fonction permettant d'obtenir la hauteur de la fenêtre correspondant aux windings
         """
@@ -3359,28 +4344,14 @@ class MagneticCircuit(QGraphicsRectItem):
         H_fen = H_fen + 2*self.e_wind_vert
         return H_fen
 
-    def get_L_fen(self):
+    def calc_L_fen(self):
         """
         Fonction permettant d'obtenir la largeur de la fenêtre correspondant aux windings
         """
         L_fen = self.e_wind_hori
         for w in self.lst_windings:
-            if w.getShapeWinding() == "two-axial-split-top" or w.getShapeWinding() == "two-axial-split-bottom":
-                L_fen = L_fen + w.getCoilRectF().width()/2 + self.e_wind_hori # Car ils sont superposés
-            elif w.getShapeWinding() in ["shell-simple-classic-in", "shell-simple-classic-out", "shell-simple-diabolo-in", "shell-simple-diabolo-out"]:
-                L_fen = L_fen + w.getCoilRectF().width()/2 + self.e_wind_hori # Car ils sont imbriqués
-            elif w.getShapeWinding() in ["shell-simple-barrel-in", "shell-simple-barrel-out"]:
-                L_fen = L_fen + w.getCoilRectF().width()/2 + self.e_wind_hori # Car ils sont imbriqués
-            elif w.getShapeWinding() in ["shell-double-diabolo-in", "shell-double-diabolo-left", "shell-double-diabolo-right"]:
-                L_fen = L_fen + w.getCoilRectF().width()/3 + self.e_wind_hori # Car ils sont imbriqués
-            elif w.getShapeWinding() in ["shell-double-classic-in", "shell-double-classic-out", "shell-double-classic-right"]:
-                L_fen = L_fen + w.getCoilRectF().width()/3 + self.e_wind_hori # Car ils sont imbriqués
-            elif w.getShapeWinding() in ["shell-double-barrel-in", "shell-double-barrel-left", "shell-double-barrel-right"]:
-                L_fen = L_fen + w.getCoilRectF().width()/3 + self.e_wind_hori # Car ils sont imbriqués
-            elif w.getShapeWinding() in ["shell-triple-classic-in", "shell-triple-classic-out", "shell-triple-classic-left", "shell-triple-classic-right"]:
-                L_fen = L_fen + w.getCoilRectF().width()/4 + self.e_wind_hori # Car ils sont imbriqués
-            else:
-                L_fen = L_fen + w.getCoilRectF().width() + self.e_wind_hori
+            # Windings superposés ou imbriqués : seule une partie de la largeur est comptée
+            L_fen = L_fen + w.getCoilRectF().width()/w.shape_desc["nb_nested"] + self.e_wind_hori
 
         if self.isCoreType:
             L_fen = 2*L_fen + 2*self.e_wind_hori # On ajoute 2*self.e_wind_hori pour la jolitée
@@ -3389,14 +4360,10 @@ class MagneticCircuit(QGraphicsRectItem):
 
         return L_fen
 
-    def get_center_col(self):
+    def calc_center_col(self, L_fen, H_fen):
         """
         Fonction renvoyant les coordonnées des centres des colonnes pour le tracé des enroulements
         """
-        # Données
-        L_fen = self.get_L_fen()
-        H_fen = self.get_H_fen()
-
         # Coordonnées des centres des colonnes pour les enroulements
         if self.nb_phases == 3:
             ### Appareil triphasé
@@ -3505,6 +4472,7 @@ class MagneticCircuit(QGraphicsRectItem):
         return self.path
 
     def paint(self, painter, option, widget=None):
+        t0 = perf_counter()
 
         # Reset du contour
         self.path = QPainterPath()
@@ -3739,6 +4707,8 @@ class MagneticCircuit(QGraphicsRectItem):
         else:
             raise Exception("Nombre de phases non géré")
 
+        addPaintStat(self, t0)
+
 class Cable(QGraphicsRectItem):
     """
     Objet graphique représentant un cable
@@ -3770,15 +4740,21 @@ class Cable(QGraphicsRectItem):
         # Contour du cable
         self.path = QPainterPath()
 
+        # Rendu mis en cache jusqu'à la prochaine modification
+        setupRenderCache(self)
+
     def setPropCable(self, prop_cable):
         self.prop_cable = prop_cable
         self.prepareGeometryChange()
+        self.update()
 
     def getPropCable(self):
         return self.prop_cable
 
     def setDrawingMode(self, mode):
-        self.drawingMode = mode
+        if mode != self.drawingMode:
+            self.drawingMode = mode
+            self.update()
 
     def setAvailableCables(self, lst_availableCables):
         self.lst_availableCables = lst_availableCables
@@ -3819,8 +4795,10 @@ class Cable(QGraphicsRectItem):
     def rotateCenter(self, angle):
         self.angle = self.angle + angle
         self.prepareGeometryChange()
+        self.update()
 
     def paint(self, painter, option, widget=None):
+        t0 = perf_counter()
 
         [x_center, y_center] = self.getCenter()
         [x_size, y_size] = self.getXYsize()
@@ -4061,3 +5039,4 @@ class Cable(QGraphicsRectItem):
         else:
             raise Exception("Mode de représentation inconnu")
 
+        addPaintStat(self, t0)
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+import numpy
+
+from PySide6.QtGui import QStandardItemModel, QStandardItem
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QDialog, QVBoxLayout, QLabel, QTableView, QAbstractItemView, QDialogButtonBox, QHeaderView, QSplitter
+
+from ..definition.ratingPlate import LST_TITLE_ENVELOPE
+
+# =============================================================================
+# Dialog "Tap envelope" : tensions, puissances et courants sur toutes les prises de tous les enroulements
+# =============================================================================
+
+# Colonnes du détail par prise : (titre, clé de la matrice)
+LST_DISPLAY_TAP = [("Winding", None), ("Tap", "tap"), ("Voltage (kV)", "u_kV"), ("Power (MVA)", "s_MVA"), \
+                   ("Line current (A)", "i_line"), ("Coil current (A)", "i_coil")]
+
+def newItem(val, val_sort=None):
+    """
+    Case non éditable : texte formaté affiché, valeur brute (ou val_sort) pour le rangement
+    """
+    if val is None:
+        item = QStandardItem("")
+    elif isinstance(val, float):
+        item = QStandardItem("%.3f"%val)
+    else:
+        item = QStandardItem("%s"%val)
+    item.setData(val if val_sort is None else val_sort, Qt.UserRole)
+    item.setData(Qt.AlignCenter, Qt.TextAlignmentRole)
+    item.setEditable(False)
+    return item
+
+class UI_TapEnvelope(QDialog):
+
+    def __init__(self, widg_ratingPlate, parent=None):
+        super().__init__(parent)
+
+        self.widg_ratingPlate = widg_ratingPlate
+
+        self.setup()
+
+    def setup(self):
+
+        # Un titre
+        self.setWindowTitle("Tap envelope")
+        self.resize(1000, 600)
+
+        # Suppression du bouton "?" dans la barre de titre
+        self.setWindowFlags(self.windowFlags() & ~Qt.WindowContextHelpButtonHint)
+
+        layout = QVBoxLayout(self)
+        splitter = QSplitter(Qt.Vertical)
+        layout.addWidget(splitter)
+
+        ### Enveloppe par enroulement
+        self.model_envelope = QStandardItemModel(0, len(LST_TITLE_ENVELOPE), self)
+        self.model_envelope.setHorizontalHeaderLabels(LST_TITLE_ENVELOPE)
+        self.ui_tab_envelope = self.newTable(self.model_envelope)
+        splitter.addWidget(self.ui_tab_envelope)
+
+        ### Détail par prise
+        self.model_taps = QStandardItemModel(0, len(LST_DISPLAY_TAP), self)
+        self.model_taps.setHorizontalHeaderLabels([title for title, _ in LST_DISPLAY_TAP])
+        self.ui_tab_taps = self.newTable(self.model_taps)
+        splitter.addWidget(self.ui_tab_taps)
+
+        self.ui_lbl_status = QLabel()
+        layout.addWidget(self.ui_lbl_status)
+
+        self.ui_buttonBox = QDialogButtonBox(QDialogButtonBox.Close)
+        layout.addWidget(self.ui_buttonBox)
+
+        self.updateTables()
+
+        # Connection
+        self.ui_buttonBox.rejected.connect(self.reject)
+
+    def newTable(self, model):
+        """
+        Tableau en lecture seule rangé sur les valeurs numériques
+        """
+        model.setSortRole(Qt.UserRole)
+        table = QTableView()
+        table.setModel(model)
+        table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        table.horizontalHeader().setStretchLastSection(True)
+        table.verticalHeader().setVisible(False)
+        table.setSortingEnabled(True)
+        return table
+
+    def updateTables(self):
+        """
+        Remplissage à partir de la matrice enroulements x prises de la plaque
+        """
+        mat = self.widg_ratingPlate.getTapMatrix()
+
+        self.model_envelope.removeRows(0, self.model_envelope.rowCount())
+        for row in self.widg_ratingPlate.getTapEnvelope():
+            self.model_envelope.appendRow([newItem(val) for val in row])
+
+        self.model_taps.removeRows(0, self.model_taps.rowCount())
+        for k, w in enumerate(mat["lst_winding"]):
+            for k_tap in range(w.model_tab_taps.rowCount()):
+                lst_item = [newItem(w.getName())]
+                for _, key in LST_DISPLAY_TAP[1:]:
+                    val = mat[key][k, k_tap]
+                    if key == "tap":
+                        # Prises numériques rangées en nombre
+                        lst_item.append(newItem(val, int(val) if val.isdigit() else None))
+                    else:
+                        lst_item.append(newItem(None if numpy.isnan(val) else float(val)))
+                self.model_taps.appendRow(lst_item)
+
+        self.ui_tab_envelope.sortByColumn(-1, Qt.AscendingOrder)
+        self.ui_tab_taps.sortByColumn(4, Qt.DescendingOrder)
+        self.ui_lbl_status.setText("%i windings, %i taps (%s)"%(len(mat["lst_winding"]), self.model_taps.rowCount(), \
+                                   "single-phase" if self.widg_ratingPlate.isMonophase() else "three-phase"))
@@ -0,0 +1,389 @@
+# -*- coding: utf-8 -*-
+import sys
+from io import BytesIO
+from os.path import splitext
+from copy import copy
+from struct import unpack
+from zipfile import ZipFile, ZIP_STORED, ZIP_DEFLATED, ZIP_BZIP2, ZIP_LZMA
+
+from numpy import savez, load
+
+from PySide6.QtCore import QByteArray
+from PySide6.QtXml import QDomDocument
+
+from .xml_stream import iterRecords
+
+# =============================================================================
+# Lecture / écriture des fichiers .ttx
+# Un .ttx est une archive zip contenant main.xml et les parties design/*.xml
+# =============================================================================
+
+### Codecs de compression disponibles
+# Un codec s'écrit "nom" ou "nom:niveau" (ex : "deflate:6")
+DICT_CODEC = {"stored": ZIP_STORED, "deflate": ZIP_DEFLATED, "lzma": ZIP_LZMA, "bzip2": ZIP_BZIP2}
+# Codec historique, utilisé par défaut
+DEFAULT_CODEC = "bzip2"
+
+### Entrées annexes déclarées par une partie (extension), nommées "<partie>_*<extension>"
+# ex : empilements colonnaires des coils design/coil_<nom>.npz déclarés dans design/coil.xml
+DICT_PART_SIBLING = {"design/coil.xml": ".npz"}
+
+### Recopie brute des entrées (sans décompression) : passe par des attributs internes de zipfile,
+# vérifiés pour ces versions de Python ; sinon l'entrée est relue puis réécrite (writestr)
+COPY_RAW_VERSIONS = ((3, 8), (3, 13))
+LST_ZIPFILE_INTERNAL = ["_lock", "_writecheck", "_didModify", "start_dir", "fp", "filelist", "NameToInfo"]
+
+def lstPartEntries(lst_name, part):
+    """
+    Entrées de l'archive appartenant à la partie part : part elle-même et ses entrées annexes déclarées
+    """
+    stem = splitext(part)[0] + "_"
+    ext = DICT_PART_SIBLING.get(part)
+    lst_out = []
+    for name in lst_name:
+        if name == part:
+            lst_out.append(name)
+        elif not ext is None and name.startswith(stem) and name.endswith(ext) and not "/" in name[len(stem):]:
+            lst_out.append(name)
+    return lst_out
+
+def getResultsPath(path_ttx):
+    """
+    Dossier des résultats de calcul à côté du ttx (un sous-dossier de fichiers .npy par coil, cf. CoilResults.saveArrays)
+    """
+    return splitext(path_ttx)[0] + "_results"
+
+def parseCodec(str_codec):
+    """
+    Renvoie (compression, compresslevel) à partir d'un codec "nom" ou "nom:niveau"
+    """
+    name, _, level = str_codec.partition(":")
+    if not name in DICT_CODEC:
+        raise Exception("Codec '%s' inconnu (valeurs attendues : %s)"%(name, ", ".join(DICT_CODEC)))
+
+    if level == "" or DICT_CODEC[name] in [ZIP_STORED, ZIP_LZMA]:
+        # Pas de niveau pour stored et lzma
+        return DICT_CODEC[name], None
+    else:
+        return DICT_CODEC[name], int(level)
+
+def newXMLDocument():
+    """
+    Création d'un document XML vide avec son en-tête et sa balise root
+    """
+    docDom = QDomDocument()
+    root = docDom.appendChild(docDom.createElement("root"))
+    header = docDom.createProcessingInstruction("xml", "version=\"1.0\" encoding=\"UTF-8\"")
+    docDom.insertBefore(header, root)
+
+    return docDom
+
+def xmlToBytes(docDom):
+    """
+    Sérialisation d'un document XML (indentation de 4, encodage UTF-8)
+    """
+    return docDom.toByteArray(4).data()
+
+def arraysToBytes(dict_arr):
+    """
+    Sérialisation d'un dictionnaire de tableaux numpy (.npz non compressé, l'archive s'en charge)
+    """
+    buffer = BytesIO()
+    savez(buffer, **dict_arr)
+    return buffer.getvalue()
+
+class TTXReader():
+    """
+    Lecture d'un fichier .ttx
+    L'archive reste ouverte et chaque partie n'est décompressée que lorsqu'elle est demandée
+    """
+
+    def __init__(self, path_open):
+        self.path_open = path_open
+        self.zip_file = ZipFile(path_open, "r")
+
+    def lstParts(self):
+        return self.zip_file.namelist()
+
+    def codec(self):
+        """
+        Codec de l'archive, enregistré dans le commentaire du zip
+        Les anciens fichiers n'en ont pas : on le déduit de la compression des entrées
+        """
+        comment = self.zip_file.comment.decode("utf-8", "replace")
+        if comment.startswith("codec="):
+            return comment[len("codec="):]
+
+        lst_info = self.zip_file.infolist()
+        if len(lst_info) == 0:
+            return DEFAULT_CODEC
+        for name, compression in DICT_CODEC.items():
+            if lst_info[0].compress_type == compression:
+                return name
+        return DEFAULT_CODEC
+
+    def hasPart(self, name):
+        return name in self.zip_file.NameToInfo
+
+    def openPart(self, name):
+        """
+        Flux de lecture de l'entrée name de l'archive (None si absente)
+        """
+        if not self.hasPart(name):
+            return None
+
+        return self.zip_file.open(name, "r")
+
+    def readBytes(self, name):
+        """
+        Contenu décompressé de l'entrée name de l'archive (None si absente)
+        """
+        if not self.hasPart(name):
+            return None
+
+        return self.zip_file.read(name)
+
+    def readXML(self, name):
+        """
+        Document XML de l'entrée name de l'archive (None si absente)
+        """
+        data = self.readBytes(name)
+        if data is None:
+            return None
+
+        docDom = QDomDocument()
+        # setContent renvoie (ok, message, ligne, colonne)
+        ok, msg, line, col = docDom.setContent(QByteArray(data))
+        if not ok:
+            raise Exception("Probleme lecture du fichier %s (ligne %i, colonne %i) : %s"%(name, line, col, msg))
+
+        return docDom
+
+    def readRecords(self, name, dict_record):
+        """
+        Lecture en flux de l'entrée XML name : générateur d'enregistrements (kind, record) (None si absente)
+        """
+        if not self.hasPart(name):
+            return None
+
+        return iterRecords(self.zip_file.open(name, "r"), dict_record, name)
+
+    def readArrays(self, name):
+        """
+        Dictionnaire des tableaux numpy de l'entrée .npz name de l'archive (None si absente)
+        """
+        data = self.readBytes(name)
+        if data is None:
+            return None
+
+        with load(BytesIO(data), allow_pickle=False) as npz:
+            return {k: npz[k] for k in npz.files}
+
+    def close(self):
+        self.zip_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class TTXSnapshot():
+    """
+    Instantané en mémoire des parties d'un ttx, même interface d'écriture que TTXWriter
+    Les documents XML et tableaux sont gardés tels quels : leur sérialisation est faite
+    plus tard (ex : dans un thread) par writeArchive
+    Les parties passées par writeState ne sont générées qu'à ce moment-là
+    """
+
+    def __init__(self, coil_binary=False, coil_blocks=False):
+        self.coil_binary = coil_binary
+        self.coil_blocks = coil_blocks
+        # key=nom de l'entrée ; data=bytes, QDomDocument, dict de tableaux ou ("copy", chemin de l'archive source)
+        self.dict_part = {}
+        self.dict_sharedDocument = {}
+        # Parties à générer dans writeArchive : [(fonction, état)]
+        self.lst_state = []
+
+    def writeBytes(self, name, data):
+        self.dict_part[name] = data
+
+    def writeState(self, fct_write, state):
+        """
+        fct_write(state, ttx) sera appelée par writeArchive (état recopié, sans accès aux widgets)
+        """
+        self.lst_state.append((fct_write, state))
+
+    def writeXML(self, name, docDom):
+        self.dict_part[name] = docDom
+
+    def writeArrays(self, name, dict_arr):
+        self.dict_part[name] = dict_arr
+
+    def copyFrom(self, path_source, name):
+        """
+        L'entrée name sera relue dans l'archive path_source au moment de l'écriture
+        """
+        self.dict_part[name] = ("copy", path_source)
+
+    def sharedDocument(self, name):
+        if not name in self.dict_sharedDocument:
+            self.dict_sharedDocument[name] = newXMLDocument()
+
+        return self.dict_sharedDocument[name]
+
+    def close(self):
+        self.dict_part.update(self.dict_sharedDocument)
+        self.dict_sharedDocument = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def writeArchive(self, path_save, codec=DEFAULT_CODEC):
+        """
+        Sérialisation, compression et écriture de l'instantané dans l'archive path_save
+        Renvoie le dictionnaire des contenus sérialisés (réutilisables pour un prochain instantané)
+        """
+        for fct_write, state in self.lst_state:
+            fct_write(state, self)
+        self.lst_state = []
+        self.close()
+
+        dict_bytes = {}
+        dict_source = {}
+        with TTXWriter(path_save, codec=codec) as ttx:
+            for name, data in self.dict_part.items():
+                if isinstance(data, QDomDocument):
+                    data = xmlToBytes(data)
+                elif isinstance(data, dict):
+                    data = arraysToBytes(data)
+                elif isinstance(data, tuple):
+                    if not data[1] in dict_source:
+                        dict_source[data[1]] = ZipFile(data[1], "r")
+                    data = dict_source[data[1]].read(name)
+                ttx.writeBytes(name, data)
+                dict_bytes[name] = data
+        for zip_file in dict_source.values():
+            zip_file.close()
+
+        return dict_bytes
+
+class TTXWriter():
+    """
+    Ecriture d'un fichier .ttx
+    Chaque partie est sérialisée en mémoire puis écrite directement dans son entrée de l'archive
+    """
+
+    def __init__(self, path_save, codec=DEFAULT_CODEC, coil_binary=False, coil_blocks=False):
+        self.path_save = path_save
+        self.codec = codec
+        # Empilements des coils au format colonnaire (.npz) plutôt qu'en XML
+        self.coil_binary = coil_binary
+        # Empilements XML par blocs de motifs répétés plutôt qu'élément par élément
+        self.coil_blocks = coil_blocks
+        compression, compresslevel = parseCodec(codec)
+        self.zip_file = ZipFile(path_save, "w", compression=compression, compresslevel=compresslevel)
+        # Le codec est enregistré dans l'archive (la décompression est de toute façon faite entrée par entrée)
+        self.zip_file.comment = ("codec=%s"%codec).encode("utf-8")
+
+        # Documents partagés entre plusieurs widgets (ex : material.xml), écrits à la fermeture
+        self.dict_sharedDocument = {}
+
+    def writeBytes(self, name, data):
+        """
+        Ecriture de données brutes dans l'entrée name de l'archive
+        """
+        with self.zip_file.open(name, "w") as f:
+            f.write(data)
+
+    def writeXML(self, name, docDom):
+        """
+        Ecriture d'un document XML dans l'entrée name de l'archive
+        """
+        self.writeBytes(name, xmlToBytes(docDom))
+
+    def writeArrays(self, name, dict_arr):
+        """
+        Ecriture d'un dictionnaire de tableaux numpy
+        """
+        self.writeBytes(name, arraysToBytes(dict_arr))
+
+    def writeState(self, fct_write, state):
+        """
+        Génération d'une partie à partir de l'état recopié d'un widget : fct_write(state, ttx)
+        (même appel que pour TTXSnapshot, où elle est différée)
+        """
+        fct_write(state, self)
+
+    def sharedDocument(self, name):
+        """
+        Document XML commun à plusieurs widgets
+        Il est créé au premier appel et écrit dans l'archive lors de close()
+        """
+        if not name in self.dict_sharedDocument:
+            self.dict_sharedDocument[name] = newXMLDocument()
+
+        return self.dict_sharedDocument[name]
+
+    def copyPart(self, ttx_reader, name):
+        """
+        Recopie de l'entrée name d'une autre archive (même codec)
+        Octet pour octet si zipfile le permet (cf. canCopyRaw), sinon décompression puis recompression
+        """
+        info = ttx_reader.zip_file.getinfo(name)
+        if not self.canCopyRaw():
+            zinfo = copy(info)
+            zinfo.flag_bits &= ~0x08
+            self.zip_file.writestr(zinfo, ttx_reader.zip_file.read(name))
+            return
+
+        # Données compressées, situées après l'en-tête local de 30 octets + nom + extra
+        with open(ttx_reader.path_open, "rb") as f:
+            f.seek(info.header_offset)
+            header = f.read(30)
+            len_name, len_extra = unpack("<2H", header[26:30])
+            f.seek(info.header_offset + 30 + len_name + len_extra)
+            raw = f.read(info.compress_size)
+
+        zinfo = copy(info)
+        # Taille et CRC sont connus : pas de data descriptor après les données
+        zinfo.flag_bits &= ~0x08
+        # zipfile n'ayant pas d'API publique pour cela, on écrit l'en-tête local et les données brutes comme le fait ZipFile.writestr
+        zip_file = self.zip_file
+        with zip_file._lock:
+            zip_file._writecheck(zinfo)
+            zip_file._didModify = True
+            zip_file.fp.seek(zip_file.start_dir)
+            zinfo.header_offset = zip_file.fp.tell()
+            zip_file.fp.write(zinfo.FileHeader())
+            zip_file.fp.write(raw)
+            zip_file.start_dir = zip_file.fp.tell()
+            zip_file.filelist.append(zinfo)
+            zip_file.NameToInfo[zinfo.filename] = zinfo
+
+    def canCopyRaw(self):
+        """
+        True si la version de Python est l'une de celles pour lesquelles la recopie brute a été vérifiée
+        """
+        if not COPY_RAW_VERSIONS[0] <= sys.version_info[:2] <= COPY_RAW_VERSIONS[1]:
+            return False
+        return all(hasattr(self.zip_file, attr) for attr in LST_ZIPFILE_INTERNAL)
+
+    def close(self):
+        for name, docDom in self.dict_sharedDocument.items():
+            self.writeXML(name, docDom)
+        self.dict_sharedDocument = {}
+        self.zip_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            # En cas d'erreur on ferme l'archive sans écrire les documents en attente
+            self.zip_file.close()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+from xml.etree.ElementTree import iterparse, ParseError
+
+# =============================================================================
+# Lecture en flux des parties XML d'un ttx
+# Le document est parcouru par morceaux avec iterparse et les éléments répétés
+# (discs, ducts, ...) sont renvoyés sous forme d'enregistrements, libérés aussitôt :
+# l'arbre complet n'est jamais construit en mémoire
+# =============================================================================
+
+def iterRecords(f, dict_record, name=""):
+    """
+    Générateur d'enregistrements (kind, record) à partir du flux XML f
+    dict_record : key=chemin de l'élément sous root (ex : "coil/discs/disc") ; value=type d'enregistrement
+    record : dict des textes des éléments feuilles, clés = chemin relatif à l'élément (ex : "radial_spacers/N_spacers")
+             et des attributs de l'élément, clés = "@nom"
+    Un enregistrement est renvoyé à la fermeture de son élément ; les feuilles d'un enregistrement
+    imbriqué (ex : disc dans coil) ne sont pas recopiées dans l'enregistrement parent
+    """
+    # Pile des éléments ouverts : noms, éléments et indicateurs de feuille
+    # (un élément n'est pas une feuille s'il a eu des enfants, même déjà détachés)
+    lst_open = []
+    lst_elt = []
+    lst_isLeaf = []
+    # Pile des enregistrements ouverts : (profondeur, type, record)
+    lst_rec = []
+
+    with f:
+        try:
+            for event, elt in iterparse(f, events=("start", "end")):
+                if event == "start":
+                    if len(lst_isLeaf) > 0:
+                        lst_isLeaf[-1] = False
+                    lst_open.append(elt.tag)
+                    lst_elt.append(elt)
+                    lst_isLeaf.append(True)
+                    # Chemin sans la balise root
+                    path = "/".join(lst_open[1:])
+                    if path in dict_record:
+                        rec = {"@" + k: v for k, v in elt.attrib.items()}
+                        lst_rec.append((len(lst_open), dict_record[path], rec))
+                    continue
+
+                lst_open.pop()
+                lst_elt.pop()
+                isLeaf = lst_isLeaf.pop()
+                if len(lst_rec) > 0 and lst_rec[-1][0] == len(lst_open) + 1:
+                    # Fermeture d'un enregistrement : l'élément n'est plus utile
+                    _, kind, rec = lst_rec.pop()
+                    elt.clear()
+                    if len(lst_elt) > 0:
+                        lst_elt[-1].remove(elt)
+                    yield kind, rec
+                    continue
+                if len(lst_rec) > 0:
+                    if isLeaf:
+                        # Feuille de l'enregistrement courant (libérée avec lui)
+                        depth = lst_rec[-1][0]
+                        key = "/".join(lst_open[depth:] + [elt.tag])
+                        lst_rec[-1][2][key] = elt.text if not elt.text is None else ""
+                elif len(lst_elt) > 0:
+                    # Elément hors enregistrement : détaché de son parent
+                    elt.clear()
+                    lst_elt[-1].remove(elt)
+        except ParseError as e:
+            raise Exception("Probleme lecture du fichier %s (ligne %i, colonne %i) : %s"% \
+                            (name, e.position[0], e.position[1], str(e)))